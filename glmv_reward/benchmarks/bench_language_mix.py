@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Language-Mix Detector Benchmark
+
+Compares `glmv_reward.utils.text.detect_long_paragraph_mixing` against its original implementation (`re.split`,
+then two uncompiled `re.findall` passes per paragraph) on long traces: Chinese only, English only, bilingual with
+the mixing near the start, and bilingual without any long paragraph.
+
+Usage:
+    python benchmarks/bench_language_mix.py [--repeat 5] [--paragraphs 60]
+"""
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+
+from glmv_reward.utils.text import detect_long_paragraph_mixing
+
+_CHINESE = "因为三角形的面积等于底乘以高除以二所以答案是十二，我们再检查一遍。"
+_ENGLISH = "the area of the triangle equals half the base times the height so the answer is twelve".split()
+
+
+def legacy_detect_long_paragraph_mixing(text: str, min_chinese_chars: int = 50, min_english_words: int = 200) -> bool:
+    paragraphs = [p.strip() for p in re.split(r"\n{2,}", text) if p.strip()]
+    has_long_chinese = False
+    has_long_english = False
+    for para in paragraphs:
+        chinese_count = len(re.findall(r"[一-鿿]", para))
+        english_count = len(re.findall(r"\b[a-zA-Z]{2,}\b", para))
+        if chinese_count >= min_chinese_chars and chinese_count / len(para) > 0.8:
+            has_long_chinese = True
+        if english_count >= min_english_words and english_count / (len(para.split()) + 1e-5) > 0.7:
+            has_long_english = True
+        if has_long_chinese and has_long_english:
+            return True
+    return has_long_chinese and has_long_english
+
+
+def build_texts(paragraphs: int, seed: int = 0) -> dict[str, str]:
+    rng = random.Random(seed)
+
+    def chinese() -> str:
+        return "".join(rng.choice(_CHINESE) for _ in range(300))
+
+    def english() -> str:
+        return " ".join(rng.choice(_ENGLISH) for _ in range(250))
+
+    def short_mixed() -> str:
+        return "".join(rng.choice(_CHINESE) for _ in range(40)) + " x = 2, so the area is 12. "
+
+    return {
+        "chinese": "\n\n".join(chinese() for _ in range(paragraphs)),
+        "english": "\n\n".join(english() for _ in range(paragraphs)),
+        "mixed": "\n\n".join([chinese(), english()] + [chinese() for _ in range(paragraphs - 2)]),
+        "short-mixed": "\n\n".join(short_mixed() for _ in range(paragraphs * 4)),
+    }
+
+
+def run(name: str, detect: Callable[[str], bool], texts: dict[str, str], repeat: int) -> None:
+    for text_name, text in texts.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = detect(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>9} {text_name:>11} ({len(text)} chars): {best * 1e3:8.3f} ms, mixing={result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--paragraphs", type=int, default=60)
+    args = parser.parse_args()
+
+    texts = build_texts(args.paragraphs)
+    run("original", legacy_detect_long_paragraph_mixing, texts, args.repeat)
+    run("streaming", detect_long_paragraph_mixing, texts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
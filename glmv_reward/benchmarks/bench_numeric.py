@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Numeric Comparator Micro-Benchmark
+
+Compares the native numeric comparator (`glmv_reward.utils.numeric.compare_numbers`) against the sympy path the
+verifiers used before it (`sympify(..., strict=True)` on both sides for every pair), on a corpus of answer pairs
+shaped like the ones produced by math / chart / physics rollouts.
+
+Usage:
+    python benchmarks/bench_numeric.py [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from typing import Any, Optional
+
+from glmv_reward.utils.numeric import compare_numbers
+
+_TOLERANCE = 1e-5
+
+
+def build_corpus(size: int = 2000, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        value = rng.choice([rng.randint(-1000, 1000), round(rng.uniform(-100, 100), rng.randint(1, 4))])
+        kind = rng.random()
+        if kind < 0.45:
+            answer, ground_truth = str(value), str(value if rng.random() < 0.6 else value + 1)
+        elif kind < 0.55:
+            numerator, denominator = rng.randint(1, 20), rng.randint(1, 20)
+            answer, ground_truth = f"{numerator}/{denominator}", str(numerator / denominator)
+        elif kind < 0.62:
+            numerator, denominator = rng.randint(1, 20), rng.randint(1, 20)
+            answer, ground_truth = f"\\frac{{{numerator}}}{{{denominator}}}", f"{numerator}/{denominator}"
+        elif kind < 0.70:
+            answer, ground_truth = f"{abs(value)}%", str(abs(value) / 100)
+        elif kind < 0.76:
+            answer, ground_truth = f"{value:.2e}", str(float(f"{value:.2e}"))
+        elif kind < 0.82:
+            big = rng.randint(1000, 10_000_000)
+            answer, ground_truth = f"{big:,}", str(big)
+        else:
+            answer, ground_truth = rng.choice(
+                [("x + 1", "1 + x"), ("\\sqrt{2}", "1.414"), ("2\\pi", "6.283"), ("(a+b)^2", "a^2+2ab+b^2")]
+            )
+        corpus.append((answer, ground_truth))
+    return corpus
+
+
+def legacy_compare(answer: str, ground_truth: str) -> Optional[bool]:
+    try:
+        from sympy import sympify
+
+        answer_number: Any = sympify(answer, strict=True)
+        gt_number: Any = sympify(ground_truth, strict=True)
+    except Exception:
+        return None
+    if answer_number.is_real and gt_number.is_real:
+        return bool(abs(answer_number - gt_number) / (abs(gt_number) + 1e-6) < _TOLERANCE)
+    return None
+
+
+def native_compare(answer: str, ground_truth: str) -> Optional[bool]:
+    return compare_numbers(answer, ground_truth, _TOLERANCE)
+
+
+def run(name: str, compare: Callable[[str, str], Optional[bool]], corpus: list[tuple[str, str]], repeat: int) -> None:
+    best = float("inf")
+    decided = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [compare(answer, ground_truth) for answer, ground_truth in corpus]
+        best = min(best, time.perf_counter() - start)
+        decided = sum(result is not None for result in results)
+    print(
+        f"{name:>8}: {best / len(corpus) * 1e6:8.2f} us/pair, "
+        f"decided {decided}/{len(corpus)} ({decided / len(corpus):.0%}) pairs"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--size", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size)
+    # * imports sympy outside of the timed region
+    legacy_compare("1", "1")
+    run("sympy", legacy_compare, corpus, args.repeat)
+    run("native", native_compare, corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Repetition Detector Benchmark
+
+Compares `glmv_reward.utils.text.detect_repeat` against its original implementation (13 unconditional `re.sub`
+passes, then a fresh substring and `hash()` call per position) on 32k-character outputs: a clean reasoning trace,
+a trace that degenerates into a loop near its end, and one that degenerates right away.
+
+Usage:
+    python benchmarks/bench_repeat.py [--repeat 5] [--length 32000]
+"""
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+
+from glmv_reward.utils.text import detect_repeat
+
+_WORDS = "the answer is we check that so let me compute area angle triangle 因此 所以 面积 = + - |".split()
+
+
+def legacy_detect_repeat(text: str, min_chars: int = 50, min_repetition: int = 10, exclude_length: int = 3) -> bool:
+    text = re.sub(r"\|[-]+\|", "|", text)
+    for ch in ["=", "|", "-", "~", "_", "#", "*", ".", "%", "－", "█", " ", "─"]:
+        text = re.sub(rf"{re.escape(ch)}{{{exclude_length},}}", "", text)
+
+    times: dict[int, int] = {}
+    for i in range(min_chars, len(text) + 1):
+        hash_val = hash(text[i - min_chars : i])
+        times[hash_val] = times.get(hash_val, 0) + 1
+        if times[hash_val] >= min_repetition:
+            return True
+    return False
+
+
+def build_texts(length: int, seed: int = 0) -> dict[str, str]:
+    rng = random.Random(seed)
+    words = []
+    while sum(len(word) + 1 for word in words) < length:
+        words.append(rng.choice(_WORDS) + str(rng.randint(0, 99)))
+    clean = " ".join(words)[:length]
+    loop = "Wait, let me re-check the area of the triangle once more. "
+    return {
+        "clean": clean,
+        "late-loop": clean[: length * 3 // 4] + loop * (length // 4 // len(loop) + 1),
+        "early-loop": clean[: length // 10] + loop * (length * 9 // 10 // len(loop) + 1),
+    }
+
+
+def run(name: str, detect: Callable[[str], bool], texts: dict[str, str], repeat: int) -> None:
+    for text_name, text in texts.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = detect(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>8} {text_name:>10} ({len(text)} chars): {best * 1e3:8.2f} ms, repeat={result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--length", type=int, default=32000)
+    args = parser.parse_args()
+
+    texts = build_texts(args.length)
+    run("original", legacy_detect_repeat, texts, args.repeat)
+    run("rolling", detect_repeat, texts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
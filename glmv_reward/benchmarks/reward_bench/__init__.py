@@ -0,0 +1,8 @@
+"""
+Reward System Benchmark Suite
+
+Synthetic rollout corpora shaped like the ones of each datasource, the benchmarks that run them through the text
+utilities, the verifiers and `RewardSystem.get_reward` (`micro.py`), and a load test replaying rollouts at fixed
+rates (`load.py`) against a local stub LLM judge (`stub_judge.py`), and the import-time budget of cold starts
+(`importtime.py`).
+"""
@@ -0,0 +1,261 @@
+"""
+Synthetic rollout corpora, one per datasource.
+
+Every rollout has a long think trace and a boxed answer, and a share of them is malformed the way real rollouts
+are: a missing `</think>`, no `<answer>` tags, two boxes, a legacy `\\boxed{}`, a truncated box or a trace that
+degenerates into a loop. Answers are shaped like the ones of the datasource: numeric, symbolic and unit answers for
+STEM, options and short phrases for VQA, text lines for OCR, place names for GeoQuest and action strings for the
+GUI agents. Ground truths are formatted like well-formed responses, as `get_reward` extracts them the same way.
+
+The datasources whose verifiers read the lenient answer part, everything after `</think>`, have responses without
+`<answer>` tags, like their own rollouts.
+"""
+
+import json
+import random
+from collections.abc import Callable
+
+import msgspec
+
+_BEGIN_OF_BOX = "<|begin_of_box|>"
+_END_OF_BOX = "<|end_of_box|>"
+
+_ENGLISH = (
+    "first let me look at the figure carefully so the base of the triangle is the segment we need and the height "
+    "follows from the right angle then we check the units again and compare the result with every option"
+).split()
+_CHINESE = "首先观察图中的条件所以三角形的底边长度已知再根据直角求出高然后检查单位是否一致最后与选项逐一比较"
+_LOOP = "Wait, let me re-check the previous step once more. "
+
+_LENIENT_DATASOURCES = frozenset(("counting", "geoguess", "multi_image", "ocr", "ocr_ignore_case"))
+
+# * share of the rollouts that are malformed, and of the answers that are wrong
+_MALFORMED_RATE = 0.2
+_WRONG_RATE = 0.4
+
+
+class Rollout(msgspec.Struct, frozen=True):
+    datasource: str
+    prompt: str
+    response: str
+    ground_truth: str
+
+
+def build_think(rng: random.Random, chars: int) -> str:
+    """
+    Returns a reasoning trace of about `chars` characters, English paragraphs with a few Chinese ones.
+    """
+    paragraphs: list[str] = []
+    length = 0
+    while length < chars:
+        if rng.random() < 0.2:
+            paragraph = "".join(rng.choice(_CHINESE) for _ in range(rng.randint(40, 160)))
+        else:
+            words = [rng.choice(_ENGLISH) for _ in range(rng.randint(20, 80))]
+            words.insert(rng.randrange(len(words)), f"{rng.randint(2, 99)} {rng.choice('+-*/=')} {rng.randint(2, 99)}")
+            paragraph = " ".join(words) + "."
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:chars]
+
+
+def format_response(think: str, answer: str, prefix: str = "", answer_tags: bool = True) -> str:
+    if not answer_tags:
+        return f"<think>{think}</think>{prefix}{_BEGIN_OF_BOX}{answer}{_END_OF_BOX}"
+    return f"<think>{think}</think><answer>{prefix}{_BEGIN_OF_BOX}{answer}{_END_OF_BOX}</answer>"
+
+
+def _malform(rng: random.Random, think: str, answer: str, prefix: str) -> str:
+    kind = rng.randrange(6)
+    if kind == 0:
+        return f"<think>{think}<answer>{prefix}{_BEGIN_OF_BOX}{answer}{_END_OF_BOX}</answer>"
+    if kind == 1:
+        return f"<think>{think}</think>{prefix}{_BEGIN_OF_BOX}{answer}{_END_OF_BOX}"
+    if kind == 2:
+        return format_response(think, f"{answer}{_END_OF_BOX} or {_BEGIN_OF_BOX}{answer}", prefix)
+    if kind == 3:
+        return f"<think>{think}</think><answer>{prefix}\\boxed{{{answer}}}</answer>"
+    if kind == 4:
+        return f"<think>{think}</think><answer>{prefix}{_BEGIN_OF_BOX}{answer}"
+    cut = len(think) // 2
+    return f"<think>{think[:cut]}{_LOOP * (len(think) // 2 // len(_LOOP) + 10)}"
+
+
+# * each answer generator returns `(answer, ground_truth, prefix)`, where `prefix` is the text before the box
+_AnswerGenerator = Callable[[random.Random], tuple[str, str, str]]
+
+
+def _maybe_wrong(rng: random.Random, answer: str, wrong: str) -> str:
+    return wrong if rng.random() < _WRONG_RATE else answer
+
+
+def _math_answer(rng: random.Random) -> tuple[str, str, str]:
+    kind = rng.randrange(5)
+    if kind == 0:
+        value = rng.randint(-1000, 1000)
+        return _maybe_wrong(rng, str(value), str(value + 1)), str(value), ""
+    if kind == 1:
+        numerator, denominator = rng.randint(1, 30), rng.randint(2, 30)
+        answer = f"\\frac{{{numerator}}}{{{denominator}}}"
+        return _maybe_wrong(rng, answer, f"\\frac{{{denominator}}}{{{numerator}}}"), f"{numerator}/{denominator}", ""
+    if kind == 2:
+        value = round(rng.uniform(-100, 100), rng.randint(1, 4))
+        return _maybe_wrong(rng, f"{value}", f"{value * 2}"), str(value), "The answer is "
+    if kind == 3:
+        answer, ground_truth = rng.choice(
+            [
+                ("x^2 + 2x + 1", "(x+1)^2"),
+                ("\\sqrt{2}", "\\sqrt{2}"),
+                ("2\\pi", "2\\pi"),
+                ("\\frac{\\pi}{3}", "60^\\circ"),
+            ]
+        )
+        return _maybe_wrong(rng, answer, "x - 1"), ground_truth, ""
+    low = rng.randint(-10, 10)
+    return _maybe_wrong(rng, f"[{low}, {low + 5})", f"({low}, {low + 5}]"), f"[{low},{low + 5})", ""
+
+
+def _unit_answer(units: tuple[str, ...]) -> _AnswerGenerator:
+    def generate(rng: random.Random) -> tuple[str, str, str]:
+        unit = rng.choice(units)
+        value = round(rng.uniform(0.1, 500), 2)
+        answer = rng.choice([f"{value} {unit}", f"{value}\\,\\text{{{unit}}}", f"{value / 1000:.2e} k{unit}"])
+        return _maybe_wrong(rng, answer, f"{value * 3} {unit}"), f"{value} {unit}", ""
+
+    return generate
+
+
+def _chart_answer(rng: random.Random) -> tuple[str, str, str]:
+    value = rng.randint(1000, 10_000_000)
+    answer = rng.choice([f"{value:,}", str(value), f"{value / 1e6:.2f} million", f"{value % 100}%"])
+    ground_truth = f"{value % 100}%" if answer.endswith("%") else str(value)
+    return _maybe_wrong(rng, answer, str(value // 7)), ground_truth, ""
+
+
+def _counting_answer(rng: random.Random) -> tuple[str, str, str]:
+    value = rng.randint(0, 40)
+    return _maybe_wrong(rng, str(value), str(value + rng.randint(1, 3))), str(value), "There are "
+
+
+def _choice_answer(rng: random.Random) -> tuple[str, str, str]:
+    option = rng.choice("ABCD")
+    return _maybe_wrong(rng, option, rng.choice("ABCD")), option, ""
+
+
+def _phrase_answer(rng: random.Random) -> tuple[str, str, str]:
+    answer = rng.choice(["a red bicycle", "two cats on a sofa", "the left one", "yes", "no", "Tuesday", "B. 45°"])
+    return _maybe_wrong(rng, answer, "a blue car"), answer, ""
+
+
+def _ocr_answer(rng: random.Random) -> tuple[str, str, str]:
+    words = [rng.choice(_ENGLISH).capitalize() for _ in range(rng.randint(3, 12))]
+    text = " ".join(words)
+    wrong = text.replace(words[0], words[0][:-1] or "x")
+    return _maybe_wrong(rng, text, wrong), text, ""
+
+
+def _place_answer(rng: random.Random) -> tuple[str, str, str]:
+    place_name, address = rng.choice(
+        [
+            ("Eiffel Tower", "Champ de Mars, Paris, France"),
+            ("故宫", "北京市东城区景山前街4号"),
+            ("Shibuya Crossing", "Shibuya City, Tokyo, Japan"),
+            ("Sydney Opera House", "Bennelong Point, Sydney NSW 2000, Australia"),
+        ]
+    )
+    ground_truth = json.dumps({"place_name": place_name, "address": address}, ensure_ascii=False)
+    return _maybe_wrong(rng, f"{place_name}, {address}", "Somewhere in Europe"), ground_truth, "结论：这里可能是"
+
+
+def _android_world_answer(rng: random.Random) -> tuple[str, str, str]:
+    x, y = rng.randint(0, 900), rng.randint(0, 900)
+    action = {"action_type": "click", "box_2d": [[x, y, x + rng.randint(20, 99), y + rng.randint(20, 99)]]}
+    if rng.random() < 0.3:
+        action = {"action_type": "input_text", "text": rng.choice(_ENGLISH), "box_2d": action["box_2d"]}
+    wrong = dict(action, action_type="wait")
+    return _maybe_wrong(rng, json.dumps(action), json.dumps(wrong)), json.dumps(action), "Action: "
+
+
+def _webvoyager_answer(rng: random.Random) -> tuple[str, str, str]:
+    x, y = rng.randint(0, 1000), rng.randint(0, 1000)
+    action = rng.choice(
+        [
+            f"CLICK(point=({x}, {y}), element_info='[button] Search')",
+            f"TYPE(point=({x}, {y}), text='{rng.choice(_ENGLISH)} tickets', element_info='[input] query')",
+            f"SCROLL_DOWN(point=({x}, {y}), distance=500)",
+            "KEY_PRESS(key='Enter')",
+            f"ANSWER(content='{rng.choice(_ENGLISH)}')",
+        ]
+    )
+    return _maybe_wrong(rng, action, f"CLICK(point=({y}, {x}))"), action, "Action: "
+
+
+def _osworld_answer(rng: random.Random) -> tuple[str, str, str]:
+    x, y = rng.randint(0, 1000), rng.randint(0, 1000)
+    action = rng.choice(
+        [
+            f"left_click(start_box='[{x}, {y}]')",
+            f"left_drag(start_box='[{x}, {y}]', end_box='[{y}, {x}]')",
+            f"type(content='{rng.choice(_ENGLISH)}')",
+            f"hover(start_box='[{x}, {y}]', element_info='menu')",
+        ]
+    )
+    return _maybe_wrong(rng, action, f"right_click(start_box='[{y}, {x}]')"), action, "Action: "
+
+
+_ANSWER_GENERATORS: dict[str, _AnswerGenerator] = {
+    "general": _phrase_answer,
+    "math": _math_answer,
+    "chemistry": _unit_answer(("mol/L", "g", "kJ/mol", "mL")),
+    "physics": _unit_answer(("m/s", "N", "J", "m/s^2", "Pa")),
+    "chart": _chart_answer,
+    "mmsi": _choice_answer,
+    "multi_image": _phrase_answer,
+    "ocr": _ocr_answer,
+    "ocr_ignore_case": _ocr_answer,
+    "vqa": _phrase_answer,
+    "counting": _counting_answer,
+    "geoguess": _place_answer,
+    "AndroidWorld": _android_world_answer,
+    "WebVoyager": _webvoyager_answer,
+    "OSWorld": _osworld_answer,
+}
+DATASOURCES = (*_ANSWER_GENERATORS, "language_mix")
+
+
+def _language_mix_response(rng: random.Random, think_chars: int) -> str:
+    think = build_think(rng, think_chars)
+    if rng.random() < 0.5:
+        # * one long Chinese and one long English paragraph, which the verifier penalizes
+        chinese = "".join(rng.choice(_CHINESE) for _ in range(300))
+        english = " ".join(rng.choice(_ENGLISH) for _ in range(250))
+        think = f"{chinese}\n\n{think}\n\n{english}"
+    return format_response(think, str(rng.randint(0, 99)))
+
+
+def build_rollouts(datasource: str, size: int, think_chars: int = 4000, seed: int = 0) -> list[Rollout]:
+    """
+    Returns `size` synthetic rollouts of `datasource`, one of `DATASOURCES`.
+    """
+    rng = random.Random(f"{datasource}-{seed}")
+    rollouts = []
+    for index in range(size):
+        prompt = f"[{datasource} #{index}] Answer the question about the image and put the answer in a box."
+        # * rollouts vary in length, from a quick answer to twice the requested trace
+        think = build_think(rng, rng.randint(think_chars // 10, think_chars * 2))
+        if datasource == "language_mix":
+            response = _language_mix_response(rng, think_chars)
+            rollouts.append(Rollout(datasource, prompt, response, format_response("Reference.", "0")))
+            continue
+        if datasource not in _ANSWER_GENERATORS:
+            err_msg = f"Unknown datasource: {datasource}, expected one of {DATASOURCES}."
+            raise ValueError(err_msg)
+        answer, ground_truth, prefix = _ANSWER_GENERATORS[datasource](rng)
+        answer_tags = datasource not in _LENIENT_DATASOURCES
+        if rng.random() < _MALFORMED_RATE:
+            response = _malform(rng, think, answer, prefix)
+        else:
+            response = format_response(think, answer, prefix, answer_tags=answer_tags)
+        ground_truth = format_response("Reference.", ground_truth, answer_tags=answer_tags)
+        rollouts.append(Rollout(datasource, prompt, response, ground_truth))
+    return rollouts
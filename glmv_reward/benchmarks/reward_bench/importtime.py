@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Reward System Import-Time Benchmark
+
+Measures the cold start of fresh interpreters with `python -X importtime`: the time spent importing modules and the
+wall time of each target, the modules it loads and the heavy dependencies among them. Verifier modules are imported
+on first use, so a reward worker only pays for the verifiers its config references.
+
+Targets:
+    - `import`: `import glmv_reward`, which should not load sympy, editdistance or PIL.
+    - `reward_system`: builds a `RewardSystem` from `--config`.
+    - `worker`: builds a `RewardSystem` and the verifier of every datasource of `--config`, as a worker process of
+      the `process` backend does on start.
+
+A target exceeding `--budget-ms` of import time, or loading one of the `--forbid` modules for the `import` target,
+fails the run with exit code 1.
+
+Usage:
+    python -m benchmarks.reward_bench.importtime [--config configs/full_config.yaml] [--targets import worker]
+        [--repeat 5] [--budget-ms import=300 worker=1500] [--output importtime.json]
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Optional
+
+import msgspec
+
+TARGETS = ("import", "reward_system", "worker")
+HEAVY_MODULES = ("sympy", "editdistance", "PIL", "numpy", "httpx", "pyarrow", "requests", "openai")
+DEFAULT_FORBIDDEN_MODULES = ("sympy", "editdistance", "PIL")
+
+# * prints the loaded modules as JSON on the last line of stdout
+_TARGET_CODE = {
+    "import": "import glmv_reward",
+    "reward_system": "from glmv_reward import RewardSystem\nRewardSystem({config!r}).close()",
+    "worker": (
+        "from glmv_reward import RewardSystem\n"
+        "reward_system = RewardSystem({config!r})\n"
+        "for datasource in reward_system.datasource_reward_configs:\n"
+        "    reward_system.get_verifier_from_datasource(datasource)\n"
+        "reward_system.close()"
+    ),
+}
+_PRINT_MODULES = "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+
+
+class ImportTimeResult(msgspec.Struct, frozen=True):
+    target: str
+    repeat: int
+    # * medians over the repeats
+    import_ms: float
+    wall_ms: float
+    num_modules: int
+    heavy_modules: list[str]
+    # * top-level packages by cumulative import time, in ms, of the median run
+    top_packages: list[tuple[str, float]]
+    budget_ms: Optional[float]
+    forbidden_modules: list[str]
+    passed: bool
+
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """
+    Parses the `-X importtime` report into the cumulative import time of each top-level import, in ms.
+    """
+    times: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # * nested imports are indented under the module importing them
+        if name.startswith("  "):
+            continue
+        times[name.strip()] = float(cumulative) / 1000
+    return times
+
+
+def run_target(target: str, config: str) -> tuple[float, float, dict[str, float], list[str]]:
+    code = _TARGET_CODE[target].format(config=config) + _PRINT_MODULES
+    start = time.perf_counter()
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=False
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if process.returncode != 0:
+        err_msg = f"Target `{target}` failed:\n{process.stderr[-2000:]}"
+        raise RuntimeError(err_msg)
+    times = parse_importtime(process.stderr)
+    modules = json.loads(process.stdout.strip().splitlines()[-1])
+    return sum(times.values()), wall_ms, times, modules
+
+
+def bench_target(
+    target: str, config: str, repeat: int, budget_ms: Optional[float], forbid: list[str]
+) -> ImportTimeResult:
+    runs = sorted((run_target(target, config) for _ in range(repeat)), key=lambda run: run[0])
+    import_ms, _, times, modules = runs[len(runs) // 2]
+    packages: dict[str, float] = {}
+    for name, cumulative_ms in times.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + cumulative_ms
+    loaded = {module.split(".")[0] for module in modules}
+    forbidden_modules = sorted(loaded & set(forbid)) if target == "import" else []
+    return ImportTimeResult(
+        target=target,
+        repeat=repeat,
+        import_ms=import_ms,
+        wall_ms=statistics.median(run[1] for run in runs),
+        num_modules=len(modules),
+        heavy_modules=[module for module in HEAVY_MODULES if module in loaded],
+        top_packages=sorted(packages.items(), key=lambda item: item[1], reverse=True)[:10],
+        budget_ms=budget_ms,
+        forbidden_modules=forbidden_modules,
+        passed=(budget_ms is None or import_ms <= budget_ms) and len(forbidden_modules) == 0,
+    )
+
+
+def parse_budgets(values: list[str]) -> dict[str, float]:
+    budgets = {}
+    for value in values:
+        target, _, budget = value.partition("=")
+        if target not in TARGETS or budget == "":
+            err_msg = f"Budgets should be `<target>=<ms>` with a target of {TARGETS}, but got {value!r}."
+            raise ValueError(err_msg)
+        budgets[target] = float(budget)
+    return budgets
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    budgets = parse_budgets(args.budget_ms)
+    results = [
+        bench_target(target, args.config, args.repeat, budgets.get(target), args.forbid) for target in args.targets
+    ]
+    return {
+        "schema_version": 1,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "args": vars(args),
+        "results": msgspec.to_builtins(results),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="configs/full_config.yaml")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target, the median is reported")
+    parser.add_argument("--budget-ms", nargs="*", default=["import=300"], help="`<target>=<ms>` budgets of import time")
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN_MODULES), help="see `import`")
+    parser.add_argument("--output", default=None, help="path of the JSON report, printed if not given")
+    args = parser.parse_args()
+
+    report = run(args)
+    encoded = msgspec.json.format(msgspec.json.encode(report))
+    if args.output is None:
+        print(encoded.decode())
+    else:
+        with open(args.output, "wb") as f:
+            f.write(encoded + b"\n")
+        for result in report["results"]:
+            print(
+                f"{result['target']:>14}: import {result['import_ms']:8.1f} ms, wall {result['wall_ms']:8.1f} ms, "
+                f"{result['num_modules']} modules, heavy {result['heavy_modules']}, "
+                f"{'passed' if result['passed'] else 'FAILED'}"
+            )
+    if not all(result["passed"] for result in report["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Reward System Load Test
+
+Replays rollouts through `RewardSystem.get_reward`, or a reward server, at fixed rates of steps per second, each
+step scoring one batch, against a local stub judge (see `stub_judge.py`), so it runs offline on a CPU box. Every LLM
+judge URL of the config is pointed to the stub judge.
+
+Steps are sent open-loop: a step starts at its scheduled time whether the previous ones finished or not, up to
+`--concurrency` steps in flight, so an overloaded reward system shows up as queueing in the step times. A level is
+saturated when its achieved rate falls below 95% of the target, or its p99 step time exceeds `--slo-ms`.
+
+Rollouts are read from a JSONL file with `prompt`, `answer`, `gt_answer`, `datasource` and optionally
+`image_file` per line, or generated with `corpus.py`, see `--write-rollouts` to save them as such a file.
+
+Targets:
+    - `inprocess`: calls `get_reward` of a `RewardSystem` built in this process.
+    - `server`: starts a reward server in this process and calls it through `RewardClient`.
+    - `--server-url`: calls a running reward server, whose judge URLs should point to the stub judge printed here.
+
+Usage:
+    python -m benchmarks.reward_bench.load [--config configs/full_config.yaml] [--rollouts rollouts.jsonl]
+        [--qps 1 2 4 8] [--duration 30] [--batch-size 256] [--target inprocess] [--latency lognormal:0.8,0.5]
+        [--error-rate 0.01] [--rate-limit-rate 0.02] [--verdict mixed] [--output load.json]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+import msgspec
+import numpy as np
+
+from glmv_reward.client import RewardClient
+from glmv_reward.configs import ServerConfig
+from glmv_reward.reward_system import RewardSystem
+from glmv_reward.server import RewardServer
+from glmv_reward.utils.serialization import load_yaml
+
+from .corpus import DATASOURCES, build_rollouts
+from .stub_judge import StubJudgeServer, StubJudgeStats, add_stub_judge_arguments, stub_judge_config_from_args
+
+TARGETS = ("inprocess", "server")
+
+_logger = logging.getLogger(__name__)
+
+# * share of the target rate below which a level is saturated
+_SATURATION_RATIO = 0.95
+
+
+class RolloutRecord(msgspec.Struct, frozen=True):
+    prompt: str
+    answer: str
+    gt_answer: str
+    datasource: str = "default"
+    image_file: Optional[str] = None
+
+
+class LevelResult(msgspec.Struct, frozen=True):
+    target_qps: float
+    achieved_qps: float
+    steps: int
+    items: int
+    errors: int
+    # * from the scheduled start of a step, so they include the time it queued behind other steps
+    step_p50_ms: float
+    step_p90_ms: float
+    step_p99_ms: float
+    step_max_ms: float
+    # * from the actual start of a step
+    service_p50_ms: float
+    service_p99_ms: float
+    judge_requests: int
+    judge_packed_requests: int
+    judge_responses: dict[str, int]
+    judge_max_inflight: int
+    saturated: bool
+
+
+def read_rollouts(path: str) -> list[RolloutRecord]:
+    decoder = msgspec.json.Decoder(RolloutRecord)
+    with open(path, "rb") as f:
+        return [decoder.decode(line) for line in f if len(line.strip()) > 0]
+
+
+def synthetic_rollouts(datasources: Sequence[str], size: int, seed: int = 0) -> list[RolloutRecord]:
+    corpora = [build_rollouts(datasource, size, seed=seed) for datasource in datasources]
+    return [
+        RolloutRecord(rollout.prompt, rollout.response, rollout.ground_truth, rollout.datasource)
+        for rollouts in zip(*corpora, strict=True)
+        for rollout in rollouts
+    ]
+
+
+def synthetic_rollouts_from_args(args: argparse.Namespace) -> list[RolloutRecord]:
+    mapping = load_yaml(args.config).get("datasource_reward_config_mapping")
+    configured = mapping.keys() if isinstance(mapping, dict) else ()
+    datasources = [datasource for datasource in args.datasources or DATASOURCES if datasource in configured]
+    return synthetic_rollouts(datasources, args.synthetic_size, seed=args.seed)
+
+
+def write_stub_config(config_path: str, judge_url: str, output_path: str, judge_cache: bool = False) -> None:
+    """
+    Writes a copy of the reward config at `config_path` whose LLM judge URLs are all `judge_url`, without the
+    verdict cache unless `judge_cache` is set, as the replayed rollouts repeat.
+    """
+    config = load_yaml(config_path)
+    if not judge_cache:
+        judge_cache_config = config.get("judge_cache")
+        config["judge_cache"] = {
+            **(judge_cache_config if isinstance(judge_cache_config, dict) else {}),
+            "enabled": False,
+        }
+    reward_configs = config.get("reward_configs")
+    if isinstance(reward_configs, dict):
+        for reward_config in reward_configs.values():
+            if isinstance(reward_config, dict) and "llm_judge_url" in reward_config:
+                urls = reward_config["llm_judge_url"]
+                reward_config["llm_judge_url"] = [judge_url] * len(urls) if isinstance(urls, list) else judge_url
+    # * JSON is valid YAML
+    with open(output_path, "wb") as f:
+        f.write(msgspec.json.encode(config))
+
+
+def iter_batches(rollouts: Sequence[RolloutRecord], batch_size: int, seed: int = 0) -> Iterator[list[RolloutRecord]]:
+    """
+    Yields batches of `batch_size` rollouts forever, going over the rollouts in a new random order every epoch.
+    """
+    rng = random.Random(seed)
+    order = list(range(len(rollouts)))
+    position = len(order)
+    while True:
+        batch = []
+        while len(batch) < batch_size:
+            if position == len(order):
+                rng.shuffle(order)
+                position = 0
+            batch.append(rollouts[order[position]])
+            position += 1
+        yield batch
+
+
+def make_step(get_reward: Callable[..., Any]) -> Callable[[list[RolloutRecord]], Any]:
+    def step(batch: list[RolloutRecord]) -> Any:
+        return get_reward(
+            prompts=[rollout.prompt for rollout in batch],
+            answers=[rollout.answer for rollout in batch],
+            gt_answers=[rollout.gt_answer for rollout in batch],
+            image_files=[rollout.image_file for rollout in batch],
+            datasources=[rollout.datasource for rollout in batch],
+        )
+
+    return step
+
+
+def run_level(
+    step: Callable[[list[RolloutRecord]], Any],
+    batches: Iterator[list[RolloutRecord]],
+    qps: float,
+    duration: float,
+    concurrency: int,
+    stub: StubJudgeServer,
+    slo_ms: Optional[float] = None,
+) -> LevelResult:
+    """
+    Sends `qps` steps per second for `duration` seconds, and waits for all of them to finish.
+    """
+    step_times: list[float] = []
+    service_times: list[float] = []
+    errors = 0
+    items = 0
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def timed_step(batch: list[RolloutRecord], scheduled: float) -> None:
+        nonlocal errors, items
+        start = time.perf_counter()
+        try:
+            step(batch)
+            failed = False
+        except Exception as e:
+            _logger.warning("Step failed: %s", repr(e))
+            failed = True
+        end = time.perf_counter()
+        slots.release()
+        with lock:
+            step_times.append(end - scheduled)
+            service_times.append(end - start)
+            errors += int(failed)
+            items += len(batch)
+
+    stub.reset_peak()
+    before = stub.stats()
+    count = max(1, round(qps * duration))
+    futures: list[Future[None]] = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reward-load") as executor:
+        begin = time.perf_counter()
+        for index in range(count):
+            scheduled = begin + index / qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # * past `concurrency` steps in flight, the next one waits here, and its step time includes the wait
+            slots.acquire()
+            futures.append(executor.submit(timed_step, next(batches), scheduled))
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - begin
+    after = stub.stats()
+
+    step_ms = np.asarray(step_times) * 1e3
+    service_ms = np.asarray(service_times) * 1e3
+    step_p50, step_p90, step_p99 = np.percentile(step_ms, [50, 90, 99])
+    service_p50, service_p99 = np.percentile(service_ms, [50, 99])
+    # * a level that keeps up finishes right after its last scheduled step
+    achieved_qps = count / max(elapsed, count / qps)
+    saturated = achieved_qps < qps * _SATURATION_RATIO or (slo_ms is not None and step_p99 > slo_ms)
+    return LevelResult(
+        target_qps=qps,
+        achieved_qps=achieved_qps,
+        steps=count,
+        items=items,
+        errors=errors,
+        step_p50_ms=float(step_p50),
+        step_p90_ms=float(step_p90),
+        step_p99_ms=float(step_p99),
+        step_max_ms=float(step_ms.max()),
+        service_p50_ms=float(service_p50),
+        service_p99_ms=float(service_p99),
+        judge_requests=after.requests - before.requests,
+        judge_packed_requests=after.packed_requests - before.packed_requests,
+        judge_responses=_diff_responses(before, after),
+        judge_max_inflight=after.max_inflight,
+        saturated=bool(saturated),
+    )
+
+
+def _diff_responses(before: StubJudgeStats, after: StubJudgeStats) -> dict[str, int]:
+    return {
+        status: count - before.responses.get(status, 0)
+        for status, count in after.responses.items()
+        if count > before.responses.get(status, 0)
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    logging.getLogger("glmv_reward").setLevel(args.log_level)
+    rollouts = read_rollouts(args.rollouts) if args.rollouts is not None else synthetic_rollouts_from_args(args)
+    if len(rollouts) == 0:
+        err_msg = "No rollouts to replay."
+        raise ValueError(err_msg)
+
+    stub = StubJudgeServer(stub_judge_config_from_args(args))
+    stub.start()
+    reward_system: Optional[RewardSystem] = None
+    server: Optional[RewardServer] = None
+    client: Optional[RewardClient] = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            if args.server_url is not None:
+                print(f"Stub judge listening on {stub.url}, point the judge URLs of the reward server to it")
+                client = RewardClient(args.server_url)
+                step = make_step(client.get_reward)
+            else:
+                config_path = os.path.join(tmp_dir, "config.yaml")
+                write_stub_config(args.config, stub.url, config_path, judge_cache=args.judge_cache)
+                reward_system = RewardSystem.from_yaml(config_path)
+                if args.target == "server":
+                    server = RewardServer(reward_system, ServerConfig(port=0))
+                    server.start()
+                    client = RewardClient(server.url)
+                    step = make_step(client.get_reward)
+                else:
+                    step = make_step(reward_system.get_reward)
+
+            batches = iter_batches(rollouts, args.batch_size, seed=args.seed)
+            if args.warmup_steps > 0:
+                for _ in range(args.warmup_steps):
+                    step(next(batches))
+
+            levels = []
+            for qps in args.qps:
+                level = run_level(step, batches, qps, args.duration, args.concurrency, stub, slo_ms=args.slo_ms)
+                levels.append(level)
+                print(
+                    f"{qps:8.2f} steps/s: achieved {level.achieved_qps:8.2f}, step p50 {level.step_p50_ms:9.1f} ms, "
+                    f"p99 {level.step_p99_ms:9.1f} ms, judge requests {level.judge_requests}, "
+                    f"errors {level.errors}{', saturated' if level.saturated else ''}",
+                    flush=True,
+                )
+                if level.saturated and args.stop_at_saturation:
+                    break
+        finally:
+            if client is not None:
+                client.close()
+            if server is not None:
+                server.shutdown()
+            elif reward_system is not None:
+                reward_system.close()
+            stub.shutdown()
+
+    sustained = [level.target_qps for level in levels if not level.saturated]
+    saturated = [level.target_qps for level in levels if level.saturated]
+    return {
+        "schema_version": 1,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "args": vars(args),
+        "rollouts": len(rollouts),
+        "max_sustained_qps": max(sustained) if len(sustained) > 0 else None,
+        "saturation_qps": min(saturated) if len(saturated) > 0 else None,
+        "levels": msgspec.to_builtins(levels),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="configs/full_config.yaml")
+    parser.add_argument("--rollouts", default=None, help="JSONL of rollouts, synthetic ones if not given")
+    parser.add_argument("--datasources", nargs="+", choices=DATASOURCES, default=None)
+    parser.add_argument("--synthetic-size", type=int, default=200, help="synthetic rollouts per datasource")
+    parser.add_argument("--write-rollouts", default=None, help="write the rollouts as JSONL and exit")
+    parser.add_argument("--target", choices=TARGETS, default="inprocess")
+    parser.add_argument("--server-url", default=None, help="URL of a running reward server, instead of `--target`")
+    parser.add_argument("--qps", type=float, nargs="+", default=[1.0], help="steps per second, one level each")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of each level")
+    parser.add_argument("--batch-size", type=int, default=256, help="rollouts per step")
+    parser.add_argument("--concurrency", type=int, default=16, help="steps in flight at most")
+    parser.add_argument("--warmup-steps", type=int, default=1)
+    parser.add_argument("--slo-ms", type=float, default=None, help="p99 step time above which a level is saturated")
+    parser.add_argument("--stop-at-saturation", action="store_true")
+    parser.add_argument("--judge-cache", action="store_true", help="keep the verdict cache of the config")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="ERROR", help="level of the glmv_reward loggers")
+    parser.add_argument("--output", default=None, help="path of the JSON report, printed if not given")
+    add_stub_judge_arguments(parser)
+    args = parser.parse_args()
+
+    if args.write_rollouts is not None:
+        rollouts = synthetic_rollouts_from_args(args)
+        with open(args.write_rollouts, "wb") as f:
+            for rollout in rollouts:
+                f.write(msgspec.json.encode(rollout) + b"\n")
+        return
+
+    report = msgspec.json.format(msgspec.json.encode(run(args)))
+    if args.output is None:
+        print(report.decode())
+    else:
+        with open(args.output, "wb") as f:
+            f.write(report + b"\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Reward System Micro-Benchmarks
+
+Measures the throughput and latency percentiles of the text utilities (`check_answer_format`, `find_boxed_content`,
+`detect_repeat`, `detect_long_paragraph_mixing`), of `extract_answer`, `judge` and `judge_batch` of the verifier of
+each datasource, and of `RewardSystem.get_reward` end to end on batches mixing every datasource, over the synthetic
+rollouts of `corpus.py`.
+
+LLM judge requests are answered in-process by a stub, after `--judge-latency` seconds, so the LLM judge path is
+exercised without any network. The verdict cache is disabled unless `--judge-cache` is given, and the cache of
+`parse_response` is cleared before each timed call of the text and verifier groups, so that every repeat parses and
+judges again.
+
+The report is written as JSON, to compare releases with each other.
+
+Usage:
+    python -m benchmarks.reward_bench.micro [--config configs/full_config.yaml] [--size 200] [--repeat 3]
+        [--groups text verifier reward] [--datasources math chart ...] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import importlib.metadata
+import logging
+import platform
+import sys
+from collections.abc import Iterator
+from typing import Any, Optional
+
+import msgspec
+
+from glmv_reward.configs import JudgeCacheConfig
+from glmv_reward.reward_system import RewardSystem
+from glmv_reward.utils.cache import configure_verdict_cache
+from glmv_reward.utils.llm import LLMJudgeEngine
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.text import detect_long_paragraph_mixing, detect_repeat, find_boxed_content
+
+from .corpus import DATASOURCES, Rollout, build_rollouts
+from .timing import BenchResult, measure
+
+GROUPS = ("text", "verifier", "reward")
+
+# * parsed as a full score by every verifier, as JSON by GeoQuest and as "1.0" by the others
+STUB_JUDGE_REPLY = '{"analysis": "stub", "score": 1.0}'
+
+
+@contextlib.contextmanager
+def stub_llm_judge(reply: str = STUB_JUDGE_REPLY, latency: float = 0.0) -> Iterator[None]:
+    """
+    Answers every LLM judge request with `reply` after `latency` seconds, instead of sending it.
+    """
+
+    async def apost_query_llm(self: LLMJudgeEngine, prompt: str, api_key: str, *args: Any, **kwargs: Any) -> str:
+        del self, prompt, api_key, args, kwargs
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return reply
+
+    original = LLMJudgeEngine.apost_query_llm
+    LLMJudgeEngine.apost_query_llm = apost_query_llm  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        LLMJudgeEngine.apost_query_llm = original  # type: ignore[method-assign]
+
+
+def bench_text(reward_system: RewardSystem, rollouts: list[Rollout], repeat: int) -> list[BenchResult]:
+    responses = [rollout.response for rollout in rollouts]
+    return [
+        measure(
+            "text",
+            "check_answer_format",
+            reward_system.check_answer_format,
+            responses,
+            repeat,
+            before_each=parse_response.cache_clear,
+        ),
+        measure("text", "find_boxed_content", find_boxed_content, responses, repeat),
+        measure("text", "detect_repeat", detect_repeat, responses, repeat),
+        measure("text", "detect_long_paragraph_mixing", detect_long_paragraph_mixing, responses, repeat),
+    ]
+
+
+def bench_verifier(
+    reward_system: RewardSystem, datasource: str, rollouts: list[Rollout], repeat: int
+) -> list[BenchResult]:
+    verifier = reward_system.get_verifier_from_datasource(datasource)
+    group = f"verifier/{datasource}"
+    results = [
+        measure(
+            group,
+            "extract_answer",
+            lambda rollout: verifier.extract_answer(rollout.response, question=rollout.prompt),
+            rollouts,
+            repeat,
+            before_each=parse_response.cache_clear,
+        )
+    ]
+    if verifier.is_batch_verifier:
+        return results
+
+    items = []
+    for rollout in rollouts:
+        try:
+            extracted = verifier.extract_answer(rollout.response, question=rollout.prompt)
+            extracted_gt = verifier.extract_answer(rollout.ground_truth, question=rollout.prompt)
+        except Exception:  # noqa: S112
+            continue
+        items.append((extracted, extracted_gt, rollout.prompt))
+    results.append(
+        measure(group, "judge", lambda item: verifier.judge(item[0], item[1], question=item[2]), items, repeat)
+    )
+    results.append(
+        measure(
+            group,
+            "judge_batch",
+            lambda batch: verifier.judge_batch(
+                [item[0] for item in batch], [item[1] for item in batch], questions=[item[2] for item in batch]
+            ),
+            [items],
+            repeat,
+            items_per_call=len(items),
+        )
+    )
+    return results
+
+
+def bench_reward(
+    reward_system: RewardSystem, rollouts: list[Rollout], batch_size: int, repeat: int
+) -> list[BenchResult]:
+    batches = [rollouts[start : start + batch_size] for start in range(0, len(rollouts), batch_size)]
+    batches = [batch for batch in batches if len(batch) == batch_size] or batches
+
+    def get_reward(batch: list[Rollout]) -> Any:
+        return reward_system.get_reward(
+            prompts=[rollout.prompt for rollout in batch],
+            answers=[rollout.response for rollout in batch],
+            gt_answers=[rollout.ground_truth for rollout in batch],
+            datasources=[rollout.datasource for rollout in batch],
+        )
+
+    return [
+        measure(
+            "reward",
+            f"get_reward[batch={len(batches[0])}]",
+            get_reward,
+            batches,
+            repeat,
+            items_per_call=len(batches[0]),
+        )
+    ]
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    # * malformed rollouts log warnings, which would dominate the timings
+    logging.getLogger("glmv_reward").setLevel(args.log_level)
+    reward_system = RewardSystem.from_yaml(args.config)
+    if not args.judge_cache:
+        configure_verdict_cache(JudgeCacheConfig(enabled=False))
+
+    datasources = [
+        datasource
+        for datasource in args.datasources or DATASOURCES
+        if datasource in reward_system.datasource_reward_configs
+    ]
+    corpora = {
+        datasource: build_rollouts(datasource, args.size, think_chars=args.think_chars, seed=args.seed)
+        for datasource in datasources
+    }
+    # * interleaved, so that every batch of `get_reward` mixes datasources like a training step
+    mixed = [rollout for rollouts in zip(*corpora.values(), strict=True) for rollout in rollouts]
+
+    results: list[BenchResult] = []
+    try:
+        with stub_llm_judge(latency=args.judge_latency):
+            if "text" in args.groups:
+                results.extend(bench_text(reward_system, mixed, args.repeat))
+            if "verifier" in args.groups:
+                for datasource, rollouts in corpora.items():
+                    results.extend(bench_verifier(reward_system, datasource, rollouts, args.repeat))
+            if "reward" in args.groups:
+                results.extend(bench_reward(reward_system, mixed, args.batch_size, args.repeat))
+    finally:
+        reward_system.close()
+
+    return {
+        "schema_version": 1,
+        "glmv_reward_version": _package_version(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "args": vars(args),
+        "datasources": datasources,
+        "results": msgspec.to_builtins(results),
+    }
+
+
+def _package_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("glmv_reward")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="configs/full_config.yaml")
+    parser.add_argument("--size", type=int, default=200, help="rollouts per datasource")
+    parser.add_argument("--think-chars", type=int, default=4000, help="typical length of the think traces")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=256, help="rollouts per `get_reward` call")
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--datasources", nargs="+", choices=DATASOURCES, default=None)
+    parser.add_argument("--judge-latency", type=float, default=0.0, help="seconds before the stub judge replies")
+    parser.add_argument("--judge-cache", action="store_true", help="keep the verdict cache of the config")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="ERROR", help="level of the glmv_reward loggers")
+    parser.add_argument("--output", default=None, help="path of the JSON report, printed if not given")
+    args = parser.parse_args()
+
+    report = msgspec.json.format(msgspec.json.encode(run(args)))
+    if args.output is None:
+        print(report.decode())
+    else:
+        with open(args.output, "wb") as f:
+            f.write(report + b"\n")
+        for result in report_rows(msgspec.json.decode(report)["results"]):
+            print(result)
+
+
+def report_rows(results: list[dict[str, Any]]) -> Iterator[str]:
+    for result in results:
+        yield (
+            f"{result['group']:>24} {result['name']:>28}: {result['items_per_s']:10.1f} items/s, "
+            f"p50 {result['p50_ms']:8.3f} ms, p99 {result['p99_ms']:8.3f} ms, errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Stub LLM Judge Server
+
+A local OpenAI-compatible chat completion server to put the reward system under load without the real judge API.
+Every request is answered after a latency drawn from a distribution, some fail with a 500 or a 429 at the given
+rates, and the verdict follows a policy:
+
+    - `correct`: every answer gets a full score.
+    - `wrong`: every answer gets a zero score.
+    - `mixed`: a share `--correct-rate` of the prompts get a full score, the same prompt always gets the same
+      verdict.
+
+Prompts packed by `glmv_reward.utils.llm.pack_judge_prompts` get a JSON array with one verdict per task.
+
+Latency distributions, in seconds:
+    `constant:<value>`, `uniform:<low>,<high>`, `exponential:<mean>` or `lognormal:<median>,<sigma>`.
+
+Usage:
+    python -m benchmarks.reward_bench.stub_judge [--port 8700] [--latency lognormal:0.8,0.5]
+        [--error-rate 0.01] [--rate-limit-rate 0.02] [--verdict mixed] [--correct-rate 0.5]
+"""
+
+import argparse
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, cast
+
+import msgspec
+
+VERDICTS = ("correct", "wrong", "mixed")
+
+# * a verdict both parsed as JSON by GeoQuest and matched as "1.0" / "0.0" by the other verifiers
+_REPLIES = {True: '{"analysis": "stub", "score": 1.0}', False: '{"analysis": "stub", "score": 0.0}'}
+_PACKED_TASK_PATTERN = re.compile(r"^### Task (\d+)$", re.MULTILINE)
+
+
+class StubJudgeConfig(msgspec.Struct, frozen=True):
+    latency: str = "constant:0.05"
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    verdict: str = "correct"
+    correct_rate: float = 0.5
+    seed: int = 0
+
+
+class StubJudgeStats(msgspec.Struct, frozen=True):
+    requests: int
+    packed_requests: int
+    # * responses by HTTP status
+    responses: dict[str, int]
+    max_inflight: int
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parses a latency distribution, see the module docstring, into a sampler of latencies in seconds.
+    """
+    name, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(",")] if params else []
+    except ValueError:
+        values = []
+    if name == "constant" and len(values) == 1:
+        return lambda _: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "exponential" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if name == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    err_msg = (
+        f"Invalid latency distribution: {spec}, expected `constant:<value>`, `uniform:<low>,<high>`, "
+        "`exponential:<mean>` or `lognormal:<median>,<sigma>`."
+    )
+    raise ValueError(err_msg)
+
+
+class _StubJudgeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubJudgeHTTPServer"
+
+    def do_POST(self) -> None:
+        stub = self.server.stub
+        try:
+            payload = msgspec.json.decode(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = str(payload["messages"][-1]["content"])
+        except (msgspec.DecodeError, KeyError, IndexError, TypeError):
+            self._send(400, {"error": {"message": "invalid chat completion request"}})
+            return
+
+        status, latency = stub._admit()
+        try:
+            time.sleep(latency)
+            if status != 200:
+                self._send(status, {"error": {"message": "stub error"}})
+                return
+            content = stub.reply(prompt)
+            # * rough usage, so that the client-side token limits can settle their reservations
+            tokens = len(prompt) // 4 + len(content) // 4
+            self._send(
+                200,
+                {
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "total_tokens": tokens},
+                },
+            )
+        finally:
+            stub._release(status, packed=_PACKED_TASK_PATTERN.search(prompt) is not None)
+
+    def _send(self, status: int, body: dict[str, Any]) -> None:
+        data = msgspec.json.encode(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _StubJudgeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # * many concurrent judge connections are expected
+    request_queue_size = 1024
+    stub: "StubJudgeServer"
+
+
+class StubJudgeServer(object):
+    """
+    Serves the stub judge from background threads, see the module docstring.
+    """
+
+    def __init__(self, config: Optional[StubJudgeConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config if config is not None else StubJudgeConfig()
+        if self.config.verdict not in VERDICTS:
+            err_msg = f"Invalid verdict policy: {self.config.verdict}, expected one of {VERDICTS}."
+            raise ValueError(err_msg)
+        self._sample_latency = parse_latency(self.config.latency)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._packed_requests = 0
+        self._responses: dict[str, int] = {}
+        self._inflight = 0
+        self._max_inflight = 0
+
+        self._server = _StubJudgeHTTPServer((host, port), _StubJudgeHandler)
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = cast(tuple[str, int], self._server.server_address)[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-judge", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def verdict(self, prompt: str) -> bool:
+        if self.config.verdict == "correct":
+            return True
+        if self.config.verdict == "wrong":
+            return False
+        return zlib.crc32(prompt.encode("utf-8", "surrogatepass")) % 10_000 < self.config.correct_rate * 10_000
+
+    def reply(self, prompt: str) -> str:
+        # * split into the preamble, then the index and the text of each task of a packed prompt
+        parts = _PACKED_TASK_PATTERN.split(prompt)
+        if len(parts) == 1:
+            return _REPLIES[self.verdict(prompt)]
+        return msgspec.json.encode([_REPLIES[self.verdict(text)] for text in parts[2::2]]).decode()
+
+    def stats(self) -> StubJudgeStats:
+        with self._lock:
+            return StubJudgeStats(
+                requests=self._requests,
+                packed_requests=self._packed_requests,
+                responses=dict(self._responses),
+                max_inflight=self._max_inflight,
+            )
+
+    def reset_peak(self) -> None:
+        """
+        Restarts the tracking of the peak number of requests in flight, e.g. between load levels.
+        """
+        with self._lock:
+            self._max_inflight = self._inflight
+
+    def _admit(self) -> tuple[int, float]:
+        with self._lock:
+            self._requests += 1
+            self._inflight += 1
+            self._max_inflight = max(self._max_inflight, self._inflight)
+            draw = self._rng.random()
+            latency = max(0.0, self._sample_latency(self._rng))
+        if draw < self.config.error_rate:
+            return 500, latency
+        if draw < self.config.error_rate + self.config.rate_limit_rate:
+            # * rate limited requests are rejected right away
+            return 429, 0.0
+        return 200, latency
+
+    def _release(self, status: int, packed: bool) -> None:
+        with self._lock:
+            self._inflight -= 1
+            self._packed_requests += int(packed)
+            self._responses[str(status)] = self._responses.get(str(status), 0) + 1
+
+
+def add_stub_judge_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="constant:0.05", help="latency distribution of the judge, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of the requests failing with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of the requests getting a 429")
+    parser.add_argument("--verdict", choices=VERDICTS, default="correct")
+    parser.add_argument("--correct-rate", type=float, default=0.5, help="share of full scores of `mixed`")
+    parser.add_argument("--judge-seed", type=int, default=0)
+
+
+def stub_judge_config_from_args(args: argparse.Namespace) -> StubJudgeConfig:
+    return StubJudgeConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        verdict=args.verdict,
+        correct_rate=args.correct_rate,
+        seed=args.judge_seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    add_stub_judge_arguments(parser)
+    args = parser.parse_args()
+
+    stub = StubJudgeServer(stub_judge_config_from_args(args), host=args.host, port=args.port)
+    stub.start()
+    print(f"Stub judge listening on {stub.url}", flush=True)
+    try:
+        while True:
+            time.sleep(10)
+            print(msgspec.json.encode(stub.stats()).decode(), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Timing of benchmark cases: every input is timed on its own, so that the report has latency percentiles on top of
+the throughput.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+import msgspec
+import numpy as np
+
+
+class BenchResult(msgspec.Struct, frozen=True):
+    group: str
+    name: str
+    # * calls timed, over all repeats, and items scored by them, e.g. a `get_reward` call scores a batch
+    calls: int
+    items: int
+    errors: int
+    total_s: float
+    items_per_s: float
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def measure(
+    group: str,
+    name: str,
+    func: Callable[[Any], Any],
+    inputs: Sequence[Any],
+    repeat: int = 3,
+    warmup: int = 1,
+    items_per_call: int = 1,
+    before_each: Optional[Callable[[], None]] = None,
+) -> BenchResult:
+    """
+    Calls `func` on each of `inputs`, `warmup` untimed times then `repeat` timed times, each timed call after an
+    untimed call to `before_each`, e.g. to clear a cache.
+
+    Exceptions are counted in `errors` rather than raised: malformed rollouts make some extraction functions raise,
+    and the reward system catches those too.
+    """
+    for _ in range(warmup):
+        for value in inputs:
+            try:
+                func(value)
+            except Exception:  # noqa: S110
+                pass
+
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        for value in inputs:
+            if before_each is not None:
+                before_each()
+            start = time.perf_counter()
+            try:
+                func(value)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    samples = np.asarray(latencies if len(latencies) > 0 else [0.0]) * 1e3
+    total_s = float(sum(latencies))
+    items = len(latencies) * items_per_call
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return BenchResult(
+        group=group,
+        name=name,
+        calls=len(latencies),
+        items=items,
+        errors=errors,
+        total_s=total_s,
+        items_per_s=items / total_s if total_s > 0 else 0.0,
+        mean_ms=float(samples.mean()),
+        p50_ms=float(p50),
+        p90_ms=float(p90),
+        p99_ms=float(p99),
+        max_ms=float(samples.max()),
+    )
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 
+from .client import RewardClient
 from .reward_system import RewardSystem
 
-__all__ = ["RewardSystem"]
+__all__ = ["RewardClient", "RewardSystem"]
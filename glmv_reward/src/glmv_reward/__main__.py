@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+
+from .cli import main
+
+main()
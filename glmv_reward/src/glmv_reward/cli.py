@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+
+import argparse
+import signal
+import threading
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import msgspec
+
+from .configs import RewardSystemConfig
+from .utils.serialization import load_yaml
+
+
+def _serve(args: argparse.Namespace) -> None:
+    from .reward_system import RewardSystem
+    from .server import RewardServer
+
+    config = msgspec.convert(load_yaml(args.config), RewardSystemConfig).server
+    overrides = {
+        name: getattr(args, name)
+        for name in ("host", "port", "unix_socket", "batch_wait", "max_batch_requests", "max_concurrent_batches")
+        if getattr(args, name) is not None
+    }
+    server = RewardServer(RewardSystem(args.config), msgspec.structs.replace(config, **overrides))
+
+    def stop(*_: Any) -> None:
+        # * `shutdown` waits for the serving threads, so it cannot run in the signal handler itself
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="glmv_reward", description="GLM-V reward system.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve `RewardSystem.get_reward` over HTTP.")
+    serve_parser.add_argument("--config", required=True, help="Path to the reward system YAML config.")
+    serve_parser.add_argument("--host", default=None, help="Overrides `server.host` of the config.")
+    serve_parser.add_argument("--port", type=int, default=None, help="Overrides `server.port` of the config.")
+    serve_parser.add_argument("--unix-socket", default=None, help="Overrides `server.unix_socket` of the config.")
+    serve_parser.add_argument("--batch-wait", type=float, default=None, help="Overrides `server.batch_wait`.")
+    serve_parser.add_argument(
+        "--max-batch-requests", type=int, default=None, help="Overrides `server.max_batch_requests`."
+    )
+    serve_parser.add_argument(
+        "--max-concurrent-batches", type=int, default=None, help="Overrides `server.max_concurrent_batches`."
+    )
+    serve_parser.set_defaults(func=_serve)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+import httpx
+import msgspec
+
+_DEFAULT_SERVER_URL = "http://127.0.0.1:8600"
+
+
+class RewardClient(object):
+    """
+    Client of a reward server started with `glmv_reward serve`, a drop-in replacement of `RewardSystem` for
+    `get_reward`.
+
+    Args:
+        url: The URL of the server.
+        unix_socket: The Unix socket of the server, used instead of `url` if given.
+        timeout: The timeout in seconds of each request, judging a large batch may take minutes.
+    """
+
+    def __init__(
+        self,
+        url: str = _DEFAULT_SERVER_URL,
+        unix_socket: Optional[str] = None,
+        timeout: Optional[float] = 600.0,
+    ) -> None:
+        if unix_socket is not None:
+            self._client = httpx.Client(
+                base_url="http://localhost", transport=httpx.HTTPTransport(uds=unix_socket), timeout=timeout
+            )
+        else:
+            self._client = httpx.Client(base_url=url, timeout=timeout)
+
+    def get_reward(
+        self,
+        prompts: Union[Sequence[str], str],
+        answers: Union[Sequence[str], str],
+        gt_answers: Union[Sequence[str], str],
+        uuids: Optional[Union[Sequence[str], str]] = None,
+        image_files: Optional[Union[Sequence[str], str]] = None,
+        answer_lengths: Optional[Union[Sequence[int], int]] = None,
+        datasources: Optional[Sequence[str] | str] = None,
+        log_reward_judge: bool = False,
+        save_dir: Optional[str] = None,
+        current_iteration: int = 0,
+        debug: bool = False,
+        return_extracted_answers: bool = False,
+    ) -> Union[list[float], tuple[list[float], list, list]]:
+        """
+        Same as `RewardSystem.get_reward`, scored by the server. `debug` is ignored, since breakpoints cannot be hit
+        in the server, and `save_dir` is a path on the server.
+
+        Extracted answers that are not JSON values are returned as strings.
+        """
+        del debug
+        request: dict[str, Any] = {
+            "prompts": prompts,
+            "answers": answers,
+            "gt_answers": gt_answers,
+            "uuids": uuids,
+            "image_files": image_files,
+            "answer_lengths": answer_lengths,
+            "datasources": datasources,
+            "log_reward_judge": log_reward_judge,
+            "save_dir": save_dir,
+            "current_iteration": current_iteration,
+            "return_extracted_answers": return_extracted_answers,
+        }
+        response = self._client.post(
+            "/v1/reward", content=msgspec.json.encode(request), headers={"Content-Type": "application/json"}
+        )
+        if response.status_code == 400:
+            err_msg = f"The reward server rejected the request: {msgspec.json.decode(response.content)['error']}"
+            raise ValueError(err_msg)
+        response.raise_for_status()
+
+        result = msgspec.json.decode(response.content)
+        rewards = [float("nan") if reward is None else reward for reward in result["rewards"]]
+        if return_extracted_answers:
+            return rewards, result["extracted_answers"], result["extracted_gt_answers"]
+        return rewards
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "RewardClient":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
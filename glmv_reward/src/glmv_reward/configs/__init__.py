@@ -1,6 +1,23 @@
 # -*- coding: utf-8 -*-
 
 
+from .executor import ExecutorConfig
+from .judge_cache import JudgeCacheConfig
+from .llm_engine import JudgeRouterConfig, LLMEngineConfig
+from .metrics import MetricsConfig
+from .profiling import ProfilingConfig
+from .reward_log import RewardLogConfig
 from .reward_system import RewardSystemConfig
+from .server import ServerConfig
 
-__all__ = ["RewardSystemConfig"]
+__all__ = [
+    "ExecutorConfig",
+    "JudgeCacheConfig",
+    "JudgeRouterConfig",
+    "LLMEngineConfig",
+    "MetricsConfig",
+    "ProfilingConfig",
+    "RewardLogConfig",
+    "RewardSystemConfig",
+    "ServerConfig",
+]
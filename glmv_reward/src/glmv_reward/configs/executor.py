@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Literal, Optional
+
+import msgspec
+
+
+class ExecutorConfig(msgspec.Struct, frozen=True):
+    # * `thread`: everything runs on the thread pool of `get_reward`
+    # * `process`: extraction and judging run in a persistent pool of pre-warmed worker processes
+    # * `hybrid`: like `process`, but judges that need the LLM are re-run on the thread pool
+    backend: Literal["thread", "process", "hybrid"] = "thread"
+    max_threads: int = 128
+    num_processes: Optional[int] = None
+    mp_start_method: Literal["spawn", "forkserver", "fork"] = "spawn"
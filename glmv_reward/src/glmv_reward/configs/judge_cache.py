@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Optional
+
+import msgspec
+
+
+class JudgeCacheConfig(msgspec.Struct, frozen=True):
+    enabled: bool = True
+    max_size: int = 100_000
+    ttl: Optional[float] = None
+    sqlite_path: Optional[str] = None
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Optional
+
+import msgspec
+
+
+class JudgeRouterConfig(msgspec.Struct, frozen=True):
+    # * health tracking, circuit breaking and balancing, defaults to whether `replicas` is set since they cannot help
+    # * with a single judge URL, retries apply either way
+    enabled: Optional[bool] = None
+    # * URLs serving the same judge model as a `llm_judge_url` (with the same API key), requests are balanced over
+    # * the healthy ones
+    replicas: dict[str, list[str]] = msgspec.field(default_factory=dict)
+    # * weight of the latest request in the moving averages of the latency and error rate of an endpoint
+    ewma_alpha: float = 0.2
+    # * consecutive failures after which an endpoint is skipped for `open_seconds`, before one probe request
+    failure_threshold: int = 5
+    open_seconds: float = 30.0
+    # * requests failed with a connection error, a 429 or a 5xx are retried with full jitter backoff, preferring
+    # * another healthy replica, or on the same URL without replicas. timeouts are only retried on another healthy
+    # * replica, a hung judge would otherwise hold the request for `max_retries + 1` timeouts
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.enabled if self.enabled is not None else len(self.replicas) > 0
+
+
+class LLMEngineConfig(msgspec.Struct, frozen=True):
+    max_connections: int = 256
+    max_keepalive_connections: int = 64
+    keepalive_expiry: float = 30.0
+    max_concurrency_per_endpoint: int = 64
+    http2: bool = True
+    # * how long a packed judge request waits for more prompts, see `llm_judge_batch_size` of the verifiers. packing
+    # * is opt-in, with the default batch size of 1 every item sends its own request
+    judge_batch_wait: float = 0.01
+    # * majority votes over several judge endpoints return as soon as the outcome can no longer change
+    judge_vote_early_exit: bool = True
+    # * a second request is sent to a judge endpoint that has not answered after this many seconds
+    judge_hedge_delay: Optional[float] = None
+    # * total time in seconds given to each judge endpoint of a vote, keyed by URL, "default" applies to the others
+    judge_endpoint_timeouts: dict[str, float] = msgspec.field(default_factory=dict)
+    router: JudgeRouterConfig = msgspec.field(default_factory=JudgeRouterConfig)
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+
+import msgspec
+
+
+class MetricsConfig(msgspec.Struct, frozen=True):
+    enabled: bool = False
+    # * `prometheus` serves `GET /metrics` on `prometheus_host:prometheus_port`, `reward_log` appends snapshots to
+    # * `<reward_log_dir>/metrics.jsonl` every `log_interval` seconds
+    exporters: list[str] = msgspec.field(default_factory=list)
+    prometheus_host: str = "127.0.0.1"
+    prometheus_port: int = 9600
+    log_interval: float = 60.0
+    # * upper bounds in seconds of the histogram buckets
+    buckets: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
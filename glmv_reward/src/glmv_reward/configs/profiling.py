@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Optional
+
+import msgspec
+
+
+class ProfilingConfig(msgspec.Struct, frozen=True):
+    # * profiles the first `num_calls` calls of `get_reward` / `get_rewards`, 0 to only profile on demand
+    num_calls: int = 0
+    # * calls profiled each time `signal` is received
+    signal_num_calls: int = 10
+    # * e.g. "SIGUSR2", the handler is only installed when set, since it replaces the one of the training framework
+    signal: Optional[str] = None
+    # * seconds between two samples of the thread stacks
+    interval: float = 0.005
+    # * defaults to `<reward_log_dir>/profiles`
+    output_dir: Optional[str] = None
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Optional
+
+import msgspec
+
+
+class RewardLogConfig(msgspec.Struct, frozen=True):
+    queue_size: int = 100_000
+    flush_interval: float = 1.0
+    fsync: bool = False
+    max_file_bytes: Optional[int] = None
+    backup_count: int = 5
+    jsonl: bool = True
+    parquet: bool = False
+    parquet_row_group_size: int = 65_536
+    parquet_compression: str = "zstd"
@@ -5,6 +5,13 @@ from collections.abc import Mapping
 
 import msgspec
 
+from .executor import ExecutorConfig
+from .judge_cache import JudgeCacheConfig
+from .llm_engine import LLMEngineConfig
+from .metrics import MetricsConfig
+from .profiling import ProfilingConfig
+from .reward_log import RewardLogConfig
+from .server import ServerConfig
 from .verifiers import VerifierConfig
 
 
@@ -13,3 +20,11 @@ class RewardSystemConfig(msgspec.Struct, frozen=True):
     reward_configs: Mapping[str, VerifierConfig]
     enable_mix_verifier: bool = True
     reward_log_dir: str = "logs"
+    reward_log: RewardLogConfig = msgspec.field(default_factory=RewardLogConfig)
+    dedup_judge: bool = True
+    executor: ExecutorConfig = msgspec.field(default_factory=ExecutorConfig)
+    llm_engine: LLMEngineConfig = msgspec.field(default_factory=LLMEngineConfig)
+    judge_cache: JudgeCacheConfig = msgspec.field(default_factory=JudgeCacheConfig)
+    server: ServerConfig = msgspec.field(default_factory=ServerConfig)
+    metrics: MetricsConfig = msgspec.field(default_factory=MetricsConfig)
+    profiling: ProfilingConfig = msgspec.field(default_factory=ProfilingConfig)
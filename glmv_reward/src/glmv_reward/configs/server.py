@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+
+from typing import Optional
+
+import msgspec
+
+
+class ServerConfig(msgspec.Struct, frozen=True):
+    host: str = "127.0.0.1"
+    port: int = 8600
+    # * also serves on this Unix socket if set, e.g. for trainer ranks on the same host
+    unix_socket: Optional[str] = None
+    # * requests arriving within this many seconds of the first one are scored together
+    batch_wait: float = 0.005
+    max_batch_requests: int = 64
+    max_concurrent_batches: int = 4
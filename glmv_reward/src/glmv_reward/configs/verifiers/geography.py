@@ -9,6 +9,7 @@ import msgspec
 
 class GeographyVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_type", tag="geography"):
     sympy_tolerance: float = 1e-5
+    sympy_timeout: Optional[float] = None
     strict_boxed_extraction: bool = True
     enable_llm_judge_fallback: bool = True
     llm_api_key: Optional[Union[Sequence[str], str]] = None
@@ -18,3 +19,6 @@ class GeographyVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_t
     llm_max_tokens: int = 10
     llm_temperature: float = 0.1
     llm_top_p: float = 1.0
+    llm_judge_batch_size: int = 1
+    llm_requests_per_second: Optional[float] = None
+    llm_tokens_per_minute: Optional[float] = None
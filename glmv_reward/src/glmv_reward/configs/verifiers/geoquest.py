@@ -15,4 +15,7 @@ class GeoQuestVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_ty
     llm_max_tokens: int = 4096
     llm_temperature: float = 0.8
     llm_top_p: float = 0.6
+    llm_judge_batch_size: int = 1
+    llm_requests_per_second: Optional[float] = None
+    llm_tokens_per_minute: Optional[float] = None
     strict_boxed_extraction: bool = True
@@ -8,6 +8,7 @@ import msgspec
 
 class MultiImageVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_type", tag="multi_image"):
     sympy_tolerance: float = 1e-5
+    sympy_timeout: Optional[float] = None
     strict_boxed_extraction: bool = True
     enable_llm_judge_fallback: bool = True
     llm_api_key: Optional[str] = None
@@ -17,3 +18,6 @@ class MultiImageVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_
     llm_max_tokens: int = 10
     llm_temperature: float = 0.1
     llm_top_p: float = 1.0
+    llm_judge_batch_size: int = 1
+    llm_requests_per_second: Optional[float] = None
+    llm_tokens_per_minute: Optional[float] = None
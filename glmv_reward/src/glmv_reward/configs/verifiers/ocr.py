@@ -20,3 +20,6 @@ class OCRVerifierConfig(msgspec.Struct, frozen=True, tag_field="verifier_type",
     llm_max_tokens: int = 10
     llm_temperature: float = 0.1
     llm_top_p: float = 1.0
+    llm_judge_batch_size: int = 1
+    llm_requests_per_second: Optional[float] = None
+    llm_tokens_per_minute: Optional[float] = None
@@ -1,25 +1,62 @@
 # -*- coding: utf-8 -*-
 
 
-import json
-import re
-from collections.abc import Sequence
-from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Optional, Union, cast
 
 import msgspec
 
 from .configs import RewardSystemConfig
 from .configs.verifiers import VerifierConfig
+from .utils.cache import configure_verdict_cache
+from .utils.llm import LLMCallDeferred, configure_llm_engine, defer_llm_calls
 from .utils.logging import get_logger
+from .utils.metrics import (
+    MetricNotes,
+    MetricsRegistry,
+    configure_metrics,
+    note_decision,
+    note_stage,
+    serve_metrics,
+    take_notes,
+)
 from .utils.misc import ensure_list
-from .utils.path import mkdir
+from .utils.path import resolve_path
+from .utils.profiling import RewardProfiler, get_env_num_calls, with_profile_label
+from .utils.response import parse_response
+from .utils.reward_log import RewardLogWriter
+from .utils.reward_parquet import ParquetRewardLogWriter, encode_extracted_answer, hash_prompt
 from .utils.serialization import load_yaml
-from .verifiers import LanguageMixVerifier, Verifier, get_verifier_from_config
+from .verifiers import Verifier, get_verifier_class, get_verifier_from_config
 
 _logger = get_logger(__name__)
 
+# * how the reward of an item was obtained, see `RewardSystem._get_raw_rewards`
+JUDGE_PATHS = ("rejected", "judged", "deduplicated", "batch")
+
+# * arguments of `RewardSystem.get_reward` describing the items, and how to report their rewards
+_REWARD_INPUT_FIELDS = ("prompts", "answers", "gt_answers", "uuids", "image_files", "answer_lengths", "datasources")
+_REWARD_OUTPUT_FIELDS = ("log_reward_judge", "save_dir", "current_iteration", "return_extracted_answers")
+
+
+class _RewardInputs(msgspec.Struct):
+    prompts: list[str]
+    answers: list[str]
+    gt_answers: list[str]
+    uuids: list[Optional[str]]
+    image_files: list[Optional[str]]
+    answer_lengths: list[int]
+    datasources: list[str]
+
 
 class RewardSystem(object):
     def __init__(self, config_file: Union[Path, str]) -> None:
@@ -34,7 +71,38 @@ class RewardSystem(object):
         _logger.info(f"> Loading reward config file: {config_file}")
         reward_config = msgspec.convert(load_yaml(config_file), RewardSystemConfig)
 
+        self.config_file = str(resolve_path(config_file))
         self.reward_log_dir = reward_config.reward_log_dir
+        # Reward logs are written by a background thread, `get_reward` only queues the encoded lines
+        self.reward_log_writer = RewardLogWriter(
+            queue_size=reward_config.reward_log.queue_size,
+            flush_interval=reward_config.reward_log.flush_interval,
+            fsync=reward_config.reward_log.fsync,
+            max_file_bytes=reward_config.reward_log.max_file_bytes,
+            backup_count=reward_config.reward_log.backup_count,
+        )
+        self.log_jsonl = reward_config.reward_log.jsonl
+        # Columnar copies of the reward logs, one Parquet dataset per datasource partitioned by iteration
+        self.parquet_log_writer: Optional[ParquetRewardLogWriter] = None
+        if reward_config.reward_log.parquet:
+            self.parquet_log_writer = ParquetRewardLogWriter(
+                row_group_size=reward_config.reward_log.parquet_row_group_size,
+                compression=reward_config.reward_log.parquet_compression,
+            )
+
+        # All verifiers share one pooled LLM judge engine, requests from the worker threads of `get_reward`
+        # are multiplexed over its keep-alive connections.
+        self.llm_engine = configure_llm_engine(reward_config.llm_engine)
+        # Judge responses are cached by (template, model, question, predict, label) and the sampling parameters of the
+        # judge, since rollouts of the same prompt keep producing the same extracted answers.
+        self.verdict_cache = configure_verdict_cache(reward_config.judge_cache)
+        # Items of a batch sharing (prompt, extracted answer, extracted gt, image) are judged once
+        self.dedup_judge = reward_config.dedup_judge
+
+        # Worker processes are created on first use, see `_get_process_pool`
+        self.executor_config = reward_config.executor
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
 
         # Set default configurations for each model if not provided
         self.reward_configs: dict[str, VerifierConfig] = {}
@@ -56,23 +124,48 @@ class RewardSystem(object):
 
         self.language_mix_verifier = None
         if reward_config.enable_mix_verifier:
-            self.language_mix_verifier = LanguageMixVerifier()
+            self.language_mix_verifier = get_verifier_class("language_mix")()
 
-        self.think_answer_pattern = re.compile(
-            r"^<think>(.*?)</think>\s*<answer>(.*?)</answer>$", re.DOTALL | re.IGNORECASE
-        )
+        # Stage timers, decision tier counters and judge request latencies, `None` if disabled. Worker processes only
+        # note what they observe, the parent process records it.
+        self.metrics_config = reward_config.metrics
+        self.metrics = configure_metrics(reward_config.metrics)
+        self._metrics_logged_at = time.monotonic()
+        if self.metrics is not None and "prometheus" in self.metrics_config.exporters and not _IN_WORKER:
+            serve_metrics(self.metrics_config.prometheus_host, self.metrics_config.prometheus_port)
 
-    def _process_single_item(
+        # Sampling profiles of the next calls, armed by `profile_next_calls`, `GLMV_REWARD_PROFILE=<num calls>` or
+        # `profiling.signal`. Worker processes are not profiled.
+        self.profiler: Optional[RewardProfiler] = None
+        if not _IN_WORKER:
+            profiling_config = reward_config.profiling
+            self.profiler = RewardProfiler(
+                output_dir=profiling_config.output_dir or os.path.join(self.reward_log_dir, "profiles"),
+                interval=profiling_config.interval,
+                signal_name=profiling_config.signal,
+                signal_num_calls=profiling_config.signal_num_calls,
+            )
+            self.profiler.arm(profiling_config.num_calls + get_env_num_calls())
+
+    def _extract_single_item(
         self,
         prompt: str,
         answer: Any,
         gt_answer: Any,
-        image_file: Optional[str],
         verifier: Verifier,
         debug: bool = False,
-    ) -> tuple[float, Any, Any]:
+    ) -> tuple[Optional[float], Any, Any]:
+        """
+        Runs the format checks and answer extraction of a single item.
+
+        Returns:
+            A tuple of (reward, extracted answer, extracted ground truth). The reward is `None` if the item still
+            needs to be judged, otherwise it is the final reward of an item rejected before judging.
+        """
         min_reward = getattr(verifier, "min_reward", float("-inf"))
 
+        # * rejected items are counted as format failures unless an exception is noted
+        stage, start = "format", time.perf_counter()
         try:
             # if it is not a correct answer format, return -inf
             if isinstance(answer, str) and not self.check_answer_format(answer):
@@ -86,6 +179,10 @@ class RewardSystem(object):
             if self.language_mix_verifier is not None and not self.language_mix_verifier.judge(answer, gt_answer):
                 return min_reward, None, None
 
+            format_end = time.perf_counter()
+            note_stage(stage, format_end - start)
+            stage, start = "extract", format_end
+
             # Extract ground truth
             extracted_gt = verifier.extract_answer(gt_answer, question=prompt)
             if extracted_gt is None:
@@ -99,6 +196,7 @@ class RewardSystem(object):
 
         except Exception as e:
             _logger.warning("> Error in verifier extract_answer due to exception: %s", repr(e))
+            note_decision("exception")
             return min_reward, None, None
         else:
             if debug:
@@ -111,20 +209,169 @@ class RewardSystem(object):
                 print("----------------------")
                 breakpoint()
 
-            try:
-                # Get reward
-                reward = verifier.judge(extracted_ans, extracted_gt, question=prompt, image_file=image_file)
-            except Exception as e:
-                _logger.warning("> Error in verifier judge: %s", repr(e))
-                reward = min_reward
+            return None, extracted_ans, extracted_gt
+        finally:
+            note_stage(stage, time.perf_counter() - start)
+
+    def _judge_single_item(
+        self,
+        prompt: str,
+        extracted_ans: Any,
+        extracted_gt: Any,
+        image_file: Optional[str],
+        verifier: Verifier,
+    ) -> float:
+        min_reward = getattr(verifier, "min_reward", float("-inf"))
+
+        try:
+            # Get reward
+            reward = verifier.judge(extracted_ans, extracted_gt, question=prompt, image_file=image_file)
+        except Exception as e:
+            _logger.warning("> Error in verifier judge: %s", repr(e))
+            note_decision("exception")
+            reward = min_reward
 
+        try:
+            reward = float(reward)
+        except Exception:
+            _logger.warning("> reward from verifier judge should be able to convert to float, but got: %s.", reward)
+            note_decision("exception")
+            reward = min_reward
+
+        return reward
+
+    def _judge_items(
+        self, items: list[tuple[str, Any, Any, Optional[str], Verifier]], executor: Optional[Executor] = None
+    ) -> list[float]:
+        """
+        Judges `(prompt, extracted answer, extracted ground truth, image file, verifier)` items sharing a verifier
+        with a single `Verifier.judge_batch` call, falling back to judging them one by one if it fails. The judge
+        threads of the batch run on `executor` if given.
+        """
+        prompts, extracted_ans_lst, extracted_gt_lst, image_files, verifiers = zip(*items, strict=True)
+        verifier = verifiers[0]
+        min_reward = getattr(verifier, "min_reward", float("-inf"))
+
+        try:
+            batch_rewards = verifier.judge_batch(
+                extracted_ans_lst,
+                extracted_gt_lst,
+                questions=prompts,
+                image_files=image_files,
+                max_threads=self.executor_config.max_threads,
+                executor=executor,
+            )
+        except Exception as e:
+            _logger.warning("> Error in verifier judge_batch, judging the items one by one: %s", repr(e))
+            return [self._judge_single_item(*item) for item in items]
+
+        rewards = []
+        for reward in batch_rewards:
             try:
-                reward = float(reward)
+                rewards.append(float(reward))
             except Exception:
                 _logger.warning("> reward from verifier judge should be able to convert to float, but got: %s.", reward)
-                reward = min_reward
+                rewards.append(min_reward)
+        return rewards
+
+    def _process_single_item(
+        self,
+        prompt: str,
+        answer: Any,
+        gt_answer: Any,
+        image_file: Optional[str],
+        verifier: Verifier,
+        debug: bool = False,
+    ) -> tuple[float, Any, Any]:
+        reward, extracted_ans, extracted_gt = self._extract_single_item(
+            prompt, answer, gt_answer, verifier, debug=debug
+        )
+        if reward is None:
+            reward = self._judge_single_item(prompt, extracted_ans, extracted_gt, image_file, verifier)
+        return reward, extracted_ans, extracted_gt
+
+    @staticmethod
+    def _get_judge_key(prompt: str, extracted_ans: Any, extracted_gt: Any, image_file: Optional[str]) -> bytes:
+        try:
+            return msgspec.json.encode([prompt, extracted_ans, extracted_gt, image_file])
+        except (TypeError, msgspec.EncodeError):
+            return repr((prompt, extracted_ans, extracted_gt, image_file)).encode()
 
-            return reward, extracted_ans, extracted_gt
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.executor_config.backend == "thread":
+            return None
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.executor_config.num_processes,
+                    mp_context=multiprocessing.get_context(self.executor_config.mp_start_method),
+                    initializer=_init_worker,
+                    initargs=(self.config_file, self.executor_config.backend == "hybrid"),
+                )
+            return self._process_pool
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes of the `process` and `hybrid` executor backends, and writes out the queued
+        reward logs.
+        """
+        with self._process_pool_lock:
+            process_pool, self._process_pool = self._process_pool, None
+        if process_pool is not None:
+            process_pool.shutdown(wait=True, cancel_futures=True)
+        self.reward_log_writer.close()
+        if self.parquet_log_writer is not None:
+            self.parquet_log_writer.close()
+
+    def flush_reward_logs(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the reward logs queued so far are written to disk. The Parquet part files written so far are
+        closed, so that they can be read.
+
+        Returns:
+            Whether the logs were written within `timeout` seconds.
+        """
+        flushed = self.reward_log_writer.flush(timeout)
+        if self.parquet_log_writer is not None:
+            flushed = self.parquet_log_writer.flush(timeout) and flushed
+        return flushed
+
+    def metrics_snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Returns the metrics recorded so far in this process, see `glmv_reward.utils.metrics.MetricsRegistry.snapshot`,
+        or an empty dict if metrics are disabled.
+        """
+        return {} if self.metrics is None else self.metrics.snapshot()
+
+    def profile_next_calls(self, num_calls: int) -> None:
+        """
+        Profiles the next `num_calls` calls of `get_reward` / `get_rewards`, and writes the collapsed stacks of each
+        datasource to the profiling output directory once they return.
+        """
+        if self.profiler is None:
+            err_msg = "Reward systems of worker processes cannot be profiled."
+            raise RuntimeError(err_msg)
+        self.profiler.arm(num_calls)
+
+    def _profile_call(self) -> contextlib.AbstractContextManager[None]:
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.profile_call()
+
+    def _observe_call_stage(self, stage: str, start: float) -> None:
+        if self.metrics is not None:
+            self.metrics.observe("glmv_reward_call_seconds", (stage,), time.perf_counter() - start)
+
+    def _maybe_log_metrics(self, log_save_dir: str) -> None:
+        # * the `reward_log` exporter appends a snapshot every `log_interval` seconds
+        if self.metrics is None or "reward_log" not in self.metrics_config.exporters:
+            return
+        now = time.monotonic()
+        if now - self._metrics_logged_at < self.metrics_config.log_interval:
+            return
+        self._metrics_logged_at = now
+        line = msgspec.json.encode({"time": time.time(), "metrics": self.metrics.snapshot()}) + b"\n"
+        self.reward_log_writer.write(os.path.join(str(resolve_path(log_save_dir)), "metrics.jsonl"), line)
 
     @classmethod
     def from_yaml(cls, config_file: Union[Path, str]) -> "RewardSystem":
@@ -140,34 +387,17 @@ class RewardSystem(object):
         return cls(config_file)
 
     def check_answer_format(self, response: str) -> bool:
-        match = self.think_answer_pattern.search(response)
-        answer_part = None
-
-        if match:
-            think_part = match.group(1).strip()
-            answer_part = match.group(2).strip()
-
-            # Check for multiple box tags in answer part
-            begin_box_count = answer_part.lower().count("<|begin_of_box|>")
-            end_box_count = answer_part.lower().count("<|end_of_box|>")
-
-            # don't support legacy \\boxed{}
-            legacy_boxed_count = answer_part.lower().count("\\boxed{")
-
-            if begin_box_count > 1 or end_box_count > 1 or legacy_boxed_count > 0:
-                return False
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>", "<answer>", "</answer>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags) or any(
-                tag.lower() in answer_part.lower() for tag in avoid_tags
-            ):
-                return False
+        parsed = parse_response(response)
+        if parsed.answer is None:
+            return False
 
-        if answer_part is None:
+        # Check for multiple box tags in answer part, and don't support legacy \\boxed{}
+        begin_box_count, end_box_count, legacy_boxed_count = parsed.box_token_counts
+        if begin_box_count > 1 or end_box_count > 1 or legacy_boxed_count > 0:
             return False
 
-        return True
+        # Basic validation against nested tags
+        return not parsed.has_nested_tags
 
     def get_reward_config_from_datasource(self, datasource: str) -> VerifierConfig:
         """
@@ -212,7 +442,7 @@ class RewardSystem(object):
             uuids (Optional[Union[Sequence[str], str]]): List of uuids
             image_files (Optional[Sequence[str]]): List of image paths
             answer_lengths (Optional[Sequence[int]]): List of answer lengths
-            datasources (Optional[Sequence[str]]): List of datasource identifiers
+            datasources (Optional[Sequence[str]]): List of datasource identifiers, may mix several datasources
             log_reward_judge (bool): Whether to log reward judgments
             save_dir (Optional[str]): Path to save logs
             current_iteration (int): Current iteration number
@@ -226,8 +456,100 @@ class RewardSystem(object):
         if debug:
             breakpoint()
 
-        log_save_dir = save_dir if save_dir else self.reward_log_dir
+        with self._profile_call():
+            call_start = time.perf_counter()
+            inputs = self._prepare_reward_inputs(
+                prompts, answers, gt_answers, uuids, image_files, answer_lengths, datasources
+            )
+            raw_rewards = self._get_raw_rewards(
+                inputs.prompts, inputs.answers, inputs.gt_answers, inputs.image_files, inputs.datasources, debug=debug
+            )
+            self._observe_call_stage("score", call_start)
+            result = self._finish_reward(
+                inputs,
+                raw_rewards,
+                log_reward_judge=log_reward_judge,
+                save_dir=save_dir,
+                current_iteration=current_iteration,
+                return_extracted_answers=return_extracted_answers,
+            )
+            self._observe_call_stage("total", call_start)
+            return result
+
+    def get_rewards(
+        self, requests: Sequence[Mapping[str, Any]]
+    ) -> list[Union[list[float], tuple[list[float], list, list]]]:
+        """
+        Scores several `get_reward` requests at once, e.g. requests of different trainer ranks.
+
+        The items of all requests are extracted and judged together, so that judges are deduplicated and batched
+        across requests, while rewards are normalized and logged per request as `get_reward` does.
 
+        Args:
+            requests: The keyword arguments of each `get_reward` call, except `debug`.
+
+        Returns:
+            The result of `get_reward` for each request.
+        """
+        with self._profile_call():
+            call_start = time.perf_counter()
+            all_inputs = [self.validate_reward_request(request) for request in requests]
+
+            raw_rewards = self._get_raw_rewards(
+                [prompt for inputs in all_inputs for prompt in inputs.prompts],
+                [answer for inputs in all_inputs for answer in inputs.answers],
+                [gt_answer for inputs in all_inputs for gt_answer in inputs.gt_answers],
+                [image_file for inputs in all_inputs for image_file in inputs.image_files],
+                [datasource for inputs in all_inputs for datasource in inputs.datasources],
+            )
+            self._observe_call_stage("score", call_start)
+
+            results = []
+            start = 0
+            for request, inputs in zip(requests, all_inputs, strict=True):
+                end = start + len(inputs.prompts)
+                results.append(
+                    self._finish_reward(
+                        inputs,
+                        cast(
+                            tuple[list[float], list, list, list[str], list[float]],
+                            tuple(values[start:end] for values in raw_rewards),
+                        ),
+                        **{key: request[key] for key in _REWARD_OUTPUT_FIELDS if key in request},
+                    )
+                )
+                start = end
+            self._observe_call_stage("total", call_start)
+            return results
+
+    def validate_reward_request(self, request: Mapping[str, Any]) -> _RewardInputs:
+        """
+        Checks the fields, the lengths and the datasources of a `get_reward` request without scoring it, e.g. before
+        it is batched with other requests.
+
+        Raises:
+            ValueError: If the request has unknown fields, inputs of different lengths or an unknown datasource.
+            TypeError: If a required field is missing.
+        """
+        unknown_fields = set(request) - set(_REWARD_INPUT_FIELDS) - set(_REWARD_OUTPUT_FIELDS)
+        if len(unknown_fields) > 0:
+            err_msg = f"Unknown reward request fields: {sorted(unknown_fields)}."
+            raise ValueError(err_msg)
+        inputs = self._prepare_reward_inputs(**{key: request[key] for key in _REWARD_INPUT_FIELDS if key in request})
+        for datasource in set(inputs.datasources):
+            self.get_reward_config_from_datasource(datasource)
+        return inputs
+
+    def _prepare_reward_inputs(
+        self,
+        prompts: Union[Sequence[str], str],
+        answers: Union[Sequence[str], str],
+        gt_answers: Union[Sequence[str], str],
+        uuids: Optional[Union[Sequence[str], str]] = None,
+        image_files: Optional[Union[Sequence[str], str]] = None,
+        answer_lengths: Optional[Union[Sequence[int], int]] = None,
+        datasources: Optional[Sequence[str] | str] = None,
+    ) -> _RewardInputs:
         # Ensure all inputs are lists
         prompt_lst: list[str] = ensure_list(prompts)
         answer_lst: list[str] = ensure_list(answers)
@@ -240,71 +562,53 @@ class RewardSystem(object):
         if image_files is not None:
             image_file_lst = ensure_list(image_files)
         datasource_lst = ["default"] * len(prompt_lst)
-        if datasources is not None:
+        if isinstance(datasources, str):
+            datasource_lst = [datasources] * len(prompt_lst)
+        elif datasources is not None:
             datasource_lst = ensure_list(datasources)
         answer_length_lst = [-1] * len(prompt_lst)
         if answer_lengths is not None:
             answer_length_lst = ensure_list(answer_lengths)
 
-        if len(set(datasource_lst)) != 1:
-            err_msg = "all datasources should be the same"
+        if not len(prompt_lst) == len(answer_lst) == len(gt_answer_lst) == len(image_file_lst) == len(datasource_lst):
+            err_msg = "The length of prompts, answers, gt_answers, image_files, and datasources should be the same."
             raise ValueError(err_msg)
-        datasource = datasource_lst[0]
-
-        # Process each prompt-answer-gt triplet using threads
-        all_rewards: list[float] = []
-        all_extracted_ans = []
-        all_extracted_gt = []
 
-        reward_config = self.get_reward_config_from_datasource(datasource)
-        verifier = get_verifier_from_config(reward_config, datasource)
-
-        if verifier.is_batch_verifier:
-            # ! mypy issue, invalid signature and return type
-            batch_rewards = verifier.judge(
-                prompts=prompt_lst, answers=answer_lst, gt_answers=gt_answer_lst, image_files=image_file_lst
-            )
-
-            all_rewards = batch_rewards
+        return _RewardInputs(
+            prompts=prompt_lst,
+            answers=answer_lst,
+            gt_answers=gt_answer_lst,
+            uuids=uuid_lst,
+            image_files=image_file_lst,
+            answer_lengths=answer_length_lst,
+            datasources=datasource_lst,
+        )
 
-            for answer, gt_answer, prompt in zip(answer_lst, gt_answer_lst, prompt_lst):  # noqa: B905
-                extracted_ans = verifier.extract_answer(answer, question=prompt)
-                extracted_gt = verifier.extract_answer(gt_answer, question=prompt)
-                all_extracted_ans.append(extracted_ans)
-                all_extracted_gt.append(extracted_gt)
+    def _finish_reward(
+        self,
+        inputs: _RewardInputs,
+        raw_rewards: tuple[list[float], list, list, list[str], list[float]],
+        log_reward_judge: bool = False,
+        save_dir: Optional[str] = None,
+        current_iteration: int = 0,
+        return_extracted_answers: bool = False,
+    ) -> Union[list[float], tuple[list[float], list, list]]:
+        # * normalizes, logs and formats the rewards of a `get_reward` request
+        log_save_dir = save_dir if save_dir else self.reward_log_dir
+        prompt_lst = inputs.prompts
+        answer_lst = inputs.answers
+        gt_answer_lst = inputs.gt_answers
+        uuid_lst = inputs.uuids
+        image_file_lst = inputs.image_files
+        datasource_lst = inputs.datasources
+        answer_length_lst = inputs.answer_lengths
+        all_rewards, all_extracted_ans, all_extracted_gt, judge_paths, latencies = raw_rewards
 
-        else:
-            # Create thread pool
-            with ThreadPoolExecutor(max_workers=min(128, len(prompts))) as executor:
-                # Submit all tasks and store futures in order
-                futures = []
-                for prompt, answer, gt_answer, image_file in zip(prompt_lst, answer_lst, gt_answer_lst, image_file_lst):  # noqa: B905
-                    future = executor.submit(
-                        self._process_single_item,
-                        prompt,
-                        answer,
-                        gt_answer,
-                        image_file,
-                        verifier,
-                        debug=debug,
-                    )
-                    futures.append(future)
-                for future in futures:
-                    reward, extracted_ans, extracted_gt = future.result()
-                    all_rewards.append(reward)
-                    all_extracted_ans.append(extracted_ans)
-                    all_extracted_gt.append(extracted_gt)
-
-        # Check if there are any -inf rewards
-        # make -inf rewards to min reward
-        # if all -inf, make all rewards to 0
-        if any(reward == float("-inf") for reward in all_rewards):
-            non_inf_rewards = [r for r in all_rewards if r != float("-inf")]
-            if len(non_inf_rewards) > 0:
-                min_non_inf = min(non_inf_rewards)
-                all_rewards = [min_non_inf if r == float("-inf") else r for r in all_rewards]
-            else:
-                all_rewards = [0.0 if r == float("-inf") else r for r in all_rewards]
+        group_keys = [
+            (datasource, prompt, image_file)
+            for datasource, prompt, image_file in zip(datasource_lst, prompt_lst, image_file_lst, strict=True)
+        ]
+        all_rewards = self.normalize_rewards(all_rewards, group_keys)
 
         if log_reward_judge:
             if not (
@@ -323,13 +627,9 @@ class RewardSystem(object):
                 )
                 raise ValueError(err_msg)
 
-            save_pobj = mkdir(log_save_dir)
-            datasource_dir = save_pobj / datasource
-            _ = mkdir(datasource_dir)
-
-            reward_status = "pass@k" if any(reward > 0.75 for reward in all_rewards) else "not_pass@k"
-            # Log each reward data pair
-            for prompt, image_file, answer, gt_answer, reward, answer_length, uuid in zip(
+            log_start = time.perf_counter()
+            self.log_reward_judge(
+                log_save_dir,
                 prompt_lst,
                 image_file_lst,
                 answer_lst,
@@ -337,61 +637,460 @@ class RewardSystem(object):
                 all_rewards,
                 answer_length_lst,
                 uuid_lst,
-                strict=True,
-            ):
-                # Setup save directory and path
-                rollout_save_pobj = datasource_dir / f"rollout_reward_{reward_status}.jsonl"
-
-                # Write reward data to file
-                reward_data = {
-                    "current_iteration": current_iteration,
-                    "prompt": prompt,
-                    "image_file": image_file,
-                    "answer": answer,
-                    "gt_answer": gt_answer,
-                    "reward": reward,
-                    "answer_token_length": answer_length,
-                    "reward_sum_of_this_prompt": sum(all_rewards),
-                    "uuid": uuid,
-                }
-                with open(rollout_save_pobj, "a") as f:
-                    f.write(json.dumps(reward_data, ensure_ascii=False) + "\n")
+                group_keys,
+                current_iteration=current_iteration,
+                extracted_answers=all_extracted_ans,
+                extracted_gt_answers=all_extracted_gt,
+                judge_paths=judge_paths,
+                latencies=latencies,
+            )
+            self._observe_call_stage("log", log_start)
+        self._maybe_log_metrics(log_save_dir)
 
-            for prompt, image_file, answer, gt_answer, reward, answer_length, uuid in zip(
-                prompt_lst,
-                image_file_lst,
-                answer_lst,
-                gt_answer_lst,
-                all_rewards,
-                answer_length_lst,
-                uuid_lst,
-                strict=True,
-            ):
-                reward_status = "correct" if reward > 0 else "incorrect"
-                rollout_save_pobj = datasource_dir / f"rollout_reward_{reward_status}.jsonl"
-                with open(rollout_save_pobj, "a") as f:
-                    f.write(
-                        json.dumps(
-                            {
-                                "current_iteration": current_iteration,
-                                "prompt": prompt,
-                                "image_file": image_file,
-                                "answer": answer,
-                                "answer_token_length": answer_length,
-                                "gt_answer": gt_answer,
-                                "reward": reward,
-                                "reward_sum_of_this_prompt": sum(all_rewards),
-                                "uuid": uuid,
-                            },
-                            ensure_ascii=False,
-                        )
-                        + "\n"
-                    )
         if return_extracted_answers:
             return all_rewards, all_extracted_ans, all_extracted_gt
 
         return all_rewards
 
+    def _judge_batch(
+        self,
+        prompts: list[str],
+        answers: list[str],
+        gt_answers: list[str],
+        image_files: list[Optional[str]],
+        verifier: Verifier,
+    ) -> tuple[list[float], list, list]:
+        # ! mypy issue, invalid signature and return type
+        batch_rewards = verifier.judge(
+            prompts=prompts,  # type: ignore[call-arg]
+            answers=answers,
+            gt_answers=gt_answers,
+            image_files=image_files,
+        )
+
+        extracted_ans_lst = []
+        extracted_gt_lst = []
+        for answer, gt_answer, prompt in zip(answers, gt_answers, prompts, strict=True):
+            extracted_ans_lst.append(verifier.extract_answer(answer, question=prompt))
+            extracted_gt_lst.append(verifier.extract_answer(gt_answer, question=prompt))
+        return cast(list[float], batch_rewards), extracted_ans_lst, extracted_gt_lst
+
+    def get_raw_rewards(
+        self,
+        prompts: list[str],
+        answers: list[str],
+        gt_answers: list[str],
+        image_files: list[Optional[str]],
+        datasources: list[str],
+        debug: bool = False,
+    ) -> tuple[list[float], list, list]:
+        """
+        Scores a batch whose items may come from different datasources, without any reward normalization.
+
+        Items are partitioned by datasource. Partitions of batch verifiers are judged by a single batch `judge`
+        call, the other items are extracted through the shared thread pool and then judged by a single
+        `Verifier.judge_batch` call per datasource, on the same thread pool as soon as the extractions of the
+        datasource are done, so that all partitions make progress concurrently. With the
+        `process` and `hybrid` executor backends, extraction and judging run in the worker processes instead.
+
+        Returns:
+            A tuple of rewards, extracted answers and extracted ground truths, in the order of the inputs.
+        """
+        rewards, extracted_ans_lst, extracted_gt_lst, _, _ = self._get_raw_rewards(
+            prompts, answers, gt_answers, image_files, datasources, debug=debug
+        )
+        return rewards, extracted_ans_lst, extracted_gt_lst
+
+    def _get_raw_rewards(
+        self,
+        prompts: list[str],
+        answers: list[str],
+        gt_answers: list[str],
+        image_files: list[Optional[str]],
+        datasources: list[str],
+        debug: bool = False,
+    ) -> tuple[list[float], list, list, list[str], list[float]]:
+        """
+        Same as `get_raw_rewards`, but also returns how each item was scored and how long it took.
+
+        Returns:
+            A tuple of rewards, extracted answers, extracted ground truths, judge paths and latencies in seconds, in
+            the order of the inputs. The judge path is one of `JUDGE_PATHS`:
+
+            - `rejected`: rejected by the format checks or the extraction, the latency is the extraction time.
+            - `judged`: judged by the verifier, the latency is the extraction and judge time. With the thread backend,
+              the judge time is the time of the `judge_batch` call of its datasource.
+            - `deduplicated`: shares the judgment of an earlier item of the batch, the latency is the extraction time.
+            - `batch`: judged by a batch verifier, the latency is the time of the whole batch call.
+        """
+        num_items = len(prompts)
+        rewards: list[float] = [0.0] * num_items
+        extracted_ans_lst: list[Any] = [None] * num_items
+        extracted_gt_lst: list[Any] = [None] * num_items
+        judge_paths: list[str] = ["rejected"] * num_items
+        latencies: list[float] = [0.0] * num_items
+        if num_items == 0:
+            return rewards, extracted_ans_lst, extracted_gt_lst, judge_paths, latencies
+        # * only filled in if metrics are enabled: the decision tier and judge time of each item, and the time of
+        # * each (datasource, stage)
+        metrics = self.metrics
+        tiers: list[str] = ["format_failure"] * num_items
+        judge_seconds: list[Optional[float]] = [None] * num_items
+        stage_seconds: dict[tuple[str, str], list[float]] = {}
+
+        partitions: dict[str, list[int]] = {}
+        for index, datasource in enumerate(datasources):
+            partitions.setdefault(datasource, []).append(index)
+        verifiers = {datasource: self.get_verifier_from_datasource(datasource) for datasource in partitions}
+
+        # * breakpoints cannot be hit in worker processes
+        process_pool = None if debug else self._get_process_pool()
+
+        # Create thread pool
+        with ThreadPoolExecutor(max_workers=min(self.executor_config.max_threads, num_items)) as executor:
+            batch_futures: dict[str, Future[tuple[Optional[tuple[list[float], list, list]], float, Any]]] = {}
+            extraction_futures: dict[int, Future[tuple[tuple[Optional[float], Any, Any], float, Any]]] = {}
+            for datasource, indices in partitions.items():
+                verifier = verifiers[datasource]
+                batch_args = (
+                    [prompts[i] for i in indices],
+                    [answers[i] for i in indices],
+                    [gt_answers[i] for i in indices],
+                    [image_files[i] for i in indices],
+                )
+                if verifier.is_batch_verifier and process_pool is not None:
+                    batch_futures[datasource] = process_pool.submit(
+                        _timed_call, _judge_batch_in_worker, datasource, *batch_args
+                    )
+                elif verifier.is_batch_verifier:
+                    batch_futures[datasource] = executor.submit(
+                        _timed_call, with_profile_label(datasource, self._judge_batch), *batch_args, verifier
+                    )
+                elif process_pool is not None:
+                    for i in indices:
+                        extraction_futures[i] = process_pool.submit(
+                            _timed_call, _extract_in_worker, datasource, prompts[i], answers[i], gt_answers[i]
+                        )
+                else:
+                    for i in indices:
+                        extraction_futures[i] = executor.submit(
+                            _timed_call,
+                            with_profile_label(datasource, self._extract_single_item),
+                            prompts[i],
+                            answers[i],
+                            gt_answers[i],
+                            verifier,
+                            debug=debug,
+                        )
+
+            # Items extracting to the same answer are judged only once
+            judge_args: list[tuple[str, Any, Any, Optional[str], Verifier]] = []
+            judge_datasources: list[str] = []
+            judge_futures: dict[int, Future[tuple[Optional[float], float, Any]]] = {}
+            judge_indices: dict[tuple[str, bytes], int] = {}
+            item_judge_indices: dict[int, int] = {}
+            # * with the thread backend, the items of each datasource are judged by one `Verifier.judge_batch` call,
+            # * submitted as soon as the extractions of the datasource are done rather than those of every datasource
+            verifier_judge_futures: list[tuple[str, list[int], Future[tuple[list[float], float, Any]]]] = []
+            pending_extractions = {
+                datasource: len(indices)
+                for datasource, indices in partitions.items()
+                if not verifiers[datasource].is_batch_verifier
+            }
+            extraction_indices = {extraction_future: i for i, extraction_future in extraction_futures.items()}
+            for extraction_future in as_completed(extraction_indices):
+                datasource = datasources[extraction_indices[extraction_future]]
+                pending_extractions[datasource] -= 1
+                if pending_extractions[datasource] > 0:
+                    continue
+                # * items are handled in order so that the first of the duplicates is the one judged
+                verifier_judge_indices: list[int] = []
+                for i in partitions[datasource]:
+                    (reward, extracted_ans, extracted_gt), latencies[i], notes = extraction_futures[i].result()
+                    if notes is not None:
+                        self._add_stage_notes(stage_seconds, datasources[i], notes)
+                        if notes.tier is not None:
+                            tiers[i] = notes.tier
+                    extracted_ans_lst[i] = extracted_ans
+                    extracted_gt_lst[i] = extracted_gt
+                    if reward is not None:
+                        rewards[i] = reward
+                        continue
+
+                    judge_key = None
+                    if self.dedup_judge:
+                        judge_key = (
+                            datasources[i],
+                            self._get_judge_key(prompts[i], extracted_ans, extracted_gt, image_files[i]),
+                        )
+                        if judge_key in judge_indices:
+                            item_judge_indices[i] = judge_indices[judge_key]
+                            judge_paths[i] = "deduplicated"
+                            continue
+                    args = (prompts[i], extracted_ans, extracted_gt, image_files[i], verifiers[datasources[i]])
+                    if process_pool is not None:
+                        judge_futures[len(judge_args)] = process_pool.submit(
+                            _timed_call, _judge_in_worker, datasources[i], *args[:-1]
+                        )
+                    else:
+                        verifier_judge_indices.append(len(judge_args))
+                    judge_args.append(args)
+                    judge_datasources.append(datasources[i])
+                    if judge_key is not None:
+                        judge_indices[judge_key] = len(judge_args) - 1
+                    item_judge_indices[i] = len(judge_args) - 1
+                    judge_paths[i] = "judged"
+
+                if len(verifier_judge_indices) > 0:
+                    verifier_judge_futures.append(
+                        (
+                            datasource,
+                            verifier_judge_indices,
+                            executor.submit(
+                                _timed_call,
+                                with_profile_label(datasource, self._judge_items),
+                                [judge_args[j] for j in verifier_judge_indices],
+                                executor=executor,
+                            ),
+                        )
+                    )
+
+            # Judges deferred by the worker processes because they need the LLM are re-run on the thread pool
+            for j, judge_future in judge_futures.items():
+                if judge_future.result()[0] is None:
+                    judge_futures[j] = executor.submit(
+                        _timed_call, with_profile_label(judge_datasources[j], self._judge_single_item), *judge_args[j]
+                    )
+            for datasource, batch_future in batch_futures.items():
+                if batch_future.result()[0] is None:
+                    indices = partitions[datasource]
+                    batch_futures[datasource] = executor.submit(
+                        _timed_call,
+                        with_profile_label(datasource, self._judge_batch),
+                        [prompts[i] for i in indices],
+                        [answers[i] for i in indices],
+                        [gt_answers[i] for i in indices],
+                        [image_files[i] for i in indices],
+                        verifiers[datasource],
+                    )
+
+            judge_rewards: list[float] = [0.0] * len(judge_args)
+            judge_latencies: list[float] = [0.0] * len(judge_args)
+            judge_tiers: list[str] = ["rule"] * len(judge_args)
+            judge_item_seconds: list[float] = [0.0] * len(judge_args)
+            for j, judge_future in judge_futures.items():
+                judge_reward, judge_latencies[j], notes = judge_future.result()
+                judge_rewards[j] = cast(float, judge_reward)
+                judge_item_seconds[j] = judge_latencies[j]
+                if notes is not None and notes.tier is not None:
+                    judge_tiers[j] = notes.tier
+                if metrics is not None:
+                    stage_seconds.setdefault((judge_datasources[j], "judge"), []).append(judge_latencies[j])
+            for datasource, indices, verifier_judge_future in verifier_judge_futures:
+                verifier_rewards, verifier_latency, notes = verifier_judge_future.result()
+                for j, judge_reward in zip(indices, verifier_rewards, strict=True):
+                    judge_rewards[j] = judge_reward
+                    judge_latencies[j] = verifier_latency
+                    judge_item_seconds[j] = verifier_latency / len(indices)
+                if notes is not None and notes.tiers is not None and len(notes.tiers) == len(indices):
+                    for k, j in enumerate(indices):
+                        judge_tiers[j] = notes.tiers[k] or "rule"
+                        if notes.seconds is not None:
+                            judge_item_seconds[j] = notes.seconds[k]
+                if metrics is not None:
+                    stage_seconds.setdefault((datasource, "judge"), []).append(verifier_latency)
+
+            for i, j in item_judge_indices.items():
+                rewards[i] = judge_rewards[j]
+                tiers[i] = judge_tiers[j]
+                if judge_paths[i] == "judged":
+                    latencies[i] += judge_latencies[j]
+                    judge_seconds[i] = judge_item_seconds[j]
+
+            for datasource, batch_future in batch_futures.items():
+                batch_result, batch_latency, _ = batch_future.result()
+                if metrics is not None:
+                    stage_seconds.setdefault((datasource, "batch"), []).append(batch_latency)
+                batch_rewards, batch_extracted_ans, batch_extracted_gt = cast(
+                    tuple[list[float], list, list], batch_result
+                )
+                for i, reward, extracted_ans, extracted_gt in zip(
+                    partitions[datasource], batch_rewards, batch_extracted_ans, batch_extracted_gt, strict=True
+                ):
+                    rewards[i] = reward
+                    extracted_ans_lst[i] = extracted_ans
+                    extracted_gt_lst[i] = extracted_gt
+                    judge_paths[i] = "batch"
+                    latencies[i] = batch_latency
+                    tiers[i] = "rule"
+
+        if metrics is not None:
+            self._record_reward_metrics(
+                metrics, datasources, verifiers, judge_paths, tiers, judge_seconds, stage_seconds
+            )
+        return rewards, extracted_ans_lst, extracted_gt_lst, judge_paths, latencies
+
+    @staticmethod
+    def _add_stage_notes(
+        stage_seconds: dict[tuple[str, str], list[float]], datasource: str, notes: MetricNotes
+    ) -> None:
+        for stage, seconds in notes.stages:
+            stage_seconds.setdefault((datasource, stage), []).append(seconds)
+
+    @staticmethod
+    def _record_reward_metrics(
+        metrics: MetricsRegistry,
+        datasources: list[str],
+        verifiers: Mapping[str, Verifier],
+        judge_paths: list[str],
+        tiers: list[str],
+        judge_seconds: list[Optional[float]],
+        stage_seconds: dict[tuple[str, str], list[float]],
+    ) -> None:
+        # * aggregated per series first, so that the registry lock is taken once per series
+        verifier_names = {datasource: verifier.__class__.__name__ for datasource, verifier in verifiers.items()}
+        decisions: dict[tuple[str, str, str], int] = {}
+        paths: dict[tuple[str, str], int] = {}
+        tier_seconds: dict[tuple[str, str, str], list[float]] = {}
+        for datasource, judge_path, tier, seconds in zip(datasources, judge_paths, tiers, judge_seconds, strict=True):
+            labels = (datasource, verifier_names[datasource], tier)
+            decisions[labels] = decisions.get(labels, 0) + 1
+            paths[(datasource, judge_path)] = paths.get((datasource, judge_path), 0) + 1
+            if seconds is not None:
+                tier_seconds.setdefault(labels, []).append(seconds)
+
+        for labels, count in decisions.items():
+            metrics.inc("glmv_reward_decisions_total", labels, count)
+        for path_labels, count in paths.items():
+            metrics.inc("glmv_reward_judge_paths_total", path_labels, count)
+        for labels, values in tier_seconds.items():
+            metrics.observe_many("glmv_reward_judge_seconds", labels, values)
+        for (datasource, stage), values in stage_seconds.items():
+            metrics.observe_many("glmv_reward_stage_seconds", (datasource, verifier_names[datasource], stage), values)
+
+    @staticmethod
+    def normalize_rewards(rewards: Sequence[float], group_keys: Sequence[Any]) -> list[float]:
+        """
+        Replaces -inf rewards within each prompt group.
+
+        In a group containing -inf rewards, they become the minimum finite reward of that group, or 0.0 if every
+        reward of the group is -inf.
+        """
+        groups: dict[Any, list[int]] = {}
+        for index, group_key in enumerate(group_keys):
+            groups.setdefault(group_key, []).append(index)
+
+        normalized_rewards = list(rewards)
+        for indices in groups.values():
+            group_rewards = [rewards[i] for i in indices]
+            if not any(reward == float("-inf") for reward in group_rewards):
+                continue
+            non_inf_rewards = [r for r in group_rewards if r != float("-inf")]
+            fill_value = min(non_inf_rewards) if len(non_inf_rewards) > 0 else 0.0
+            for i in indices:
+                if rewards[i] == float("-inf"):
+                    normalized_rewards[i] = fill_value
+        return normalized_rewards
+
+    def log_reward_judge(
+        self,
+        log_save_dir: str,
+        prompts: Sequence[str],
+        image_files: Sequence[Optional[str]],
+        answers: Sequence[str],
+        gt_answers: Sequence[str],
+        rewards: Sequence[float],
+        answer_lengths: Sequence[int],
+        uuids: Sequence[Optional[str]],
+        group_keys: Sequence[tuple[str, str, Optional[str]]],
+        current_iteration: int = 0,
+        extracted_answers: Optional[Sequence[Any]] = None,
+        extracted_gt_answers: Optional[Sequence[Any]] = None,
+        judge_paths: Optional[Sequence[str]] = None,
+        latencies: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Queues the judged rollouts to be appended to the JSONL logs under `log_save_dir/<datasource>/`, per prompt
+        group, and to the Parquet dataset `log_save_dir/<datasource>/rollout_reward/` if enabled. The logs are written
+        in the background, see `flush_reward_logs`.
+
+        The extracted answers, judge paths and latencies (in seconds) of the items are only logged to Parquet.
+        """
+        groups: dict[tuple[str, str, Optional[str]], list[int]] = {}
+        for index, group_key in enumerate(group_keys):
+            groups.setdefault(group_key, []).append(index)
+
+        save_dir = str(resolve_path(log_save_dir))
+        parquet_columns: dict[str, dict[str, list]] = {}
+        for (datasource, prompt, _), indices in groups.items():
+            datasource_dir = os.path.join(save_dir, datasource)
+
+            group_rewards = [rewards[i] for i in indices]
+            reward_sum = sum(group_rewards)
+            pass_at_k = any(reward > 0.75 for reward in group_rewards)
+
+            if self.log_jsonl:
+                reward_status = "pass@k" if pass_at_k else "not_pass@k"
+                pass_at_k_path = os.path.join(datasource_dir, f"rollout_reward_{reward_status}.jsonl")
+                correct_paths = {
+                    status: os.path.join(datasource_dir, f"rollout_reward_{status}.jsonl")
+                    for status in ("correct", "incorrect")
+                }
+                # Log each reward data pair, once in the pass@k log and once in the correct/incorrect log
+                lines: list[tuple[str, bytes]] = []
+                for i in indices:
+                    line = msgspec.json.encode(
+                        {
+                            "current_iteration": current_iteration,
+                            "prompt": prompts[i],
+                            "image_file": image_files[i],
+                            "answer": answers[i],
+                            "gt_answer": gt_answers[i],
+                            "reward": rewards[i],
+                            "answer_token_length": answer_lengths[i],
+                            "reward_sum_of_this_prompt": reward_sum,
+                            "uuid": uuids[i],
+                        }
+                    )
+                    line += b"\n"
+                    lines.append((pass_at_k_path, line))
+                    lines.append((correct_paths["correct" if rewards[i] > 0 else "incorrect"], line))
+                self.reward_log_writer.write_many(lines)
+
+            if self.parquet_log_writer is not None:
+                columns = parquet_columns.setdefault(datasource_dir, {})
+                values: dict[str, list] = {
+                    "prompt": [prompts[i] for i in indices],
+                    "prompt_hash": [hash_prompt(prompt)] * len(indices),
+                    "image_file": [image_files[i] for i in indices],
+                    "gt_answer": [gt_answers[i] for i in indices],
+                    "answer": [answers[i] for i in indices],
+                    "answer_token_length": [answer_lengths[i] for i in indices],
+                    "extracted_answer": [
+                        None if extracted_answers is None else encode_extracted_answer(extracted_answers[i])
+                        for i in indices
+                    ],
+                    "extracted_gt_answer": [
+                        None if extracted_gt_answers is None else encode_extracted_answer(extracted_gt_answers[i])
+                        for i in indices
+                    ],
+                    "reward": group_rewards,
+                    "reward_sum_of_this_prompt": [reward_sum] * len(indices),
+                    "pass_at_k": [pass_at_k] * len(indices),
+                    "correct": [reward > 0 for reward in group_rewards],
+                    "uuid": [uuids[i] for i in indices],
+                    "judge_path": [None if judge_paths is None else judge_paths[i] for i in indices],
+                    "judge_latency_s": [None if latencies is None else latencies[i] for i in indices],
+                }
+                for name, column in values.items():
+                    columns.setdefault(name, []).extend(column)
+
+        if self.parquet_log_writer is not None:
+            for datasource_dir, columns in parquet_columns.items():
+                self.parquet_log_writer.write(
+                    os.path.join(datasource_dir, "rollout_reward"), current_iteration, columns
+                )
+
     def extract_answer_from_response(
         self, answers: Union[Sequence[str], str], datasources: Union[Sequence[str], str]
     ) -> list:
@@ -408,3 +1107,84 @@ class RewardSystem(object):
             all_extracted_ans.append(extracted_ans)
 
         return all_extracted_ans
+
+
+_WORKER_REWARD_SYSTEM: Optional[RewardSystem] = None
+# * worker processes do not start the metrics exporters of their reward system
+_IN_WORKER = False
+# * symbolic workers, i.e. sympy comparisons under a deadline, of each worker process
+_WORKER_SYMBOLIC_POOL_SIZE = 2
+
+
+def _init_worker(config_file: str, defer_llm: bool) -> None:
+    """
+    Initializer of the worker processes, builds the reward system and pre-warms every verifier.
+    """
+    global _IN_WORKER, _WORKER_REWARD_SYSTEM
+    _IN_WORKER = True
+    reward_system = RewardSystem(config_file)
+    for datasource in reward_system.datasource_reward_configs:
+        try:
+            reward_system.get_verifier_from_datasource(datasource)
+        except Exception as e:
+            _logger.debug("Failed to pre-warm the verifier of `%s`: %s", datasource, repr(e))
+    # * sympy is only pre-warmed for the verifiers using symbolic comparisons
+    if "glmv_reward.utils.symbolic" in sys.modules:
+        from .utils.symbolic import set_symbolic_pool_size
+
+        # * each worker process has its own pool of symbolic workers
+        set_symbolic_pool_size(_WORKER_SYMBOLIC_POOL_SIZE)
+        try:
+            importlib.import_module("sympy")
+        except ImportError:
+            _logger.debug("sympy is not installed, skip pre-warming it.")
+    # LLM judge calls are issued by the parent process in the `hybrid` backend
+    defer_llm_calls(defer_llm)
+    _WORKER_REWARD_SYSTEM = reward_system
+
+
+def _get_worker_reward_system() -> RewardSystem:
+    if _WORKER_REWARD_SYSTEM is None:
+        err_msg = "The reward system of the worker process is not initialized."
+        raise RuntimeError(err_msg)
+    return _WORKER_REWARD_SYSTEM
+
+
+def _extract_in_worker(datasource: str, prompt: str, answer: Any, gt_answer: Any) -> tuple[Optional[float], Any, Any]:
+    reward_system = _get_worker_reward_system()
+    verifier = reward_system.get_verifier_from_datasource(datasource)
+    return reward_system._extract_single_item(prompt, answer, gt_answer, verifier)
+
+
+def _judge_in_worker(
+    datasource: str, prompt: str, extracted_ans: Any, extracted_gt: Any, image_file: Optional[str]
+) -> Optional[float]:
+    reward_system = _get_worker_reward_system()
+    verifier = reward_system.get_verifier_from_datasource(datasource)
+    try:
+        return reward_system._judge_single_item(prompt, extracted_ans, extracted_gt, image_file, verifier)
+    except LLMCallDeferred:
+        return None
+
+
+def _timed_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[Any, float, Optional[MetricNotes]]:
+    # * also returns what the call noted for the metrics, since it may run in a worker process
+    take_notes()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start, take_notes()
+
+
+def _judge_batch_in_worker(
+    datasource: str,
+    prompts: list[str],
+    answers: list[str],
+    gt_answers: list[str],
+    image_files: list[Optional[str]],
+) -> Optional[tuple[list[float], list, list]]:
+    reward_system = _get_worker_reward_system()
+    verifier = reward_system.get_verifier_from_datasource(datasource)
+    try:
+        return reward_system._judge_batch(prompts, answers, gt_answers, image_files, verifier)
+    except LLMCallDeferred:
+        return None
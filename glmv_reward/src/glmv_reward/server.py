@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Union, cast
+
+import msgspec
+
+from .configs import ServerConfig
+from .reward_system import RewardSystem
+from .utils.logging import get_logger
+from .utils.metrics import METRICS_PATH, PROMETHEUS_CONTENT_TYPE
+
+_logger = get_logger(__name__)
+
+REWARD_PATH = "/v1/reward"
+HEALTH_PATH = "/healthz"
+
+_RewardResult = Union[list[float], tuple[list[float], list, list]]
+
+
+class _RewardBatcher(object):
+    """
+    Collects concurrent reward requests and scores them together with `RewardSystem.get_rewards`.
+
+    A batch is closed `batch_wait` seconds after its first request arrived, or once it holds `max_batch_requests`
+    requests, and up to `max_concurrent_batches` batches are scored at the same time.
+    """
+
+    def __init__(
+        self,
+        reward_system: RewardSystem,
+        batch_wait: float = 0.005,
+        max_batch_requests: int = 64,
+        max_concurrent_batches: int = 4,
+    ) -> None:
+        self.reward_system = reward_system
+        self.batch_wait = batch_wait
+        self.max_batch_requests = max_batch_requests
+        self._queue: queue.SimpleQueue[Optional[tuple[dict[str, Any], Future[_RewardResult]]]] = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="glmv-reward-server-batch"
+        )
+        self._thread = threading.Thread(target=self._run, name="glmv-reward-server-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, request: dict[str, Any]) -> "Future[_RewardResult]":
+        future: Future[_RewardResult] = Future()
+        self._queue.put((request, future))
+        return future
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            stop = False
+            while len(batch) < self.max_batch_requests:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._executor.submit(self._score, batch)
+            if stop:
+                return
+
+    def _score(self, batch: list[tuple[dict[str, Any], "Future[_RewardResult]"]]) -> None:
+        try:
+            results = self.reward_system.get_rewards([request for request, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # * requests are validated before they are batched, so this is rare: the halves are scored again as
+            # * batches, which isolates a failing request in a logarithmic number of batches
+            middle = len(batch) // 2
+            self._score(batch[:middle])
+            self._score(batch[middle:])
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
+
+
+class _RewardRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_RewardHTTPServer | _RewardUnixHTTPServer"
+
+    def do_GET(self) -> None:
+        if self.path == METRICS_PATH:
+            self._send_metrics()
+            return
+        if self.path != HEALTH_PATH:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        self._send(200, {"status": "ok"})
+
+    def _send_metrics(self) -> None:
+        metrics = self.server.batcher.reward_system.metrics
+        if metrics is None:
+            self._send(404, {"error": "Metrics are disabled, see `metrics.enabled` of the reward config."})
+            return
+        data = metrics.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        if self.path != REWARD_PATH:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            request = msgspec.json.decode(
+                self.rfile.read(int(self.headers.get("Content-Length", 0))), type=dict[str, Any]
+            )
+            # * on the handler thread, so that an invalid request is rejected without joining a batch
+            self.server.batcher.reward_system.validate_reward_request(request)
+            result = self.server.batcher.submit(request).result()
+        except (ValueError, TypeError, msgspec.DecodeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Exception as e:
+            _logger.exception("Failed to score a reward request.")
+            self._send(500, {"error": repr(e)})
+            return
+
+        if isinstance(result, tuple):
+            rewards, extracted_answers, extracted_gt_answers = result
+            self._send(
+                200,
+                {
+                    "rewards": rewards,
+                    "extracted_answers": extracted_answers,
+                    "extracted_gt_answers": extracted_gt_answers,
+                },
+            )
+        else:
+            self._send(200, {"rewards": result})
+
+    def _send(self, status: int, body: dict[str, Any]) -> None:
+        # * extracted answers may be any object, e.g. sympy expressions
+        data = msgspec.json.encode(body, enc_hook=str)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # * the client address of a Unix socket is not a (host, port) tuple
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        _logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _RewardHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    batcher: _RewardBatcher
+
+
+class _RewardUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    batcher: _RewardBatcher
+
+
+class RewardServer(object):
+    """
+    Serves `RewardSystem.get_reward` over HTTP, and optionally over a Unix socket, see `glmv_reward.RewardClient`.
+
+    Concurrent requests, e.g. from the ranks of a trainer, are scored together so that they share the verifiers,
+    the judge deduplication, the verdict cache and the pooled judge connections of a single `RewardSystem`.
+
+    Endpoints:
+        - `POST /v1/reward`: takes the keyword arguments of `get_reward` as a JSON object, and returns
+          `{"rewards": [...]}`, with `extracted_answers` and `extracted_gt_answers` if `return_extracted_answers` is
+          set. Invalid requests get a 400 response.
+        - `GET /healthz`: returns `{"status": "ok"}`.
+        - `GET /metrics`: returns the metrics of the reward system in the Prometheus text format, if enabled.
+    """
+
+    def __init__(self, reward_system: RewardSystem, config: Optional[ServerConfig] = None) -> None:
+        self.reward_system = reward_system
+        self.config = config if config is not None else ServerConfig()
+        self.batcher = _RewardBatcher(
+            reward_system,
+            batch_wait=self.config.batch_wait,
+            max_batch_requests=self.config.max_batch_requests,
+            max_concurrent_batches=self.config.max_concurrent_batches,
+        )
+
+        self._servers: list[socketserver.BaseServer] = []
+        http_server = _RewardHTTPServer((self.config.host, self.config.port), _RewardRequestHandler)
+        http_server.batcher = self.batcher
+        self._servers.append(http_server)
+        if self.config.unix_socket is not None:
+            if os.path.exists(self.config.unix_socket):
+                os.remove(self.config.unix_socket)
+            unix_server = _RewardUnixHTTPServer(self.config.unix_socket, _RewardRequestHandler)
+            unix_server.batcher = self.batcher
+            self._servers.append(unix_server)
+        self._threads: list[threading.Thread] = []
+        self._stopped = threading.Event()
+
+    @property
+    def url(self) -> str:
+        host, port = cast(tuple[str, int], self._servers[0].server_address)[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        """
+        Starts serving from background threads.
+        """
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, name="glmv-reward-server", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        _logger.info(
+            "> Reward server listening on %s%s",
+            self.url,
+            "" if self.config.unix_socket is None else f" and {self.config.unix_socket}",
+        )
+
+    def serve_forever(self) -> None:
+        """
+        Serves until `shutdown` is called from another thread.
+        """
+        self.start()
+        self._stopped.wait()
+
+    def shutdown(self) -> None:
+        """
+        Stops serving, scores the requests already received and closes the reward system.
+        """
+        for server in self._servers:
+            if len(self._threads) > 0:
+                server.shutdown()
+            server.server_close()
+        self._threads.clear()
+        self.batcher.close()
+        self.reward_system.close()
+        if self.config.unix_socket is not None and os.path.exists(self.config.unix_socket):
+            os.remove(self.config.unix_socket)
+        self._stopped.set()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, cast
+
+import msgspec
+
+from glmv_reward.configs.judge_cache import JudgeCacheConfig
+
+from .logging import get_logger
+from .path import resolve_path
+
+_logger = get_logger(__name__)
+
+
+def make_verdict_key(
+    template: Optional[str],
+    model: Any,
+    question: Optional[str],
+    predict: Any,
+    label: Any,
+    endpoint: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    top_p: Optional[float] = None,
+) -> str:
+    """
+    Builds a content-addressed key for a judge verdict.
+
+    `endpoint` identifies the voting slot (e.g. the judge URL and its position in the endpoint list), so that
+    independent votes of an ensemble are never collapsed into one cached answer. The sampling parameters of the judge
+    request are part of the key, so that verdicts are not reused after the judge config of a verifier changes.
+    """
+    raw = msgspec.json.encode([template, model, question, predict, label, endpoint, max_tokens, temperature, top_p])
+    return hashlib.sha256(raw).hexdigest()
+
+
+class VerdictCache(object):
+    """
+    A two-tier cache of raw LLM judge responses.
+
+    The first tier is an in-process LRU with an optional TTL. The optional second tier is a SQLite database
+    (WAL mode) that can be shared by all worker processes on a host and survives restarts.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl: Optional[float] = None, sqlite_path: Optional[str] = None):
+        if max_size <= 0:
+            err_msg = f"`max_size` should be greater than 0, but got {max_size}."
+            raise ValueError(err_msg)
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sqlite_path = None if sqlite_path is None else str(resolve_path(sqlite_path))
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if self.sqlite_path is not None:
+            conn = self._get_connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS verdicts (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # * sqlite connections cannot be shared between threads
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(cast(str, self.sqlite_path), timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def _reset_after_fork(self) -> None:
+        # * sqlite connections must not be used across `fork`, the child opens its own on first use
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[tuple[float, str]]:
+        try:
+            row = self._get_connection().execute("SELECT created, value FROM verdicts WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            _logger.warning("Failed to read the judge verdict cache: %s", repr(e))
+            return None
+        if row is None or self._is_expired(row[0], now):
+            return None
+        return float(row[0]), str(row[1])
+
+    def _put_to_memory(self, key: str, created: float, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (created, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_expired(entry[0], now):
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+        if self.sqlite_path is not None:
+            disk_entry = self._get_from_disk(key, now)
+            if disk_entry is not None:
+                self._put_to_memory(key, *disk_entry)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return disk_entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        created = time.time()
+        self._put_to_memory(key, created, value)
+        if self.sqlite_path is not None:
+            try:
+                conn = self._get_connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, value, created) VALUES (?, ?, ?)", (key, value, created)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                _logger.warning("Failed to write the judge verdict cache: %s", repr(e))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.disk_hits = 0
+        if self.sqlite_path is not None:
+            conn = self._get_connection()
+            conn.execute("DELETE FROM verdicts")
+            conn.commit()
+
+
+_VERDICT_CACHE: Optional[VerdictCache] = None
+
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    return _VERDICT_CACHE
+
+
+def configure_verdict_cache(config: JudgeCacheConfig) -> Optional[VerdictCache]:
+    global _VERDICT_CACHE
+    sqlite_path = None if config.sqlite_path is None else str(resolve_path(config.sqlite_path))
+    if not config.enabled:
+        _VERDICT_CACHE = None
+    elif (
+        _VERDICT_CACHE is None
+        or _VERDICT_CACHE.max_size != config.max_size
+        or _VERDICT_CACHE.ttl != config.ttl
+        or _VERDICT_CACHE.sqlite_path != sqlite_path
+    ):
+        _VERDICT_CACHE = VerdictCache(max_size=config.max_size, ttl=config.ttl, sqlite_path=config.sqlite_path)
+    return _VERDICT_CACHE
+
+
+def _reset_cache_after_fork() -> None:
+    if _VERDICT_CACHE is not None:
+        _VERDICT_CACHE._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_cache_after_fork)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+
+import random
+import time
+from collections.abc import Callable, Sequence
+from typing import Optional
+
+import msgspec
+
+from glmv_reward.configs.llm_engine import JudgeRouterConfig
+
+from .logging import get_logger
+
+_logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class EndpointStats(msgspec.Struct, frozen=True):
+    url: str
+    state: str
+    inflight: int
+    requests: int
+    failures: int
+    consecutive_failures: int
+    ewma_latency_s: Optional[float]
+    ewma_error_rate: float
+
+
+# * called with `(url, latency in seconds, success)` after every judge request
+EndpointMetricsHook = Callable[[str, float, bool], None]
+
+_METRICS_HOOKS: list[EndpointMetricsHook] = []
+
+
+def add_endpoint_metrics_hook(hook: EndpointMetricsHook) -> None:
+    """
+    Registers a callable called with `(url, latency_s, success)` after every request to a judge endpoint.
+
+    Hooks run on the judge engine loop and must not block.
+    """
+    _METRICS_HOOKS.append(hook)
+
+
+def remove_endpoint_metrics_hook(hook: EndpointMetricsHook) -> None:
+    if hook in _METRICS_HOOKS:
+        _METRICS_HOOKS.remove(hook)
+
+
+def notify_endpoint_metrics(url: str, latency_s: float, success: bool) -> None:
+    """
+    Calls the registered endpoint metrics hooks, a failing hook is logged and skipped.
+    """
+    for hook in _METRICS_HOOKS:
+        try:
+            hook(url, latency_s, success)
+        except Exception as e:
+            _logger.warning("Endpoint metrics hook %r failed: %s", hook, repr(e))
+
+
+def retry_backoff(config: JudgeRouterConfig, attempt: int) -> float:
+    """
+    Returns the delay in seconds before retry `attempt` (starting at 1) of a judge request, with full jitter.
+    """
+    cap = min(config.backoff_max, config.backoff_base * 2 ** (attempt - 1))
+    return random.uniform(0.0, cap)  # noqa: S311
+
+
+class _EndpointState(object):
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.inflight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ewma_latency_s: Optional[float] = None
+        self.ewma_error_rate = 0.0
+
+
+class EndpointRouter(object):
+    """
+    Tracks the health of judge endpoints and picks the endpoint of each request.
+
+    Each endpoint keeps a moving average of its latency and error rate. After `failure_threshold` consecutive
+    failures its circuit opens and requests go to the other replicas for `open_seconds`, then a single probe request
+    decides whether it closes again. Requests to a URL with `replicas` go to the healthy replica with the lowest
+    expected wait, i.e. average latency times the number of requests in flight.
+
+    Only used from the judge engine loop, `stats` may be called from any thread.
+    """
+
+    def __init__(self, config: Optional[JudgeRouterConfig] = None) -> None:
+        self.config = config if config is not None else JudgeRouterConfig()
+        self._endpoints: dict[str, _EndpointState] = {}
+
+    def _get(self, url: str) -> _EndpointState:
+        endpoint = self._endpoints.get(url)
+        if endpoint is None:
+            endpoint = self._endpoints[url] = _EndpointState(url)
+        return endpoint
+
+    def _is_available(self, endpoint: _EndpointState, now: float) -> bool:
+        if endpoint.state == CLOSED:
+            return True
+        if endpoint.state == OPEN and now - endpoint.opened_at >= self.config.open_seconds:
+            return True
+        # * a half-open endpoint only takes the one probe request in flight
+        return False
+
+    def pick(self, url: str, exclude: Sequence[str] = ()) -> str:
+        """
+        Returns the endpoint to send a request for `url` to, preferring endpoints not in `exclude`.
+
+        If every replica has an open circuit, the request is still sent to the one whose circuit opened first rather
+        than dropped, since failing it would turn an outage of the judge into rewards of 0.
+        """
+        now = time.monotonic()
+        candidates = [self._get(candidate) for candidate in [url, *self.config.replicas.get(url, ())]]
+        available = [endpoint for endpoint in candidates if self._is_available(endpoint, now)]
+        if len(available) == 0:
+            preferred = [endpoint for endpoint in candidates if endpoint.url not in exclude] or candidates
+            return min(preferred, key=lambda e: e.opened_at).url
+        preferred = [endpoint for endpoint in available if endpoint.url not in exclude] or available
+        # * endpoints without a latency sample yet are tried first, ties go to the primary URL
+        endpoint = min(preferred, key=lambda e: (e.ewma_latency_s or 0.0) * (e.inflight + 1))
+        if endpoint.state == OPEN:
+            endpoint.state = HALF_OPEN
+        return endpoint.url
+
+    def has_alternative(self, url: str, exclude: Sequence[str]) -> bool:
+        """
+        Returns whether an available endpoint for `url` that is not in `exclude` is left.
+        """
+        now = time.monotonic()
+        return any(
+            candidate not in exclude and self._is_available(self._get(candidate), now)
+            for candidate in [url, *self.config.replicas.get(url, ())]
+        )
+
+    def on_start(self, url: str) -> None:
+        self._get(url).inflight += 1
+
+    def on_cancel(self, url: str) -> None:
+        """
+        Records that a request started with `on_start` was cancelled before it finished.
+        """
+        endpoint = self._get(url)
+        endpoint.inflight -= 1
+        # * a cancelled probe leaves the circuit open, the next request probes again
+        if endpoint.state == HALF_OPEN:
+            endpoint.state = OPEN
+
+    def on_rate_limited(self, url: str) -> None:
+        """
+        Records that a request started with `on_start` was rate limited, which counts as neither a success nor a
+        failure of the endpoint.
+        """
+        self.on_cancel(url)
+
+    def on_finish(self, url: str, latency_s: float, success: bool) -> None:
+        """
+        Records the outcome of a request started with `on_start`.
+        """
+        endpoint = self._get(url)
+        alpha = self.config.ewma_alpha
+        endpoint.inflight -= 1
+        endpoint.requests += 1
+        if endpoint.ewma_latency_s is None:
+            endpoint.ewma_latency_s = latency_s
+        else:
+            endpoint.ewma_latency_s += alpha * (latency_s - endpoint.ewma_latency_s)
+        endpoint.ewma_error_rate += alpha * (float(not success) - endpoint.ewma_error_rate)
+
+        if success:
+            endpoint.consecutive_failures = 0
+            endpoint.state = CLOSED
+        else:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.state == HALF_OPEN or endpoint.consecutive_failures >= self.config.failure_threshold:
+                if endpoint.state != OPEN:
+                    _logger.warning(
+                        "LLM judge endpoint %s failed %d times in a row, avoiding it for %.1fs.",
+                        url,
+                        endpoint.consecutive_failures,
+                        self.config.open_seconds,
+                    )
+                endpoint.state = OPEN
+                endpoint.opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, EndpointStats]:
+        """
+        Returns a snapshot of the health of every endpoint seen so far.
+        """
+        return {
+            url: EndpointStats(
+                url=url,
+                state=endpoint.state,
+                inflight=endpoint.inflight,
+                requests=endpoint.requests,
+                failures=endpoint.failures,
+                consecutive_failures=endpoint.consecutive_failures,
+                ewma_latency_s=endpoint.ewma_latency_s,
+                ewma_error_rate=endpoint.ewma_error_rate,
+            )
+            for url, endpoint in list(self._endpoints.items())
+        }
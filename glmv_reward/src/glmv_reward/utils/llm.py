@@ -1,30 +1,691 @@
 # -*- coding: utf-8 -*-
 
 
-import json
-from typing import Optional, cast
+import asyncio
+import atexit
+import importlib.util
+import os
+import threading
+import time
+from collections.abc import Callable, Coroutine, Sequence
+from typing import Any, Optional, TypeVar, cast
 
-import requests
+import httpx
+import msgspec
 
+from glmv_reward.configs.llm_engine import LLMEngineConfig
+
+from .cache import get_verdict_cache
+from .judge_router import EndpointRouter, notify_endpoint_metrics, retry_backoff
 from .logging import get_logger
+from .metrics import note_decision
+from .rate_limit import estimate_tokens, get_rate_limiter
 
 _logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+_DEFAULT_URL = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
+_DEFAULT_MODEL = "glm-4-flash"
+
+
+class LLMCallDeferred(BaseException):
+    """
+    Raised by `post_query_llm` in processes where LLM calls are deferred to the parent process.
+
+    It derives from `BaseException` so that the broad `except Exception` handlers of the verifiers do not turn a
+    deferred call into a judge failure.
+    """
+
+
+_DEFER_LLM_CALLS = False
+
+
+def defer_llm_calls(enabled: bool = True) -> None:
+    """
+    Makes `post_query_llm` raise `LLMCallDeferred` instead of querying the endpoint, unless the verdict is cached.
+    """
+    global _DEFER_LLM_CALLS
+    _DEFER_LLM_CALLS = enabled
+
+
+_PACKED_JUDGE_INSTRUCTION = (
+    "You are given {count} independent judging tasks. Handle each task on its own, exactly as if it were the only "
+    "task you were given. Reply with only a JSON array of {count} strings, where the i-th string is your complete "
+    "reply to task i."
+)
+
+
+def pack_judge_prompts(prompts: Sequence[str]) -> str:
+    """
+    Packs several judge prompts into one prompt asking for a JSON array of the replies, see `parse_packed_replies`.
+
+    The lines shared by the beginning of every prompt, usually the instructions of the prompt template, are only
+    included once.
+    """
+    shared_prefix = os.path.commonprefix(list(prompts))
+    shared_prefix = shared_prefix[: shared_prefix.rfind("\n") + 1]
+    parts = [_PACKED_JUDGE_INSTRUCTION.format(count=len(prompts))]
+    if len(shared_prefix.strip()) > 0:
+        parts.append(f"Every task starts with these shared instructions:\n<<<\n{shared_prefix.strip()}\n>>>")
+    for index, prompt in enumerate(prompts, start=1):
+        parts.append(f"### Task {index}\n{prompt[len(shared_prefix) :].strip()}")
+    return "\n\n".join(parts)
+
+
+def parse_packed_replies(response: str, count: int) -> Optional[list[str]]:
+    """
+    Parses the reply to a prompt of `pack_judge_prompts`, tolerating text around the JSON array (e.g. markdown code
+    fences or a reasoning preamble) and numbers in place of strings.
+
+    Returns:
+        The reply to each task, or `None` if the response is not an array of `count` replies.
+    """
+    start = response.find("[")
+    end = response.rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        replies = msgspec.json.decode(response[start : end + 1])
+    except msgspec.DecodeError:
+        return None
+    if not isinstance(replies, list) or len(replies) != count:
+        return None
+    parsed_replies = []
+    for reply in replies:
+        if isinstance(reply, str):
+            parsed_replies.append(reply)
+        elif isinstance(reply, (int, float)) and not isinstance(reply, bool):
+            parsed_replies.append(str(reply))
+        else:
+            return None
+    return parsed_replies
+
+
+class _PendingJudgeBatch(object):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self.futures: list[asyncio.Future[str]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMJudgeEngine(object):
+    """
+    An asyncio-based client for LLM judge endpoints.
+
+    The engine owns a private event loop running in a daemon thread and a single pooled `httpx.AsyncClient`,
+    so every judge request issued by the process, from any thread, shares keep-alive connections (and HTTP/2
+    multiplexing when `h2` is installed). Concurrency towards each endpoint is bounded by a semaphore.
+    """
+
+    def __init__(self, config: Optional[LLMEngineConfig] = None) -> None:
+        self.config = config if config is not None else LLMEngineConfig()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # * only touched from the engine loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._pending_batches: dict[tuple, _PendingJudgeBatch] = {}
+        self.router = EndpointRouter(self.config.router) if self.config.router.is_enabled else None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="glmv-reward-llm-engine", daemon=True)
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = self.config.http2 and _http2_available()
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry,
+                ),
+            )
+            _logger.debug("Created pooled LLM judge client (http2=%s).", http2)
+        return self._client
+
+    def _get_semaphore(self, url: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(url)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.config.max_concurrency_per_endpoint)
+            self._semaphores[url] = semaphore
+        return semaphore
+
+    def _finish_attempt(self, url: str, start: float, *, success: bool, rate_limited: bool = False) -> None:
+        latency_s = time.monotonic() - start
+        if self.router is not None:
+            # * rate limits come from the load of the API key, not from the health of the endpoint
+            if rate_limited:
+                self.router.on_rate_limited(url)
+            else:
+                self.router.on_finish(url, latency_s, success=success)
+        notify_endpoint_metrics(url, latency_s, success and not rate_limited)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """
+        Runs a coroutine on the engine loop and blocks the calling thread until it finishes.
+        """
+        loop = self._get_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            err_msg = "`LLMJudgeEngine.run` cannot be called from the engine loop, await the coroutine instead."
+            raise RuntimeError(err_msg)
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def apost_query_llm(
+        self,
+        prompt: str,
+        api_key: str,
+        url: str = _DEFAULT_URL,
+        model: str = _DEFAULT_MODEL,
+        image_file: Optional[str] = None,
+        max_tokens: Optional[int] = 10,
+        temperature: Optional[float] = 0.1,
+        top_p: Optional[float] = 1.0,
+        timeout: Optional[int] = 120,
+    ) -> str:
+        """
+        Coroutine version of `post_query_llm`, must be awaited on the engine loop.
+        """
+        del image_file  # Not currently supported
+
+        messages: list[dict[str, object]] = [{"role": "user", "content": prompt}]
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": top_p,
+            "stream": False,
+        }
+
+        limiter = get_rate_limiter()
+        reserved_tokens = estimate_tokens(prompt, max_tokens) if limiter.enabled else 0
+        # * over the rate limits of the key, wait for capacity here rather than get a 429, once per logical request
+        # * since the reservation of a failed attempt is not refunded
+        request_key = await limiter.acquire(api_key, url, reserved_tokens) if limiter.enabled else api_key
+        router = self.router
+        tried: list[str] = []
+        while True:
+            target = router.pick(url, exclude=tried) if router is not None else url
+            tried.append(target)
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {request_key}",
+            }
+            if router is not None:
+                router.on_start(target)
+            start = time.monotonic()
+            try:
+                async with self._get_semaphore(target):
+                    response = await self._get_client().post(target, headers=headers, json=payload, timeout=timeout)
+                response.raise_for_status()
+                response_data = response.json()
+            except asyncio.CancelledError:
+                if router is not None:
+                    router.on_cancel(target)
+                raise
+            except httpx.HTTPError as e:
+                _logger.warning("HTTP request error in `post_query_llm`: %s", repr(e))
+                # * connection errors, timeouts, rate limits and server errors are the endpoint's, others are ours
+                retryable = isinstance(e, httpx.TransportError) or (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and (e.response.status_code == 429 or e.response.status_code >= 500)
+                )
+                self._finish_attempt(
+                    target,
+                    start,
+                    success=not retryable,
+                    rate_limited=isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 429,
+                )
+                # * without replicas, the request is retried on the same URL, except after a timeout which would
+                # * most likely time out again
+                if isinstance(e, httpx.TimeoutException):
+                    retryable = router is not None and router.has_alternative(url, tried)
+                if retryable and len(tried) <= self.config.router.max_retries:
+                    await asyncio.sleep(retry_backoff(self.config.router, len(tried)))
+                    continue
+                return ""
+            except KeyError as e:
+                _logger.warning("Response parsing error in `post_query_llm`: %s", e)
+                self._finish_attempt(target, start, success=True)
+                return ""
+            except Exception as e:
+                _logger.warning("Unexpected error in `post_query_llm` due to exception: %s", repr(e))
+                self._finish_attempt(target, start, success=False)
+                return ""
+            self._finish_attempt(target, start, success=True)
+            usage = response_data.get("usage") if isinstance(response_data, dict) else None
+            if limiter.enabled and isinstance(usage, dict) and isinstance(usage.get("total_tokens"), int):
+                limiter.settle(request_key, reserved_tokens, usage["total_tokens"])
+            break
+
+        # Extract content from Zhipu AI response format
+        if "choices" in response_data and len(response_data["choices"]) > 0:
+            content = response_data["choices"][0]["message"]["content"]
+            return cast(str, content)
+        _logger.error("Unexpected response format from Zhipu AI API: %s", response_data)
+        return ""
+
+    async def apost_query_llm_batched(
+        self,
+        prompt: str,
+        api_key: str,
+        url: str = _DEFAULT_URL,
+        model: str = _DEFAULT_MODEL,
+        max_tokens: Optional[int] = 10,
+        temperature: Optional[float] = 0.1,
+        top_p: Optional[float] = 1.0,
+        timeout: Optional[int] = 120,
+        batch_size: int = 8,
+    ) -> str:
+        """
+        Same as `apost_query_llm`, but packs up to `batch_size` concurrent prompts sent with the same parameters into
+        one request, see `pack_judge_prompts`. A batch is sent once it is full, or `judge_batch_wait` seconds after
+        its first prompt arrived.
+
+        If the reply cannot be parsed into one reply per prompt, each prompt of the batch is sent on its own.
+        """
+        loop = asyncio.get_running_loop()
+        key = (url, api_key, model, max_tokens, temperature, top_p, timeout)
+        batch = self._pending_batches.get(key)
+        if batch is None:
+            batch = self._pending_batches[key] = _PendingJudgeBatch()
+            batch.timer = loop.call_later(self.config.judge_batch_wait, self._send_batch, key)
+        future: asyncio.Future[str] = loop.create_future()
+        batch.prompts.append(prompt)
+        batch.futures.append(future)
+        if len(batch.prompts) >= batch_size:
+            self._send_batch(key)
+        return await future
+
+    def _send_batch(self, key: tuple) -> None:
+        batch = self._pending_batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        # * the loop only keeps weak references to tasks
+        task = asyncio.ensure_future(self._judge_batch(key, batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _judge_batch(self, key: tuple, batch: _PendingJudgeBatch) -> None:
+        url, api_key, model, max_tokens, temperature, top_p, timeout = key
+        kwargs = {"url": url, "model": model, "temperature": temperature, "top_p": top_p, "timeout": timeout}
+        try:
+            replies = None
+            if len(batch.prompts) > 1:
+                response = await self.apost_query_llm(
+                    pack_judge_prompts(batch.prompts),
+                    api_key,
+                    # * room for the JSON quoting and separators of every reply
+                    max_tokens=None if max_tokens is None else (max_tokens + 8) * len(batch.prompts) + 16,
+                    **kwargs,
+                )
+                replies = parse_packed_replies(response, len(batch.prompts))
+                if replies is None:
+                    _logger.warning(
+                        "Failed to parse the reply to %d packed judge prompts, sending them one by one.",
+                        len(batch.prompts),
+                    )
+            if replies is None:
+                replies = await asyncio.gather(
+                    *(
+                        self.apost_query_llm(prompt, api_key, max_tokens=max_tokens, **kwargs)
+                        for prompt in batch.prompts
+                    )
+                )
+        except BaseException as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        for future, reply in zip(batch.futures, replies, strict=True):
+            if not future.done():
+                future.set_result(reply)
+
+    async def _aquery_endpoint(
+        self,
+        prompt: str,
+        api_key: str,
+        url: str,
+        model: str,
+        image_file: Optional[str],
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        top_p: Optional[float],
+        timeout: Optional[int],
+        batch_size: int,
+    ) -> str:
+        def query() -> "asyncio.Future[str]":
+            if batch_size > 1 and image_file is None:
+                coro = self.apost_query_llm_batched(
+                    prompt, api_key, url, model, max_tokens, temperature, top_p, timeout, batch_size=batch_size
+                )
+            else:
+                coro = self.apost_query_llm(
+                    prompt, api_key, url, model, image_file, max_tokens, temperature, top_p, timeout
+                )
+            return asyncio.ensure_future(coro)
+
+        tasks = {query()}
+        try:
+            if self.config.judge_hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=self.config.judge_hedge_delay)
+                if len(done) == 0:
+                    tasks.add(query())
+            while len(tasks) > 0:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # * failed requests return an empty string, a hedged request still pending may succeed
+                    if len(task.result()) > 0:
+                        return task.result()
+            return ""
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aquery_llm_endpoints(
+        self,
+        prompt: str,
+        endpoints: Sequence[tuple[str, str, str]],
+        on_response: Optional[Callable[[int, str], bool]] = None,
+        image_file: Optional[str] = None,
+        max_tokens: Optional[int] = 10,
+        temperature: Optional[float] = 0.1,
+        top_p: Optional[float] = 1.0,
+        timeout: Optional[int] = 120,
+        batch_size: int = 1,
+    ) -> list[Optional[str]]:
+        """
+        Sends `prompt` to every `(api_key, url, model)` endpoint concurrently, must be awaited on the engine loop.
+
+        `on_response(index, response)` is called as the response of each endpoint arrives, and the requests still
+        pending are cancelled once it returns `True`. A request still unanswered after `judge_hedge_delay` seconds is
+        sent a second time to the same endpoint, and an endpoint that has not answered within its entry of
+        `judge_endpoint_timeouts` counts as failed.
+
+        Returns:
+            The response of each endpoint, empty for failed requests and `None` for cancelled ones.
+        """
+        endpoint_timeouts = self.config.judge_endpoint_timeouts
+        tasks = {
+            asyncio.ensure_future(
+                asyncio.wait_for(
+                    self._aquery_endpoint(
+                        prompt, api_key, url, model, image_file, max_tokens, temperature, top_p, timeout, batch_size
+                    ),
+                    endpoint_timeouts.get(url, endpoint_timeouts.get("default")),
+                )
+            ): index
+            for index, (api_key, url, model) in enumerate(endpoints)
+        }
+        responses: list[Optional[str]] = [None] * len(endpoints)
+        pending = set(tasks)
+        try:
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                stop = False
+                for task in sorted(done, key=tasks.__getitem__):
+                    index = tasks[task]
+                    try:
+                        responses[index] = task.result()
+                    except asyncio.TimeoutError:
+                        _logger.warning("LLM judge endpoint %s timed out.", endpoints[index][1])
+                        responses[index] = ""
+                    if on_response is not None and on_response(index, cast(str, responses[index])):
+                        stop = True
+                if stop:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        return responses
+
+    def post_query_llm(
+        self,
+        prompt: str,
+        api_key: str,
+        url: str = _DEFAULT_URL,
+        model: str = _DEFAULT_MODEL,
+        image_file: Optional[str] = None,
+        max_tokens: Optional[int] = 10,
+        temperature: Optional[float] = 0.1,
+        top_p: Optional[float] = 1.0,
+        timeout: Optional[int] = 120,
+        batch_size: int = 1,
+    ) -> str:
+        if batch_size > 1 and image_file is None:
+            return self.run(
+                self.apost_query_llm_batched(
+                    prompt,
+                    api_key,
+                    url=url,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    timeout=timeout,
+                    batch_size=batch_size,
+                )
+            )
+        return self.run(
+            self.apost_query_llm(
+                prompt,
+                api_key,
+                url=url,
+                model=model,
+                image_file=image_file,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                timeout=timeout,
+            )
+        )
+
+    async def _aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=5)
+        except Exception as e:
+            _logger.debug("Failed to close the LLM judge client cleanly: %s", repr(e))
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        self._semaphores.clear()
+
+
+_ENGINE: Optional[LLMJudgeEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_llm_engine() -> LLMJudgeEngine:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = LLMJudgeEngine()
+        return _ENGINE
+
+
+def configure_llm_engine(config: LLMEngineConfig) -> LLMJudgeEngine:
+    """
+    Replaces the process-wide engine if `config` differs from the one currently in use.
+    """
+    global _ENGINE
+    with _ENGINE_LOCK:
+        old_engine = _ENGINE
+        if old_engine is not None and old_engine.config == config:
+            return old_engine
+        _ENGINE = LLMJudgeEngine(config)
+    if old_engine is not None:
+        old_engine.close()
+    return _ENGINE
+
+
+def _close_engine() -> None:
+    if _ENGINE is not None:
+        _ENGINE.close()
+
+
+def _reset_engine_after_fork() -> None:
+    # * the engine thread does not survive `fork`, children must build their own engine
+    global _ENGINE, _ENGINE_LOCK
+    _ENGINE = None
+    _ENGINE_LOCK = threading.Lock()
+
+
+atexit.register(_close_engine)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
+def vote_llm_judges(
+    prompt: str,
+    api_keys: Sequence[str],
+    urls: Sequence[str],
+    models: Sequence[str],
+    score_response: Callable[[str], float],
+    cache_keys: Optional[Sequence[Optional[str]]] = None,
+    majority: bool = True,
+    image_file: Optional[str] = None,
+    max_tokens: Optional[int] = 10,
+    temperature: Optional[float] = 0.1,
+    top_p: Optional[float] = 1.0,
+    timeout: Optional[int] = 120,
+    batch_size: int = 1,
+) -> float:
+    """
+    Asks several LLM judge endpoints the same prompt concurrently and combines their scores.
+
+    Args:
+        prompt: The judge prompt.
+        api_keys: The API key of each endpoint.
+        urls: The chat completion URL of each endpoint.
+        models: The model of each endpoint.
+        score_response: Returns the score of a judge response, an empty response means the request failed.
+        cache_keys: The verdict cache key of each endpoint, see `post_query_llm`.
+        majority: If set, returns 1.0 when the scores sum to more than half of the number of endpoints and 0.0
+          otherwise. With `judge_vote_early_exit`, scores are clipped to [0, 1] and the requests still pending are
+          cancelled once the outcome is decided. Otherwise returns the mean score over all endpoints.
+        image_file: The image file to generation completions for (not currently supported).
+        max_tokens: The maximum number of tokens that can be generated.
+        temperature: The sampling temperature used for the generation.
+        top_p: The parameter for nucleus sampling.
+        timeout: The timeout value of each request.
+        batch_size: See `post_query_llm`.
+
+    Returns:
+        The combined score.
+    """
+    num_endpoints = len(urls)
+    if not len(api_keys) == len(models) == num_endpoints:
+        err_msg = f"Got {len(api_keys)} API keys, {num_endpoints} URLs and {len(models)} models for the LLM judges."
+        raise ValueError(err_msg)
+    note_decision("llm")
+    keys = list(cache_keys) if cache_keys is not None else [None] * num_endpoints
+    scores: list[Optional[float]] = [None] * num_endpoints
+    engine = get_llm_engine()
+    # * the outcome can only be decided before all votes are in if each vote is bounded
+    early_exit = majority and engine.config.judge_vote_early_exit
+
+    def add_score(index: int, response: str) -> None:
+        score = score_response(response)
+        scores[index] = min(max(score, 0.0), 1.0) if early_exit else score
+
+    def is_decided() -> bool:
+        total = sum(score for score in scores if score is not None)
+        num_missing = scores.count(None)
+        if not early_exit or num_missing == 0:
+            return num_missing == 0
+        return total > num_endpoints / 2 or total + num_missing <= num_endpoints / 2
+
+    cache = get_verdict_cache() if any(key is not None for key in keys) else None
+    if cache is not None:
+        for index, key in enumerate(keys):
+            cached_response = cache.get(key) if key is not None else None
+            if cached_response is not None:
+                add_score(index, cached_response)
+
+    missing = [index for index, score in enumerate(scores) if score is None]
+    if len(missing) > 0 and not is_decided():
+        if _DEFER_LLM_CALLS:
+            raise LLMCallDeferred
+
+        def on_response(position: int, response: str) -> bool:
+            add_score(missing[position], response)
+            return early_exit and is_decided()
+
+        responses = engine.run(
+            engine.aquery_llm_endpoints(
+                prompt,
+                [(api_keys[index], urls[index], models[index]) for index in missing],
+                on_response=on_response,
+                image_file=image_file,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                timeout=timeout,
+                batch_size=batch_size,
+            )
+        )
+        if cache is not None:
+            for index, response in zip(missing, responses, strict=True):
+                key = keys[index]
+                # * failed requests return an empty string and must not be cached
+                if key is not None and response is not None and len(response) > 0:
+                    cache.put(key, response)
+
+    total = sum(score for score in scores if score is not None)
+    if majority:
+        return float(total > num_endpoints / 2)
+    return total / num_endpoints
+
 
 def post_query_llm(
     prompt: str,
     api_key: str,
-    url: str = "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-    model: str = "glm-4-flash",
+    url: str = _DEFAULT_URL,
+    model: str = _DEFAULT_MODEL,
     image_file: Optional[str] = None,
     max_tokens: Optional[int] = 10,
     temperature: Optional[float] = 0.1,
     top_p: Optional[float] = 1.0,
     timeout: Optional[int] = 120,
+    cache_key: Optional[str] = None,
+    batch_size: int = 1,
 ) -> str:
     """
     Sends a query to Zhipu AI API endpoint.
 
+    This is a blocking wrapper around `LLMJudgeEngine.apost_query_llm`, the request itself is issued on the
+    shared engine loop so that concurrent callers reuse pooled connections.
+
     Args:
         prompt: The prompt to generate completions for.
         api_key: The API key used for authentication.
@@ -36,48 +697,38 @@ def post_query_llm(
         top_p: The parameter for nucleus sampling, where the model considers the
           results of the tokens with top_p probability mass.
         timeout: The timeout value for the LLM request.
+        cache_key: If given and the judge verdict cache is enabled, a cached response stored under this key
+          is returned without querying the endpoint, see `glmv_reward.utils.cache.make_verdict_key`.
+        batch_size: If greater than 1, up to `batch_size` concurrent prompts sent with the same parameters are
+          packed into a single request, see `LLMJudgeEngine.apost_query_llm_batched`.
 
     Returns:
         The response content from the API.
 
     """
-    del image_file  # Not currently supported
-
-    # Get API key from environment
-
-    messages: list[dict[str, object]] = [{"role": "user", "content": prompt}]
-
-    payload = {
-        "model": model,
-        "messages": messages,
-        "max_tokens": max_tokens,
-        "temperature": temperature,
-        "top_p": top_p,
-        "stream": False,
-    }
+    note_decision("llm")
+    cache = get_verdict_cache() if cache_key is not None else None
+    if cache is not None:
+        cached_response = cache.get(cast(str, cache_key))
+        if cached_response is not None:
+            return cached_response
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
+    if _DEFER_LLM_CALLS:
+        raise LLMCallDeferred
 
-    try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=timeout)
-        response.raise_for_status()
-        response_data = response.json()
-    except requests.exceptions.RequestException as e:
-        _logger.warning("HTTP request error in `post_query_llm`: %s", e)
-        return ""
-    except KeyError as e:
-        _logger.warning("Response parsing error in `post_query_llm`: %s", e)
-        return ""
-    except Exception as e:
-        _logger.warning("Unexpected error in `post_query_llm` due to exception: %s", repr(e))
-        return ""
-    else:
-        # Extract content from Zhipu AI response format
-        if "choices" in response_data and len(response_data["choices"]) > 0:
-            content = response_data["choices"][0]["message"]["content"]
-            return cast(str, content)
-        _logger.error("Unexpected response format from Zhipu AI API: %s", response_data)
-        return ""
+    response = get_llm_engine().post_query_llm(
+        prompt,
+        api_key,
+        url=url,
+        model=model,
+        image_file=image_file,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        top_p=top_p,
+        timeout=timeout,
+        batch_size=batch_size,
+    )
+    # * failed requests return an empty string and must not be cached
+    if cache is not None and len(response) > 0:
+        cache.put(cast(str, cache_key), response)
+    return response
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+
+import bisect
+import threading
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, cast
+
+import msgspec
+
+from glmv_reward.configs.metrics import MetricsConfig
+
+from .judge_router import add_endpoint_metrics_hook
+from .logging import get_logger
+
+_logger = get_logger(__name__)
+
+# * how the reward of an item was decided, from the cheapest to the most expensive check
+DECISION_TIERS = ("exact_match", "numeric", "sympy", "llm", "rule", "format_failure", "exception")
+METRICS_EXPORTERS = ("prometheus", "reward_log")
+METRICS_PATH = "/metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# * name: (type, label names, help)
+_METRIC_FAMILIES: dict[str, tuple[str, tuple[str, ...], str]] = {
+    "glmv_reward_decisions_total": (
+        "counter",
+        ("datasource", "verifier", "tier"),
+        "Rewards by the decision tier that produced them.",
+    ),
+    "glmv_reward_judge_paths_total": (
+        "counter",
+        ("datasource", "path"),
+        "Rewards by how their item was scored, see `glmv_reward.reward_system.JUDGE_PATHS`.",
+    ),
+    "glmv_reward_stage_seconds": (
+        "histogram",
+        ("datasource", "verifier", "stage"),
+        "Time spent in each stage of scoring, per item for `format` and `extract`, per judge call otherwise.",
+    ),
+    "glmv_reward_judge_seconds": (
+        "histogram",
+        ("datasource", "verifier", "tier"),
+        "Judge time of an item by the decision tier of its reward.",
+    ),
+    "glmv_reward_call_seconds": (
+        "histogram",
+        ("stage",),
+        "Time spent in each stage of a `get_reward` or `get_rewards` call.",
+    ),
+    "glmv_reward_llm_request_seconds": (
+        "histogram",
+        ("endpoint", "outcome"),
+        "Latency of the LLM judge requests issued by this process.",
+    ),
+}
+
+
+class MetricNotes(msgspec.Struct):
+    """
+    What the current thread observed while scoring, collected by the caller with `take_notes`, possibly in another
+    process.
+    """
+
+    # * the decision tier of a single judged item
+    tier: Optional[str] = None
+    # * the decision tier and the judge time in seconds of each item of a batch
+    tiers: Optional[list[Optional[str]]] = None
+    seconds: Optional[list[float]] = None
+    # * (stage, seconds) pairs
+    stages: list[tuple[str, float]] = msgspec.field(default_factory=list)
+
+
+class _Histogram(object):
+    def __init__(self, num_buckets: int) -> None:
+        self.counts = [0] * (num_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+class MetricsRegistry(object):
+    """
+    Thread-safe counters and histograms of the reward system, see `_METRIC_FAMILIES` for the metrics and their labels.
+    """
+
+    def __init__(self, buckets: Sequence[float] = MetricsConfig().buckets) -> None:
+        if len(buckets) == 0 or list(buckets) != sorted(buckets):
+            err_msg = f"`buckets` should be a non-empty increasing sequence, but got {buckets}."
+            raise ValueError(err_msg)
+        self.buckets = tuple(float(bucket) for bucket in buckets)
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple[str, ...], float]] = {}
+        self._histograms: dict[str, dict[tuple[str, ...], _Histogram]] = {}
+
+    def inc(self, name: str, labels: tuple[str, ...], value: float = 1.0) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: tuple[str, ...], value: float) -> None:
+        self.observe_many(name, labels, (value,))
+
+    def observe_many(self, name: str, labels: tuple[str, ...], values: Sequence[float]) -> None:
+        index = [bisect.bisect_left(self.buckets, value) for value in values]
+        with self._lock:
+            histogram = self._histograms.setdefault(name, {}).get(labels)
+            if histogram is None:
+                histogram = self._histograms[name][labels] = _Histogram(len(self.buckets))
+            for value, i in zip(values, index, strict=True):
+                histogram.counts[i] += 1
+                histogram.count += 1
+                histogram.sum += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        Returns the value of every series as plain data, keyed by metric name.
+
+        Counters are `{"labels": {...}, "value": ...}` and histograms are `{"labels": {...}, "count": ..., "sum": ...,
+        "buckets": [[upper bound, cumulative count], ...]}`, the last bucket being `inf`.
+        """
+        snapshot: dict[str, list[dict[str, Any]]] = {}
+        with self._lock:
+            for name, counter_series in self._counters.items():
+                label_names = _METRIC_FAMILIES[name][1]
+                snapshot[name] = [
+                    {"labels": dict(zip(label_names, labels, strict=True)), "value": value}
+                    for labels, value in sorted(counter_series.items())
+                ]
+            for name, histogram_series in self._histograms.items():
+                label_names = _METRIC_FAMILIES[name][1]
+                samples = []
+                for labels, histogram in sorted(histogram_series.items()):
+                    cumulative = 0
+                    buckets = []
+                    for bound, count in zip((*self.buckets, float("inf")), histogram.counts, strict=True):
+                        cumulative += count
+                        buckets.append([bound, cumulative])
+                    samples.append(
+                        {
+                            "labels": dict(zip(label_names, labels, strict=True)),
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                            "buckets": buckets,
+                        }
+                    )
+                snapshot[name] = samples
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, samples in sorted(self.snapshot().items()):
+            metric_type, _, help_text = _METRIC_FAMILIES[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for sample in samples:
+                labels = sample["labels"]
+                if metric_type == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(sample['value'])}")
+                    continue
+                for bound, cumulative in sample["buckets"]:
+                    bucket_labels = {**labels, "le": _format_value(bound)}
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if len(labels) == 0:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+_REGISTRY: Optional[MetricsRegistry] = None
+_LOCAL = threading.local()
+_hook_registered = False
+
+
+def configure_metrics(config: MetricsConfig) -> Optional[MetricsRegistry]:
+    """
+    Enables the metrics of this process as configured, keeping the metrics recorded so far if the buckets did not
+    change, or disables them.
+    """
+    global _REGISTRY, _hook_registered
+    unknown_exporters = set(config.exporters) - set(METRICS_EXPORTERS)
+    if len(unknown_exporters) > 0:
+        err_msg = f"Unknown metrics exporters: {sorted(unknown_exporters)}, expected some of {METRICS_EXPORTERS}."
+        raise ValueError(err_msg)
+
+    if not config.enabled:
+        _REGISTRY = None
+    elif _REGISTRY is None or _REGISTRY.buckets != tuple(config.buckets):
+        _REGISTRY = MetricsRegistry(config.buckets)
+    if _REGISTRY is not None and not _hook_registered:
+        add_endpoint_metrics_hook(_record_llm_request)
+        _hook_registered = True
+    return _REGISTRY
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """
+    Returns the metrics registry of this process, or `None` if metrics are disabled.
+    """
+    return _REGISTRY
+
+
+def metrics_enabled() -> bool:
+    return _REGISTRY is not None
+
+
+def _record_llm_request(url: str, latency_s: float, success: bool) -> None:
+    registry = _REGISTRY
+    if registry is not None:
+        registry.observe("glmv_reward_llm_request_seconds", (url, "success" if success else "failure"), latency_s)
+
+
+def _current_notes() -> MetricNotes:
+    notes: Optional[MetricNotes] = getattr(_LOCAL, "notes", None)
+    if notes is None:
+        notes = _LOCAL.notes = MetricNotes()
+    return notes
+
+
+def note_decision(tier: str) -> None:
+    """
+    Records the decision tier of the item being judged by the current thread, the last one noted wins.
+
+    A no-op if metrics are disabled.
+    """
+    if _REGISTRY is not None:
+        _current_notes().tier = tier
+
+
+def note_batch_decisions(tiers: list[Optional[str]], seconds: Optional[list[float]] = None) -> None:
+    """
+    Records the decision tier, and optionally the judge time, of each item of the batch judged by the current thread.
+
+    A no-op if metrics are disabled.
+    """
+    if _REGISTRY is not None:
+        notes = _current_notes()
+        notes.tiers = tiers
+        notes.seconds = seconds
+
+
+def note_stage(stage: str, seconds: float) -> None:
+    """
+    Records the time spent by the current thread in a scoring stage. A no-op if metrics are disabled.
+    """
+    if _REGISTRY is not None:
+        _current_notes().stages.append((stage, seconds))
+
+
+def take_notes() -> Optional[MetricNotes]:
+    """
+    Returns and clears what the current thread noted so far, `None` if nothing was noted.
+    """
+    notes: Optional[MetricNotes] = getattr(_LOCAL, "notes", None)
+    if notes is not None:
+        _LOCAL.notes = None
+    return notes
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        registry = _REGISTRY
+        if self.path != METRICS_PATH or registry is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = registry.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        _logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+_METRICS_SERVER: Optional[_MetricsHTTPServer] = None
+_METRICS_SERVER_LOCK = threading.Lock()
+
+
+def serve_metrics(host: str = "127.0.0.1", port: int = 9600) -> str:
+    """
+    Serves the metrics of this process in the Prometheus text format on `GET /metrics` from a background thread. The
+    server is shared by every reward system of the process.
+
+    Returns:
+        The URL of the metrics endpoint.
+    """
+    global _METRICS_SERVER
+    with _METRICS_SERVER_LOCK:
+        if _METRICS_SERVER is None:
+            _METRICS_SERVER = _MetricsHTTPServer((host, port), _MetricsRequestHandler)
+            thread = threading.Thread(target=_METRICS_SERVER.serve_forever, name="glmv-reward-metrics", daemon=True)
+            thread.start()
+        server_host, server_port = cast(tuple[str, int], _METRICS_SERVER.server_address)[:2]
+        url = f"http://{server_host}:{server_port}{METRICS_PATH}"
+    _logger.info("> Serving reward metrics on %s", url)
+    return url
+
+
+def stop_serving_metrics() -> None:
+    global _METRICS_SERVER
+    with _METRICS_SERVER_LOCK:
+        if _METRICS_SERVER is not None:
+            _METRICS_SERVER.shutdown()
+            _METRICS_SERVER.server_close()
+            _METRICS_SERVER = None
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+
+import math
+import re
+from typing import Optional
+
+# * the native comparisons only decide matches, within at most this relative tolerance. The `sympy_tolerance` of a
+# * verifier was tuned for sympy, whose strict parsing rejects every string, so a loose one (e.g. 0.9 for MMSI) never
+# * applied to text answers, which were left to the LLM judge, and would accept wrong answers such as "1" for "10"
+MAX_NUMERIC_TOLERANCE = 1e-5
+
+_DECIMAL = r"(?:\d+(?:\.\d*)?|\.\d+)"
+
+# * integers, decimals and simple fractions of integers, e.g. "-12", "3.14", ".5", "3/4"
+_PLAIN_NUMBER_PATTERN = re.compile(rf"[+-]?\d+\s*/\s*\d+|[+-]?{_DECIMAL}")
+
+# * e.g. "1e3", "2.5E-2", "1.2 × 10^3", "1.2\times10^{-3}", "3*10**8"
+_SCIENTIFIC_PATTERN = re.compile(
+    rf"(?P<mantissa>[+-]?{_DECIMAL})\s*"
+    r"(?:[eE](?P<e_exponent>[+-]?\d+)|(?:\\times|×|\*|\\cdot)\s*10\s*(?:\^|\*\*)\s*\{?\s*(?P<exponent>[+-]?\d+)\s*\}?)"
+)
+# * e.g. "\frac{1}{2}", "-\dfrac{3}{4}"
+_LATEX_FRACTION_PATTERN = re.compile(
+    rf"(?P<sign>[+-]?)\s*\\[dt]?frac\s*\{{\s*(?P<numerator>{_DECIMAL})\s*\}}\s*\{{\s*(?P<denominator>{_DECIMAL})\s*\}}"
+)
+# * e.g. "1,234,567.5", only groups of exactly three digits are accepted
+_THOUSANDS_PATTERN = re.compile(r"[+-]?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+_PERCENT_PATTERN = re.compile(r"(?P<number>.+?)\s*\\?%")
+
+
+def _finite(value: float) -> Optional[float]:
+    # * values out of the float range cannot be compared reliably
+    return value if math.isfinite(value) else None
+
+
+def parse_plain_number(text: str) -> Optional[float]:
+    """
+    Parses a plain integer, decimal or fraction into a float, returns `None` for anything else.
+
+    The value is not exact, e.g. "1/3" is rounded to the nearest float. The comparisons only decide matches within a
+    relative tolerance of at most `MAX_NUMERIC_TOLERANCE`, which is far above the rounding error of a float.
+    """
+    text = text.strip()
+    if _PLAIN_NUMBER_PATTERN.fullmatch(text) is None:
+        return None
+    numerator, _, denominator = text.partition("/")
+    try:
+        if len(denominator) == 0:
+            return _finite(float(numerator))
+        return _finite(float(numerator) / float(denominator))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _parse_extended_number(text: str) -> Optional[float]:
+    match = _SCIENTIFIC_PATTERN.fullmatch(text)
+    if match is not None:
+        exponent = match.group("e_exponent") or match.group("exponent")
+        return _finite(float(f"{match.group('mantissa')}e{exponent}"))
+
+    match = _LATEX_FRACTION_PATTERN.fullmatch(text)
+    if match is not None:
+        value = _finite(float(match.group("numerator")) / float(match.group("denominator")))
+        return -value if value is not None and match.group("sign") == "-" else value
+
+    if _THOUSANDS_PATTERN.fullmatch(text) is not None:
+        return _finite(float(text.replace(",", "")))
+
+    match = _PERCENT_PATTERN.fullmatch(text)
+    if match is not None:
+        number = match.group("number").strip()
+        percent = parse_plain_number(number)
+        if percent is None and "%" not in number:
+            percent = _parse_extended_number(number)
+        return None if percent is None else percent / 100
+
+    return None
+
+
+def parse_number(text: str) -> Optional[tuple[float, bool]]:
+    """
+    Parses a numeric literal into a float without sympy.
+
+    Besides plain integers, decimals and fractions, scientific notation, percentages, LaTeX `\\frac{a}{b}` and
+    thousands separators are understood.
+
+    Returns:
+        A tuple of the value and whether the text is a plain number, or `None` if the text is not a numeric literal.
+    """
+    text = text.strip()
+    value = parse_plain_number(text)
+    if value is not None:
+        return value, True
+    try:
+        value = _parse_extended_number(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return None if value is None else (value, False)
+
+
+def _is_close(answer: float, ground_truth: float, tolerance: float) -> bool:
+    return abs(answer - ground_truth) / (abs(ground_truth) + 1e-6) < tolerance
+
+
+def compare_plain_numbers(answer: str, ground_truth: str, tolerance: float) -> Optional[bool]:
+    """
+    Compares two plain numbers with the relative tolerance used by the sympy-based verifiers, capped to
+    `MAX_NUMERIC_TOLERANCE`.
+
+    Returns:
+        `True` if the numbers match, `None` otherwise, mismatches are left to the caller.
+    """
+    answer_number = parse_plain_number(answer)
+    if answer_number is None:
+        return None
+    gt_number = parse_plain_number(ground_truth)
+    if gt_number is None:
+        return None
+    return True if _is_close(answer_number, gt_number, min(tolerance, MAX_NUMERIC_TOLERANCE)) else None
+
+
+def compare_numbers(answer: str, ground_truth: str, tolerance: float) -> Optional[bool]:
+    """
+    Compares two numeric literals with the relative tolerance used by the sympy-based verifiers, capped to
+    `MAX_NUMERIC_TOLERANCE`.
+
+    Only matches are decided. Mismatches are left to the caller, i.e. to the LLM judge fallback of the verifiers,
+    which decided every pair of distinct strings before the native comparisons, since "41" against "42" may be a
+    rounding of a chart reading and "50%" against "50" may be read either way.
+
+    Returns:
+        `True` if the pair is decided as a match, `None` otherwise.
+    """
+    answer_number = parse_number(answer)
+    if answer_number is None:
+        return None
+    gt_number = parse_number(ground_truth)
+    if gt_number is None:
+        return None
+    return True if _is_close(answer_number[0], gt_number[0], min(tolerance, MAX_NUMERIC_TOLERANCE)) else None
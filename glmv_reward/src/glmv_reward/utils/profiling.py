@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+
+import contextlib
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import FrameType
+from typing import Any, Optional, TypeVar
+
+from .logging import get_logger
+
+_logger = get_logger(__name__)
+
+PROFILE_ENV_VAR = "GLMV_REWARD_PROFILE"
+# * label of the threads calling `get_reward` / `get_rewards` while they are profiled
+CALL_PROFILE_LABEL = "get_reward"
+
+_T = TypeVar("_T")
+
+# * thread ident: label, only maintained while a profiler is sampling
+_THREAD_LABELS: dict[int, str] = {}
+_num_sampling = 0
+_sampling_lock = threading.Lock()
+
+
+def _labels_enabled() -> bool:
+    return _num_sampling > 0
+
+
+def set_profile_label(label: Optional[str]) -> Optional[str]:
+    """
+    Sets the label under which the samples of the current thread are recorded, `None` to stop recording them.
+
+    Returns:
+        The previous label of the thread.
+    """
+    ident = threading.get_ident()
+    previous = _THREAD_LABELS.get(ident)
+    if label is None:
+        _THREAD_LABELS.pop(ident, None)
+    else:
+        _THREAD_LABELS[ident] = label
+    return previous
+
+
+def with_profile_label(label: str, func: Callable[..., _T]) -> Callable[..., _T]:
+    """
+    Wraps `func` to record the samples of the thread running it under `label`. Returns `func` itself when no profiler
+    is sampling, so that unprofiled calls pay nothing.
+    """
+    if not _labels_enabled():
+        return func
+
+    def labelled(*args: Any, **kwargs: Any) -> _T:
+        previous = set_profile_label(label)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            set_profile_label(previous)
+
+    return labelled
+
+
+def propagate_profile_label(func: Callable[..., _T]) -> Callable[..., _T]:
+    """
+    Wraps `func` to run under the label of the current thread, for the functions submitted to nested thread pools.
+    """
+    label = _THREAD_LABELS.get(threading.get_ident())
+    if label is None:
+        return func
+    return with_profile_label(label, func)
+
+
+def get_env_num_calls() -> int:
+    """
+    Reads the number of calls to profile from the `GLMV_REWARD_PROFILE` environment variable, 0 if it is unset or not
+    a non-negative integer.
+    """
+    value = os.environ.get(PROFILE_ENV_VAR, "").strip()
+    if value == "":
+        return 0
+    try:
+        num_calls = int(value)
+    except ValueError:
+        num_calls = -1
+    if num_calls < 0:
+        _logger.warning(f"> Ignoring {PROFILE_ENV_VAR}={value!r}, expected a non-negative number of calls")
+        return 0
+    return num_calls
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler(object):
+    """
+    Samples the stacks of the labelled threads of this process from a background thread, and aggregates them as
+    collapsed stacks per label, the input format of `flamegraph.pl`, speedscope and inferno.
+
+    Unlike cProfile, the profiled threads are not slowed down, only the sampling thread takes the GIL every `interval`
+    seconds. The profiler can be started and stopped several times, the samples accumulate.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        if interval <= 0:
+            err_msg = f"`interval` should be positive, but got {interval}."
+            raise ValueError(err_msg)
+        self.interval = interval
+        # * label: {collapsed stack: number of samples}
+        self.stacks: dict[str, dict[str, int]] = {}
+        self.num_samples = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        global _num_sampling
+        if self._thread is not None:
+            return
+        with _sampling_lock:
+            _num_sampling += 1
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="glmv-reward-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        global _num_sampling
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        with _sampling_lock:
+            _num_sampling -= 1
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.sample(skip_ident=own_ident)
+
+    def sample(self, skip_ident: Optional[int] = None) -> None:
+        """
+        Records the current stack of each labelled thread.
+        """
+        labels = dict(_THREAD_LABELS)
+        if len(labels) == 0:
+            return
+        for ident, frame in sys._current_frames().items():
+            label = labels.get(ident)
+            if label is None or ident == skip_ident:
+                continue
+            names = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                names.append(_frame_name(current))
+                current = current.f_back
+            stack = ";".join(reversed(names))
+            label_stacks = self.stacks.setdefault(label, {})
+            label_stacks[stack] = label_stacks.get(stack, 0) + 1
+            self.num_samples += 1
+
+    def write(self, output_dir: str) -> list[Path]:
+        """
+        Writes the collapsed stacks of each label to `<output_dir>/<label>.collapsed`.
+
+        Returns:
+            The written files.
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for label, label_stacks in sorted(self.stacks.items()):
+            path = output_path / f"{_safe_file_name(label)}.collapsed"
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(label_stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
+
+
+def _safe_file_name(label: str) -> str:
+    return re.sub(r"[^\w.-]", "_", label) or "_"
+
+
+class RewardProfiler(object):
+    """
+    Profiles the next N `get_reward` calls on demand, armed by `arm`, by the `GLMV_REWARD_PROFILE` environment
+    variable or by a signal, and writes the samples of each datasource to `<output_dir>/<time>-<pid>/`.
+
+    Concurrent calls are profiled together, the profile is written once the last profiled call returns.
+    """
+
+    def __init__(
+        self, output_dir: str, interval: float = 0.005, signal_name: Optional[str] = None, signal_num_calls: int = 10
+    ) -> None:
+        self.output_dir = output_dir
+        self.interval = interval
+        self.signal_num_calls = signal_num_calls
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._num_active = 0
+        self._profiler: Optional[SamplingProfiler] = None
+        # * only incremented by the signal handler, which cannot take `_lock` since it interrupts the main thread
+        self._num_signals = 0
+        self._num_handled_signals = 0
+        self._num_written = 0
+        if signal_name is not None:
+            self._install_signal_handler(signal_name)
+
+    def _install_signal_handler(self, signal_name: str) -> None:
+        signal_num = getattr(signal, signal_name, None)
+        if not isinstance(signal_num, signal.Signals):
+            _logger.warning(f"> Signal {signal_name} is not available on this platform, profile with `arm` instead")
+            return
+        if threading.current_thread() is not threading.main_thread():
+            _logger.warning(f"> Cannot handle {signal_name} outside of the main thread, profile with `arm` instead")
+            return
+
+        def handle(signum: int, frame: Optional[FrameType]) -> None:
+            del signum, frame
+            self._num_signals += 1
+
+        signal.signal(signal_num, handle)
+
+    def arm(self, num_calls: int) -> None:
+        """
+        Profiles the next `num_calls` calls, in addition to the ones already armed.
+        """
+        if num_calls < 0:
+            err_msg = f"`num_calls` should be non-negative, but got {num_calls}."
+            raise ValueError(err_msg)
+        with self._lock:
+            self._remaining += num_calls
+
+    @property
+    def remaining_calls(self) -> int:
+        return self._remaining + (self._num_signals - self._num_handled_signals) * self.signal_num_calls
+
+    @contextlib.contextmanager
+    def profile_call(self) -> Iterator[None]:
+        """
+        Profiles the enclosed call if one is armed.
+        """
+        if self._remaining == 0 and self._num_active == 0 and self._num_signals == self._num_handled_signals:
+            yield
+            return
+
+        with self._lock:
+            num_signals = self._num_signals
+            self._remaining += (num_signals - self._num_handled_signals) * self.signal_num_calls
+            self._num_handled_signals = num_signals
+            profiled = self._remaining > 0
+            if profiled:
+                self._remaining -= 1
+                self._num_active += 1
+                if self._profiler is None:
+                    self._profiler = SamplingProfiler(self.interval)
+                    _logger.info(f"> Profiling the next {self._remaining + 1} reward calls")
+                self._profiler.start()
+        if not profiled:
+            yield
+            return
+
+        previous = set_profile_label(CALL_PROFILE_LABEL)
+        try:
+            yield
+        finally:
+            set_profile_label(previous)
+            with self._lock:
+                self._num_active -= 1
+                if self._num_active == 0 and self._profiler is not None:
+                    self._profiler.stop()
+                    if self._remaining == 0:
+                        self._write(self._profiler)
+                        self._profiler = None
+
+    def _write(self, profiler: SamplingProfiler) -> None:
+        self._num_written += 1
+        run_dir = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._num_written}")
+        try:
+            paths = profiler.write(run_dir)
+        except OSError:
+            _logger.exception(f"> Failed to write the reward profile to {run_dir}")
+            return
+        _logger.info(f"> Wrote {profiler.num_samples} profile samples of {len(paths)} labels to {run_dir}")
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+from .logging import get_logger
+
+_logger = get_logger(__name__)
+
+
+def estimate_tokens(prompt: str, max_tokens: Optional[int]) -> int:
+    """
+    Returns a rough upper bound of the tokens used by a request, about 4 bytes of UTF-8 per prompt token.
+    """
+    return math.ceil(len(prompt.encode("utf-8", "surrogatepass")) / 4) + (max_tokens or 0)
+
+
+class TokenBucket(object):
+    """
+    A token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens.
+
+    Tokens are reserved ahead of time, so the bucket may go negative: each reservation returns how long its caller
+    has to wait, which queues concurrent callers in order instead of rejecting them. Not thread-safe on its own.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0:
+            err_msg = f"`rate` should be greater than 0, but got {rate}."
+            raise ValueError(err_msg)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Returns how long a reservation of `amount` tokens made now would have to wait, without reserving them.
+        """
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Takes `amount` tokens, at most `capacity`, and returns how long to wait until they are available.
+        """
+        wait = self.wait_time(amount, now)
+        self.tokens -= min(amount, self.capacity)
+        return wait
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _KeyLimit(object):
+    def __init__(self, requests_per_second: Optional[float], tokens_per_minute: Optional[float]) -> None:
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = (
+            None if requests_per_second is None else TokenBucket(requests_per_second, max(1.0, requests_per_second))
+        )
+        self.tokens = None if tokens_per_minute is None else TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(
+            0.0 if self.requests is None else self.requests.wait_time(1, now),
+            0.0 if self.tokens is None else self.tokens.wait_time(tokens, now),
+        )
+
+    def reserve(self, tokens: int, now: float) -> float:
+        return max(
+            0.0 if self.requests is None else self.requests.reserve(1, now),
+            0.0 if self.tokens is None else self.tokens.reserve(tokens, now),
+        )
+
+
+class RateLimiter(object):
+    """
+    Client-side rate limits of LLM judge API keys, in requests per second and tokens per minute.
+
+    Keys with limits that are configured for the same URL form a pool: a request for one of them is sent with the
+    key of the pool that has capacity the soonest, preferring the requested key. Callers over the limits wait for
+    capacity instead of failing, with `acquire` on an event loop or `acquire_blocking` from a thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._limits: dict[str, _KeyLimit] = {}
+        self._pools: dict[str, list[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return len(self._limits) > 0
+
+    def set_limits(
+        self,
+        api_keys: Sequence[str],
+        urls: Sequence[str],
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        """
+        Limits each of `api_keys`, and pools them for each of `urls`. A key limited twice keeps the lower limits.
+        """
+        if requests_per_second is None and tokens_per_minute is None:
+            return
+        with self._lock:
+            for api_key in api_keys:
+                limit = self._limits.get(api_key)
+                if limit is not None:
+                    requests_per_second = _min_limit(requests_per_second, limit.requests_per_second)
+                    tokens_per_minute = _min_limit(tokens_per_minute, limit.tokens_per_minute)
+                if (
+                    limit is None
+                    or limit.requests_per_second != requests_per_second
+                    or limit.tokens_per_minute != tokens_per_minute
+                ):
+                    self._limits[api_key] = _KeyLimit(requests_per_second, tokens_per_minute)
+            for url in urls:
+                pool = self._pools.setdefault(url, [])
+                pool.extend(api_key for api_key in api_keys if api_key not in pool)
+
+    def _reserve(self, api_key: str, url: str, tokens: int) -> tuple[str, float]:
+        with self._lock:
+            pool = self._pools.get(url, ())
+            candidates = [api_key, *(key for key in pool if key != api_key)] if api_key in pool else [api_key]
+            candidates = [key for key in candidates if key in self._limits]
+            if len(candidates) == 0:
+                return api_key, 0.0
+            now = time.monotonic()
+            # * ties go to the requested key, which comes first
+            chosen = min(candidates, key=lambda key: self._limits[key].wait_time(tokens, now))
+            return chosen, self._limits[chosen].reserve(tokens, now)
+
+    async def acquire(self, api_key: str, url: str, tokens: int = 0) -> str:
+        """
+        Waits until a request of about `tokens` tokens to `url` fits in the limits.
+
+        Returns:
+            The API key to send the request with.
+        """
+        chosen, wait = self._reserve(api_key, url, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return chosen
+
+    def acquire_blocking(self, api_key: str, url: str, tokens: int = 0) -> str:
+        """
+        Blocking version of `acquire`.
+        """
+        chosen, wait = self._reserve(api_key, url, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return chosen
+
+    def settle(self, api_key: str, reserved_tokens: int, used_tokens: int) -> None:
+        """
+        Corrects the token reservation of a finished request with the tokens it actually used.
+        """
+        with self._lock:
+            limit = self._limits.get(api_key)
+            if limit is not None and limit.tokens is not None:
+                limit.tokens.refund(reserved_tokens - used_tokens)
+
+
+def _min_limit(first: Optional[float], second: Optional[float]) -> Optional[float]:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first, second)
+
+
+_RATE_LIMITER = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _RATE_LIMITER
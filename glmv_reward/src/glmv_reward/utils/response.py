@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+
+import functools
+import re
+from typing import Optional
+
+from .text import BoxMatch, find_boxed_matches
+
+# * the layouts are matched as by `^<think>(.*?)</think>\s*<answer>(.*?)</answer>$` (strict) and
+# * `^<think>(.*?)</think>(.*)$` (lenient) with `re.DOTALL | re.IGNORECASE`, but by jumping between the tags instead
+# * of trying the lazy groups at every character
+_THINK_OPEN_PATTERN = re.compile(r"<think>", re.IGNORECASE)
+_THINK_CLOSE_PATTERN = re.compile(r"</think>", re.IGNORECASE)
+_ANSWER_OPEN_PATTERN = re.compile(r"\s*<answer>", re.IGNORECASE)
+_ANSWER_CLOSE_PATTERN = re.compile(r"</answer>\n?\Z", re.IGNORECASE)
+
+_RESPONSE_TAGS = ("<think>", "</think>", "<answer>", "</answer>")
+_THINK_TAGS = ("<think>", "</think>")
+_RESPONSE_TAG_PATTERN = re.compile("|".join(map(re.escape, _RESPONSE_TAGS)), re.IGNORECASE)
+_THINK_TAG_PATTERN = re.compile("|".join(map(re.escape, _THINK_TAGS)), re.IGNORECASE)
+
+_BOX_TOKENS = ("<|begin_of_box|>", "<|end_of_box|>", "\\boxed{")
+_BOX_TOKEN_PATTERNS = tuple(re.compile(re.escape(token), re.IGNORECASE) for token in _BOX_TOKENS)
+
+
+def _contains_any_ignore_case(text: str, tags: tuple[str, ...], pattern: re.Pattern[str]) -> bool:
+    # * the case-insensitive search accepts everything `tag in text.lower()` does, so the `.lower()` copy is only
+    # * made to confirm a hit
+    if pattern.search(text) is None:
+        return False
+    lowered = text.lower()
+    return any(tag in lowered for tag in tags)
+
+
+def _count_ignore_case(text: str, token: str, pattern: re.Pattern[str]) -> int:
+    # * same as `text.lower().count(token)`, which lies between the exact and the case-insensitive counts
+    count = text.count(token)
+    if count == len(pattern.findall(text)):
+        return count
+    return text.lower().count(token)
+
+
+class ParsedResponse(object):
+    """
+    A response split into its think and answer parts, shared by `RewardSystem.check_answer_format` and the verifiers'
+    `extract_answer`, so that a response is only scanned once per layout. Use `parse_response` to get one.
+
+    Every attribute is computed on first access. Two layouts are understood:
+
+    - strict: `<think>...</think><answer>...</answer>`, see `think`, `answer` and `has_nested_tags`.
+    - lenient: `<think>...</think>` followed by anything, see `lenient_think`, `lenient_answer`,
+      `lenient_has_think_tags` and `lenient_has_nested_tags`.
+
+    All parts are stripped, and are `None` if the response does not follow the layout.
+    """
+
+    __slots__ = ("_answer_boxes", "_lenient_answer_boxes", "_lenient_parts", "_parts", "response")
+
+    def __init__(self, response: str) -> None:
+        self.response = response
+        # * `None` until parsed, an empty tuple if the response does not follow the layout
+        self._parts: Optional[tuple[str, ...]] = None
+        self._lenient_parts: Optional[tuple[str, ...]] = None
+        self._answer_boxes: Optional[list[BoxMatch]] = None
+        self._lenient_answer_boxes: Optional[list[BoxMatch]] = None
+
+    @staticmethod
+    def _split_strict(response: str) -> tuple[str, ...]:
+        if _THINK_OPEN_PATTERN.match(response) is None:
+            return ()
+        # * `(.*?)</answer>$` can only end right before the closing tag at the end, the earliest such end is taken
+        answer_end = -1
+        for end in (len(response) - 10, len(response) - 9):
+            if end >= 0 and _ANSWER_CLOSE_PATTERN.match(response, end) is not None:
+                answer_end = end
+                break
+        if answer_end == -1:
+            return ()
+        # * the think part ends at the first `</think>` followed by `<answer>`, that leaves room for the answer part
+        for think_close in _THINK_CLOSE_PATTERN.finditer(response, 7):
+            answer_open = _ANSWER_OPEN_PATTERN.match(response, think_close.end())
+            if answer_open is None:
+                continue
+            answer_start = answer_open.end()
+            if answer_start > answer_end:
+                if answer_start <= len(response) - 9 and _ANSWER_CLOSE_PATTERN.match(response, len(response) - 9):
+                    answer_end = len(response) - 9
+                else:
+                    return ()
+            think = response[7 : think_close.start()]
+            return think.strip(), response[answer_start:answer_end].strip()
+        return ()
+
+    @staticmethod
+    def _split_lenient(response: str) -> tuple[str, ...]:
+        if _THINK_OPEN_PATTERN.match(response) is None:
+            return ()
+        think_close = _THINK_CLOSE_PATTERN.search(response, 7)
+        if think_close is None:
+            return ()
+        return response[7 : think_close.start()].strip(), response[think_close.end() :].strip()
+
+    @property
+    def _strict(self) -> tuple[str, ...]:
+        if self._parts is None:
+            self._parts = self._split_strict(self.response)
+        return self._parts
+
+    @property
+    def _lenient(self) -> tuple[str, ...]:
+        if self._lenient_parts is None:
+            self._lenient_parts = self._split_lenient(self.response)
+        return self._lenient_parts
+
+    @property
+    def think(self) -> Optional[str]:
+        return self._strict[0] if self._strict else None
+
+    @property
+    def answer(self) -> Optional[str]:
+        return self._strict[1] if self._strict else None
+
+    @property
+    def has_nested_tags(self) -> bool:
+        """
+        Whether the strict think or answer part contains a (case-insensitive) think or answer tag.
+        """
+        return any(_contains_any_ignore_case(part, _RESPONSE_TAGS, _RESPONSE_TAG_PATTERN) for part in self._strict)
+
+    @property
+    def answer_boxes(self) -> list[BoxMatch]:
+        """
+        The boxed answers of the strict answer part, see `glmv_reward.utils.text.find_boxed_matches`.
+        """
+        if self._answer_boxes is None:
+            self._answer_boxes = [] if self.answer is None else find_boxed_matches(self.answer)
+        return self._answer_boxes
+
+    @property
+    def box_token_counts(self) -> tuple[int, int, int]:
+        """
+        The case-insensitive counts of `<|begin_of_box|>`, `<|end_of_box|>` and `\\boxed{` in the strict answer part.
+        """
+        answer = self.answer
+        if answer is None:
+            return 0, 0, 0
+        begin_count, end_count, boxed_count = (
+            _count_ignore_case(answer, token, pattern)
+            for token, pattern in zip(_BOX_TOKENS, _BOX_TOKEN_PATTERNS, strict=True)
+        )
+        return begin_count, end_count, boxed_count
+
+    @property
+    def lenient_think(self) -> Optional[str]:
+        return self._lenient[0] if self._lenient else None
+
+    @property
+    def lenient_answer(self) -> Optional[str]:
+        return self._lenient[1] if self._lenient else None
+
+    @property
+    def lenient_has_think_tags(self) -> bool:
+        """
+        Whether the lenient think part contains a (case-insensitive) think tag.
+        """
+        think = self.lenient_think
+        return think is not None and _contains_any_ignore_case(think, _THINK_TAGS, _THINK_TAG_PATTERN)
+
+    @property
+    def lenient_has_nested_tags(self) -> bool:
+        """
+        Whether the lenient think or answer part contains a (case-insensitive) think or answer tag.
+        """
+        return any(_contains_any_ignore_case(part, _RESPONSE_TAGS, _RESPONSE_TAG_PATTERN) for part in self._lenient)
+
+    @property
+    def lenient_answer_boxes(self) -> list[BoxMatch]:
+        """
+        The boxed answers of the lenient answer part, see `glmv_reward.utils.text.find_boxed_matches`.
+        """
+        if self._lenient_answer_boxes is None:
+            answer = self.lenient_answer
+            self._lenient_answer_boxes = [] if answer is None else find_boxed_matches(answer)
+        return self._lenient_answer_boxes
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_response(response: str) -> ParsedResponse:
+    """
+    Returns the `ParsedResponse` of a response.
+
+    Results are memoized, so that the format check of `RewardSystem` and the extraction of the verifier share the same
+    parsed response, as do the rollouts of a prompt sharing its ground truth.
+    """
+    return ParsedResponse(response)
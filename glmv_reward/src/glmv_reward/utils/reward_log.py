@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+
+import atexit
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, Optional, Union, cast
+
+from .logging import get_logger
+
+_logger = get_logger(__name__)
+
+
+class _FlushRequest(object):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class _StopRequest(_FlushRequest):
+    pass
+
+
+class RewardLogWriter(object):
+    """
+    Appends JSONL lines to reward log files from a background thread, so that `get_reward` never blocks on log I/O.
+
+    Lines are put in a bounded buffer and written by a single daemon thread that keeps one open handle per file.
+    When the buffer is full, lines are dropped and counted in `dropped` instead of blocking the caller. Handles are
+    flushed every `flush_interval` seconds (and `os.fsync`-ed if `fsync` is set), and a file larger than
+    `max_file_bytes` is rotated like `logging.handlers.RotatingFileHandler` does, keeping `backup_count` backups
+    named `<file>.1`, `<file>.2`, ...
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 100_000,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+        max_file_bytes: Optional[int] = None,
+        backup_count: int = 5,
+    ) -> None:
+        if queue_size <= 0:
+            err_msg = f"`queue_size` should be greater than 0, but got {queue_size}."
+            raise ValueError(err_msg)
+        if max_file_bytes is not None and max_file_bytes <= 0:
+            err_msg = f"`max_file_bytes` should be greater than 0, but got {max_file_bytes}."
+            raise ValueError(err_msg)
+
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_file_bytes = max_file_bytes
+        self.backup_count = backup_count
+
+        self.dropped = 0
+        self.written = 0
+        self._reset()
+        _WRITERS.add(self)
+
+    def _reset(self) -> None:
+        # * the writer thread is started lazily, and again in a forked child where it does not exist
+        self._pid = os.getpid()
+        self._condition = threading.Condition(threading.Lock())
+        self._buffer: deque[Union[tuple[str, bytes], _FlushRequest]] = deque()
+        self._num_lines = 0
+        self._thread: Optional[threading.Thread] = None
+        self._handles: dict[str, IO[bytes]] = {}
+
+    def _start_thread(self) -> None:
+        # * called with `_condition` held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="glmv-reward-log-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, path: Union[Path, str], line: bytes) -> bool:
+        """
+        Queues a line (including its trailing newline) to be appended to `path`, without blocking.
+
+        Returns:
+            Whether the line was queued, `False` if it was dropped because the buffer is full.
+        """
+        return self.write_many([(str(path), line)]) == 1
+
+    def write_many(self, lines: Sequence[tuple[str, bytes]]) -> int:
+        """
+        Queues `(path, line)` pairs to be appended in order, without blocking. Lines that do not fit in the buffer are
+        dropped.
+
+        Returns:
+            The number of queued lines.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+        with self._condition:
+            self._start_thread()
+            num_queued = max(0, min(len(lines), self.queue_size - self._num_lines))
+            self._buffer.extend(lines[:num_queued] if num_queued < len(lines) else lines)
+            self._num_lines += num_queued
+            num_dropped = len(lines) - num_queued
+            self.dropped += num_dropped
+            dropped = self.dropped
+            self._condition.notify()
+
+        # * logs the first drop and then about every 1000th, to not flood the log
+        if num_dropped > 0 and (dropped == num_dropped or (dropped - num_dropped) // 1000 != dropped // 1000):
+            _logger.warning("Reward log buffer is full, %d lines dropped so far.", dropped)
+        return num_queued
+
+    def _request(self, request: _FlushRequest, timeout: Optional[float]) -> bool:
+        with self._condition:
+            if self._thread is None or self._pid != os.getpid():
+                return True
+            self._buffer.append(request)
+            self._condition.notify()
+        return request.done.wait(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every line queued so far is written and flushed.
+
+        Returns:
+            Whether the flush completed within `timeout` seconds.
+        """
+        return self._request(_FlushRequest(), timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Writes out the queued lines, closes every file and stops the writer thread. The writer can still be used
+        afterwards, a new thread is started by the next `write`.
+        """
+        self._request(_StopRequest(), timeout)
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            with self._condition:
+                if len(self._buffer) == 0:
+                    self._condition.wait(max(0.0, last_flush + self.flush_interval - time.monotonic()))
+                items = list(self._buffer)
+                self._buffer.clear()
+                self._num_lines = 0
+
+            stop = False
+            start = 0
+            requests: list[_FlushRequest] = []
+            for index, item in enumerate(items):
+                if isinstance(item, _FlushRequest):
+                    # * lines queued before the request are written before it is answered
+                    self._write_pending(cast(list[tuple[str, bytes]], items[start:index]))
+                    start = index + 1
+                    self._flush_handles()
+                    last_flush = time.monotonic()
+                    requests.append(item)
+                    stop = stop or isinstance(item, _StopRequest)
+            self._write_pending(cast(list[tuple[str, bytes]], items[start:]))
+
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_handles()
+                last_flush = time.monotonic()
+
+            if stop:
+                self._close_handles()
+                with self._condition:
+                    # * lines queued after the stop request are written by the next thread
+                    self._thread = None
+                    if len(self._buffer) > 0:
+                        self._start_thread()
+            for request in requests:
+                request.done.set()
+            if stop:
+                return
+
+    def _write_pending(self, lines: list[tuple[str, bytes]]) -> None:
+        pending: dict[str, list[bytes]] = {}
+        for path, line in lines:
+            pending.setdefault(path, []).append(line)
+        for path, file_lines in pending.items():
+            try:
+                self._write_lines(path, file_lines)
+            except OSError as e:
+                _logger.warning("Failed to write %d lines to reward log %s: %s", len(file_lines), path, repr(e))
+
+    def _write_lines(self, path: str, lines: list[bytes]) -> None:
+        handle = self._get_handle(path)
+        if self.max_file_bytes is None:
+            handle.write(b"".join(lines))
+        else:
+            for line in lines:
+                if handle.tell() > 0 and handle.tell() + len(line) > self.max_file_bytes:
+                    handle = self._rotate(path)
+                handle.write(line)
+        self.written += len(lines)
+
+    def _get_handle(self, path: str) -> IO[bytes]:
+        handle = self._handles.get(path)
+        if handle is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handle = self._handles[path] = open(path, "ab")
+        return handle
+
+    def _rotate(self, path: str) -> IO[bytes]:
+        self._handles.pop(path).close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{path}.{index}"):
+                    os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        return self._get_handle(path)
+
+    def _flush_handles(self) -> None:
+        for path, handle in self._handles.items():
+            try:
+                handle.flush()
+                if self.fsync:
+                    os.fsync(handle.fileno())
+            except OSError as e:
+                _logger.warning("Failed to flush reward log %s: %s", path, repr(e))
+
+    def _close_handles(self) -> None:
+        self._flush_handles()
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+
+
+_WRITERS: "weakref.WeakSet[RewardLogWriter]" = weakref.WeakSet()
+
+
+def _close_writers() -> None:
+    for writer in list(_WRITERS):
+        writer.close(timeout=10)
+
+
+atexit.register(_close_writers)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+
+import atexit
+import hashlib
+import os
+import threading
+import uuid
+import weakref
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Optional
+
+import msgspec
+
+from .logging import get_logger
+
+if TYPE_CHECKING:
+    import pyarrow
+
+_logger = get_logger(__name__)
+
+# * columns of the Parquet reward logs, the iteration is the hive partition of the dataset
+REWARD_LOG_COLUMNS = (
+    "prompt",
+    "prompt_hash",
+    "image_file",
+    "gt_answer",
+    "answer",
+    "answer_token_length",
+    "extracted_answer",
+    "extracted_gt_answer",
+    "reward",
+    "reward_sum_of_this_prompt",
+    "pass_at_k",
+    "correct",
+    "uuid",
+    "judge_path",
+    "judge_latency_s",
+)
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        err_msg = "Parquet reward logs require `pyarrow`, install it with `pip install glmv_reward[parquet]`."
+        raise ImportError(err_msg) from e
+    return pyarrow, pyarrow.parquet
+
+
+def _reward_log_schema(pa: Any) -> "pyarrow.Schema":
+    # * prompts, images, ground truths and judge paths repeat across the rollouts of a prompt, so they are
+    # * dictionary-encoded
+    repeated_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("prompt", repeated_string),
+            ("prompt_hash", pa.uint64()),
+            ("image_file", repeated_string),
+            ("gt_answer", repeated_string),
+            ("answer", pa.large_string()),
+            ("answer_token_length", pa.int64()),
+            ("extracted_answer", pa.string()),
+            ("extracted_gt_answer", pa.string()),
+            ("reward", pa.float64()),
+            ("reward_sum_of_this_prompt", pa.float64()),
+            ("pass_at_k", pa.bool_()),
+            ("correct", pa.bool_()),
+            ("uuid", pa.string()),
+            ("judge_path", pa.dictionary(pa.int8(), pa.string())),
+            ("judge_latency_s", pa.float64()),
+        ]
+    )
+
+
+def hash_prompt(prompt: str) -> int:
+    """
+    Returns a stable 64-bit hash of a prompt, unlike `hash()` it does not change across processes.
+    """
+    return int.from_bytes(hashlib.blake2b(prompt.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+def encode_extracted_answer(extracted_answer: Any) -> Optional[str]:
+    """
+    Returns an extracted answer as a string column value, lists and dicts are encoded as JSON.
+    """
+    if extracted_answer is None or isinstance(extracted_answer, str):
+        return extracted_answer
+    try:
+        return msgspec.json.encode(extracted_answer).decode()
+    except (TypeError, msgspec.EncodeError):
+        return repr(extracted_answer)
+
+
+class ParquetRewardLogWriter(object):
+    """
+    Appends reward log rows to Parquet datasets, one per datasource, partitioned by iteration.
+
+    Rows of `dataset_dir` at iteration `n` are written to `dataset_dir/iteration=<n>/part-<id>.parquet`, so the
+    dataset can be read with `pyarrow.dataset.dataset(dataset_dir, partitioning="hive")`. Rows are buffered and
+    written as row groups of `row_group_size` rows by a background thread. A part file is only readable once closed,
+    which happens on `flush`, on `close`, and when rows of a later iteration arrive for the same dataset.
+
+    Requires `pyarrow`, see the `parquet` extra.
+    """
+
+    def __init__(self, row_group_size: int = 65_536, compression: str = "zstd") -> None:
+        if row_group_size <= 0:
+            err_msg = f"`row_group_size` should be greater than 0, but got {row_group_size}."
+            raise ValueError(err_msg)
+
+        self._pa, self._pq = _import_pyarrow()
+        self.schema = _reward_log_schema(self._pa)
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+        self.written = 0
+        self._lock = threading.Lock()
+        self._reset()
+        _WRITERS.add(self)
+
+    def _reset(self) -> None:
+        # * a forked child drops the buffers and part files of its parent instead of writing them out again
+        self._pid = os.getpid()
+        self._buffers: dict[tuple[str, int], dict[str, list]] = {}
+        self._iterations: dict[str, int] = {}
+        self._part_files: dict[tuple[str, int], Any] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: list[Future[None]] = []
+
+    def write(self, dataset_dir: str, iteration: int, columns: Mapping[str, Sequence[Any]]) -> None:
+        """
+        Queues rows, given as a mapping from each of `REWARD_LOG_COLUMNS` to its values, without blocking on I/O.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+
+            previous_iteration = self._iterations.get(dataset_dir)
+            if previous_iteration is not None and previous_iteration != iteration:
+                self._finish_partition((dataset_dir, previous_iteration))
+            self._iterations[dataset_dir] = iteration
+
+            partition = (dataset_dir, iteration)
+            buffer = self._buffers.setdefault(partition, {name: [] for name in REWARD_LOG_COLUMNS})
+            for name in REWARD_LOG_COLUMNS:
+                buffer[name].extend(columns[name])
+            if len(buffer["reward"]) >= self.row_group_size:
+                self._submit(self._write_row_group, partition, self._buffers.pop(partition))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every row queued so far is written, closing the current part files so that they can be read.
+
+        Returns:
+            Whether the flush completed within `timeout` seconds.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            # * rows are only buffered, and part files only open, for the current iteration of each dataset
+            for partition in list(self._iterations.items()):
+                self._finish_partition(partition)
+            self._iterations.clear()
+            futures, self._futures = self._futures, []
+
+        _, not_done = wait(futures, timeout)
+        return len(not_done) == 0
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Writes out the queued rows and stops the writer thread. The writer can still be used afterwards.
+        """
+        self.flush(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _finish_partition(self, partition: tuple[str, int]) -> None:
+        # * called with `_lock` held
+        buffer = self._buffers.pop(partition, None)
+        if buffer is not None and len(buffer["reward"]) > 0:
+            self._submit(self._write_row_group, partition, buffer)
+        self._submit(self._close_part_file, partition)
+
+    def _submit(self, func: Callable[..., None], *args: Any) -> None:
+        # * called with `_lock` held
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="glmv-reward-parquet-writer")
+        try:
+            future = self._executor.submit(func, *args)
+        except RuntimeError:
+            # * the executor no longer accepts tasks at interpreter shutdown
+            func(*args)
+            return
+        self._futures = [f for f in self._futures if not f.done()]
+        self._futures.append(future)
+
+    def _write_row_group(self, partition: tuple[str, int], buffer: dict[str, list]) -> None:
+        try:
+            table = self._pa.Table.from_pydict(buffer, schema=self.schema)
+            part_file = self._part_files.get(partition)
+            if part_file is None:
+                dataset_dir, iteration = partition
+                partition_dir = os.path.join(dataset_dir, f"iteration={iteration}")
+                os.makedirs(partition_dir, exist_ok=True)
+                path = os.path.join(partition_dir, f"part-{os.getpid()}-{uuid.uuid4().hex[:12]}.parquet")
+                part_file = self._part_files[partition] = self._pq.ParquetWriter(
+                    path, self.schema, compression=self.compression
+                )
+            part_file.write_table(table, row_group_size=self.row_group_size)
+            self.written += table.num_rows
+        except Exception as e:
+            _logger.warning("Failed to write %d rows to reward log %s: %s", len(buffer["reward"]), partition, repr(e))
+
+    def _close_part_file(self, partition: tuple[str, int]) -> None:
+        part_file = self._part_files.pop(partition, None)
+        if part_file is not None:
+            try:
+                part_file.close()
+            except Exception as e:
+                _logger.warning("Failed to close reward log %s: %s", partition, repr(e))
+
+
+_WRITERS: "weakref.WeakSet[ParquetRewardLogWriter]" = weakref.WeakSet()
+
+
+def _close_writers() -> None:
+    for writer in list(_WRITERS):
+        writer.close(timeout=10)
+
+
+atexit.register(_close_writers)
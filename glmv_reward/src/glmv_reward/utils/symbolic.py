@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+
+import atexit
+import enum
+import functools
+import importlib
+import multiprocessing
+import os
+import queue
+import threading
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from .logging import get_logger
+from .metrics import note_decision
+from .numeric import MAX_NUMERIC_TOLERANCE, compare_numbers, parse_plain_number
+
+if TYPE_CHECKING:
+    from sympy import Basic
+
+_logger = get_logger(__name__)
+
+
+class SymbolicResult(enum.Enum):
+    MATCH = "match"
+    MISMATCH = "mismatch"
+    # * both sides were parsed, but at least one of them is not a real number
+    NOT_REAL = "not_real"
+    UNPARSEABLE = "unparseable"
+    TIMEOUT = "timeout"
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse_text(text: str) -> Optional["Basic"]:
+    from sympy import sympify
+
+    try:
+        return cast("Basic", sympify(text, strict=True))
+    except Exception:
+        return None
+
+
+def parse_expression(expression: Any) -> Optional["Basic"]:
+    """
+    Parses an expression with `sympify(expression, strict=True)`, returns `None` if it cannot be parsed.
+
+    Results for strings are memoized in a size-bounded LRU cache, since the ground truth, and often the answer, is
+    the same for all rollouts of a prompt.
+    """
+    if isinstance(expression, str):
+        return _parse_text(expression)
+    try:
+        from sympy import sympify
+
+        return cast("Basic", sympify(expression, strict=True))
+    except Exception:
+        return None
+
+
+def _compare_real(answer: str, ground_truth: str, tolerance: float) -> SymbolicResult:
+    answer_number = parse_expression(answer)
+    gt_number = parse_expression(ground_truth)
+    if answer_number is None or gt_number is None:
+        return SymbolicResult.UNPARSEABLE
+
+    if not (answer_number.is_real and gt_number.is_real):
+        return SymbolicResult.NOT_REAL
+    if abs(answer_number - gt_number) / (abs(gt_number) + 1e-6) < tolerance:
+        return SymbolicResult.MATCH
+    return SymbolicResult.MISMATCH
+
+
+def _compare_equivalent(answer: str, ground_truth: str, tolerance: float) -> SymbolicResult:
+    parsed_answer = parse_expression(answer)
+    parsed_gt = parse_expression(ground_truth)
+    if parsed_answer is None or parsed_gt is None:
+        return SymbolicResult.UNPARSEABLE
+
+    # Sympy is imported here to avoid making it a hard dependency for the whole system
+    from sympy import Abs, N, S, simplify
+
+    # If they are relations (e.g. x > 0)
+    if parsed_answer.is_Relational and parsed_gt.is_Relational:
+        # simplify helps in making relations comparable e.g. x<1 vs 1>x
+        if simplify(parsed_answer) == simplify(parsed_gt):
+            return SymbolicResult.MATCH
+    # If they are numbers
+    elif parsed_answer.is_number and parsed_gt.is_number:
+        # Use N for numerical evaluation, then compare
+        diff = Abs(N(parsed_answer) - N(parsed_gt))
+        denom = Abs(N(parsed_gt))
+
+        if denom < S(tolerance):
+            # gt ≈ 0, compare using absolute error
+            if diff < S(tolerance):
+                return SymbolicResult.MATCH
+        # Compare using relative error
+        elif diff / (denom + S(tolerance)) < S(tolerance):
+            return SymbolicResult.MATCH
+    # For symbolic expressions
+    elif parsed_answer.equals(parsed_gt):
+        return SymbolicResult.MATCH
+    # Try simplifying both and comparing
+    elif simplify(parsed_answer).equals(simplify(parsed_gt)):
+        return SymbolicResult.MATCH
+
+    return SymbolicResult.MISMATCH
+
+
+def _worker_main(conn: Connection) -> None:
+    # * sympy is imported before reporting ready, so that its import time does not count towards any deadline
+    try:
+        importlib.import_module("sympy")
+    except ImportError:
+        pass
+    conn.send("ready")
+
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            # * exceptions are re-raised by the caller, like in the inline mode
+            try:
+                conn.send((False, e))
+            except Exception:
+                conn.send((False, RuntimeError(repr(e))))
+
+
+class _Worker(object):
+    def __init__(self, context: multiprocessing.context.BaseContext) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process: BaseProcess = context.Process(  # type: ignore[attr-defined]
+            target=_worker_main, args=(child_conn,), name="glmv-reward-symbolic-worker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        # * waits for the worker to be ready
+        self.conn.recv()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SymbolicWorkerPool(object):
+    """
+    A pool of persistent worker processes running sympy comparisons under a hard deadline.
+
+    Sympy cannot be interrupted from another thread, so a comparison that misses its deadline is stopped by
+    killing the worker process running it, a fresh worker is started on the next request.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = "spawn") -> None:
+        self.max_workers = max_workers if max_workers is not None else min(32, os.cpu_count() or 1)
+        self._context = multiprocessing.get_context(start_method)
+        self._idle_workers: queue.LifoQueue[Optional[_Worker]] = queue.LifoQueue()
+        # * `None` stands for a worker slot whose process is not started yet
+        for _ in range(self.max_workers):
+            self._idle_workers.put(None)
+        self._lock = threading.Lock()
+        self.timeouts = 0
+
+    def run(self, func: Callable[..., SymbolicResult], *args: Any, timeout: float) -> SymbolicResult:
+        """
+        Runs `func(*args)` in a worker process, `SymbolicResult.TIMEOUT` is returned if it takes longer than
+        `timeout` seconds. The time spent waiting for an idle worker, or starting one, does not count towards the
+        deadline.
+        """
+        worker = self._idle_workers.get()
+        finished = False
+        try:
+            if worker is None or not worker.process.is_alive():
+                if worker is not None:
+                    worker.kill()
+                worker = _Worker(self._context)
+            worker.conn.send((func, args))
+            finished = worker.conn.poll(timeout)
+            succeeded, result = worker.conn.recv() if finished else (True, SymbolicResult.TIMEOUT)
+        except (EOFError, OSError) as e:
+            _logger.warning("Symbolic worker failed: %s", repr(e))
+            finished = False
+            result = SymbolicResult.UNPARSEABLE
+        except BaseException:
+            self._discard(worker)
+            raise
+
+        if finished:
+            self._idle_workers.put(worker)
+            if not succeeded:
+                raise cast(Exception, result)
+            return cast(SymbolicResult, result)
+
+        # * the worker is either broken or still busy with the late comparison
+        self._discard(worker)
+        if result is SymbolicResult.TIMEOUT:
+            with self._lock:
+                self.timeouts += 1
+            _logger.warning("Symbolic comparison timed out after %.1fs with args: %s", timeout, repr(args)[:200])
+        return result
+
+    def _discard(self, worker: Optional[_Worker]) -> None:
+        if worker is not None:
+            worker.kill()
+        self._idle_workers.put(None)
+
+    def close(self) -> None:
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.kill()
+
+
+_POOL: Optional[SymbolicWorkerPool] = None
+_POOL_LOCK = threading.Lock()
+_POOL_MAX_WORKERS: Optional[int] = None
+
+
+def set_symbolic_pool_size(max_workers: Optional[int]) -> None:
+    """
+    Sets the number of worker processes of the symbolic pool of this process, `None` for `min(32, cpu_count)`.
+
+    Worker processes of the `process` and `hybrid` backends each have their own pool, so they set a small size to
+    not start up to `cpu_count` symbolic workers per executor worker.
+    """
+    global _POOL_MAX_WORKERS
+    if max_workers is not None and max_workers < 1:
+        err_msg = f"`max_workers` should be positive, but got {max_workers}."
+        raise ValueError(err_msg)
+    with _POOL_LOCK:
+        _POOL_MAX_WORKERS = max_workers
+        if _POOL is not None:
+            _logger.warning("The symbolic pool is already started, its size is not changed.")
+
+
+def get_symbolic_pool() -> SymbolicWorkerPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SymbolicWorkerPool(_POOL_MAX_WORKERS)
+        return _POOL
+
+
+def get_symbolic_timeout_count() -> int:
+    """
+    Returns the number of symbolic comparisons of this process that missed their deadline.
+    """
+    return 0 if _POOL is None else _POOL.timeouts
+
+
+def _run(func: Callable[..., SymbolicResult], *args: Any, timeout: Optional[float]) -> SymbolicResult:
+    if timeout is None or timeout <= 0:
+        return func(*args)
+    # * parsing is strict, so it is quick and safe in this process, and the pairs that cannot be parsed, i.e. most of
+    # * them, do not pay for a round trip to a worker process
+    answer, ground_truth = args[:2]
+    if parse_expression(answer) is None or parse_expression(ground_truth) is None:
+        return SymbolicResult.UNPARSEABLE
+    return get_symbolic_pool().run(func, *args, timeout=timeout)
+
+
+def _note_sympy_decision(result: SymbolicResult) -> SymbolicResult:
+    if result in (SymbolicResult.MATCH, SymbolicResult.MISMATCH, SymbolicResult.NOT_REAL):
+        note_decision("sympy")
+    return result
+
+
+def compare_real_numbers(
+    answer: str, ground_truth: str, tolerance: float, timeout: Optional[float] = None
+) -> SymbolicResult:
+    """
+    Compares two answers as real numbers with a relative tolerance after parsing them with sympy.
+
+    Matches of numeric literals are decided natively without involving sympy, see
+    `glmv_reward.utils.numeric.compare_numbers`, other pairs are escalated to sympy.
+
+    Args:
+        answer: The extracted answer.
+        ground_truth: The extracted ground truth.
+        tolerance: The relative tolerance of the comparison.
+        timeout: If given, the comparison runs in a killable worker process and `SymbolicResult.TIMEOUT` is
+          returned when it takes longer than `timeout` seconds, otherwise it runs in the calling thread.
+
+    Returns:
+        `MATCH` or `MISMATCH` if both sides are real numbers, `NOT_REAL`, `UNPARSEABLE` or `TIMEOUT` otherwise.
+    """
+    if isinstance(answer, str) and isinstance(ground_truth, str):
+        if compare_numbers(answer, ground_truth, tolerance):
+            note_decision("numeric")
+            return SymbolicResult.MATCH
+    return _note_sympy_decision(_run(_compare_real, answer, ground_truth, tolerance, timeout=timeout))
+
+
+def compare_symbolic_equivalence(
+    answer: str, ground_truth: str, tolerance: float, timeout: Optional[float] = None
+) -> SymbolicResult:
+    """
+    Checks whether two answers are equivalent relations, numbers or symbolic expressions.
+
+    Matches of plain integers, decimals and fractions are decided natively without involving sympy, within at most
+    `glmv_reward.utils.numeric.MAX_NUMERIC_TOLERANCE`, other pairs are escalated to sympy.
+
+    See `compare_real_numbers` for the meaning of `timeout`.
+
+    Returns:
+        `MATCH` or `MISMATCH` if both sides are parsed, `UNPARSEABLE` or `TIMEOUT` otherwise.
+    """
+    if isinstance(answer, str) and isinstance(ground_truth, str):
+        answer_number = parse_plain_number(answer)
+        gt_number = parse_plain_number(ground_truth) if answer_number is not None else None
+        if answer_number is not None and gt_number is not None:
+            numeric_tolerance = min(tolerance, MAX_NUMERIC_TOLERANCE)
+            diff = abs(answer_number - gt_number)
+            denom = abs(gt_number)
+            # gt ≈ 0, compare using absolute error, otherwise using relative error
+            if denom < numeric_tolerance:
+                is_match = diff < numeric_tolerance
+            else:
+                is_match = diff / (denom + numeric_tolerance) < numeric_tolerance
+            if is_match:
+                note_decision("numeric")
+                return SymbolicResult.MATCH
+    return _note_sympy_decision(_run(_compare_equivalent, answer, ground_truth, tolerance, timeout=timeout))
+
+
+def _close_pool() -> None:
+    if _POOL is not None:
+        _POOL.close()
+
+
+def _reset_pool_after_fork() -> None:
+    # * worker pipes belong to the parent process
+    global _POOL, _POOL_LOCK
+    _POOL = None
+    _POOL_LOCK = threading.Lock()
+
+
+atexit.register(_close_pool)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
@@ -2,11 +2,119 @@
 
 
 import re
-from collections.abc import Sequence
-from typing import Optional
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple, Optional, cast
+
+import numpy as np
+import numpy.typing as npt
 
 _BEGIN_OF_BOX = "<|begin_of_box|>"
 _END_OF_BOX = "<|end_of_box|>"
+_BOXED_OPEN = "\\boxed{"
+_BRACE_PATTERN = re.compile(r"[{}]")
+
+_PARAGRAPH_SEPARATOR_PATTERN = re.compile(r"\n{2,}")
+_CHINESE_CHAR_PATTERN = re.compile(r"[\u4e00-\u9fff]")
+_NON_CHINESE_CHARS_PATTERN = re.compile(r"[^\u4e00-\u9fff]+")
+_ENGLISH_WORD_PATTERN = re.compile(r"\b[a-zA-Z]{2,}\b")
+
+_TABLE_RULE_PATTERN = re.compile(r"\|[-]+\|")
+_FORMATTING_CHARS = ("=", "|", "-", "~", "_", "#", "*", ".", "%", "－", "█", " ", "─")
+# * texts shorter than this are checked with a plain loop, the numpy setup costs more than it saves
+_NUMPY_MIN_LENGTH = 4096
+_HASH_BASE = 1_000_003
+
+
+class BoxMatch(NamedTuple):
+    """
+    A boxed answer found by `find_boxed_matches`.
+
+    Attributes:
+        content: The extracted content, as returned by `find_boxed_content`.
+        start: The start index of the whole block, including its opening delimiter.
+        end: The end index of the whole block, including its closing delimiter if any.
+    """
+
+    content: str
+    start: int
+    end: int
+
+
+def _scan_boxed(text: str, pos: int, matches: list[BoxMatch]) -> list[BoxMatch]:
+    # * an unclosed \boxed{ takes the rest of the text as its content
+    pos = text.find(_BOXED_OPEN, pos)
+    while pos != -1:
+        content_start = pos + len(_BOXED_OPEN)
+        content_end = end = len(text)
+        brace_count = 1
+        for brace in _BRACE_PATTERN.finditer(text, content_start):
+            brace_count += 1 if brace.group() == "{" else -1
+            if brace_count == 0:
+                content_end = brace.start()
+                end = content_end + 1
+                break
+        matches.append(BoxMatch(text[content_start:content_end], pos, end))
+        pos = text.find(_BOXED_OPEN, end)
+    return matches
+
+
+def find_boxed_matches(text: str, begin_token: str = _BEGIN_OF_BOX, end_token: str = _END_OF_BOX) -> list[BoxMatch]:
+    """
+    Finds all top-level boxed answers with their spans, see `find_boxed_content` for the extraction rules.
+
+    The text is traversed once: box tokens are matched until the first \\boxed{ is seen, from which point only
+    \\boxed{...} blocks are collected, since they take precedence over box tokens.
+
+    Returns:
+        A list of `BoxMatch` in order of appearance.
+    """
+    if len(begin_token) == 0 or len(end_token) == 0:
+        err_msg = "`begin_token` and `end_token` should not be empty."
+        raise ValueError(err_msg)
+
+    if "\\" in begin_token or "\\" in end_token:
+        # * tokens that could overlap a \boxed{ are matched in a separate pass, like the original implementation
+        boxed_matches = _scan_boxed(text, 0, [])
+        if len(boxed_matches) > 0:
+            return boxed_matches
+        boxed_pos = -1
+    else:
+        boxed_pos = text.find(_BOXED_OPEN)
+
+    matches = []
+    # * only the outermost begin token is needed, inner ones are counted by `depth`
+    outer_begin = 0
+    depth = 0
+    pos = 0
+    begin_pos = text.find(begin_token)
+    end_pos = text.find(end_token)
+    while True:
+        # * ties are resolved in favor of \boxed{, then of the begin token
+        if boxed_pos != -1 and (begin_pos == -1 or boxed_pos <= begin_pos) and (end_pos == -1 or boxed_pos <= end_pos):
+            return _scan_boxed(text, boxed_pos, [])
+        if begin_pos != -1 and (end_pos == -1 or begin_pos <= end_pos):
+            if depth == 0:
+                outer_begin = begin_pos
+            depth += 1
+            pos = begin_pos + len(begin_token)
+        elif end_pos != -1:
+            if depth > 0:
+                depth -= 1
+                if depth == 0:
+                    content = text[outer_begin + len(begin_token) : end_pos].strip()
+                    matches.append(BoxMatch(content, outer_begin, end_pos + len(end_token)))
+            pos = end_pos + len(end_token)
+        else:
+            return matches
+
+        # * tokens overlapping the consumed one are searched again after it
+        if begin_pos < pos:
+            begin_pos = text.find(begin_token, pos)
+        if end_pos < pos:
+            end_pos = text.find(end_token, pos)
+        if boxed_pos != -1 and boxed_pos < pos:
+            boxed_pos = text.find(_BOXED_OPEN, pos)
 
 
 def find_boxed_content_with_boxed(text: str) -> list[str]:
@@ -14,9 +122,9 @@ def find_boxed_content_with_boxed(text: str) -> list[str]:
     Extract all top-level \boxed{...} contents from the input string,
     handling nested braces correctly.
 
-    This function scans the string manually to ensure proper brace matching,
-    allowing for nested expressions inside \boxed{}, but only extracting
-    the outermost matched segments.
+    Braces are matched so that nested expressions inside \boxed{} are kept,
+    but only the outermost matched segments are extracted. An unclosed
+    \boxed{ takes the rest of the string as its content.
 
     Behavior:
     - For nested boxed expressions like \\boxed{\\boxed{\\boxed{42}}},
@@ -27,27 +135,7 @@ def find_boxed_content_with_boxed(text: str) -> list[str]:
     Returns:
         A list of strings extracted from each top-level \boxed{...} block.
     """
-    results = []
-    i = 0
-    while i < len(text):
-        if text[i : i + 7] == "\\boxed{":
-            i += 7  # Move past "\boxed{"
-            content = ""
-            brace_count = 1
-            while i < len(text) and brace_count > 0:
-                if text[i] == "{":
-                    brace_count += 1
-                elif text[i] == "}":
-                    brace_count -= 1
-
-                if brace_count > 0:
-                    content += text[i]
-                i += 1
-
-            results.append(content)
-        else:
-            i += 1
-    return results
+    return [match.content for match in _scan_boxed(text, 0, [])]
 
 
 # NOTE:
@@ -60,66 +148,34 @@ def find_boxed_content(text: str, begin_token: str = _BEGIN_OF_BOX, end_token: s
     """
     Extract all content between <|begin_of_box|> and <|end_of_box|> tokens from the input string.
 
-    This function uses a stack-based approach similar to bracket matching to properly handle nested box tokens.
+    \\boxed{...} blocks take precedence: if any is found, only their contents are returned.
 
     Behavior:
     - For multiple boxed expressions like <|begin_of_box|>42<|end_of_box|> and <|begin_of_box|>43<|end_of_box|>,
       it returns ['42', '43'].
-    - For nested box tokens, it will extract each complete pair separately.
+    - For nested box tokens, the content of the outermost pair is extracted, unmatched tokens are ignored.
 
     Returns:
         A list of strings extracted from each <|begin_of_box|>...<|end_of_box|> block.
     """
-    # 1. find all \boxed{...}
-    boxed_matches = find_boxed_content_with_boxed(text)
-    if len(boxed_matches) > 0:
-        return boxed_matches
-
-    # 2. find all <|begin_of_box|>...<|end_of_box|>
-    results = []
-
-    stack: list[int] = []  # Stack to track begin token positions
-    num = 0  # Counter for nested levels
-    i = 0
-
-    while i < len(text):
-        # Find the next begin token
-        begin_pos = text.find(begin_token, i)
-        # Find the next end token
-        end_pos = text.find(end_token, i)
-
-        # If no more tokens found, break
-        if begin_pos == -1 and end_pos == -1:
-            break
-
-        # If only end token found or end token comes before begin token
-        if begin_pos == -1 or (end_pos != -1 and end_pos < begin_pos):
-            if stack and end_pos != -1:
-                num -= 1
-                # Only extract content when we're back to the outermost level (num == 0)
-                if num == 0:
-                    # Extract content between the most recent begin token and current end token
-                    content_start = stack[-1] + len(begin_token)
-                    content = text[content_start:end_pos].strip()
-                    results.append(content)
-
-                # Pop the matched begin position from stack
-                stack.pop()
-
-            i = end_pos + len(end_token)
-        else:
-            # Push begin position to stack
-            stack.append(begin_pos)
-            num += 1
-            i = begin_pos + len(begin_token)
+    return [match.content for match in find_boxed_matches(text, begin_token, end_token)]
 
-    return results
+
+def _iter_paragraphs(text: str) -> Iterator[str]:
+    start = 0
+    for separator in _PARAGRAPH_SEPARATOR_PATTERN.finditer(text):
+        yield text[start : separator.start()]
+        start = separator.end()
+    yield text[start:]
 
 
 def detect_long_paragraph_mixing(text: str, min_chinese_chars: int = 50, min_english_words: int = 200) -> bool:
     """
     Detect whether text contains both long Chinese paragraphs and long English paragraphs.
 
+    Paragraphs are walked lazily and the scan stops as soon as both kinds are seen. Texts without any Chinese
+    character or English word are rejected before any paragraph is looked at.
+
     Args:
         text: Input text to analyze
         min_chinese_chars: Minimum character count threshold for Chinese paragraphs
@@ -128,39 +184,109 @@ def detect_long_paragraph_mixing(text: str, min_chinese_chars: int = 50, min_eng
     Returns:
         bool: True if long paragraph mixing is detected
     """
-    paragraphs = [p.strip() for p in re.split(r"\n{2,}", text) if p.strip()]
+    if _CHINESE_CHAR_PATTERN.search(text) is None or _ENGLISH_WORD_PATTERN.search(text) is None:
+        return False
+
+    # * an English word has at least 2 letters and is followed by a non-letter unless it ends the paragraph
+    min_english_length = 3 * min_english_words - 1
 
     has_long_chinese = False
     has_long_english = False
 
-    for para in paragraphs:
-        if len(para) == 0:
+    for para in _iter_paragraphs(text):
+        para = para.strip()
+        total_chars = len(para)
+        if total_chars == 0:
             continue
 
-        chinese_chars = re.findall(r"[\u4e00-\u9fff]", para)
-        chinese_count = len(chinese_chars)
+        if not has_long_chinese and total_chars >= min_chinese_chars:
+            # * dropping the runs of other characters is cheaper than matching each Chinese character
+            chinese_count = len(_NON_CHINESE_CHARS_PATTERN.sub("", para))
+            if chinese_count >= min_chinese_chars and chinese_count / total_chars > 0.8:
+                has_long_chinese = True
 
-        english_words = re.findall(r"\b[a-zA-Z]{2,}\b", para)
-        english_count = len(english_words)
+        if not has_long_english and total_chars >= min_english_length:
+            # * `subn` counts the words without building a list of them
+            english_count = _ENGLISH_WORD_PATTERN.subn("", para)[1]
+            if english_count >= min_english_words and english_count / (len(para.split()) + 1e-5) > 0.7:
+                has_long_english = True
 
-        total_chars = len(para)
+        if has_long_chinese and has_long_english:
+            return True
 
-        if chinese_count >= min_chinese_chars and chinese_count / total_chars > 0.8:
-            has_long_chinese = True
+    return False
 
-        if english_count >= min_english_words and english_count / (len(para.split()) + 1e-5) > 0.7:
-            has_long_english = True
 
-        if has_long_chinese and has_long_english:
+def _remove_formatting_runs(text: str, exclude_length: int) -> str:
+    # * the passes are applied in order, since removing a run may join two runs of the next character, each pass is
+    # * skipped when the text has no run of its character
+    if "|-" in text:
+        text = _TABLE_RULE_PATTERN.sub("|", text)
+    for ch in _FORMATTING_CHARS:
+        if ch * exclude_length in text:
+            text = re.sub(rf"{re.escape(ch)}{{{exclude_length},}}", "", text)
+    return text
+
+
+def _detect_repeat_python(text: str, min_chars: int, min_repetition: int) -> bool:
+    times: dict[str, int] = {}
+    for i in range(min_chars, len(text) + 1):
+        sub = text[i - min_chars : i]
+        count = times.get(sub, 0) + 1
+        if count >= min_repetition:
             return True
+        times[sub] = count
+    return False
+
 
-    return has_long_chinese and has_long_english
+def _window_hashes(codes: npt.NDArray[np.uint64], window: int) -> npt.NDArray[np.uint64]:
+    # * polynomial hashes modulo 2**64 of all windows, built by doubling the hashed length, O(n log(window))
+    result: Optional[npt.NDArray[np.uint64]] = None
+    result_length = 0
+    block = codes
+    block_length = 1
+    while True:
+        if window & 1:
+            if result is None:
+                result = block
+            else:
+                size = len(codes) - result_length - block_length + 1
+                shift = np.uint64(pow(_HASH_BASE, block_length, 2**64))
+                result = result[:size] * shift + block[result_length : result_length + size]
+            result_length += block_length
+        window >>= 1
+        if window == 0:
+            return cast(npt.NDArray[np.uint64], result)
+        shift = np.uint64(pow(_HASH_BASE, block_length, 2**64))
+        block = block[:-block_length] * shift + block[block_length:]
+        block_length *= 2
+
+
+def _detect_repeat_numpy(text: str, min_chars: int, min_repetition: int) -> bool:
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.uint64)
+    hashes = _window_hashes(codes, min_chars)
+    # * repetitive outputs usually degenerate early, so growing prefixes are checked first
+    size = _NUMPY_MIN_LENGTH
+    while True:
+        size = min(size, len(hashes))
+        unique_hashes, counts = np.unique(hashes[:size], return_counts=True)
+        for candidate in unique_hashes[counts >= min_repetition]:
+            # * hashes may collide, the windows are compared to confirm
+            positions = np.flatnonzero(hashes[:size] == candidate)
+            windows = Counter(text[pos : pos + min_chars] for pos in positions.tolist())
+            if max(windows.values()) >= min_repetition:
+                return True
+        if size == len(hashes):
+            return False
+        size *= 4
 
 
 def detect_repeat(text: str, min_chars: int = 50, min_repetition: int = 10, exclude_length: int = 3) -> bool:
     """
     Detect repetitive content in text without using a tokenizer.
 
+    Long texts are checked with vectorized rolling hashes, whose matches are confirmed by comparing the windows.
+
     Args:
         text (str): The input text to check for repetitions
         min_chars (int): Minimum character sequence length to consider
@@ -178,28 +304,14 @@ def detect_repeat(text: str, min_chars: int = 50, min_repetition: int = 10, excl
         err_msg = f"`min_repetition` should be greater than 1, but got {min_repetition}."
         raise ValueError(err_msg)
 
-    def conditional_replace(content: str, char: str, max_length: int = 80) -> str:
-        pattern = rf"{re.escape(char)}{{{max_length},}}"
-        return re.sub(pattern, "", content)
-
     # Clean up the text by removing formatting patterns
-    text = re.sub(r"\|[-]+\|", "|", text)
-    for ch in ["=", "|", "-", "~", "_", "#", "*", ".", "%", "－", "█", " ", "─"]:
-        text = conditional_replace(text, ch, max_length=exclude_length)
+    text = _remove_formatting_runs(text, exclude_length)
 
-    # Use character-based sliding window instead of tokens
-    times: dict[int, int] = {}
-    for i in range(min_chars, len(text) + 1):
-        sub = text[i - min_chars : i]
-        hash_val = hash(sub)
-        if hash_val in times:
-            times[hash_val] += 1
-            if times[hash_val] >= min_repetition:
-                return True
-        else:
-            times[hash_val] = 1
-
-    return False
+    if len(text) - min_chars + 1 < min_repetition:
+        return False
+    if len(text) < _NUMPY_MIN_LENGTH:
+        return _detect_repeat_python(text, min_chars, min_repetition)
+    return _detect_repeat_numpy(text, min_chars, min_repetition)
 
 
 def protect_template(template: str, allowed: Optional[Sequence[str]] = ("question", "predict", "label")) -> str:
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, Optional, TypeVar, Union
+
+import editdistance
+import numpy as np
+import numpy.typing as npt
+
+from .metrics import metrics_enabled, note_batch_decisions
+from .numeric import MAX_NUMERIC_TOLERANCE, parse_number
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+def _map_unique(func: Callable[[_K], _V], values: Sequence[_K]) -> list[_V]:
+    # * ground truths (and often answers) repeat across the rollouts of a prompt, so each distinct value is
+    # * processed once
+    results: dict[_K, _V] = {}
+    mapped = []
+    for value in values:
+        if value not in results:
+            results[value] = func(value)
+        mapped.append(results[value])
+    return mapped
+
+
+def string_pair_mask(answers: Sequence[Any], ground_truths: Sequence[Any]) -> npt.NDArray[np.bool_]:
+    """
+    Returns a boolean mask of the pairs where both the answer and the ground truth are strings.
+    """
+    return np.fromiter(
+        (isinstance(answer, str) and isinstance(gt, str) for answer, gt in zip(answers, ground_truths, strict=True)),
+        dtype=np.bool_,
+        count=len(answers),
+    )
+
+
+def exact_match_mask(
+    answers: Sequence[Any], ground_truths: Sequence[Any], normalize: Optional[Callable[[str], str]] = None
+) -> npt.NDArray[np.bool_]:
+    """
+    Returns a boolean mask of the pairs of strings that are equal, after applying `normalize` to both sides if given.
+    """
+    if normalize is None:
+        # * comparing in a list comprehension is faster than building object arrays for NumPy to compare
+        return np.array(
+            [
+                isinstance(answer, str) and isinstance(gt, str) and answer == gt
+                for answer, gt in zip(answers, ground_truths, strict=True)
+            ],
+            dtype=np.bool_,
+        )
+    is_string = string_pair_mask(answers, ground_truths)
+    answer_array = np.empty(len(answers), dtype=object)
+    gt_array = np.empty(len(answers), dtype=object)
+    # * iterating over a list is much faster than over the NumPy scalars of the mask
+    keep_lst = is_string.tolist()
+    answer_array[is_string] = _map_unique(
+        normalize, [answer for answer, keep in zip(answers, keep_lst, strict=True) if keep]
+    )
+    gt_array[is_string] = _map_unique(normalize, [gt for gt, keep in zip(ground_truths, keep_lst, strict=True) if keep])
+    return is_string & (answer_array == gt_array)
+
+
+def _parse_numbers(texts: Sequence[Any]) -> npt.NDArray[np.float64]:
+    parsed = _map_unique(lambda text: parse_number(text) if isinstance(text, str) else None, texts)
+    return np.fromiter((np.nan if p is None else p[0] for p in parsed), dtype=np.float64, count=len(parsed))
+
+
+def numeric_match_mask(answers: Sequence[Any], ground_truths: Sequence[Any], tolerance: float) -> npt.NDArray[np.bool_]:
+    """
+    Batch version of `glmv_reward.utils.numeric.compare_numbers`: numeric literals are parsed once per distinct
+    string, then compared with the capped relative tolerance as arrays.
+
+    Returns:
+        A boolean mask of the pairs decided as a match, the other pairs are undecided.
+    """
+    answer_values = _parse_numbers(answers)
+    gt_values = _parse_numbers(ground_truths)
+    is_parsed = ~np.isnan(answer_values) & ~np.isnan(gt_values)
+    with np.errstate(invalid="ignore", over="ignore"):
+        is_close = np.abs(answer_values - gt_values) / (np.abs(gt_values) + 1e-6) < min(
+            tolerance, MAX_NUMERIC_TOLERANCE
+        )
+    return is_parsed & is_close
+
+
+def edit_similarities(answers: Sequence[str], ground_truths: Sequence[str]) -> npt.NDArray[np.float64]:
+    """
+    Returns `1 - edit distance / length of the longer string` of each pair of strings, computed once per distinct
+    pair. Pairs of empty strings get NaN.
+    """
+    distances = _map_unique(lambda pair: editdistance.eval(*pair), list(zip(answers, ground_truths, strict=True)))
+    distance_array = np.asarray(distances, dtype=np.float64)
+    lengths = np.maximum(
+        np.fromiter(map(len, answers), dtype=np.float64, count=len(answers)),
+        np.fromiter(map(len, ground_truths), dtype=np.float64, count=len(ground_truths)),
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(lengths > 0, 1 - distance_array / lengths, np.nan)
+
+
+def select_rewards(
+    num_items: int, *rules: Union[tuple[npt.NDArray[np.bool_], float], tuple[npt.NDArray[np.bool_], float, str]]
+) -> list[Optional[float]]:
+    """
+    Combines rule masks into rewards: an item gets the reward of the first `(mask, reward)` rule that selects it, and
+    `None` if no rule does.
+
+    A rule may be given as `(mask, reward, tier)`, with `tier` one of `glmv_reward.utils.metrics.DECISION_TIERS`, to
+    attribute the items it decides in the metrics.
+    """
+    rewards = np.full(num_items, np.nan)
+    is_decided = np.zeros(num_items, dtype=np.bool_)
+    tiers: Optional[list[Optional[str]]] = [None] * num_items if metrics_enabled() else None
+    for mask, reward, *tier in rules:
+        selected = mask & ~is_decided
+        rewards[selected] = reward
+        is_decided |= selected
+        if tiers is not None and len(tier) > 0:
+            for i in np.flatnonzero(selected):
+                tiers[i] = tier[0]
+    if tiers is not None:
+        note_batch_decisions(tiers)
+    return [reward if decided else None for reward, decided in zip(rewards.tolist(), is_decided.tolist(), strict=True)]
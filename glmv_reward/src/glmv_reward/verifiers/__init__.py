@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 
+import importlib
+import importlib.metadata
 import inspect
-from typing import Any
+import threading
+from typing import TYPE_CHECKING, Any
 
 import msgspec
 
@@ -10,53 +13,179 @@ from glmv_reward.configs.verifiers import VerifierConfig
 from glmv_reward.utils.logging import get_logger
 from glmv_reward.utils.misc import ensure_text
 from glmv_reward.utils.msgspec import get_struct_attr, get_struct_tag
+from glmv_reward.utils.rate_limit import get_rate_limiter
 
 from ._base_verifier import Verifier
-from .biology_verifier import BiologyVerifier
-from .chart_verifier import ChartVerifier
-from .chemistry_verifier import ChemistryVerifier
-from .counting_verifier import CountingVerifier
-from .general_verifier import GeneralVerifier
-from .geography_verifier import GeographyVerifier
-from .geoquest_verifier import GeoQuestVerifier
-from .language_mix_verifier import LanguageMixVerifier
-from .liberal_arts_verifier import LiberalArtsVerifier
-from .math_verifier import MathVerifier
-from .mmsi_verifier import MmsiVerifier
-from .multi_image_verifier import MultiImageVerifier
-from .ocr_verifier import OCRVerifier
-from .physics_verifier import PhysicsVerifier
 from .verifier_from_file import FileBasedVerifier
-from .vqa_verifier import VQAVerifier
-
-_VERIFIER_REGISTRY: dict[str, type[Verifier]] = {
-    "biology": BiologyVerifier,
-    "chart": ChartVerifier,
-    "chemistry": ChemistryVerifier,
-    "counting": CountingVerifier,
-    "general": GeneralVerifier,
-    "geography": GeographyVerifier,
-    "geoquest": GeoQuestVerifier,
-    "language_mix": LanguageMixVerifier,
-    "liberal_arts": LiberalArtsVerifier,
-    "math": MathVerifier,
-    "mmsi": MmsiVerifier,
-    "multi_image": MultiImageVerifier,
-    "ocr": OCRVerifier,
-    "physics": PhysicsVerifier,
-    "vqa": VQAVerifier,
-    "file_based": FileBasedVerifier,
+
+if TYPE_CHECKING:
+    from .biology_verifier import BiologyVerifier
+    from .chart_verifier import ChartVerifier
+    from .chemistry_verifier import ChemistryVerifier
+    from .counting_verifier import CountingVerifier
+    from .general_verifier import GeneralVerifier
+    from .geography_verifier import GeographyVerifier
+    from .geoquest_verifier import GeoQuestVerifier
+    from .language_mix_verifier import LanguageMixVerifier
+    from .liberal_arts_verifier import LiberalArtsVerifier
+    from .math_verifier import MathVerifier
+    from .mmsi_verifier import MmsiVerifier
+    from .multi_image_verifier import MultiImageVerifier
+    from .ocr_verifier import OCRVerifier
+    from .physics_verifier import PhysicsVerifier
+    from .vqa_verifier import VQAVerifier
+
+__all__ = [
+    "VERIFIER_ENTRY_POINT_GROUP",
+    "BiologyVerifier",
+    "ChartVerifier",
+    "ChemistryVerifier",
+    "CountingVerifier",
+    "FileBasedVerifier",
+    "GeneralVerifier",
+    "GeographyVerifier",
+    "GeoQuestVerifier",
+    "LanguageMixVerifier",
+    "LiberalArtsVerifier",
+    "MathVerifier",
+    "MmsiVerifier",
+    "MultiImageVerifier",
+    "OCRVerifier",
+    "PhysicsVerifier",
+    "VQAVerifier",
+    "Verifier",
+    "get_verifier_class",
+    "get_verifier_from_config",
+    "register_verifier",
+]
+
+# * verifier classes exported by this package: module, imported on first access, see `__getattr__`
+_VERIFIER_MODULES = {
+    "BiologyVerifier": ".biology_verifier",
+    "ChartVerifier": ".chart_verifier",
+    "ChemistryVerifier": ".chemistry_verifier",
+    "CountingVerifier": ".counting_verifier",
+    "GeneralVerifier": ".general_verifier",
+    "GeographyVerifier": ".geography_verifier",
+    "GeoQuestVerifier": ".geoquest_verifier",
+    "LanguageMixVerifier": ".language_mix_verifier",
+    "LiberalArtsVerifier": ".liberal_arts_verifier",
+    "MathVerifier": ".math_verifier",
+    "MmsiVerifier": ".mmsi_verifier",
+    "MultiImageVerifier": ".multi_image_verifier",
+    "OCRVerifier": ".ocr_verifier",
+    "PhysicsVerifier": ".physics_verifier",
+    "VQAVerifier": ".vqa_verifier",
+}
+
+# * verifier type: "module:class", modules are imported on first use so that a process only loads the verifiers
+# * (and their dependencies) its config references
+_VERIFIER_REGISTRY: dict[str, str] = {
+    "biology": ".biology_verifier:BiologyVerifier",
+    "chart": ".chart_verifier:ChartVerifier",
+    "chemistry": ".chemistry_verifier:ChemistryVerifier",
+    "counting": ".counting_verifier:CountingVerifier",
+    "general": ".general_verifier:GeneralVerifier",
+    "geography": ".geography_verifier:GeographyVerifier",
+    "geoquest": ".geoquest_verifier:GeoQuestVerifier",
+    "language_mix": ".language_mix_verifier:LanguageMixVerifier",
+    "liberal_arts": ".liberal_arts_verifier:LiberalArtsVerifier",
+    "math": ".math_verifier:MathVerifier",
+    "mmsi": ".mmsi_verifier:MmsiVerifier",
+    "multi_image": ".multi_image_verifier:MultiImageVerifier",
+    "ocr": ".ocr_verifier:OCRVerifier",
+    "physics": ".physics_verifier:PhysicsVerifier",
+    "vqa": ".vqa_verifier:VQAVerifier",
+    "file_based": ".verifier_from_file:FileBasedVerifier",
     # Function-based verifiers
-    "androidworld": FileBasedVerifier,
-    "osworld": FileBasedVerifier,
-    "webvoyager": FileBasedVerifier,
+    "androidworld": ".verifier_from_file:FileBasedVerifier",
+    "osworld": ".verifier_from_file:FileBasedVerifier",
+    "webvoyager": ".verifier_from_file:FileBasedVerifier",
 }
+# * entry points of this group register or override the class of a verifier type, e.g.
+# * `math = "my_package.verifiers:FastMathVerifier"`, the verifier is still built from the config of its type
+VERIFIER_ENTRY_POINT_GROUP = "glmv_reward.verifiers"
+_VERIFIER_CLASSES: dict[str, type[Verifier]] = {}
+_plugins_loaded = False
+_registry_lock = threading.Lock()
 _VERIFIER_INSTANCE_REGISTRY: dict[str, Verifier] = {}
 
 
 _logger = get_logger(__name__)
 
 
+def _set_rate_limits(config: VerifierConfig) -> None:
+    requests_per_second = getattr(config, "llm_requests_per_second", None)
+    tokens_per_minute = getattr(config, "llm_tokens_per_minute", None)
+    api_key = getattr(config, "llm_api_key", None)
+    if (requests_per_second is None and tokens_per_minute is None) or api_key is None:
+        return
+    urls = getattr(config, "llm_judge_url", None) or []
+    get_rate_limiter().set_limits(
+        [api_key] if isinstance(api_key, str) else list(api_key),
+        [urls] if isinstance(urls, str) else list(urls),
+        requests_per_second=requests_per_second,
+        tokens_per_minute=tokens_per_minute,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name in _VERIFIER_MODULES:
+        return getattr(importlib.import_module(_VERIFIER_MODULES[name], __name__), name)
+    err_msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(err_msg)
+
+
+def register_verifier(verifier_type: str, verifier_cls: type[Verifier] | str) -> None:
+    """
+    Registers the class of a verifier type, either the class itself or its "module:class" path imported on first use.
+    """
+    with _registry_lock:
+        verifier_type = verifier_type.lower()
+        _VERIFIER_CLASSES.pop(verifier_type, None)
+        if isinstance(verifier_cls, str):
+            _VERIFIER_REGISTRY[verifier_type] = verifier_cls
+        else:
+            _VERIFIER_REGISTRY[verifier_type] = f"{verifier_cls.__module__}:{verifier_cls.__qualname__}"
+            _VERIFIER_CLASSES[verifier_type] = verifier_cls
+
+
+def _load_verifier_plugins() -> None:
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for entry_point in importlib.metadata.entry_points(group=VERIFIER_ENTRY_POINT_GROUP):
+        verifier_type = entry_point.name.lower()
+        if verifier_type in _VERIFIER_REGISTRY:
+            _logger.info(f"> Verifier plugin `{entry_point.value}` overrides the `{verifier_type}` verifier")
+        _VERIFIER_REGISTRY[verifier_type] = entry_point.value
+        _VERIFIER_CLASSES.pop(verifier_type, None)
+
+
+def get_verifier_class(verifier_type: str) -> type[Verifier]:
+    """
+    Returns the class of a verifier type, importing its module on first use.
+    """
+    verifier_type = verifier_type.lower()
+    with _registry_lock:
+        verifier_cls = _VERIFIER_CLASSES.get(verifier_type)
+        if verifier_cls is not None:
+            return verifier_cls
+
+        _load_verifier_plugins()
+        if verifier_type not in _VERIFIER_REGISTRY:
+            err_msg = f"Verifier '{verifier_type}' is not supported."
+            raise ValueError(err_msg)
+        module_name, _, class_name = _VERIFIER_REGISTRY[verifier_type].partition(":")
+        verifier_cls = getattr(importlib.import_module(module_name, __name__), class_name)
+        if not (isinstance(verifier_cls, type) and issubclass(verifier_cls, Verifier)):
+            err_msg = f"`{_VERIFIER_REGISTRY[verifier_type]}` of the verifier '{verifier_type}' is not a `Verifier`."
+            raise TypeError(err_msg)
+        _VERIFIER_CLASSES[verifier_type] = verifier_cls
+        return verifier_cls
+
+
 def get_verifier_from_config(config: VerifierConfig, datasource: str) -> Verifier:
     """
     Factory function to get an instance of a verifier.
@@ -67,14 +196,11 @@ def get_verifier_from_config(config: VerifierConfig, datasource: str) -> Verifie
         raise ValueError(err_msg)
 
     verifier_type = verifier_type.lower()
-    if verifier_type not in _VERIFIER_REGISTRY:
-        err_msg = f"Verifier '{verifier_type}' is not supported."
-        raise ValueError(err_msg)
-
-    verifier_cls = _VERIFIER_REGISTRY[verifier_type]
+    verifier_cls = get_verifier_class(verifier_type)
     verifier_instance_key = f"{datasource}@{verifier_type}"
 
     if verifier_instance_key not in _VERIFIER_INSTANCE_REGISTRY:
+        _set_rate_limits(config)
         if verifier_cls == FileBasedVerifier:
             # FileBasedVerifier expects a config dict
             config_dict = {}
@@ -1,8 +1,23 @@
 # -*- coding: utf-8 -*-
 
 
+import itertools
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from collections.abc import Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from typing import Any, Optional, cast
+
+from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import metrics_enabled, note_batch_decisions, note_decision, take_notes
+from glmv_reward.utils.profiling import propagate_profile_label
+
+_logger = get_logger(__name__)
+
+# * the residual items of `judge_batch` are judged on the calling thread, and only fanned out to a thread pool once
+# * one of them takes longer than this, e.g. because it waits on an LLM judge request
+_INLINE_JUDGE_SECONDS = 0.005
 
 
 class Verifier(ABC):
@@ -50,6 +65,174 @@ class Verifier(ABC):
         """
         pass
 
+    def judge_batch(
+        self,
+        extracted_answers: Sequence[Any],
+        ground_truths: Sequence[Any],
+        questions: Optional[Sequence[Optional[str]]] = None,
+        image_files: Optional[Sequence[Optional[str]]] = None,
+        max_threads: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> list[float]:
+        """
+        Judges a batch of items, each as `judge` would.
+
+        The items decided by the rule-based checks of `_judge_batch_by_rules` are judged at once. The residual items
+        are passed to `judge` on the calling thread, as most of them are still settled by cheap rules. Once one of them
+        takes longer than `_INLINE_JUDGE_SECONDS`, e.g. because it waits on sympy or the LLM judge, the remaining
+        ones are judged concurrently by up to `max_threads` threads, so that their LLM requests are in flight
+        together. These requests are only packed into shared ones by verifiers with `llm_judge_batch_size` > 1, which
+        is opt-in. An item whose `judge` raises gets `min_reward`.
+
+        Args:
+            extracted_answers (Sequence[Any]): The answers extracted from the model's responses.
+            ground_truths (Sequence[Any]): The answers extracted from the ground truth responses.
+            questions (Optional[Sequence[Optional[str]]]): The questions/prompts, for context.
+            image_files (Optional[Sequence[Optional[str]]]): Paths to images, if relevant for judging.
+            max_threads (Optional[int]): The maximum number of threads judging the residual items, one per residual
+                item by default.
+            executor (Optional[Executor]): Runs the helper threads judging the residual items instead of a thread pool
+                of the call, e.g. a thread pool shared with the other work of the caller so that concurrent calls do
+                not multiply the number of threads.
+
+        Returns:
+            list[float]: The score of each item.
+        """
+        num_items = len(extracted_answers)
+        if len(ground_truths) != num_items:
+            err_msg = "The length of extracted_answers and ground_truths should be the same."
+            raise ValueError(err_msg)
+        question_lst = list(questions) if questions is not None else [None] * num_items
+        image_file_lst = list(image_files) if image_files is not None else [None] * num_items
+
+        rules_start = time.perf_counter()
+        rewards = self._judge_batch_by_rules(extracted_answers, ground_truths)
+        rules_seconds = time.perf_counter() - rules_start
+        residual_indices = [i for i, reward in enumerate(rewards) if reward is None]
+        # * the decision tier and judge time of each item, recorded only if metrics are enabled
+        rule_notes = take_notes()
+        tiers: list[Optional[str]] = [None] * num_items
+        seconds = [rules_seconds / max(num_items - len(residual_indices), 1)] * num_items
+        if rule_notes is not None and rule_notes.tiers is not None:
+            tiers = rule_notes.tiers
+        if len(residual_indices) > 0:
+            self._judge_residuals(
+                residual_indices,
+                (extracted_answers, ground_truths, question_lst, image_file_lst),
+                (rewards, tiers, seconds),
+                max_threads if max_threads is not None else len(residual_indices),
+                executor,
+            )
+        if metrics_enabled():
+            note_batch_decisions(tiers, seconds)
+        return cast(list[float], rewards)
+
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        """
+        Vectorized rule-based checks of `judge_batch`, e.g. exact and numeric matches.
+
+        Returns:
+            The reward of each item decided by the rules, exactly as `judge` would return it, or `None` for the items
+            left to `judge`. By default no item is decided.
+        """
+        del ground_truths
+        return [None] * len(extracted_answers)
+
+    def _judge_residuals(
+        self,
+        indices: list[int],
+        inputs: tuple[Sequence[Any], Sequence[Any], Sequence[Optional[str]], Sequence[Optional[str]]],
+        outputs: tuple[list[Optional[float]], list[Optional[str]], list[float]],
+        max_threads: int,
+        executor: Optional[Executor],
+    ) -> None:
+        # * judges the items at `indices` of `inputs` into `outputs`, i.e. the rewards, decision tiers and judge times
+        # * the calling thread judges the items in order, a watchdog thread adds helper threads taking the remaining
+        # * items once the calling thread has been judging the same item for a whole `_INLINE_JUDGE_SECONDS` interval
+        extracted_answers, ground_truths, questions, image_files = inputs
+        rewards, tiers, seconds = outputs
+        # * shared by the threads, `next` on it is atomic
+        next_positions = itertools.count()
+        done = threading.Event()
+        # * the position of the item being judged by the calling thread
+        current = [-1]
+        helpers: list[Future[None]] = []
+        own_executors: list[ThreadPoolExecutor] = []
+        noting_decisions = metrics_enabled()
+
+        def judge_remaining(*, track_items: bool) -> None:
+            num_items = len(indices)
+            for position in next_positions:
+                if position >= num_items:
+                    return
+                if track_items:
+                    current[0] = position
+                i = indices[position]
+                if noting_decisions:
+                    rewards[i], tiers[i], seconds[i] = self._judge_noting_decision(
+                        extracted_answers[i], ground_truths[i], questions[i], image_files[i]
+                    )
+                else:
+                    rewards[i] = self._judge_or_min_reward(
+                        extracted_answers[i], ground_truths[i], questions[i], image_files[i]
+                    )
+
+        def watch() -> None:
+            last_seen = -1
+            while not done.wait(_INLINE_JUDGE_SECONDS):
+                if current[0] != last_seen:
+                    last_seen = current[0]
+                else:
+                    num_helpers = min(max_threads, len(indices)) - 1
+                    helper_executor = executor
+                    if helper_executor is None:
+                        helper_executor = ThreadPoolExecutor(max_workers=num_helpers)
+                        own_executors.append(helper_executor)
+                    helpers.extend(
+                        helper_executor.submit(helper_judge_remaining, track_items=False) for _ in range(num_helpers)
+                    )
+                    return
+
+        helper_judge_remaining = propagate_profile_label(judge_remaining)
+        watchdog = threading.Thread(target=watch, daemon=True) if len(indices) > 1 and max_threads > 1 else None
+        if watchdog is not None:
+            watchdog.start()
+        try:
+            judge_remaining(track_items=True)
+        finally:
+            done.set()
+            if watchdog is not None:
+                watchdog.join()
+            # * helpers still queued on a busy shared executor would find no item left, waiting for them could deadlock
+            for helper in helpers:
+                helper.cancel()
+            wait(helpers)
+            for helper_executor in own_executors:
+                helper_executor.shutdown(wait=False)
+
+    def _judge_or_min_reward(
+        self, extracted_answer: Any, ground_truth: Any, question: Optional[str], image_file: Optional[str]
+    ) -> float:
+        try:
+            return self.judge(extracted_answer, ground_truth, question, image_file)
+        except Exception as e:
+            _logger.warning("%s: Error in verifier judge: %s", self.__class__.__name__, repr(e))
+            note_decision("exception")
+            return self.min_reward
+
+    def _judge_noting_decision(
+        self, extracted_answer: Any, ground_truth: Any, question: Optional[str], image_file: Optional[str]
+    ) -> tuple[float, Optional[str], float]:
+        # * returns the reward, the decision tier noted by `judge` and the judge time in seconds
+        take_notes()
+        start = time.perf_counter()
+        reward = self._judge_or_min_reward(extracted_answer, ground_truth, question, image_file)
+        seconds = time.perf_counter() - start
+        notes = take_notes()
+        return reward, None if notes is None else notes.tier, seconds
+
     @property
     def min_reward(self) -> float:
         return 0.0
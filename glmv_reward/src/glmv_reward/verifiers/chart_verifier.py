@@ -4,8 +4,11 @@
 import re
 from typing import Any, Optional, cast
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import note_decision
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers
 from glmv_reward.utils.text import find_boxed_content, protect_template
 
 from ._base_verifier import Verifier
@@ -18,6 +21,7 @@ class ChartVerifier(Verifier):
         self,
         answer_extraction_regex: str,
         sympy_tolerance: float = 1e-5,
+        sympy_timeout: Optional[float] = None,
         strict_boxed_extraction: bool = True,
         enable_llm_judge_fallback: bool = True,
         llm_api_key: Optional[str] = None,
@@ -27,10 +31,12 @@ class ChartVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         self.extraction_pattern = re.compile(rf"{answer_extraction_regex}", re.DOTALL | re.IGNORECASE)
 
         self.sympy_tolerance = sympy_tolerance
+        self.sympy_timeout = sympy_timeout
         self.strict_boxed = strict_boxed_extraction
         self.enable_llm_judge_fallback = enable_llm_judge_fallback
         self.llm_api_key = llm_api_key
@@ -40,6 +46,7 @@ class ChartVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question  # unused
@@ -94,6 +101,7 @@ class ChartVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
         # ! seems hacky
@@ -115,23 +123,21 @@ class ChartVerifier(Verifier):
                     1000 <= abs(num1) <= 3000 and num1 == int(num1) and 1000 <= abs(num2) <= 3000 and num2 == int(num2)
                 )
 
-        try:
-            from sympy import Basic, sympify
-
-            extract_answer_number = cast(Basic, sympify(extracted_answer, strict=True))
-            extract_gt_answer_number = cast(Basic, sympify(ground_truth, strict=True))
-        except Exception:
+        match_result = compare_real_numbers(
+            extracted_answer, ground_truth, self.sympy_tolerance, timeout=self.sympy_timeout
+        )
+        if match_result is SymbolicResult.UNPARSEABLE:
             _logger.debug("Failed to convert the answer to a numeric value. Skip number match.")
-        else:
-            if extract_answer_number.is_real and extract_gt_answer_number.is_real:
-                if question is not None and is_year_question(question, extracted_answer, ground_truth):
-                    return 1.0 if extract_answer_number == extract_gt_answer_number else 0.0
-                if (
-                    abs(extract_answer_number - extract_gt_answer_number) / (abs(extract_gt_answer_number) + 1e-6)
-                    < self.sympy_tolerance
-                ):
-                    return 1.0
-                return self.min_reward
+        elif (
+            match_result in (SymbolicResult.MATCH, SymbolicResult.MISMATCH)
+            and question is not None
+            and is_year_question(question, extracted_answer, ground_truth)
+        ):
+            return 1.0 if float(extracted_answer) == float(ground_truth) else 0.0
+        elif match_result is SymbolicResult.MATCH:
+            return 1.0
+        elif match_result is SymbolicResult.MISMATCH:
+            return self.min_reward
 
         if self.enable_llm_judge_fallback:
             return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
@@ -183,6 +189,18 @@ class ChartVerifier(Verifier):
                 max_tokens=self.llm_max_tokens,
                 temperature=self.llm_temperature,
                 top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+                cache_key=make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    self.llm_model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=self.llm_judge_url,
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                ),
             )
             if response_json:
                 content = response_json.strip()
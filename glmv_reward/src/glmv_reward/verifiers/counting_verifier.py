@@ -2,11 +2,16 @@
 
 
 import re
-from typing import Any, Optional, cast
+from collections.abc import Sequence
+from typing import Any, Optional
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.metrics import note_decision
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, select_rewards
 
 from ._base_verifier import Verifier
 
@@ -25,6 +30,7 @@ class CountingVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         self.strict_boxed = strict_boxed_extraction
         self.enable_llm_judge_fallback = enable_llm_judge_fallback
@@ -35,31 +41,18 @@ class CountingVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
-
-        self.think_answer_pattern = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>", "<answer>", "</answer>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags) or any(
-                tag.lower() in answer_part.lower() for tag in avoid_tags
-            ):
-                return None
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.lenient_answer
 
-            answer_content_to_check = answer_part
-
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.lenient_has_nested_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.lenient_answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -90,6 +83,7 @@ class CountingVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
         if extracted_answer.isdigit() and ground_truth.isdigit():
@@ -106,6 +100,14 @@ class CountingVerifier(Verifier):
 
         return self.min_reward
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * only exact matches are decided, the rest is left to `judge`
+        return select_rewards(
+            len(extracted_answers), (exact_match_mask(extracted_answers, ground_truths), 1.0, "exact_match")
+        )
+
     def _llm_judge_fallback(
         self, extracted_answer: str, ground_truth: str, question: Optional[str] = None, image_file: Optional[str] = None
     ) -> float:
@@ -148,6 +150,18 @@ class CountingVerifier(Verifier):
                 max_tokens=self.llm_max_tokens,
                 temperature=self.llm_temperature,
                 top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+                cache_key=make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    self.llm_model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=self.llm_judge_url,
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                ),
             )
 
             if response_json:
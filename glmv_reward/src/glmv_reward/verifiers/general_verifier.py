@@ -2,11 +2,15 @@
 
 
 import re
+from collections.abc import Sequence
 from typing import Any, Optional, cast
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import note_decision
 from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, select_rewards
 
 from ._base_verifier import Verifier
 
@@ -23,6 +27,7 @@ class GeneralVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
         answer_extraction_regex: Optional[str] = None,
     ) -> None:
         self.llm_api_key = llm_api_key
@@ -32,6 +37,7 @@ class GeneralVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
+        self.llm_judge_batch_size = llm_judge_batch_size
 
         self.extraction_pattern = None
         if answer_extraction_regex is not None:
@@ -78,6 +84,7 @@ class GeneralVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
         verifier_template = self.llm_judge_prompt_template
@@ -117,6 +124,18 @@ class GeneralVerifier(Verifier):
                 max_tokens=self.llm_max_tokens,
                 temperature=self.llm_temperature,
                 top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+                cache_key=make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    self.llm_model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=self.llm_judge_url,
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                ),
             )
 
             if len(response_json) > 0:
@@ -133,3 +152,11 @@ class GeneralVerifier(Verifier):
                 prompt[:100],
             )
             return self.min_reward
+
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * only exact matches are decided, the rest is left to the LLM judge
+        return select_rewards(
+            len(extracted_answers), (exact_match_mask(extracted_answers, ground_truths), 1.0, "exact_match")
+        )
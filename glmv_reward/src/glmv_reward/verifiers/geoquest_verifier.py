@@ -4,12 +4,14 @@
 import json
 import re
 from collections.abc import Sequence
-from typing import Any, Optional, Union, cast
+from typing import Any, Optional, Union
 
-from glmv_reward.utils.llm import post_query_llm
+from glmv_reward.utils.cache import make_verdict_key
+from glmv_reward.utils.llm import vote_llm_judges
 from glmv_reward.utils.logging import get_logger
 from glmv_reward.utils.misc import ensure_list
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.text import protect_template
 
 from ._base_verifier import Verifier
 
@@ -26,6 +28,7 @@ class GeoQuestVerifier(Verifier):
         llm_max_tokens: int = 4096,
         llm_temperature: float = 0.8,
         llm_top_p: float = 0.6,
+        llm_judge_batch_size: int = 1,
         strict_boxed_extraction: bool = True,
     ):
         self.llm_api_key = llm_api_key
@@ -35,29 +38,19 @@ class GeoQuestVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
+        self.llm_judge_batch_size = llm_judge_batch_size
         self.strict_boxed = strict_boxed_extraction
-        self.think_answer_pattern = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.lenient_answer
 
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags):
-                return None
-
-            answer_content_to_check = answer_part
-
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.lenient_has_think_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.lenient_answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -132,19 +125,8 @@ class GeoQuestVerifier(Verifier):
         if len(reward_url_lst) == 0:
             err_msg = "Empty llm_judge_url"
             raise ValueError(err_msg)
-        reward_score = 0.0
-        for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
-            response_text = post_query_llm(
-                prompt,
-                api_key,
-                url=reward_url,
-                model=model,
-                image_file=image_file,
-                max_tokens=self.llm_max_tokens,
-                temperature=self.llm_temperature,
-                top_p=self.llm_top_p,
-            )
-            # Initialize content with a default value to avoid referencing it later
+
+        def score_response(response_text: str) -> float:
             if response_text and type(response_text) is str:
                 verifier_think_pattern = re.compile(r"<think>.*?</think>\s*", re.DOTALL | re.IGNORECASE)
                 response_text = verifier_think_pattern.sub("", response_text).strip()
@@ -161,11 +143,7 @@ class GeoQuestVerifier(Verifier):
                     except Exception:
                         _logger.exception("Error: Could not parse response as JSON: %s", response_text)
                         judge_score = 0.0
-                try:
-                    reward_score += judge_score
-                    continue
-                except ValueError:
-                    pass
+                return judge_score
 
             _logger.warning(
                 "%s: LLM fallback judge failed or gave unexpected response for ('%s', '%s'). Raw response: %s",
@@ -174,6 +152,33 @@ class GeoQuestVerifier(Verifier):
                 ground_truth,
                 response_text,
             )
+            return 0.0
 
         # average reward score
-        return reward_score / len(reward_url_lst)
+        return vote_llm_judges(
+            prompt,
+            api_key_lst,
+            reward_url_lst,
+            model_lst,
+            score_response,
+            cache_keys=[
+                make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    model,
+                    None,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=f"{slot}@{reward_url}",
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                )
+                for slot, (reward_url, model) in enumerate(zip(reward_url_lst, model_lst, strict=True))
+            ],
+            majority=False,
+            image_file=image_file,
+            max_tokens=self.llm_max_tokens,
+            temperature=self.llm_temperature,
+            top_p=self.llm_top_p,
+            batch_size=self.llm_judge_batch_size,
+        )
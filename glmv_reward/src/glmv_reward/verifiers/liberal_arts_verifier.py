@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 
 
+from collections.abc import Sequence
 from typing import Any, Optional
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import note_decision
 from glmv_reward.utils.misc import ensure_list
 from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, select_rewards
 
 from .math_verifier import MathVerifier
 
@@ -60,6 +64,7 @@ class LiberalArtsVerifier(MathVerifier):
             return self.min_reward
 
         if extracted_answer.strip() == ground_truth.strip():
+            note_decision("exact_match")
             return 1.0
 
         if self.enable_llm_judge_fallback:
@@ -73,6 +78,15 @@ class LiberalArtsVerifier(MathVerifier):
 
         return 0.0
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * only exact matches are decided, the rest is left to the LLM judge
+        return select_rewards(
+            len(extracted_answers),
+            (exact_match_mask(extracted_answers, ground_truths, normalize=str.strip), 1.0, "exact_match"),
+        )
+
     def _llm_judge_fallback(
         self, extracted_answer: str, ground_truth: str, question: Optional[str] = None, image_file: Optional[str] = None
     ) -> float:
@@ -113,7 +127,7 @@ class LiberalArtsVerifier(MathVerifier):
             model_lst = ensure_list(self.llm_model)
 
         reward_score = 0.0
-        for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
+        for slot, (api_key, reward_url, model) in enumerate(zip(api_key_lst, reward_url_lst, model_lst, strict=True)):
             response_json = post_query_llm(
                 prompt,
                 api_key,
@@ -123,6 +137,18 @@ class LiberalArtsVerifier(MathVerifier):
                 max_tokens=self.llm_max_tokens,
                 temperature=self.llm_temperature,
                 top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+                cache_key=make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=f"{slot}@{reward_url}",
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                ),
             )
 
             content = None
@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 
 
-import re
 from collections.abc import Sequence
-from typing import Any, Optional, Union, cast
+from typing import Any, Optional, Union
 
-from glmv_reward.utils.llm import post_query_llm
+from glmv_reward.utils.cache import make_verdict_key
+from glmv_reward.utils.llm import vote_llm_judges
 from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import note_decision
 from glmv_reward.utils.misc import ensure_list
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers
+from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, numeric_match_mask, select_rewards
 
 from ._base_verifier import Verifier
 
@@ -19,6 +23,7 @@ class MathVerifier(Verifier):
     def __init__(
         self,
         sympy_tolerance: float = 1e-5,
+        sympy_timeout: Optional[float] = None,
         strict_boxed_extraction: bool = True,
         enable_llm_judge_fallback: bool = True,
         llm_api_key: Optional[Union[Sequence[str], str]] = None,
@@ -28,11 +33,10 @@ class MathVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
-        self.think_answer_pattern = re.compile(
-            r"^<think>(.*?)</think>\s*<answer>(.*?)</answer>$", re.DOTALL | re.IGNORECASE
-        )
         self.sympy_tolerance = sympy_tolerance
+        self.sympy_timeout = sympy_timeout
         self.strict_boxed = strict_boxed_extraction
         self.enable_llm_judge_fallback = enable_llm_judge_fallback
         self.llm_api_key = llm_api_key
@@ -42,29 +46,18 @@ class MathVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>", "<answer>", "</answer>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags) or any(
-                tag.lower() in answer_part.lower() for tag in avoid_tags
-            ):
-                return None
-
-            answer_content_to_check = answer_part
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.answer
 
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.has_nested_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -95,29 +88,35 @@ class MathVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
-        try:
-            from sympy import Basic, sympify
-
-            extract_answer_number = cast(Basic, sympify(extracted_answer, strict=True))
-            extract_gt_answer_number = cast(Basic, sympify(ground_truth, strict=True))
-        except Exception:
+        match_result = compare_real_numbers(
+            extracted_answer, ground_truth, self.sympy_tolerance, timeout=self.sympy_timeout
+        )
+        if match_result is SymbolicResult.UNPARSEABLE:
             _logger.debug("Failed to convert the answer to a numeric value. Skip number match.")
-        else:
-            if extract_answer_number.is_real and extract_gt_answer_number.is_real:
-                if (
-                    abs(extract_answer_number - extract_gt_answer_number) / (abs(extract_gt_answer_number) + 1e-6)
-                    < self.sympy_tolerance
-                ):
-                    return 1.0
-                return self.min_reward
+        elif match_result is SymbolicResult.MATCH:
+            return 1.0
+        elif match_result is SymbolicResult.MISMATCH:
+            return self.min_reward
 
         if self.enable_llm_judge_fallback:
             return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
 
         return self.min_reward
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * same order as `judge`: exact match, then numeric literals, the rest is left to sympy and the LLM judge
+        numeric_matched = numeric_match_mask(extracted_answers, ground_truths, self.sympy_tolerance)
+        return select_rewards(
+            len(extracted_answers),
+            (exact_match_mask(extracted_answers, ground_truths), 1.0, "exact_match"),
+            (numeric_matched, 1.0, "numeric"),
+        )
+
     def _llm_judge_fallback(
         self,
         extracted_answer: str,
@@ -161,30 +160,15 @@ class MathVerifier(Verifier):
             if self.llm_model is not None:
                 model_lst = ensure_list(self.llm_model)
 
-            reward_score = 0.0
-            for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
-                response_json = post_query_llm(
-                    prompt,
-                    api_key,
-                    url=reward_url,
-                    model=model,
-                    image_file=image_file,
-                    max_tokens=self.llm_max_tokens,
-                    temperature=self.llm_temperature,
-                    top_p=self.llm_top_p,
-                )
-
-                # Initialize content with a default value to avoid referencing it later
-                if len(response_json) > 0:
-                    content = response_json.strip()
+            def score_response(response: str) -> float:
+                if len(response) > 0:
+                    content = response.strip()
                     if "1.0" in content:
-                        reward_score += 1.0
-                        continue
+                        return 1.0
                     if "0.0" in content:
-                        continue
+                        return 0.0
                     try:
-                        reward_score += float(content)  # LLM directly returns a number
-                        continue
+                        return float(content)  # LLM directly returns a number
                     except ValueError:
                         pass
                 _logger.warning(
@@ -192,8 +176,34 @@ class MathVerifier(Verifier):
                     self.__class__.__name__,
                     extracted_answer,
                     ground_truth,
-                    response_json,
+                    response,
                 )
+                return 0.0
 
             # at least > half of the reward_url_list return 1.0
-            return float(reward_score > len(reward_url_lst) / 2)
+            return vote_llm_judges(
+                prompt,
+                api_key_lst,
+                reward_url_lst,
+                model_lst,
+                score_response,
+                cache_keys=[
+                    make_verdict_key(
+                        self.llm_judge_prompt_template,
+                        model,
+                        question,
+                        extracted_answer,
+                        ground_truth,
+                        endpoint=f"{slot}@{reward_url}",
+                        max_tokens=self.llm_max_tokens,
+                        temperature=self.llm_temperature,
+                        top_p=self.llm_top_p,
+                    )
+                    for slot, (reward_url, model) in enumerate(zip(reward_url_lst, model_lst, strict=True))
+                ],
+                image_file=image_file,
+                max_tokens=self.llm_max_tokens,
+                temperature=self.llm_temperature,
+                top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+            )
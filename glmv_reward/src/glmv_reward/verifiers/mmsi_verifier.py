@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 
 
-import re
-from typing import Any, Optional, cast
+from typing import Any, Optional
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.metrics import note_decision
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.symbolic import SymbolicResult, compare_symbolic_equivalence
+from glmv_reward.utils.text import protect_template
 
 from ._base_verifier import Verifier
 
@@ -17,6 +20,7 @@ class MmsiVerifier(Verifier):
     def __init__(
         self,
         sympy_tolerance: float = 1e-5,
+        sympy_timeout: Optional[float] = None,
         strict_boxed_extraction: bool = True,
         enable_llm_judge_fallback: bool = True,
         llm_api_key: Optional[str] = None,
@@ -26,8 +30,10 @@ class MmsiVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         self.sympy_tolerance = sympy_tolerance
+        self.sympy_timeout = sympy_timeout
         self.strict_boxed = strict_boxed_extraction  # If true, only boxed answer is valid
 
         # NEW: Configuration for enabling/disabling LLM judge fallback
@@ -39,39 +45,30 @@ class MmsiVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
-
-        self.think_answer_pattern = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Optional[str]:
         del question
 
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags):
-                return None
-            answer_content_to_check = answer_part
-        else:
-            # If no think/answer tag, directly return None
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.lenient_answer
+
+        # If no think/answer tag, directly return None
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.lenient_has_think_tags:
             return None
 
-        if answer_content_to_check is not None:
-            if answer_content_to_check == "":
-                return None  # Explicitly mark as extraction failure
+        if answer_content_to_check == "":
+            return None  # Explicitly mark as extraction failure
 
-            boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.lenient_answer_boxes]
 
-            if len(boxed_matches) == 1:
-                return boxed_matches[0].strip()
+        if len(boxed_matches) == 1:
+            return boxed_matches[0].strip()
 
-            if not self.strict_boxed and not boxed_matches:
-                # No \boxed{}, but not strictly required, return original content
-                return answer_content_to_check
+        if not self.strict_boxed and not boxed_matches:
+            # No \boxed{}, but not strictly required, return original content
+            return answer_content_to_check
 
         # Multiple boxed or other issues
         return None
@@ -109,56 +106,19 @@ class MmsiVerifier(Verifier):
                 pass
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
-        try:
-            # Sympy is imported here to avoid making it a hard dependency for the whole system
-            # if MathVerifier is not used.
-            from sympy import Abs, Basic, N, S, simplify, sympify
-
-            # Attempt to parse with sympy
-            # Add local symbols if necessary, e.g. for physics/math common symbols
-            # local_dict = {"pi": sympy.pi, "e": sympy.E}
-            parsed_answer = cast(Basic, sympify(extracted_answer, strict=True))  # , locals=local_dict)
-            parsed_gt = cast(Basic, sympify(ground_truth, strict=True))  # , locals=local_dict)
-
-        except Exception:
-            # TODO(Logging): These `print` statements are temporary.  Once a project-wide
-            # logging configuration is in place, replace them with calls to the standard
-            # `logging` module (e.g. logger.warning / logger.info / logger.debug).
+        match_result = compare_symbolic_equivalence(
+            extracted_answer, ground_truth, self.sympy_tolerance, timeout=self.sympy_timeout
+        )
+        if match_result in (SymbolicResult.UNPARSEABLE, SymbolicResult.TIMEOUT):
             if self.enable_llm_judge_fallback:
                 return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_paths)
             return self.min_reward  # If sympy must pass or no fallback (or fallback disabled)
-        else:
-            # If they are relations (e.g. x > 0)
-            if parsed_answer.is_Relational and parsed_gt.is_Relational:
-                # simplify helps in making relations comparable e.g. x<1 vs 1>x
-                if simplify(parsed_answer) == simplify(parsed_gt):
-                    return 1.0
-            # If they are numbers
-            elif parsed_answer.is_number and parsed_gt.is_number:
-                # Use N for numerical evaluation, then compare
-                # Adding a small epsilon to parsed_gt denominator to avoid division by zero
-                # FIXME: when gt approx 0, try to compare absolute error
-                diff = Abs(N(parsed_answer) - N(parsed_gt))
-                denom = Abs(N(parsed_gt))
-
-                if denom < S(self.sympy_tolerance):
-                    # gt ≈ 0, compare using absolute error
-                    if diff < S(self.sympy_tolerance):
-                        return 1.0
-                else:
-                    # Compare using relative error
-                    if diff / (denom + S(self.sympy_tolerance)) < S(self.sympy_tolerance):
-                        return 1.0
-            # For symbolic expressions
-            elif parsed_answer.equals(parsed_gt):
-                return 1.0
-            # Try simplifying both and comparing
-            elif simplify(parsed_answer).equals(simplify(parsed_gt)):
-                return 1.0
-
-            return self.min_reward  # Default to 0.0 if no condition met
+        if match_result is SymbolicResult.MATCH:
+            return 1.0
+        return self.min_reward  # Default to 0.0 if no condition met
 
     def _llm_judge_fallback(
         self, extracted_answer: str, ground_truth: str, question: Optional[str] = None, image_file: Optional[str] = None
@@ -204,6 +164,18 @@ class MmsiVerifier(Verifier):
             max_tokens=self.llm_max_tokens,
             temperature=self.llm_temperature,
             top_p=self.llm_top_p,
+            batch_size=self.llm_judge_batch_size,
+            cache_key=make_verdict_key(
+                self.llm_judge_prompt_template,
+                self.llm_model,
+                question,
+                extracted_answer,
+                ground_truth,
+                endpoint=self.llm_judge_url,
+                max_tokens=self.llm_max_tokens,
+                temperature=self.llm_temperature,
+                top_p=self.llm_top_p,
+            ),
         )
         # Initialize content with a default value to avoid referencing it later
         content = None
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 
 
-import re
-from typing import Any, Optional, cast
+from collections.abc import Sequence
+from typing import Any, Optional
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.metrics import note_decision
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers
+from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, numeric_match_mask, select_rewards
 
 from ._base_verifier import Verifier
 
@@ -17,6 +22,7 @@ class MultiImageVerifier(Verifier):
     def __init__(
         self,
         sympy_tolerance: float = 1e-5,
+        sympy_timeout: Optional[float] = None,
         strict_boxed_extraction: bool = True,
         enable_llm_judge_fallback: bool = True,
         llm_api_key: Optional[str] = None,
@@ -26,8 +32,10 @@ class MultiImageVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         self.sympy_tolerance = sympy_tolerance
+        self.sympy_timeout = sympy_timeout
         self.strict_boxed = strict_boxed_extraction
 
         self.enable_llm_judge_fallback = enable_llm_judge_fallback
@@ -38,29 +46,18 @@ class MultiImageVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
-
-        self.think_answer_pattern = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags):
-                return None
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.lenient_answer
 
-            answer_content_to_check = answer_part
-
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.lenient_has_think_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.lenient_answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -91,29 +88,35 @@ class MultiImageVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
-        try:
-            from sympy import Basic, sympify
-
-            extract_answer_number = cast(Basic, sympify(extracted_answer, strict=True))
-            extract_gt_answer_number = cast(Basic, sympify(ground_truth, strict=True))
-        except Exception:
+        match_result = compare_real_numbers(
+            extracted_answer, ground_truth, self.sympy_tolerance, timeout=self.sympy_timeout
+        )
+        if match_result is SymbolicResult.UNPARSEABLE:
             _logger.debug("Failed to convert the answer to a numeric value. Skip number match.")
-        else:
-            if extract_answer_number.is_real and extract_gt_answer_number.is_real:
-                if (
-                    abs(extract_answer_number - extract_gt_answer_number) / (abs(extract_gt_answer_number) + 1e-6)
-                    < self.sympy_tolerance
-                ):
-                    return 1.0
-                return self.min_reward
+        elif match_result is SymbolicResult.MATCH:
+            return 1.0
+        elif match_result is SymbolicResult.MISMATCH:
+            return self.min_reward
 
         if self.enable_llm_judge_fallback:
             return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
 
         return 0.0
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * same order as `judge`: exact match, then numeric literals, the rest is left to sympy and the LLM judge
+        numeric_matched = numeric_match_mask(extracted_answers, ground_truths, self.sympy_tolerance)
+        return select_rewards(
+            len(extracted_answers),
+            (exact_match_mask(extracted_answers, ground_truths), 1.0, "exact_match"),
+            (numeric_matched, 1.0, "numeric"),
+        )
+
     def _llm_judge_fallback(
         self,
         extracted_answer: str,
@@ -159,6 +162,18 @@ class MultiImageVerifier(Verifier):
                 max_tokens=self.llm_max_tokens,
                 temperature=self.llm_temperature,
                 top_p=self.llm_top_p,
+                batch_size=self.llm_judge_batch_size,
+                cache_key=make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    self.llm_model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=self.llm_judge_url,
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                ),
             )
             # Initialize content with a default value to avoid referencing it later
             if response_json:
@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
 
 
-import re
+import math
 from collections.abc import Sequence
-from typing import Any, Optional, Union, cast
+from typing import Any, Optional, Union
 
 import editdistance
 
+from glmv_reward.utils.cache import make_verdict_key
 from glmv_reward.utils.llm import post_query_llm
 from glmv_reward.utils.logging import get_logger
 from glmv_reward.utils.misc import ensure_list
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import edit_similarities, string_pair_mask
 
 from ._base_verifier import Verifier
 
@@ -32,6 +35,7 @@ class OCRVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         self.strict_boxed = strict_boxed_extraction
         # >= upper bound, score will be 1.0
@@ -47,29 +51,18 @@ class OCRVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
-
-        self.think_answer_pattern = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
-
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags):
-                return None
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.lenient_answer
 
-            answer_content_to_check = answer_part
-
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.lenient_has_think_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.lenient_answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -99,12 +92,8 @@ class OCRVerifier(Verifier):
             )
             return self.min_reward
 
-        if self.ignore_case:
-            extracted_answer = extracted_answer.lower()
-            ground_truth = ground_truth.lower()
-
-        extracted_answer = extracted_answer.strip().replace("\n", " ").replace(" ", "")
-        ground_truth = ground_truth.strip().replace("\n", " ").replace(" ", "")
+        extracted_answer = self._normalize_text(extracted_answer)
+        ground_truth = self._normalize_text(ground_truth)
 
         similarity = 1 - editdistance.eval(extracted_answer, ground_truth) / max(
             len(extracted_answer), len(ground_truth)
@@ -115,18 +104,54 @@ class OCRVerifier(Verifier):
         if similarity <= self.edit_distance_lower_bound:
             return 0.0
 
-        if (
-            self.enable_llm_judge_fallback
-            and self.llm_api_key
-            and self.llm_judge_url
-            and self.llm_judge_prompt_template
-        ):
+        if self._use_llm_judge_fallback:
             llm_reward = self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
             if llm_reward == 1.0:
                 return 1.0
 
         return similarity
 
+    def _normalize_text(self, text: str) -> str:
+        if self.ignore_case:
+            text = text.lower()
+        return text.strip().replace("\n", " ").replace(" ", "")
+
+    @property
+    def _use_llm_judge_fallback(self) -> bool:
+        return bool(
+            self.enable_llm_judge_fallback
+            and self.llm_api_key
+            and self.llm_judge_url
+            and self.llm_judge_prompt_template
+        )
+
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * the edit similarities of the whole batch are computed at once, only the items between the bounds that
+        # * may be rescued by the LLM judge are left to `judge`
+        is_string = string_pair_mask(extracted_answers, ground_truths)
+        similarities = edit_similarities(
+            [
+                self._normalize_text(answer) if keep else ""
+                for answer, keep in zip(extracted_answers, is_string, strict=True)
+            ],
+            [self._normalize_text(gt) if keep else "" for gt, keep in zip(ground_truths, is_string, strict=True)],
+        )
+        use_llm_judge_fallback = self._use_llm_judge_fallback
+
+        rewards: list[Optional[float]] = []
+        for keep, similarity in zip(is_string.tolist(), similarities.tolist(), strict=True):
+            if not keep or math.isnan(similarity):
+                rewards.append(None)
+            elif similarity >= self.edit_distance_upper_bound:
+                rewards.append(1.0)
+            elif similarity <= self.edit_distance_lower_bound:
+                rewards.append(0.0)
+            else:
+                rewards.append(None if use_llm_judge_fallback else similarity)
+        return rewards
+
     def _llm_judge_fallback(
         self,
         extracted_answer: str,
@@ -168,7 +193,9 @@ class OCRVerifier(Verifier):
                 model_lst = ensure_list(self.llm_model)
 
             reward_score = 0.0
-            for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
+            for slot, (api_key, reward_url, model) in enumerate(
+                zip(api_key_lst, reward_url_lst, model_lst, strict=True)
+            ):
                 response_json = post_query_llm(
                     prompt,
                     api_key,
@@ -178,6 +205,18 @@ class OCRVerifier(Verifier):
                     max_tokens=self.llm_max_tokens,
                     temperature=self.llm_temperature,
                     top_p=self.llm_top_p,
+                    batch_size=self.llm_judge_batch_size,
+                    cache_key=make_verdict_key(
+                        self.llm_judge_prompt_template,
+                        model,
+                        question,
+                        extracted_answer,
+                        ground_truth,
+                        endpoint=f"{slot}@{reward_url}",
+                        max_tokens=self.llm_max_tokens,
+                        temperature=self.llm_temperature,
+                        top_p=self.llm_top_p,
+                    ),
                 )
 
                 if response_json:
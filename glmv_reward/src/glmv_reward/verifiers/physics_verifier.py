@@ -2,12 +2,18 @@
 
 
 import re
-from typing import Any, Optional, cast
+from collections.abc import Sequence
+from typing import Any, Optional
 
-from glmv_reward.utils.llm import post_query_llm
+import numpy as np
+
+from glmv_reward.utils.cache import make_verdict_key
+from glmv_reward.utils.llm import vote_llm_judges
 from glmv_reward.utils.logging import get_logger
 from glmv_reward.utils.misc import ensure_list
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers
 from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import numeric_match_mask, select_rewards
 
 from .math_verifier import MathVerifier  # Physics often has math-like answers with units
 
@@ -75,27 +81,39 @@ class PhysicsVerifier(MathVerifier):
         if _has_unit(extracted_answer) or _has_unit(ground_truth):
             return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
 
-        try:
-            from sympy import Basic, sympify
-
-            extract_answer_number = cast(Basic, sympify(extracted_answer, strict=True))
-            extract_gt_answer_number = cast(Basic, sympify(ground_truth, strict=True))
-        except Exception:
+        match_result = compare_real_numbers(
+            extracted_answer, ground_truth, self.sympy_tolerance, timeout=self.sympy_timeout
+        )
+        if match_result is SymbolicResult.UNPARSEABLE:
             _logger.debug("Failed to convert the answer to a numeric value. Skip number match.")
-        else:
-            if extract_answer_number.is_real and extract_gt_answer_number.is_real:
-                if (
-                    abs(extract_answer_number - extract_gt_answer_number) / (abs(extract_gt_answer_number) + 1e-6)
-                    < self.sympy_tolerance
-                ):
-                    return 1.0
-                return 0.0
+        elif match_result is SymbolicResult.MATCH:
+            return 1.0
+        elif match_result is SymbolicResult.MISMATCH:
+            return 0.0
 
         if self.enable_llm_judge_fallback:
             return self._llm_judge_fallback(extracted_answer, ground_truth, question, image_file)
 
         return 0.0
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * answers with units go to the LLM judge, the others are compared as numeric literals first like in `judge`
+        has_no_unit = np.fromiter(
+            (
+                isinstance(answer, str) and isinstance(gt, str) and not (_has_unit(answer) or _has_unit(gt))
+                for answer, gt in zip(extracted_answers, ground_truths, strict=True)
+            ),
+            dtype=np.bool_,
+            count=len(extracted_answers),
+        )
+        numeric_matched = numeric_match_mask(extracted_answers, ground_truths, self.sympy_tolerance)
+        return select_rewards(
+            len(extracted_answers),
+            (has_no_unit & numeric_matched, 1.0, "numeric"),
+        )
+
     def _llm_judge_fallback(
         self, extracted_answer: str, ground_truth: str, question: Optional[str] = None, image_file: Optional[str] = None
     ) -> float:
@@ -134,44 +152,53 @@ class PhysicsVerifier(MathVerifier):
         if self.llm_model is not None:
             model_lst = ensure_list(self.llm_model)
 
-        reward_score = 0.0
-        for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
-            response_json = post_query_llm(
-                prompt,
-                api_key,
-                url=reward_url,
-                model=model,
-                image_file=image_file,
-                max_tokens=self.llm_max_tokens,
-                temperature=self.llm_temperature,
-                top_p=self.llm_top_p,
-            )
-
-            # Initialize content with a default value to avoid referencing it later
-            content = None
-            if response_json:
-                content = response_json.strip()
+        def score_response(response: str) -> float:
+            if len(response) > 0:
+                content = response.strip()
                 score_matches = re.findall(r"(?:1\.0|0\.0)", content)
                 if score_matches:
                     last_score = score_matches[-1]
                     if last_score == "1.0":
-                        reward_score += 1.0
-                        continue
+                        return 1.0
                     if last_score == "0.0":
-                        continue
+                        return 0.0
                 try:
-                    reward_score += float(content)  # LLM directly returns a number
-                    continue
+                    return float(content)  # LLM directly returns a number
                 except ValueError:
                     pass
-
             _logger.warning(
                 "%s: LLM fallback judge failed or gave unexpected response for ('%s', '%s'). Raw response: %s",
                 self.__class__.__name__,
                 extracted_answer,
                 ground_truth,
-                response_json,
+                response,
             )
+            return 0.0
 
         # at least > half of the reward_url_list return 1.0
-        return float(reward_score > len(reward_url_lst) / 2)
+        return vote_llm_judges(
+            prompt,
+            api_key_lst,
+            reward_url_lst,
+            model_lst,
+            score_response,
+            cache_keys=[
+                make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=f"{slot}@{reward_url}",
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                )
+                for slot, (reward_url, model) in enumerate(zip(reward_url_lst, model_lst, strict=True))
+            ],
+            image_file=image_file,
+            max_tokens=self.llm_max_tokens,
+            temperature=self.llm_temperature,
+            top_p=self.llm_top_p,
+            batch_size=self.llm_judge_batch_size,
+        )
@@ -1,14 +1,17 @@
 # -*- coding: utf-8 -*-
 
 
-import re
 from collections.abc import Sequence
-from typing import Any, Optional, Union, cast
+from typing import Any, Optional, Union
 
-from glmv_reward.utils.llm import post_query_llm
+from glmv_reward.utils.cache import make_verdict_key
+from glmv_reward.utils.llm import vote_llm_judges
 from glmv_reward.utils.logging import get_logger
+from glmv_reward.utils.metrics import note_decision
 from glmv_reward.utils.misc import ensure_list
-from glmv_reward.utils.text import find_boxed_content, protect_template
+from glmv_reward.utils.response import parse_response
+from glmv_reward.utils.text import protect_template
+from glmv_reward.utils.vectorized import exact_match_mask, select_rewards
 
 from ._base_verifier import Verifier
 
@@ -27,13 +30,10 @@ class VQAVerifier(Verifier):
         llm_max_tokens: int = 10,
         llm_temperature: float = 0.1,
         llm_top_p: float = 1.0,
+        llm_judge_batch_size: int = 1,
     ) -> None:
         # assert "llm_judge_url" in self.config, "llm_judge_url is required for VQAVerifier"
 
-        self.think_answer_pattern = re.compile(
-            r"^<think>(.*?)</think>\s*<answer>(.*?)</answer>$", re.DOTALL | re.IGNORECASE
-        )
-
         self.strict_boxed = strict_boxed_extraction
         self.enable_llm_judge_fallback = enable_llm_judge_fallback
         self.llm_api_key = llm_api_key
@@ -43,30 +43,19 @@ class VQAVerifier(Verifier):
         self.llm_max_tokens = llm_max_tokens
         self.llm_temperature = llm_temperature
         self.llm_top_p = llm_top_p
+        self.llm_judge_batch_size = llm_judge_batch_size
 
     def extract_answer(self, response: str, question: Optional[str] = None) -> Any:
         del question
 
-        match = self.think_answer_pattern.search(response)
-        answer_content_to_check = None
-
-        if match:
-            think_part = cast(str, match.group(1)).strip()
-            answer_part = cast(str, match.group(2)).strip()
+        parsed = parse_response(response)
+        answer_content_to_check = parsed.answer
 
-            # Basic validation against nested tags
-            avoid_tags = ["<think>", "</think>", "<answer>", "</answer>"]
-            if any(tag.lower() in think_part.lower() for tag in avoid_tags) or any(
-                tag.lower() in answer_part.lower() for tag in avoid_tags
-            ):
-                return None
-
-            answer_content_to_check = answer_part
-
-        if answer_content_to_check is None or len(answer_content_to_check) == 0:
+        # Basic validation against nested tags
+        if answer_content_to_check is None or parsed.has_nested_tags or len(answer_content_to_check) == 0:
             return None
 
-        boxed_matches = find_boxed_content(answer_content_to_check)
+        boxed_matches = [match.content for match in parsed.answer_boxes]
 
         if len(boxed_matches) == 1:
             return boxed_matches[0].strip()
@@ -97,6 +86,7 @@ class VQAVerifier(Verifier):
             return self.min_reward
 
         if extracted_answer == ground_truth:
+            note_decision("exact_match")
             return 1.0
 
         if self.enable_llm_judge_fallback:
@@ -104,6 +94,14 @@ class VQAVerifier(Verifier):
 
         return 0.0
 
+    def _judge_batch_by_rules(
+        self, extracted_answers: Sequence[Any], ground_truths: Sequence[Any]
+    ) -> list[Optional[float]]:
+        # * only exact matches are decided, the rest is left to the LLM judge
+        return select_rewards(
+            len(extracted_answers), (exact_match_mask(extracted_answers, ground_truths), 1.0, "exact_match")
+        )
+
     def _llm_judge_fallback(
         self,
         extracted_answer: str,
@@ -147,41 +145,50 @@ class VQAVerifier(Verifier):
         if self.llm_model is not None:
             model_lst = ensure_list(self.llm_model)
 
-        reward_score = 0.0
-        for api_key, reward_url, model in zip(api_key_lst, reward_url_lst, model_lst, strict=True):
-            response_json = post_query_llm(
-                prompt,
-                api_key,
-                url=reward_url,
-                model=model,
-                image_file=image_file,
-                max_tokens=self.llm_max_tokens,
-                temperature=self.llm_temperature,
-                top_p=self.llm_top_p,
-            )
-
-            # Initialize content with a default value to avoid referencing it later
-            content = None
-            if response_json:
-                content = response_json.strip()
+        def score_response(response: str) -> float:
+            if len(response) > 0:
+                content = response.strip()
                 if "1.0" in content:
-                    reward_score += 1.0
-                    continue
+                    return 1.0
                 if "0.0" in content:
-                    continue
+                    return 0.0
                 try:
-                    reward_score += float(content)  # LLM directly returns a number
-                    continue
+                    return float(content)  # LLM directly returns a number
                 except ValueError:
                     pass
-
             _logger.warning(
                 "%s: LLM fallback judge failed or gave unexpected response for ('%s', '%s'). Raw response: %s",
                 self.__class__.__name__,
                 extracted_answer,
                 ground_truth,
-                response_json,
+                response,
             )
+            return 0.0
 
         # at least > half of the reward_url_list return 1.0
-        return float(reward_score > len(reward_url_lst) / 2)
+        return vote_llm_judges(
+            prompt,
+            api_key_lst,
+            reward_url_lst,
+            model_lst,
+            score_response,
+            cache_keys=[
+                make_verdict_key(
+                    self.llm_judge_prompt_template,
+                    model,
+                    question,
+                    extracted_answer,
+                    ground_truth,
+                    endpoint=f"{slot}@{reward_url}",
+                    max_tokens=self.llm_max_tokens,
+                    temperature=self.llm_temperature,
+                    top_p=self.llm_top_p,
+                )
+                for slot, (reward_url, model) in enumerate(zip(reward_url_lst, model_lst, strict=True))
+            ],
+            image_file=image_file,
+            max_tokens=self.llm_max_tokens,
+            temperature=self.llm_temperature,
+            top_p=self.llm_top_p,
+            batch_size=self.llm_judge_batch_size,
+        )
@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from glmv_reward.utils.numeric import compare_numbers
+from glmv_reward.utils.vectorized import edit_similarities, numeric_match_mask
+from glmv_reward.verifiers import (
+    BiologyVerifier,
+    ChemistryVerifier,
+    GeographyVerifier,
+    MathVerifier,
+    MultiImageVerifier,
+    OCRVerifier,
+    PhysicsVerifier,
+    VQAVerifier,
+)
+from glmv_reward.verifiers._base_verifier import Verifier
+
+_PIECES = ["42", "42.0", "41.99999", "-3", "3/4", "0.75", "75%", "1,000", "1e3", "x+1", "Paris", " paris ", "", None]
+
+
+def _random_pairs(rng, num_pairs):
+    return [(rng.choice(_PIECES), rng.choice(_PIECES[:-1])) for _ in range(num_pairs)]
+
+
+def _judge_one_by_one(verifier, pairs):
+    rewards = []
+    for answer, gt in pairs:
+        try:
+            rewards.append(verifier.judge(answer, gt))
+        except Exception:
+            rewards.append(verifier.min_reward)
+    return rewards
+
+
+@pytest.mark.parametrize(
+    "verifier",
+    [
+        MathVerifier(enable_llm_judge_fallback=False),
+        MultiImageVerifier(enable_llm_judge_fallback=False),
+        PhysicsVerifier(enable_llm_judge_fallback=False),
+        ChemistryVerifier(enable_llm_judge_fallback=False),
+        GeographyVerifier(enable_llm_judge_fallback=False),
+        BiologyVerifier(enable_llm_judge_fallback=False),
+        VQAVerifier(enable_llm_judge_fallback=False),
+        OCRVerifier(enable_llm_judge_fallback=False, edit_distance_upper_bound=0.8, edit_distance_lower_bound=0.2),
+    ],
+    ids=lambda verifier: verifier.__class__.__name__,
+)
+def test_judge_batch_matches_judge(verifier):
+    pairs = _random_pairs(random.Random(0), 300)
+    answers, gts = zip(*pairs)
+    assert verifier.judge_batch(answers, gts) == _judge_one_by_one(verifier, pairs)
+
+
+@pytest.mark.parametrize("tolerance", [1e-5, 2.5e-2])
+def test_numeric_match_mask_matches_compare_numbers(tolerance):
+    rng = random.Random(1)
+    pairs = [(rng.choice(_PIECES[:-1]), rng.choice(_PIECES[:-1])) for _ in range(500)]
+    matched = numeric_match_mask(*zip(*pairs), tolerance=tolerance)
+    for (answer, gt), is_match in zip(pairs, matched, strict=True):
+        assert (True if is_match else None) is compare_numbers(answer, gt, tolerance)
+
+
+def test_edit_similarities():
+    similarities = edit_similarities(["hello", "hello", ""], ["hello", "help", ""])
+    assert similarities[0] == 1.0
+    assert similarities[1] == 1 - 2 / 5
+    assert similarities[2] != similarities[2]
+
+
+def test_only_residual_items_are_judged_one_by_one(monkeypatch):
+    verifier = MathVerifier(enable_llm_judge_fallback=False)
+    judged = []
+    judge = verifier.judge
+
+    def recording_judge(extracted_answer, ground_truth, question=None, image_file=None):
+        judged.append(extracted_answer)
+        return judge(extracted_answer, ground_truth, question, image_file)
+
+    monkeypatch.setattr(verifier, "judge", recording_judge)
+    rewards = verifier.judge_batch(["42", "41", "x+1", "42.0"], ["42"] * 4)
+    assert rewards == [1.0, 0.0, 0.0, 1.0]
+    # * mismatching numbers are not decided by the rules
+    assert judged == ["41", "x+1"]
+
+
+class _SlowVerifier(Verifier):
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def extract_answer(self, response, question=None):
+        return response
+
+    def judge(self, extracted_answer, ground_truth, question=None, image_file=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.get_ident())
+        if self.seconds > 0:
+            time.sleep(self.seconds)
+        with self.lock:
+            self.active -= 1
+        if extracted_answer == "error":
+            raise RuntimeError("judge failed")
+        return float(extracted_answer == ground_truth)
+
+
+def test_default_judge_batch_is_concurrent():
+    verifier = _SlowVerifier()
+    rewards = verifier.judge_batch(["a", "b", "error", "a"], ["a"] * 4, questions=["q"] * 4)
+    assert rewards == [1.0, 0.0, 0.0, 1.0]
+    assert verifier.max_active > 1
+
+
+def test_judge_batch_threads_follow_max_threads():
+    verifier = _SlowVerifier(seconds=0.1)
+    verifier.judge_batch(["a"] * 96, ["a"] * 96, max_threads=64)
+    assert 32 < verifier.max_active <= 64
+
+    verifier = _SlowVerifier(seconds=0.05)
+    verifier.judge_batch(["a"] * 16, ["a"] * 16, max_threads=4)
+    assert verifier.max_active <= 4
+
+
+def test_concurrent_judge_batches_share_the_executor():
+    verifier = _SlowVerifier(seconds=0.02)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(verifier.judge_batch, ["a"] * 16, ["a"] * 16, max_threads=8, executor=executor)
+            for _ in range(4)
+        ]
+        assert all(future.result(timeout=10) == [1.0] * 16 for future in futures)
+    assert len(verifier.threads) <= 8
+    assert verifier.max_active > 4
+
+
+def test_cheap_residual_items_are_judged_inline():
+    verifier = _SlowVerifier(seconds=0.0)
+    rewards = verifier.judge_batch(["a", "b"] * 100, ["a"] * 200)
+    assert rewards == [1.0, 0.0] * 100
+    assert verifier.threads == {threading.get_ident()}
+
+
+def test_judge_batch_checks_lengths():
+    with pytest.raises(ValueError, match="length"):
+        _SlowVerifier().judge_batch(["a"], [])
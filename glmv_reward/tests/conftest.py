@@ -1,8 +1,47 @@
 # tests/conftest.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 from glmv_reward.reward_system import RewardSystem
 
+# * a verifier config deciding math answers by rules only
+RULE_MATH_CONFIG = {"verifier_type": "math", "enable_llm_judge_fallback": False}
+
+
+def make_response(answer):
+    return f"<think>...</think><answer><|begin_of_box|>{answer}<|end_of_box|></answer>"
+
+
+def llm_judge_config(url, verifier_type="general"):
+    return {
+        "verifier_type": verifier_type,
+        "llm_api_key": "sk-test",
+        "llm_judge_url": url,
+        "llm_judge_prompt_template": "{question} {predict} {label}",
+    }
+
+
+def write_reward_config(config_file, reward_configs, **config):
+    """
+    Writes a reward system config mapping each datasource of `reward_configs` to its own verifier config, the other
+    top-level keys are given as keyword arguments.
+
+    Verifier instances are shared per datasource by the process, so datasources whose verifier config differs from
+    the one of `configs/full_config.yaml` should have a name of their own.
+    """
+    config = {
+        **config,
+        "datasource_reward_config_mapping": {datasource: f"{datasource}_config" for datasource in reward_configs},
+        "reward_configs": {f"{datasource}_config": value for datasource, value in reward_configs.items()},
+    }
+    # * YAML is a superset of JSON
+    config_file.write_text(json.dumps(config))
+    return config_file
+
 
 @pytest.fixture(scope="session")
 def reward_system_instance():
@@ -97,3 +136,83 @@ def long_doc_verifier(reward_system_instance):
 @pytest.fixture
 def language_mix_verifier(reward_system_instance):
     return reward_system_instance.get_verifier_from_datasource("language_mix")
+
+
+@pytest.fixture
+def make_reward_system(tmp_path):
+    """
+    Builds reward systems with `write_reward_config`, logging to `<tmp_path>/logs` unless `reward_log_dir` is given,
+    and closes them on teardown.
+    """
+    reward_systems = []
+
+    def make(reward_configs, **config):
+        config.setdefault("reward_log_dir", str(tmp_path / "logs"))
+        config_file = write_reward_config(tmp_path / f"config-{len(reward_systems)}.yaml", reward_configs, **config)
+        reward_system = RewardSystem(config_file)
+        reward_systems.append(reward_system)
+        return reward_system
+
+    yield make
+    for reward_system in reward_systems:
+        reward_system.close()
+
+
+class StubJudgeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        with server.lock:
+            server.requests.append(payload)
+            server.client_ports.add(self.client_address[1])
+            server.inflight += 1
+            server.max_inflight = max(server.max_inflight, server.inflight)
+        try:
+            time.sleep(server.delay)
+            with server.lock:
+                status = server.statuses.pop(0) if len(server.statuses) > 0 else server.status
+            if status == 200:
+                content = server.reply(payload) if callable(server.reply) else server.reply
+                body = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]}).encode()
+            else:
+                body = json.dumps({"error": {"message": "stub error"}}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.inflight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_judge():
+    """
+    A local OpenAI-compatible chat completion server, `reply` may be a string or a callable of the payload.
+
+    Requests get the HTTP status codes queued in `statuses` first, then `status`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubJudgeHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.client_ports = set()
+    server.inflight = 0
+    server.max_inflight = 0
+    server.delay = 0.0
+    server.status = 200
+    server.statuses = []
+    server.reply = "1.0"
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
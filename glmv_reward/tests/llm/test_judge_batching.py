@@ -0,0 +1,88 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from glmv_reward.configs import LLMEngineConfig
+from glmv_reward.utils.llm import LLMJudgeEngine, pack_judge_prompts, parse_packed_replies
+
+_TEMPLATE = "Judge whether the answer matches the ground truth.\nReply with 1.0 or 0.0.\nAnswer: {answer}"
+
+
+@pytest.fixture
+def engine():
+    # * a long wait so that the batches in the tests are only sent once full
+    engine = LLMJudgeEngine(LLMEngineConfig(http2=False, judge_batch_wait=5.0))
+    yield engine
+    engine.close()
+
+
+def _packed_reply(payload):
+    content = payload["messages"][0]["content"]
+    answers = re.findall(r"Answer: (\S+)", content)
+    return json.dumps([f"verdict {answer}" for answer in answers])
+
+
+def _judge_concurrently(engine, url, answers, batch_size):
+    with ThreadPoolExecutor(len(answers)) as pool:
+        return list(
+            pool.map(
+                lambda answer: engine.post_query_llm(
+                    _TEMPLATE.format(answer=answer), "sk-test", url=url, batch_size=batch_size
+                ),
+                answers,
+            )
+        )
+
+
+def test_packs_concurrent_prompts_into_one_request(engine, stub_judge):
+    stub_judge.reply = _packed_reply
+    answers = ["1", "2", "3", "4"]
+    assert _judge_concurrently(engine, stub_judge.url, answers, batch_size=4) == [f"verdict {a}" for a in answers]
+
+    assert len(stub_judge.requests) == 1
+    payload = stub_judge.requests[0]
+    assert payload["max_tokens"] == (10 + 8) * 4 + 16
+    # * the shared instructions are only sent once
+    assert payload["messages"][0]["content"].count("Judge whether the answer") == 1
+
+
+def test_falls_back_to_single_requests_on_unparsable_reply(engine, stub_judge):
+    stub_judge.reply = "1.0"
+    assert _judge_concurrently(engine, stub_judge.url, ["1", "2", "3"], batch_size=3) == ["1.0"] * 3
+    assert len(stub_judge.requests) == 1 + 3
+
+
+def test_partial_batch_is_sent_after_wait(stub_judge):
+    engine = LLMJudgeEngine(LLMEngineConfig(http2=False, judge_batch_wait=0.01))
+    try:
+        assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url, batch_size=8) == "1.0"
+    finally:
+        engine.close()
+    assert stub_judge.requests[0]["messages"] == [{"role": "user", "content": "prompt"}]
+
+
+def test_pack_judge_prompts_hoists_shared_lines():
+    packed = pack_judge_prompts([_TEMPLATE.format(answer="12"), _TEMPLATE.format(answer="13")])
+    assert "JSON array of 2 strings" in packed
+    assert packed.count("Reply with 1.0 or 0.0.") == 1
+    assert "### Task 1\nAnswer: 12" in packed
+    assert "### Task 2\nAnswer: 13" in packed
+
+
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        ('["1.0", "0.0"]', ["1.0", "0.0"]),
+        ('```json\n["yes", "no"]\n```', ["yes", "no"]),
+        ("Verdicts: [1.0, 0]", ["1.0", "0"]),
+        ('["1.0"]', None),
+        ('["1.0", ["0.0"]]', None),
+        ('["1.0", true]', None),
+        ('["1.0", "0.0"', None),
+        ("1.0", None),
+    ],
+)
+def test_parse_packed_replies(response, expected):
+    assert parse_packed_replies(response, 2) == expected
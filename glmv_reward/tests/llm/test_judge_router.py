@@ -0,0 +1,181 @@
+import pytest
+
+from glmv_reward.configs import JudgeRouterConfig, LLMEngineConfig
+from glmv_reward.utils.judge_router import (
+    EndpointRouter,
+    add_endpoint_metrics_hook,
+    remove_endpoint_metrics_hook,
+    retry_backoff,
+)
+from glmv_reward.utils.llm import LLMJudgeEngine
+
+_DOWN_URL = "http://127.0.0.1:9/v1/chat/completions"
+
+
+@pytest.fixture
+def make_engine():
+    engines = []
+
+    def make(**kwargs):
+        engine = LLMJudgeEngine(LLMEngineConfig(http2=False, router=JudgeRouterConfig(**kwargs)))
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.close()
+
+
+@pytest.fixture
+def metrics_events():
+    events = []
+
+    def hook(url, latency_s, success):
+        events.append((url, success))
+
+    add_endpoint_metrics_hook(hook)
+    yield events
+    remove_endpoint_metrics_hook(hook)
+
+
+def _fail(router, url, times):
+    for _ in range(times):
+        assert router.pick(url) == url
+        router.on_start(url)
+        router.on_finish(url, 0.1, success=False)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    router = EndpointRouter(
+        JudgeRouterConfig(replicas={"http://a": ["http://b"]}, failure_threshold=3, open_seconds=10.0)
+    )
+    router.on_start("http://b")
+    router.on_finish("http://b", 5.0, success=True)
+    _fail(router, "http://a", 3)
+    assert router.stats()["http://a"].state == "open"
+    assert router.pick("http://a") == "http://b"
+
+    # * after `open_seconds`, a single probe is let through and its success closes the circuit
+    router._endpoints["http://a"].opened_at -= 10.0
+    assert router.pick("http://a") == "http://a"
+    assert router.pick("http://a") == "http://b"
+    router.on_start("http://a")
+    router.on_finish("http://a", 0.1, success=True)
+    assert router.stats()["http://a"].state == "closed"
+    assert router.stats()["http://a"].consecutive_failures == 0
+
+
+def test_failed_probe_reopens_circuit():
+    router = EndpointRouter(JudgeRouterConfig(failure_threshold=1, open_seconds=10.0))
+    _fail(router, "http://a", 1)
+    router._endpoints["http://a"].opened_at -= 10.0
+    _fail(router, "http://a", 1)
+    assert router.stats()["http://a"].state == "open"
+
+
+def test_requests_are_sent_without_healthy_alternative():
+    router = EndpointRouter(JudgeRouterConfig(replicas={"http://a": ["http://b"]}, failure_threshold=1))
+    _fail(router, "http://a", 1)
+    router.on_start("http://b")
+    router.on_finish("http://b", 0.1, success=False)
+    # * the endpoint whose circuit opened first is the closest to its probe
+    assert router.pick("http://a") == "http://a"
+    assert router.pick("http://a", exclude=["http://a"]) == "http://b"
+    assert router.stats()["http://a"].state == "open"
+
+
+def test_rate_limits_do_not_open_the_circuit():
+    router = EndpointRouter(JudgeRouterConfig(failure_threshold=2))
+    for _ in range(3):
+        router.on_start("http://a")
+        router.on_rate_limited("http://a")
+    stats = router.stats()["http://a"]
+    assert (stats.state, stats.failures, stats.inflight) == ("closed", 0, 0)
+
+
+def test_picks_replica_with_lowest_expected_wait():
+    router = EndpointRouter(JudgeRouterConfig(replicas={"http://a": ["http://b"]}))
+    for url, latency_s in [("http://a", 1.0), ("http://b", 0.3)]:
+        router.on_start(url)
+        router.on_finish(url, latency_s, success=True)
+    assert router.pick("http://a") == "http://b"
+
+    for _ in range(4):
+        router.on_start("http://b")
+    assert router.pick("http://a") == "http://a"
+    assert router.pick("http://a", exclude=["http://a"]) == "http://b"
+
+
+def test_ewma_stats():
+    router = EndpointRouter(JudgeRouterConfig(ewma_alpha=0.5))
+    for latency_s, success in [(1.0, True), (3.0, False)]:
+        router.on_start("http://a")
+        router.on_finish("http://a", latency_s, success=success)
+    stats = router.stats()["http://a"]
+    assert stats.ewma_latency_s == pytest.approx(2.0)
+    assert stats.ewma_error_rate == pytest.approx(0.5)
+    assert (stats.requests, stats.failures, stats.inflight) == (2, 1, 0)
+
+
+def test_backoff_is_capped():
+    config = JudgeRouterConfig(backoff_base=0.5, backoff_max=2.0)
+    assert all(0.0 <= retry_backoff(config, attempt) <= 2.0 for attempt in range(1, 20))
+
+
+def test_retries_on_healthy_replica(make_engine, stub_judge, metrics_events):
+    engine = make_engine(replicas={_DOWN_URL: [stub_judge.url]}, backoff_base=0.01)
+    assert engine.post_query_llm("prompt", "sk-test", url=_DOWN_URL) == "1.0"
+    assert len(stub_judge.requests) == 1
+    assert metrics_events == [(_DOWN_URL, False), (stub_judge.url, True)]
+
+
+def test_single_endpoint_recovers_after_outage(make_engine, stub_judge):
+    engine = make_engine(enabled=True, failure_threshold=2, max_retries=0)
+    stub_judge.status = 500
+    for _ in range(3):
+        assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == ""
+    assert engine.router.stats()[stub_judge.url].state == "open"
+
+    # * the open circuit of the only endpoint does not drop requests
+    stub_judge.status = 200
+    assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == "1.0"
+    assert len(stub_judge.requests) == 4
+    assert engine.router.stats()[stub_judge.url].state == "closed"
+
+
+def test_client_errors_are_not_retried(make_engine, stub_judge):
+    engine = make_engine(enabled=True, backoff_base=0.01)
+    stub_judge.status = 400
+    assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == ""
+    assert len(stub_judge.requests) == 1
+    assert engine.router.stats()[stub_judge.url].failures == 0
+
+
+def test_router_is_only_enabled_by_default_with_replicas():
+    assert not JudgeRouterConfig().is_enabled
+    assert JudgeRouterConfig(replicas={"http://a": ["http://b"]}).is_enabled
+    assert not JudgeRouterConfig(enabled=False, replicas={"http://a": ["http://b"]}).is_enabled
+
+
+def test_single_url_retries_transient_errors(make_engine, stub_judge):
+    engine = make_engine(backoff_base=0.01)
+    assert engine.router is None
+    stub_judge.statuses = [503, 429]
+    assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == "1.0"
+    assert len(stub_judge.requests) == 3
+
+    # * retries stop after `max_retries`
+    stub_judge.status = 500
+    assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == ""
+    assert len(stub_judge.requests) == 6
+
+
+def test_timeouts_are_only_retried_on_another_replica(make_engine, stub_judge):
+    stub_judge.delay = 0.3
+    engine = make_engine(backoff_base=0.01)
+    assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url, timeout=0.1) == ""
+    assert len(stub_judge.requests) == 1
+
+    stub_judge.delay = 0.0
+    engine = make_engine(replicas={_DOWN_URL: [stub_judge.url]}, backoff_base=0.01)
+    assert engine.post_query_llm("prompt", "sk-test", url=_DOWN_URL, timeout=0.1) == "1.0"
@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from glmv_reward.configs import JudgeCacheConfig, LLMEngineConfig
+from glmv_reward.utils import cache as cache_module
+from glmv_reward.utils import llm as llm_module
+from glmv_reward.utils.cache import configure_verdict_cache
+from glmv_reward.utils.llm import LLMJudgeEngine, vote_llm_judges
+
+
+@pytest.fixture
+def use_engine():
+    previous = llm_module._ENGINE
+    engines = []
+
+    def use(**kwargs):
+        engine = LLMJudgeEngine(LLMEngineConfig(http2=False, **kwargs))
+        engines.append(engine)
+        llm_module._ENGINE = engine
+        return engine
+
+    yield use
+    llm_module._ENGINE = previous
+    for engine in engines:
+        engine.close()
+
+
+def _slow_model_reply(replies, delay=3.0):
+    # * each endpoint is told apart by its model, the "slow" one only answers after `delay` seconds
+    def reply(payload):
+        if payload["model"].startswith("slow"):
+            time.sleep(delay)
+        return replies[payload["model"]]
+
+    return reply
+
+
+def _score(response):
+    return 1.0 if "1.0" in response else 0.0
+
+
+def _vote(url, models, **kwargs):
+    return vote_llm_judges("Is 2 + 2 = 4?", ["sk-test"] * len(models), [url] * len(models), models, _score, **kwargs)
+
+
+@pytest.mark.parametrize(("verdict", "expected"), [("1.0", 1.0), ("0.0", 0.0)])
+def test_majority_returns_without_waiting_for_stragglers(use_engine, stub_judge, verdict, expected):
+    use_engine()
+    stub_judge.reply = _slow_model_reply({"a": verdict, "b": verdict, "slow": "1.0"})
+
+    start = time.monotonic()
+    assert _vote(stub_judge.url, ["a", "b", "slow"]) == expected
+    assert time.monotonic() - start < 2.0
+
+
+def test_waits_for_the_deciding_vote(use_engine, stub_judge):
+    use_engine()
+    stub_judge.reply = _slow_model_reply({"a": "1.0", "b": "0.0", "slow": "1.0"}, delay=0.5)
+    assert _vote(stub_judge.url, ["a", "b", "slow"]) == 1.0
+    assert len(stub_judge.requests) == 3
+
+
+def test_queries_endpoints_concurrently(use_engine, stub_judge):
+    use_engine(judge_vote_early_exit=False)
+    stub_judge.delay = 0.5
+    stub_judge.reply = "1.0"
+
+    start = time.monotonic()
+    assert _vote(stub_judge.url, ["a", "b", "c"]) == 1.0
+    assert time.monotonic() - start < 1.2
+    assert stub_judge.max_inflight == 3
+
+
+def test_mean_of_all_endpoints(use_engine, stub_judge):
+    use_engine()
+    stub_judge.reply = _slow_model_reply({"a": "1.0", "b": "0.0", "slow": "1.0"}, delay=0.2)
+    assert _vote(stub_judge.url, ["a", "b", "slow"], majority=False) == pytest.approx(2 / 3)
+
+
+@pytest.mark.parametrize(("early_exit", "expected"), [(False, 1.0), (True, 0.0)])
+def test_out_of_range_scores_are_only_clipped_with_early_exit(use_engine, stub_judge, early_exit, expected):
+    use_engine(judge_vote_early_exit=early_exit)
+    stub_judge.reply = lambda payload: {"a": "2", "b": "0", "c": "0"}[payload["model"]]
+
+    # * without early exit, the scores sum up as they are, so the reply "2" alone makes a majority
+    models = ["a", "b", "c"]
+    assert vote_llm_judges("prompt", ["sk-test"] * 3, [stub_judge.url] * 3, models, float) == expected
+
+
+def test_mean_keeps_out_of_range_scores(use_engine, stub_judge):
+    use_engine()
+    stub_judge.reply = lambda payload: {"a": "2", "b": "0", "c": "-1"}[payload["model"]]
+    models = ["a", "b", "c"]
+    assert vote_llm_judges(
+        "prompt", ["sk-test"] * 3, [stub_judge.url] * 3, models, float, majority=False
+    ) == pytest.approx(1 / 3)
+
+
+def test_endpoint_timeout_counts_as_failed_vote(use_engine, stub_judge):
+    use_engine(judge_endpoint_timeouts={"default": 0.3})
+    stub_judge.reply = _slow_model_reply({"a": "1.0", "slow": "1.0"})
+
+    start = time.monotonic()
+    assert _vote(stub_judge.url, ["a", "slow"], majority=False) == 0.5
+    assert time.monotonic() - start < 2.0
+
+
+def test_hedges_slow_requests(use_engine, stub_judge):
+    use_engine(judge_hedge_delay=0.2)
+    lock = threading.Lock()
+    num_requests = []
+
+    def reply(payload):
+        with lock:
+            num_requests.append(payload)
+            is_first = len(num_requests) == 1
+        if is_first:
+            time.sleep(3.0)
+        return "1.0"
+
+    stub_judge.reply = reply
+    start = time.monotonic()
+    assert _vote(stub_judge.url, ["a"]) == 1.0
+    assert time.monotonic() - start < 2.0
+    assert len(num_requests) == 2
+
+
+def test_cached_votes_skip_requests(use_engine, stub_judge):
+    use_engine()
+    previous = cache_module._VERDICT_CACHE
+    try:
+        configure_verdict_cache(JudgeCacheConfig(max_size=16))
+        stub_judge.reply = "1.0"
+        assert _vote(stub_judge.url, ["a", "b", "c"], cache_keys=["ka", "kb", "kc"]) == 1.0
+        num_requests = len(stub_judge.requests)
+        assert _vote(stub_judge.url, ["a", "b", "c"], cache_keys=["ka", "kb", "kc"]) == 1.0
+        assert len(stub_judge.requests) == num_requests
+    finally:
+        cache_module._VERDICT_CACHE = previous
+
+
+def test_mismatched_endpoint_lists_raise():
+    with pytest.raises(ValueError, match="API keys"):
+        vote_llm_judges("prompt", ["sk-test"], ["http://a", "http://b"], ["m", "m"], _score)
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from glmv_reward.configs import LLMEngineConfig
+from glmv_reward.utils.llm import LLMJudgeEngine, post_query_llm
+
+
+@pytest.fixture
+def engine():
+    engine = LLMJudgeEngine(LLMEngineConfig(max_concurrency_per_endpoint=2, http2=False))
+    yield engine
+    engine.close()
+
+
+def test_post_query_llm_returns_content(stub_judge):
+    stub_judge.reply = "1.0"
+    assert post_query_llm("Is 2 + 2 = 4?", "sk-test", url=stub_judge.url, model="stub") == "1.0"
+
+    payload = stub_judge.requests[-1]
+    assert payload["model"] == "stub"
+    assert payload["messages"] == [{"role": "user", "content": "Is 2 + 2 = 4?"}]
+
+
+def test_post_query_llm_swallows_http_errors(stub_judge):
+    stub_judge.status = 500
+    assert post_query_llm("prompt", "sk-test", url=stub_judge.url) == ""
+
+
+def test_unreachable_endpoint_returns_empty_string():
+    assert post_query_llm("prompt", "sk-test", url="http://127.0.0.1:9/v1/chat/completions", timeout=2) == ""
+
+
+def test_engine_reuses_connections(engine, stub_judge):
+    for _ in range(8):
+        assert engine.post_query_llm("prompt", "sk-test", url=stub_judge.url) == "1.0"
+    assert len(stub_judge.requests) == 8
+    assert len(stub_judge.client_ports) == 1
+
+
+def test_engine_bounds_concurrency_per_endpoint(engine, stub_judge):
+    stub_judge.delay = 0.05
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(
+            executor.map(lambda i: engine.post_query_llm(f"prompt {i}", "sk-test", url=stub_judge.url), range(16))
+        )
+    assert results == ["1.0"] * 16
+    assert stub_judge.max_inflight <= 2
+
+
+def test_engine_rejects_blocking_calls_from_its_own_loop(engine, stub_judge):
+    async def nested():
+        return engine.post_query_llm("prompt", "sk-test", url=stub_judge.url)
+
+    with pytest.raises(RuntimeError):
+        engine.run(nested())
@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from glmv_reward.configs import JudgeRouterConfig, LLMEngineConfig
+from glmv_reward.configs.verifiers.math import MathVerifierConfig
+from glmv_reward.utils import rate_limit as rate_limit_module
+from glmv_reward.utils.llm import LLMJudgeEngine
+from glmv_reward.utils.rate_limit import RateLimiter, TokenBucket, estimate_tokens
+from glmv_reward.verifiers import get_verifier_from_config
+
+
+@pytest.fixture
+def rate_limiter(monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setattr(rate_limit_module, "_RATE_LIMITER", limiter)
+    return limiter
+
+
+def test_token_bucket_queues_reservations():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    now = bucket.updated
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == pytest.approx(0.1)
+    assert bucket.reserve(1, now) == pytest.approx(0.2)
+    # * requests larger than the bucket only wait for a full bucket
+    assert bucket.wait_time(100, now + 10.0) == 0.0
+
+
+def test_requests_per_second_are_enforced():
+    limiter = RateLimiter()
+    limiter.set_limits(["sk-a"], ["http://judge"], requests_per_second=20.0)
+    start = time.monotonic()
+    with ThreadPoolExecutor(8) as pool:
+        keys = list(pool.map(lambda _: limiter.acquire_blocking("sk-a", "http://judge"), range(30)))
+    assert keys == ["sk-a"] * 30
+    # * a burst of 20 requests, then 10 more at 20 per second
+    assert time.monotonic() - start >= 0.4
+
+
+def test_spreads_requests_over_pooled_keys():
+    limiter = RateLimiter()
+    limiter.set_limits(["sk-a", "sk-b"], ["http://judge"], requests_per_second=1.0)
+    assert limiter.acquire_blocking("sk-a", "http://judge") == "sk-a"
+    assert limiter.acquire_blocking("sk-a", "http://judge") == "sk-b"
+    # * keys are only pooled for the URLs they are configured for
+    assert limiter._reserve("sk-a", "http://other", 0)[0] == "sk-a"
+
+
+def test_tokens_per_minute_and_settle():
+    limiter = RateLimiter()
+    limiter.set_limits(["sk-a"], ["http://judge"], tokens_per_minute=600.0)
+    assert limiter._reserve("sk-a", "http://judge", 600)[1] == 0.0
+    assert limiter._reserve("sk-a", "http://judge", 60)[1] == pytest.approx(6.0, abs=0.1)
+    # * the requests used fewer tokens than reserved
+    limiter.settle("sk-a", 660, 60)
+    assert limiter._reserve("sk-a", "http://judge", 60)[1] == 0.0
+
+
+def test_lower_limits_win():
+    limiter = RateLimiter()
+    limiter.set_limits(["sk-a"], ["http://judge"], requests_per_second=10.0)
+    limiter.set_limits(["sk-a"], ["http://judge"], requests_per_second=2.0, tokens_per_minute=1000.0)
+    limit = limiter._limits["sk-a"]
+    assert (limit.requests_per_second, limit.tokens_per_minute) == (2.0, 1000.0)
+
+
+def test_unlimited_keys_pass_through():
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert limiter._reserve("sk-a", "http://judge", 10**9) == ("sk-a", 0.0)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("abcd" * 10, 5) == 15
+    assert estimate_tokens("", None) == 0
+
+
+def test_engine_waits_instead_of_failing(rate_limiter, stub_judge):
+    rate_limiter.set_limits(["sk-test"], [stub_judge.url], requests_per_second=10.0)
+    engine = LLMJudgeEngine(LLMEngineConfig(http2=False))
+    try:
+        start = time.monotonic()
+        with ThreadPoolExecutor(16) as pool:
+            responses = list(pool.map(lambda _: engine.post_query_llm("p", "sk-test", url=stub_judge.url), range(15)))
+        assert time.monotonic() - start >= 0.4
+    finally:
+        engine.close()
+    assert responses == ["1.0"] * 15
+
+
+def test_retries_reserve_once(rate_limiter, stub_judge, monkeypatch):
+    rate_limiter.set_limits(["sk-test"], [stub_judge.url], requests_per_second=10.0)
+    reservations = []
+    reserve = rate_limiter._reserve
+    monkeypatch.setattr(rate_limiter, "_reserve", lambda *args: reservations.append(args) or reserve(*args))
+    stub_judge.statuses = [503]
+    engine = LLMJudgeEngine(LLMEngineConfig(http2=False, router=JudgeRouterConfig(backoff_base=0.01)))
+    try:
+        assert engine.post_query_llm("p", "sk-test", url=stub_judge.url) == "1.0"
+    finally:
+        engine.close()
+    assert len(stub_judge.requests) == 2
+    assert len(reservations) == 1
+
+
+def test_verifier_config_sets_limits(rate_limiter):
+    config = MathVerifierConfig(
+        llm_api_key=["sk-a", "sk-b"],
+        llm_judge_url=["http://judge", "http://judge"],
+        llm_requests_per_second=5.0,
+    )
+    get_verifier_from_config(config, "rate_limited_math")
+    assert rate_limiter._limits["sk-a"].requests_per_second == 5.0
+    assert rate_limiter._pools["http://judge"] == ["sk-a", "sk-b"]
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+from glmv_reward.configs import JudgeCacheConfig
+from glmv_reward.utils import cache as cache_module
+from glmv_reward.utils.cache import VerdictCache, configure_verdict_cache, make_verdict_key
+from glmv_reward.utils.llm import post_query_llm
+from glmv_reward.verifiers import GeneralVerifier
+
+
+@pytest.fixture
+def verdict_cache():
+    previous = cache_module._VERDICT_CACHE
+    yield configure_verdict_cache(JudgeCacheConfig(max_size=16))
+    cache_module._VERDICT_CACHE = previous
+
+
+def test_make_verdict_key_separates_endpoint_slots():
+    key = make_verdict_key("{question} {predict} {label}", "glm", "q", "1", "1", endpoint="0@http://a")
+    assert key == make_verdict_key("{question} {predict} {label}", "glm", "q", "1", "1", endpoint="0@http://a")
+    assert key != make_verdict_key("{question} {predict} {label}", "glm", "q", "1", "1", endpoint="1@http://a")
+    assert key != make_verdict_key("{question} {predict} {label}", "glm", "q", "2", "1", endpoint="0@http://a")
+
+
+def test_verdicts_are_not_reused_across_sampling_configs(verdict_cache, stub_judge):
+    stub_judge.reply = "\\boxed{Correct}"
+
+    def judge(**llm_kwargs):
+        verifier = GeneralVerifier("sk-test", stub_judge.url, "{question} {predict} {label}", **llm_kwargs)
+        return verifier.judge("1", "2", question="q")
+
+    assert judge() == 1.0
+    assert judge() == 1.0
+    assert len(stub_judge.requests) == 1
+    for llm_kwargs in [{"llm_max_tokens": 64}, {"llm_temperature": 0.7}, {"llm_top_p": 0.9}]:
+        assert judge(**llm_kwargs) == 1.0
+    assert len(stub_judge.requests) == 4
+
+
+def test_lru_eviction():
+    cache = VerdictCache(max_size=2)
+    cache.put("a", "1.0")
+    cache.put("b", "0.0")
+    assert cache.get("a") == "1.0"
+    cache.put("c", "1.0")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1.0"
+    assert cache.get("c") == "1.0"
+    assert cache.stats() == {"hits": 3, "misses": 1, "disk_hits": 0, "size": 2}
+
+
+def test_ttl_expiry():
+    cache = VerdictCache(ttl=0.05)
+    cache.put("a", "1.0")
+    assert cache.get("a") == "1.0"
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_tier_is_shared(tmp_path):
+    sqlite_path = str(tmp_path / "verdicts.sqlite")
+    VerdictCache(sqlite_path=sqlite_path).put("a", "1.0")
+
+    cache = VerdictCache(sqlite_path=sqlite_path)
+    assert cache.get("a") == "1.0"
+    assert cache.get("a") == "1.0"
+    assert cache.stats() == {"hits": 2, "misses": 0, "disk_hits": 1, "size": 1}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires `os.fork`")
+def test_sqlite_connection_is_reopened_after_fork(tmp_path):
+    previous = cache_module._VERDICT_CACHE
+    try:
+        cache = configure_verdict_cache(JudgeCacheConfig(sqlite_path=str(tmp_path / "verdicts.sqlite")))
+        cache.put("a", "1.0")
+        parent_conn = cache._local.conn
+
+        pid = os.fork()
+        if pid == 0:
+            is_reopened = False
+            try:
+                cache.put("b", "0.0")
+                is_reopened = (
+                    cache._local.conn is not parent_conn and cache._get_from_disk("a", time.time()) is not None
+                )
+            finally:
+                os._exit(0 if is_reopened else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert cache.get("b") == "0.0"
+        assert cache._local.conn is parent_conn
+    finally:
+        cache_module._VERDICT_CACHE = previous
+
+
+def test_post_query_llm_reuses_cached_verdicts(verdict_cache, stub_judge):
+    for _ in range(3):
+        assert post_query_llm("prompt", "sk-test", url=stub_judge.url, cache_key="k") == "1.0"
+    assert len(stub_judge.requests) == 1
+    assert verdict_cache.stats()["hits"] == 2
+
+
+def test_post_query_llm_does_not_cache_failures(verdict_cache, stub_judge):
+    stub_judge.status = 500
+    assert post_query_llm("prompt", "sk-test", url=stub_judge.url, cache_key="k") == ""
+    num_failed_requests = len(stub_judge.requests)
+    stub_judge.status = 200
+    assert post_query_llm("prompt", "sk-test", url=stub_judge.url, cache_key="k") == "1.0"
+    assert len(stub_judge.requests) == num_failed_requests + 1
@@ -0,0 +1,159 @@
+import json
+
+import httpx
+import pytest
+from conftest import RULE_MATH_CONFIG, llm_judge_config, make_response
+from sympy import Rational, sympify
+
+from glmv_reward.configs import MetricsConfig, ServerConfig
+from glmv_reward.server import RewardServer
+from glmv_reward.utils.metrics import MetricsRegistry, configure_metrics, get_metrics, note_decision, take_notes
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers
+
+
+def _decisions(snapshot):
+    return {
+        (sample["labels"]["datasource"], sample["labels"]["tier"]): sample["value"]
+        for sample in snapshot.get("glmv_reward_decisions_total", [])
+    }
+
+
+@pytest.fixture
+def make_metrics_reward_system(make_reward_system):
+    def make(backend="thread", url="http://127.0.0.1:9/v1/chat/completions", enabled=True):
+        # * verifier instances are shared per datasource by the process, so the datasources of this config are unique
+        return make_reward_system(
+            {"metrics_general": llm_judge_config(url), "metrics_math": RULE_MATH_CONFIG},
+            judge_cache={"enabled": False},
+            llm_engine={"http2": False},
+            executor={"backend": backend, "num_processes": 2},
+            metrics={"enabled": enabled, "exporters": ["reward_log"], "log_interval": 0.0},
+        )
+
+    yield make
+    configure_metrics(MetricsConfig())
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry(buckets=[0.1, 1.0])
+    registry.inc("glmv_reward_decisions_total", ("math", "MathVerifier", "exact_match"), 3)
+    registry.observe_many("glmv_reward_call_seconds", ("score",), [0.05, 0.5, 2.0])
+
+    text = registry.render_prometheus()
+    assert "# TYPE glmv_reward_decisions_total counter" in text
+    assert 'glmv_reward_decisions_total{datasource="math",verifier="MathVerifier",tier="exact_match"} 3.0' in text
+    assert 'glmv_reward_call_seconds_bucket{stage="score",le="0.1"} 1' in text
+    assert 'glmv_reward_call_seconds_bucket{stage="score",le="1.0"} 2' in text
+    assert 'glmv_reward_call_seconds_bucket{stage="score",le="+Inf"} 3' in text
+    assert 'glmv_reward_call_seconds_count{stage="score"} 3' in text
+
+    histogram = registry.snapshot()["glmv_reward_call_seconds"][0]
+    assert histogram["count"] == 3
+    assert histogram["sum"] == pytest.approx(2.55)
+
+
+def test_notes_are_dropped_when_disabled():
+    configure_metrics(MetricsConfig())
+    note_decision("exact_match")
+    assert take_notes() is None
+
+    configure_metrics(MetricsConfig(enabled=True))
+    try:
+        assert compare_real_numbers("42.0", "42", 1e-4) is SymbolicResult.MATCH
+        assert take_notes().tier == "numeric"
+        compare_real_numbers(Rational(1, 2), sympify(0.5), 1e-4)
+        assert take_notes().tier == "sympy"
+    finally:
+        configure_metrics(MetricsConfig())
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_reward_system_counts_decision_tiers(make_metrics_reward_system, backend):
+    reward_system = make_metrics_reward_system(backend)
+    rewards = reward_system.get_reward(
+        prompts=["What is 6 * 7?"] * 4,
+        answers=[make_response("42"), make_response("42.0"), make_response("41"), "bad format"],
+        gt_answers=[make_response("42")] * 4,
+        datasources="metrics_math",
+    )
+
+    assert rewards == [1.0, 1.0, 0.0, 0.0]
+    snapshot = reward_system.metrics_snapshot()
+    # * numeric mismatches are not decided natively, the rules of `judge` give the minimum reward without a judge
+    assert _decisions(snapshot) == {
+        ("metrics_math", "exact_match"): 1,
+        ("metrics_math", "numeric"): 1,
+        ("metrics_math", "rule"): 1,
+        ("metrics_math", "format_failure"): 1,
+    }
+    stages = {sample["labels"]["stage"]: sample["count"] for sample in snapshot["glmv_reward_stage_seconds"]}
+    assert stages["format"] == 4
+    assert stages["extract"] == 3
+    assert "judge" in stages
+    calls = {sample["labels"]["stage"]: sample["count"] for sample in snapshot["glmv_reward_call_seconds"]}
+    assert calls == {"score": 1, "total": 1}
+
+
+def test_llm_tier_and_request_latencies(make_metrics_reward_system, stub_judge, tmp_path):
+    stub_judge.reply = "<|begin_of_box|>Correct<|end_of_box|>"
+    reward_system = make_metrics_reward_system(url=stub_judge.url)
+    rewards = reward_system.get_reward(
+        prompts=["Name the capital of France."],
+        answers=[make_response("paris")],
+        gt_answers=[make_response("Paris")],
+        datasources="metrics_general",
+        log_reward_judge=True,
+    )
+
+    assert rewards == [1.0]
+    snapshot = reward_system.metrics_snapshot()
+    assert _decisions(snapshot) == {("metrics_general", "llm"): 1}
+    (judge_seconds,) = snapshot["glmv_reward_judge_seconds"]
+    assert judge_seconds["labels"]["tier"] == "llm"
+    (request_seconds,) = snapshot["glmv_reward_llm_request_seconds"]
+    assert request_seconds["labels"] == {"endpoint": stub_judge.url, "outcome": "success"}
+    assert "log" in {sample["labels"]["stage"] for sample in snapshot["glmv_reward_call_seconds"]}
+
+    # * the `reward_log` exporter appends a snapshot after each call
+    assert reward_system.flush_reward_logs(timeout=10)
+    lines = (tmp_path / "logs" / "metrics.jsonl").read_text().splitlines()
+    assert "glmv_reward_decisions_total" in json.loads(lines[-1])["metrics"]
+
+
+def test_metrics_disabled(make_metrics_reward_system):
+    reward_system = make_metrics_reward_system(enabled=False)
+    reward_system.get_reward(
+        prompts=["What is 6 * 7?"],
+        answers=[make_response("42")],
+        gt_answers=[make_response("42")],
+        datasources="metrics_math",
+    )
+
+    assert reward_system.metrics is None
+    assert get_metrics() is None
+    assert reward_system.metrics_snapshot() == {}
+
+
+def test_reward_server_serves_metrics(make_metrics_reward_system):
+    server = RewardServer(make_metrics_reward_system(), ServerConfig(port=0))
+    server.start()
+    try:
+        httpx.post(
+            f"{server.url}/v1/reward",
+            json={
+                "prompts": ["q"],
+                "answers": [make_response("42")],
+                "gt_answers": [make_response("42")],
+                "datasources": "metrics_math",
+            },
+        ).raise_for_status()
+        response = httpx.get(f"{server.url}/metrics")
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert (
+        'glmv_reward_decisions_total{datasource="metrics_math",verifier="MathVerifier",tier="exact_match"} 1.0'
+        in response.text
+    )
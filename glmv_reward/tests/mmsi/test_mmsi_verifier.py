@@ -59,3 +59,18 @@ def test_judge_percentage_and_degree(mmsi_verifier):
     assert mmsi_verifier.judge("72°", "72") == 1.0
     assert mmsi_verifier.judge("72", "72°") == 1.0
     assert mmsi_verifier.judge("50 %", "0.5") == 1.0
+
+
+@pytest.mark.parametrize(("answer", "ground_truth"), [("1", "10"), ("3", "5"), ("42", "72"), ("1/2", "12")])
+def test_judge_numeric_mismatch_is_left_to_llm(mmsi_verifier, monkeypatch, answer, ground_truth):
+    # * the shipped tolerance is only meant for sympy, it must not accept wrong numbers
+    assert mmsi_verifier.sympy_tolerance == 0.9
+    fallback_calls = []
+
+    def llm_judge_fallback(extracted_answer, ground_truth, question=None, image_file=None):
+        fallback_calls.append((extracted_answer, ground_truth))
+        return 0.0
+
+    monkeypatch.setattr(mmsi_verifier, "_llm_judge_fallback", llm_judge_fallback)
+    assert mmsi_verifier.judge(answer, ground_truth) == 0.0
+    assert fallback_calls == [(answer, ground_truth)]
@@ -0,0 +1,134 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+from conftest import RULE_MATH_CONFIG, llm_judge_config, make_response
+
+from glmv_reward.configs import ProfilingConfig
+from glmv_reward.utils.profiling import (
+    PROFILE_ENV_VAR,
+    SamplingProfiler,
+    get_env_num_calls,
+    set_profile_label,
+    with_profile_label,
+)
+
+
+def _read_collapsed(path):
+    stacks = {}
+    for line in path.read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    return stacks
+
+
+@pytest.fixture
+def make_profiled_reward_system(make_reward_system, stub_judge):
+    stub_judge.reply = "<|begin_of_box|>Correct<|end_of_box|>"
+    stub_judge.delay = 0.2
+
+    # * verifier instances are shared per datasource by the process, the judge URL of this one changes with each test
+    def make(num_calls=0):
+        return make_reward_system(
+            {"profiled_general": llm_judge_config(stub_judge.url), "profiled_math": RULE_MATH_CONFIG},
+            judge_cache={"enabled": False},
+            profiling={"num_calls": num_calls, "signal_num_calls": 1, "signal": "SIGUSR2", "interval": 0.001},
+        )
+
+    return make
+
+
+def _score(reward_system):
+    return reward_system.get_reward(
+        prompts=["Name the capital of France.", "What is 6 * 7?"],
+        answers=[make_response("paris"), make_response("42")],
+        gt_answers=[make_response("Paris"), make_response("42")],
+        datasources=["profiled_general", "profiled_math"],
+    )
+
+
+def _profile_dirs(tmp_path):
+    profiles_dir = tmp_path / "logs" / "profiles"
+    return sorted(profiles_dir.iterdir()) if profiles_dir.exists() else []
+
+
+def test_sampling_profiler_collapses_labelled_threads(tmp_path):
+    profiler = SamplingProfiler(interval=0.001)
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    profiler.start()
+    labelled = threading.Thread(target=with_profile_label("busy", spin))
+    idle = threading.Thread(target=stop.wait)
+    labelled.start()
+    idle.start()
+    time.sleep(0.2)
+    stop.set()
+    labelled.join()
+    idle.join()
+    profiler.stop()
+
+    assert set(profiler.stacks) == {"busy"}
+    (path,) = profiler.write(str(tmp_path))
+    assert path.name == "busy.collapsed"
+    stacks = _read_collapsed(path)
+    assert sum(stacks.values()) == profiler.num_samples > 0
+    # * stacks are written root first
+    assert all(stack.startswith("_bootstrap (threading.py:") for stack in stacks)
+    assert any(stack.split(";")[-1].startswith("spin (test_profiling.py:") for stack in stacks)
+
+
+def test_labels_are_not_kept_without_profiler():
+    def label():
+        return set_profile_label(None)
+
+    # * unprofiled calls are not wrapped, so their threads stay unlabelled
+    assert with_profile_label("math", label) is label
+
+
+def test_profiles_the_armed_calls_per_datasource(make_profiled_reward_system, tmp_path):
+    reward_system = make_profiled_reward_system(num_calls=1)
+    assert _score(reward_system) == [1.0, 1.0]
+    (profile_dir,) = _profile_dirs(tmp_path)
+    assert {path.name for path in profile_dir.iterdir()} >= {"get_reward.collapsed", "profiled_general.collapsed"}
+    judge_stacks = _read_collapsed(profile_dir / "profiled_general.collapsed")
+    assert any("judge (general_verifier.py:" in stack for stack in judge_stacks)
+
+    # * only the armed call is profiled
+    _score(reward_system)
+    assert len(_profile_dirs(tmp_path)) == 1
+
+    reward_system.profile_next_calls(1)
+    _score(reward_system)
+    assert len(_profile_dirs(tmp_path)) == 2
+
+
+def test_profiling_armed_by_env_var_and_signal(make_profiled_reward_system, tmp_path, monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV_VAR, "1")
+    previous_handler = signal.getsignal(signal.SIGUSR2)
+    reward_system = make_profiled_reward_system()
+    try:
+        _score(reward_system)
+        assert len(_profile_dirs(tmp_path)) == 1
+
+        os.kill(os.getpid(), signal.SIGUSR2)
+        assert reward_system.profiler.remaining_calls == 1
+        _score(reward_system)
+        assert len(_profile_dirs(tmp_path)) == 2
+    finally:
+        signal.signal(signal.SIGUSR2, previous_handler)
+
+
+def test_signal_handler_is_opt_in():
+    assert ProfilingConfig().signal is None
+
+
+@pytest.mark.parametrize(("value", "expected"), [("", 0), (" 3 ", 3), ("1x", 0), ("true", 0), ("-1", 0)])
+def test_env_num_calls_ignores_invalid_values(value, expected, monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV_VAR, value)
+    assert get_env_num_calls() == expected
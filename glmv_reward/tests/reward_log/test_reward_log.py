@@ -0,0 +1,94 @@
+import threading
+
+import msgspec
+
+from glmv_reward.utils import reward_log
+from glmv_reward.utils.reward_log import RewardLogWriter
+
+
+def _line(value):
+    return msgspec.json.encode({"value": value}) + b"\n"
+
+
+def _read(path):
+    return [msgspec.json.decode(line)["value"] for line in path.read_bytes().splitlines()]
+
+
+def test_writes_lines_in_order_per_file(tmp_path):
+    writer = RewardLogWriter(flush_interval=60)
+    for i in range(100):
+        assert writer.write(tmp_path / "math" / f"log_{i % 2}.jsonl", _line(i))
+    assert writer.flush(timeout=10)
+
+    assert _read(tmp_path / "math" / "log_0.jsonl") == list(range(0, 100, 2))
+    assert _read(tmp_path / "math" / "log_1.jsonl") == list(range(1, 100, 2))
+    assert writer.written == 100
+    writer.close(timeout=10)
+
+
+def test_keeps_one_handle_per_file(tmp_path, monkeypatch):
+    writer = RewardLogWriter()
+    opened = []
+    get_handle = writer._get_handle
+
+    def counting_get_handle(path):
+        if path not in writer._handles:
+            opened.append(path)
+        return get_handle(path)
+
+    monkeypatch.setattr(writer, "_get_handle", counting_get_handle)
+    for _ in range(3):
+        for i in range(50):
+            writer.write(tmp_path / "log.jsonl", _line(i))
+        writer.flush(timeout=10)
+    assert opened == [str(tmp_path / "log.jsonl")]
+    writer.close(timeout=10)
+
+
+def test_drops_lines_instead_of_blocking(tmp_path, monkeypatch):
+    writer = RewardLogWriter(queue_size=10)
+    release = threading.Event()
+    write_pending = writer._write_pending
+
+    def blocked_write_pending(pending):
+        release.wait(10)
+        write_pending(pending)
+
+    monkeypatch.setattr(writer, "_write_pending", blocked_write_pending)
+    results = [writer.write(tmp_path / "log.jsonl", _line(i)) for i in range(100)]
+    release.set()
+    writer.flush(timeout=10)
+
+    assert not all(results)
+    assert writer.dropped == results.count(False)
+    assert len(_read(tmp_path / "log.jsonl")) == results.count(True)
+    writer.close(timeout=10)
+
+
+def test_rotates_by_size(tmp_path):
+    line = _line("x" * 90)
+    writer = RewardLogWriter(max_file_bytes=5 * len(line), backup_count=2)
+    for _ in range(23):
+        writer.write(tmp_path / "log.jsonl", line)
+    writer.close(timeout=10)
+
+    assert len(_read(tmp_path / "log.jsonl")) == 3
+    assert len(_read(tmp_path / "log.jsonl.1")) == 5
+    assert len(_read(tmp_path / "log.jsonl.2")) == 5
+    assert not (tmp_path / "log.jsonl.3").exists()
+
+
+def test_can_be_reused_after_close(tmp_path):
+    writer = RewardLogWriter()
+    writer.write(tmp_path / "log.jsonl", _line(1))
+    writer.close(timeout=10)
+    writer.write(tmp_path / "log.jsonl", _line(2))
+    writer.close(timeout=10)
+    assert _read(tmp_path / "log.jsonl") == [1, 2]
+
+
+def test_writers_are_closed_at_exit(tmp_path):
+    writer = RewardLogWriter(flush_interval=60)
+    writer.write(tmp_path / "log.jsonl", _line(1))
+    reward_log._close_writers()
+    assert _read(tmp_path / "log.jsonl") == [1]
@@ -0,0 +1,85 @@
+import pytest
+from conftest import RULE_MATH_CONFIG, make_response
+
+from glmv_reward.utils.reward_parquet import REWARD_LOG_COLUMNS, ParquetRewardLogWriter, hash_prompt
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+def _columns(rewards, prompt="What is 6 * 7?"):
+    num_rows = len(rewards)
+    columns = {name: [None] * num_rows for name in REWARD_LOG_COLUMNS}
+    columns.update(
+        prompt=[prompt] * num_rows,
+        prompt_hash=[hash_prompt(prompt)] * num_rows,
+        answer=["42"] * num_rows,
+        reward=rewards,
+        judge_path=["judged"] * num_rows,
+    )
+    return columns
+
+
+def _read(dataset_dir):
+    return ds.dataset(dataset_dir, format="parquet", partitioning="hive").to_table()
+
+
+def test_partitions_rows_by_iteration(tmp_path):
+    writer = ParquetRewardLogWriter(row_group_size=4)
+    dataset_dir = str(tmp_path / "math" / "rollout_reward")
+    for iteration in range(3):
+        for _ in range(3):
+            writer.write(dataset_dir, iteration, _columns([1.0, 0.0, 0.5]))
+    assert writer.flush(timeout=10)
+
+    assert sorted(path.name for path in (tmp_path / "math" / "rollout_reward").iterdir()) == [
+        "iteration=0",
+        "iteration=1",
+        "iteration=2",
+    ]
+    table = _read(dataset_dir).sort_by("iteration")
+    assert table.num_rows == writer.written == 27
+    assert table["iteration"].to_pylist() == [0] * 9 + [1] * 9 + [2] * 9
+    assert table["reward"].to_pylist()[:3] == [1.0, 0.0, 0.5]
+    writer.close(timeout=10)
+
+
+def test_repeated_strings_are_dictionary_encoded(tmp_path):
+    writer = ParquetRewardLogWriter()
+    dataset_dir = str(tmp_path / "rollout_reward")
+    writer.write(dataset_dir, 0, _columns([1.0] * 8))
+    writer.close(timeout=10)
+
+    table = _read(dataset_dir)
+    assert pa.types.is_dictionary(table.schema.field("prompt").type)
+    assert pa.types.is_dictionary(table.schema.field("judge_path").type)
+    assert table.schema.field("prompt_hash").type == pa.uint64()
+    assert table["prompt"].combine_chunks().dictionary.to_pylist() == ["What is 6 * 7?"]
+
+
+def test_hash_prompt_is_stable():
+    assert hash_prompt("What is 6 * 7?") == hash_prompt("What is 6 * 7?")
+    assert hash_prompt("What is 6 * 7?") != hash_prompt("What is 6 * 8?")
+    assert 0 <= hash_prompt("") < 2**64
+
+
+def test_reward_system_logs_to_parquet(make_reward_system, tmp_path):
+    reward_system = make_reward_system({"math": RULE_MATH_CONFIG}, reward_log={"jsonl": False, "parquet": True})
+    reward_system.get_reward(
+        prompts=["What is 6 * 7?"] * 3,
+        answers=[make_response("42"), make_response("42"), "bad format"],
+        gt_answers=[make_response("42")] * 3,
+        datasources="math",
+        log_reward_judge=True,
+        save_dir=str(tmp_path / "logs"),
+        current_iteration=7,
+    )
+    assert reward_system.flush_reward_logs(timeout=10)
+
+    assert not list((tmp_path / "logs" / "math").glob("*.jsonl"))
+    records = _read(str(tmp_path / "logs" / "math" / "rollout_reward")).to_pylist()
+    assert [record["reward"] for record in records] == [1.0, 1.0, 0.0]
+    assert [record["judge_path"] for record in records] == ["judged", "deduplicated", "rejected"]
+    assert [record["extracted_answer"] for record in records] == ["42", "42", None]
+    assert all(record["iteration"] == 7 and record["pass_at_k"] for record in records)
+    assert all(record["judge_latency_s"] >= 0 for record in records)
@@ -0,0 +1,55 @@
+import pytest
+from conftest import RULE_MATH_CONFIG, llm_judge_config, make_response
+
+from glmv_reward.utils.llm import LLMJudgeEngine
+
+
+@pytest.fixture
+def make_backend_reward_system(make_reward_system):
+    def make(backend, url="http://127.0.0.1:9/v1/chat/completions"):
+        return make_reward_system(
+            {
+                "backends_general": llm_judge_config(url),
+                "backends_math": RULE_MATH_CONFIG,
+                "backends_ocr": {"verifier_type": "ocr"},
+            },
+            executor={"backend": backend, "num_processes": 2},
+        )
+
+    return make
+
+
+def test_process_backend_matches_thread_backend(make_backend_reward_system):
+    kwargs = {
+        "prompts": ["What is 6 * 7?", "What is 6 * 7?", "Read the text.", "What is 6 * 7?"],
+        "answers": [make_response("42"), make_response("41"), make_response("hello"), "bad format"],
+        "gt_answers": [make_response("42"), make_response("42"), make_response("hello world"), make_response("42")],
+        "datasources": ["backends_math", "backends_math", "backends_ocr", "backends_math"],
+        "return_extracted_answers": True,
+    }
+    expected = make_backend_reward_system("thread").get_reward(**kwargs)
+    assert make_backend_reward_system("process").get_reward(**kwargs) == expected
+
+
+def test_hybrid_backend_runs_llm_judges_on_threads(make_backend_reward_system, stub_judge, monkeypatch):
+    parent_llm_calls = []
+    post_query_llm = LLMJudgeEngine.post_query_llm
+
+    def counting_post_query_llm(self, *args, **kwargs):
+        parent_llm_calls.append(args)
+        return post_query_llm(self, *args, **kwargs)
+
+    monkeypatch.setattr(LLMJudgeEngine, "post_query_llm", counting_post_query_llm)
+    stub_judge.reply = "<|begin_of_box|>Correct<|end_of_box|>"
+    reward_system = make_backend_reward_system("hybrid", url=stub_judge.url)
+
+    rewards = reward_system.get_reward(
+        prompts=["Name the capital of France.", "What is 6 * 7?"],
+        answers=[make_response("paris"), make_response("42")],
+        gt_answers=[make_response("Paris"), make_response("42")],
+        datasources=["backends_general", "backends_math"],
+    )
+
+    assert rewards == [1.0, 1.0]
+    assert len(stub_judge.requests) == 1
+    assert len(parent_llm_calls) == 1
@@ -0,0 +1,63 @@
+import pytest
+from conftest import make_response
+
+
+@pytest.fixture
+def judge_calls(reward_system_instance, monkeypatch):
+    calls = []
+    judge_items = reward_system_instance._judge_items
+
+    def counting_judge_items(items, executor=None):
+        calls.extend(item[:-1] for item in items)
+        return judge_items(items, executor=executor)
+
+    monkeypatch.setattr(reward_system_instance, "_judge_items", counting_judge_items)
+    return calls
+
+
+def test_identical_answers_are_judged_once(reward_system_instance, judge_calls):
+    answers = [
+        make_response("42"),
+        make_response("41"),
+        make_response("42"),
+        "bad format",
+        make_response("42"),
+        make_response("41"),
+    ]
+    rewards, extracted_ans, extracted_gt = reward_system_instance.get_reward(
+        prompts=["What is 6 * 7?"] * len(answers),
+        answers=answers,
+        gt_answers=[make_response("42")] * len(answers),
+        datasources=["math"] * len(answers),
+        return_extracted_answers=True,
+    )
+
+    assert len(judge_calls) == 2
+    assert rewards == [1.0, 0.0, 1.0, 0.0, 1.0, 0.0]
+    assert extracted_ans == ["42", "41", "42", None, "42", "41"]
+    assert extracted_gt == ["42", "42", "42", None, "42", "42"]
+
+
+def test_different_images_are_judged_separately(reward_system_instance, judge_calls):
+    rewards = reward_system_instance.get_reward(
+        prompts=["What is 6 * 7?"] * 2,
+        answers=[make_response("42")] * 2,
+        gt_answers=[make_response("42")] * 2,
+        image_files=["a.png", "b.png"],
+        datasources=["math"] * 2,
+    )
+
+    assert len(judge_calls) == 2
+    assert rewards == [1.0, 1.0]
+
+
+def test_dedup_can_be_disabled(reward_system_instance, judge_calls, monkeypatch):
+    monkeypatch.setattr(reward_system_instance, "dedup_judge", False)
+    reward_system_instance.get_reward(
+        prompts=["What is 6 * 7?"] * 3,
+        answers=[make_response("42")] * 3,
+        gt_answers=[make_response("42")] * 3,
+        datasources=["math"] * 3,
+    )
+
+    assert len(judge_calls) == 3
@@ -0,0 +1,96 @@
+import importlib.metadata
+import json
+import subprocess
+import sys
+
+import pytest
+
+import glmv_reward.verifiers as verifiers_module
+from glmv_reward.verifiers import MathVerifier, Verifier, get_verifier_class, register_verifier
+
+_CONFIG = """
+reward_log_dir: "{log_dir}"
+
+datasource_reward_config_mapping:
+  math: "math_verifier_config"
+
+reward_configs:
+  math_verifier_config:
+    verifier_type: "math"
+    enable_llm_judge_fallback: false
+"""
+
+
+class EchoVerifier(Verifier):
+    def extract_answer(self, response, question=None):
+        return response
+
+    def judge(self, extracted_answer, ground_truth, question=None, image_file=None):
+        return float(extracted_answer == ground_truth)
+
+
+def _loaded_modules(code):
+    process = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(process.stdout.splitlines()[-1]))
+
+
+@pytest.fixture
+def restore_registry(monkeypatch):
+    monkeypatch.setattr(verifiers_module, "_VERIFIER_REGISTRY", dict(verifiers_module._VERIFIER_REGISTRY))
+    monkeypatch.setattr(verifiers_module, "_VERIFIER_CLASSES", dict(verifiers_module._VERIFIER_CLASSES))
+
+
+def test_import_does_not_load_verifier_dependencies():
+    modules = _loaded_modules("import glmv_reward")
+    assert {"sympy", "editdistance", "PIL"}.isdisjoint(modules)
+    verifier_modules = sorted(module for module in modules if module.startswith("glmv_reward.verifiers."))
+    assert verifier_modules == ["glmv_reward.verifiers._base_verifier", "glmv_reward.verifiers.verifier_from_file"]
+
+
+def test_reward_system_only_loads_referenced_verifiers(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(_CONFIG.format(log_dir=tmp_path / "logs"))
+    modules = _loaded_modules(
+        f"from glmv_reward import RewardSystem\nRewardSystem({str(config_file)!r}).get_verifier_from_datasource('math')"
+    )
+    assert "glmv_reward.verifiers.math_verifier" in modules
+    assert "glmv_reward.verifiers.ocr_verifier" not in modules
+    assert "glmv_reward.verifiers.chart_verifier" not in modules
+
+
+def test_verifier_classes_are_resolved_on_first_use(restore_registry):
+    assert get_verifier_class("Math") is MathVerifier
+
+    register_verifier("echo", f"{__name__}:EchoVerifier")
+    assert get_verifier_class("echo") is EchoVerifier
+    register_verifier("math", EchoVerifier)
+    assert get_verifier_class("math") is EchoVerifier
+
+    with pytest.raises(ValueError, match="not supported"):
+        get_verifier_class("unknown")
+    register_verifier("not_a_verifier", "json:dumps")
+    with pytest.raises(TypeError, match="is not a `Verifier`"):
+        get_verifier_class("not_a_verifier")
+
+
+def test_entry_point_plugins(restore_registry, monkeypatch):
+    entry_point = importlib.metadata.EntryPoint(
+        name="echo", value=f"{__name__}:EchoVerifier", group=verifiers_module.VERIFIER_ENTRY_POINT_GROUP
+    )
+    groups = []
+
+    def entry_points(group):
+        groups.append(group)
+        return [entry_point]
+
+    monkeypatch.setattr(verifiers_module, "_plugins_loaded", False)
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+
+    assert get_verifier_class("echo") is EchoVerifier
+    assert get_verifier_class("math") is MathVerifier
+    assert groups == [verifiers_module.VERIFIER_ENTRY_POINT_GROUP]
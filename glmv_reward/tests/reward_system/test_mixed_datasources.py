@@ -0,0 +1,94 @@
+import json
+import threading
+
+from conftest import make_response
+
+from glmv_reward.reward_system import RewardSystem
+
+
+def test_mixed_datasources_match_separate_calls(reward_system_instance):
+    items = [
+        ("What is 6 * 7?", make_response("42"), make_response("42"), "math"),
+        ("Read the text.", make_response("hello world"), make_response("hello world"), "ocr"),
+        ("What is 6 * 7?", make_response("41"), make_response("42"), "math"),
+        ("Read the text.", make_response("hello"), make_response("hello world"), "ocr"),
+        ("What is 6 * 7?", "bad format", make_response("42"), "math"),
+    ]
+    prompts, answers, gt_answers, datasources = (list(column) for column in zip(*items))
+
+    rewards, extracted_ans, _ = reward_system_instance.get_reward(
+        prompts=prompts,
+        answers=answers,
+        gt_answers=gt_answers,
+        datasources=datasources,
+        return_extracted_answers=True,
+    )
+
+    for datasource in ("math", "ocr"):
+        indices = [i for i, item_datasource in enumerate(datasources) if item_datasource == datasource]
+        expected_rewards, expected_extracted_ans, _ = reward_system_instance.get_reward(
+            prompts=[prompts[i] for i in indices],
+            answers=[answers[i] for i in indices],
+            gt_answers=[gt_answers[i] for i in indices],
+            datasources=datasource,
+            return_extracted_answers=True,
+        )
+        assert [rewards[i] for i in indices] == expected_rewards
+        assert [extracted_ans[i] for i in indices] == expected_extracted_ans
+    assert rewards[0] == 1.0
+    assert extracted_ans[1] == "hello world"
+
+
+def test_datasources_are_judged_once_their_extractions_are_done(reward_system_instance, monkeypatch):
+    math_judged = threading.Event()
+    judged_during_extraction = []
+    extract_single_item = reward_system_instance._extract_single_item
+    judge_items = reward_system_instance._judge_items
+
+    def slow_ocr_extraction(prompt, answer, gt_answer, verifier, debug=False):
+        if prompt == "Read the text.":
+            judged_during_extraction.append(math_judged.wait(timeout=2))
+        return extract_single_item(prompt, answer, gt_answer, verifier, debug=debug)
+
+    def signalling_judge_items(items, executor=None):
+        rewards = judge_items(items, executor=executor)
+        if items[0][0] == "What is 6 * 7?":
+            math_judged.set()
+        return rewards
+
+    monkeypatch.setattr(reward_system_instance, "_extract_single_item", slow_ocr_extraction)
+    monkeypatch.setattr(reward_system_instance, "_judge_items", signalling_judge_items)
+    rewards = reward_system_instance.get_reward(
+        prompts=["What is 6 * 7?", "Read the text."],
+        answers=[make_response("42"), make_response("hello world")],
+        gt_answers=[make_response("42"), make_response("hello world")],
+        datasources=["math", "ocr"],
+    )
+    assert judged_during_extraction == [True]
+    assert rewards == [1.0, 1.0]
+
+
+def test_normalize_rewards_per_prompt_group():
+    rewards = RewardSystem.normalize_rewards(
+        [float("-inf"), 0.5, 1.0, float("-inf"), float("-inf"), 0.2],
+        ["a", "a", "a", "b", "b", "c"],
+    )
+    assert rewards == [0.5, 0.5, 1.0, 0.0, 0.0, 0.2]
+
+
+def test_log_reward_judge_per_prompt_group(reward_system_instance, tmp_path):
+    reward_system_instance.get_reward(
+        prompts=["What is 6 * 7?", "What is 6 * 7?", "Read the text."],
+        answers=[make_response("42"), make_response("41"), make_response("hello")],
+        gt_answers=[make_response("42"), make_response("42"), make_response("hello world")],
+        datasources=["math", "math", "ocr"],
+        log_reward_judge=True,
+        save_dir=str(tmp_path),
+    )
+    assert reward_system_instance.flush_reward_logs(timeout=10)
+
+    math_records = [json.loads(line) for line in (tmp_path / "math" / "rollout_reward_pass@k.jsonl").open()]
+    assert [record["reward"] for record in math_records] == [1.0, 0.0]
+    assert all(record["reward_sum_of_this_prompt"] == 1.0 for record in math_records)
+    assert (tmp_path / "ocr" / "rollout_reward_not_pass@k.jsonl").exists()
+    assert not (tmp_path / "ocr" / "rollout_reward_pass@k.jsonl").exists()
@@ -0,0 +1,213 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+from conftest import RULE_MATH_CONFIG, make_response, write_reward_config
+
+from glmv_reward import RewardClient, RewardSystem
+from glmv_reward.configs import ServerConfig
+from glmv_reward.server import RewardServer
+
+
+def _request(answers, prompt="What is 6 * 7?"):
+    return {
+        "prompts": [prompt] * len(answers),
+        "answers": [make_response(answer) for answer in answers],
+        "gt_answers": [make_response("42")] * len(answers),
+        "datasources": "math",
+    }
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    return write_reward_config(tmp_path / "server.yaml", {"math": RULE_MATH_CONFIG})
+
+
+@pytest.fixture
+def make_server(config_file, tmp_path):
+    servers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("port", 0)
+        server = RewardServer(RewardSystem(config_file), ServerConfig(**kwargs))
+        server.start()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.shutdown()
+
+
+def test_get_rewards_matches_get_reward(config_file):
+    reward_system = RewardSystem(config_file)
+    try:
+        requests = [_request(["42", "41"]), _request(["42"], prompt="What is 7 * 6?"), _request([])]
+        expected = [reward_system.get_reward(**request) for request in requests]
+        assert reward_system.get_rewards(requests) == expected
+
+        with pytest.raises(ValueError, match="Unknown reward request fields"):
+            reward_system.get_rewards([{**requests[0], "debug": True}])
+    finally:
+        reward_system.close()
+
+
+def test_client_matches_in_process_rewards(make_server, config_file):
+    server = make_server()
+    reward_system = RewardSystem(config_file)
+    request = _request(["42", "41", "not a number"])
+    try:
+        with RewardClient(server.url) as client:
+            assert client.get_reward(**request) == reward_system.get_reward(**request)
+            rewards, extracted_answers, extracted_gt_answers = client.get_reward(
+                **request, return_extracted_answers=True
+            )
+    finally:
+        reward_system.close()
+    assert rewards == [1.0, 0.0, 0.0]
+    assert extracted_answers[:2] == ["42", "41"]
+    assert extracted_gt_answers[0] == "42"
+
+
+def test_unix_socket(make_server, tmp_path):
+    socket_path = str(tmp_path / "reward.sock")
+    make_server(unix_socket=socket_path)
+    with RewardClient(unix_socket=socket_path) as client:
+        assert client.get_reward(**_request(["42"])) == [1.0]
+
+
+def test_concurrent_requests_are_batched(make_server, monkeypatch):
+    server = make_server(batch_wait=0.2)
+    get_rewards = server.reward_system.get_rewards
+    batch_sizes = []
+
+    def recording_get_rewards(requests):
+        batch_sizes.append(len(requests))
+        return get_rewards(requests)
+
+    monkeypatch.setattr(server.reward_system, "get_rewards", recording_get_rewards)
+    results = [None] * 8
+
+    def send(index):
+        with RewardClient(server.url) as client:
+            results[index] = client.get_reward(**_request(["42"] if index % 2 == 0 else ["41"]))
+
+    threads = [threading.Thread(target=send, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[1.0], [0.0]] * 4
+    assert sum(batch_sizes) == 8
+    assert len(batch_sizes) < 8
+
+
+def test_invalid_requests_fail_alone(make_server, monkeypatch):
+    server = make_server(batch_wait=0.2)
+    get_rewards = server.reward_system.get_rewards
+    batch_sizes = []
+
+    def recording_get_rewards(requests):
+        batch_sizes.append(len(requests))
+        return get_rewards(requests)
+
+    monkeypatch.setattr(server.reward_system, "get_rewards", recording_get_rewards)
+    errors = []
+
+    def send_invalid(request):
+        with RewardClient(server.url) as client:
+            try:
+                client.get_reward(**request)
+            except ValueError as e:
+                errors.append(str(e))
+
+    threads = [
+        threading.Thread(target=send_invalid, args=(request,))
+        for request in [
+            {"prompts": ["a", "b"], "answers": ["a"], "gt_answers": ["a"], "datasources": "math"},
+            {**_request(["42"]), "datasources": "unknown"},
+        ]
+    ]
+    for thread in threads:
+        thread.start()
+    with RewardClient(server.url) as client:
+        assert client.get_reward(**_request(["42"])) == [1.0]
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 2
+    assert any("should be the same" in error for error in errors)
+    assert any("No reward config found for datasource: unknown" in error for error in errors)
+    # * invalid requests are rejected before they are batched
+    assert batch_sizes == [1]
+
+    assert httpx.post(f"{server.url}/v1/reward", content=b"[1, 2]").status_code == 400
+    assert httpx.get(f"{server.url}/healthz").json() == {"status": "ok"}
+
+
+def test_failing_batch_is_split(make_server, monkeypatch):
+    server = make_server(batch_wait=0.5)
+    get_rewards = server.reward_system.get_rewards
+    batch_sizes = []
+
+    def failing_get_rewards(requests):
+        batch_sizes.append(len(requests))
+        if any(request["prompts"][0] == "fail" for request in requests):
+            raise RuntimeError("scoring failed")
+        return get_rewards(requests)
+
+    monkeypatch.setattr(server.reward_system, "get_rewards", failing_get_rewards)
+    results = [None] * 8
+
+    def send(index):
+        with RewardClient(server.url) as client:
+            try:
+                results[index] = client.get_reward(**_request(["42"], prompt="fail" if index == 0 else "6 * 7?"))
+            except httpx.HTTPStatusError as e:
+                results[index] = e.response.status_code
+
+    threads = [threading.Thread(target=send, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [500] + [[1.0]] * 7
+    # * the halves of a failing batch are scored as batches, rather than each request on its own
+    assert sorted(batch_sizes) == [1, 1, 2, 2, 4, 4, 8]
+
+
+def test_serve_command(config_file, tmp_path):
+    socket_path = str(tmp_path / "reward.sock")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "glmv_reward",
+            "serve",
+            "--config",
+            str(config_file),
+            "--unix-socket",
+            socket_path,
+            "--port",
+            "0",
+        ],
+        env=env,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while not os.path.exists(socket_path):
+            assert process.poll() is None and time.monotonic() < deadline
+            time.sleep(0.1)
+        with RewardClient(unix_socket=socket_path) as client:
+            assert client.get_reward(**_request(["42"])) == [1.0]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,149 @@
+from fractions import Fraction
+
+import pytest
+
+from glmv_reward.utils import symbolic
+from glmv_reward.utils.numeric import compare_numbers, compare_plain_numbers, parse_number, parse_plain_number
+from glmv_reward.utils.symbolic import SymbolicResult, compare_real_numbers, compare_symbolic_equivalence
+from glmv_reward.verifiers import GeographyVerifier, get_verifier_from_config
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("42", Fraction(42)),
+        (" -12 ", Fraction(-12)),
+        ("+3.50", Fraction(7, 2)),
+        (".5", Fraction(1, 2)),
+        ("3.", Fraction(3)),
+        ("3 / 4", Fraction(3, 4)),
+        ("-1/2", Fraction(-1, 2)),
+        ("1/0", None),
+        ("1.5/2", None),
+        ("1e3", None),
+        ("x + 1", None),
+        ("", None),
+    ],
+)
+def test_parse_plain_number(text, expected):
+    assert parse_plain_number(text) == expected
+
+
+def test_compare_plain_numbers():
+    assert compare_plain_numbers("2", "2.0", 1e-5) is True
+    assert compare_plain_numbers("1/2", "0.5", 1e-5) is True
+    # * mismatches are left to the caller, and loose tolerances are capped
+    assert compare_plain_numbers("3.14", "3.14159", 1e-5) is None
+    assert compare_plain_numbers("3.14", "3.14159", 1e-2) is None
+    assert compare_plain_numbers("1", "10", 0.9) is None
+    assert compare_plain_numbers("0", "0.0000001", 1e-5) is None
+    assert compare_plain_numbers("pi", "3.14159", 1e-5) is None
+
+
+def test_plain_numbers_skip_sympy(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("sympy should not be used for plain numbers")
+
+    monkeypatch.setattr(symbolic, "_run", fail)
+    assert compare_real_numbers("5.00", "5", 1e-5) is SymbolicResult.MATCH
+    assert compare_symbolic_equivalence("0.25", "1/4", 1e-5) is SymbolicResult.MATCH
+    assert compare_symbolic_equivalence("0", "0.000001", 1e-5) is SymbolicResult.MATCH
+
+
+def test_plain_number_mismatches_are_escalated(monkeypatch):
+    escalated = []
+
+    def run(func, *args, timeout):
+        escalated.append(args[:2])
+        return SymbolicResult.UNPARSEABLE
+
+    monkeypatch.setattr(symbolic, "_run", run)
+    assert compare_symbolic_equivalence("1", "10", 0.9) is SymbolicResult.UNPARSEABLE
+    assert compare_symbolic_equivalence("1/2", "12", 0.9) is SymbolicResult.UNPARSEABLE
+    assert escalated == [("1", "10"), ("1/2", "12")]
+
+
+def test_parse_expression_is_memoized():
+    symbolic._parse_text.cache_clear()
+    assert symbolic.parse_expression("not parseable") is None
+    assert symbolic.parse_expression("not parseable") is None
+    assert symbolic._parse_text.cache_info().hits == 1
+
+
+def test_math_verifier_decides_plain_numbers_natively(math_verifier):
+    assert math_verifier.judge("2", "2.0") == 1.0
+    assert math_verifier.judge("3/2", "1.5") == 1.0
+
+
+@pytest.mark.parametrize(
+    ("datasource", "tolerance"),
+    [("math", 1e-6), ("chart", 2.5e-2), ("physics", 1e-5), ("chemistry", 1e-5), ("multi_image", 1e-6)],
+)
+@pytest.mark.parametrize(("answer", "ground_truth"), [("41", "42"), ("42", "41"), ("0.5", "0.51"), ("1e3", "1001")])
+def test_near_misses_are_left_to_llm(reward_system_instance, datasource, tolerance, answer, ground_truth, monkeypatch):
+    # * verifier instances are shared per datasource by the process, other tests register "math" without fallback
+    verifier = get_verifier_from_config(
+        reward_system_instance.get_reward_config_from_datasource(datasource), f"near_miss_{datasource}"
+    )
+    assert verifier.sympy_tolerance == tolerance
+    assert verifier.enable_llm_judge_fallback
+    fallback_calls = []
+
+    def fallback(extracted_answer, ground_truth, question=None, image_file=None):
+        fallback_calls.append((extracted_answer, ground_truth))
+        return 0.0
+
+    monkeypatch.setattr(verifier, "_llm_judge_fallback", fallback)
+    assert verifier.judge(answer, ground_truth) == 0.0
+    assert verifier.judge_batch([answer], [ground_truth]) == [0.0]
+    assert fallback_calls == [(answer, ground_truth)] * 2
+
+
+def test_geography_near_misses_are_left_to_llm(monkeypatch):
+    verifier = GeographyVerifier(enable_llm_judge_fallback=True)
+    monkeypatch.setattr(verifier, "_llm_judge_fallback", lambda *args, **kwargs: 0.0)
+    assert verifier.judge("41", "42") == 0.0
+    monkeypatch.setattr(verifier, "_llm_judge_fallback", lambda *args, **kwargs: 1.0)
+    assert verifier.judge("41", "42") == 1.0
+    assert verifier.judge_batch(["41", "42.0"], ["42", "42"]) == [1.0, 1.0]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("42", (42.0, True)),
+        ("1e3", (1000.0, False)),
+        ("2.5E-2", (0.025, False)),
+        ("1.2 × 10^3", (1200.0, False)),
+        ("1.2\\times10^{-3}", (0.0012, False)),
+        ("3*10**8", (3e8, False)),
+        ("50%", (0.5, False)),
+        ("12.5\\%", (0.125, False)),
+        ("\\frac{1}{2}", (0.5, False)),
+        ("-\\dfrac{3}{4}", (-0.75, False)),
+        ("1,234,567.5", (1234567.5, False)),
+        ("1,23", None),
+        ("\\frac{1}{0}", None),
+        ("1e99999", None),
+        ("\\frac{x}{2}", None),
+    ],
+)
+def test_parse_number(text, expected):
+    parsed = parse_number(text)
+    if expected is None:
+        assert parsed is None
+    else:
+        assert parsed is not None
+        assert parsed[0] == pytest.approx(expected[0], rel=1e-12)
+        assert parsed[1] is expected[1]
+
+
+def test_compare_numbers_only_decides_matches_for_extended_notations():
+    assert compare_numbers("1e3", "1000", 1e-5) is True
+    assert compare_numbers("\\frac{1}{4}", "0.25", 1e-5) is True
+    assert compare_numbers("50%", "0.5", 1e-5) is True
+    assert compare_numbers("50%", "50", 1e-5) is None
+    assert compare_numbers("1,000", "1001", 1e-5) is None
+    # * mismatches are left to the caller, and loose tolerances are capped
+    assert compare_numbers("3", "4", 1e-5) is None
+    assert compare_numbers("41", "42", 2.5e-2) is None
@@ -0,0 +1,118 @@
+import time
+
+import pytest
+from sympy import Rational, Symbol, sympify
+
+from glmv_reward.utils import symbolic
+from glmv_reward.utils.symbolic import (
+    SymbolicResult,
+    SymbolicWorkerPool,
+    _compare_equivalent,
+    _compare_real,
+    compare_real_numbers,
+    compare_symbolic_equivalence,
+    get_symbolic_pool,
+    set_symbolic_pool_size,
+)
+
+x = Symbol("x")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SymbolicWorkerPool(max_workers=1)
+    yield pool
+    pool.close()
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return SymbolicResult.MATCH
+
+
+def _raise_value_error():
+    raise ValueError("boom")
+
+
+@pytest.mark.parametrize(
+    ("answer", "ground_truth", "expected"),
+    [
+        (Rational(1, 2), sympify(0.5), SymbolicResult.MATCH),
+        (sympify(2), sympify(3), SymbolicResult.MISMATCH),
+        (x + 1, x + 1, SymbolicResult.NOT_REAL),
+        ("1 +", "1", SymbolicResult.UNPARSEABLE),
+    ],
+)
+def test_compare_real_numbers(answer, ground_truth, expected):
+    assert compare_real_numbers(answer, ground_truth, 1e-5) is expected
+
+
+@pytest.mark.parametrize(
+    ("answer", "ground_truth", "expected"),
+    [
+        (x < 1, 1 > x, SymbolicResult.MATCH),
+        (sympify("sin(x)**2 + cos(x)**2"), sympify(1), SymbolicResult.MATCH),
+        ((x + 1) ** 2, x**2 + 2 * x + 1, SymbolicResult.MATCH),
+        (x + 2, x + 1, SymbolicResult.MISMATCH),
+        ("1 +", "1", SymbolicResult.UNPARSEABLE),
+    ],
+)
+def test_compare_symbolic_equivalence(answer, ground_truth, expected):
+    assert compare_symbolic_equivalence(answer, ground_truth, 1e-5) is expected
+
+
+@pytest.mark.parametrize(
+    ("func", "answer", "ground_truth"),
+    [
+        (_compare_real, Rational(1, 2), sympify(0.5)),
+        (_compare_real, sympify(2), sympify(3)),
+        (_compare_real, "2", "2.0"),
+        (_compare_equivalent, (x + 1) ** 2, x**2 + 2 * x + 1),
+    ],
+)
+def test_worker_pool_matches_inline_results(pool, func, answer, ground_truth):
+    assert pool.run(func, answer, ground_truth, 1e-5, timeout=60) is func(answer, ground_truth, 1e-5)
+
+
+def test_worker_pool_reraises_exceptions(pool):
+    with pytest.raises(ValueError, match="boom"):
+        pool.run(_raise_value_error, timeout=60)
+    assert pool.run(_sleep, 0, timeout=60) is SymbolicResult.MATCH
+
+
+def test_worker_pool_kills_slow_comparisons(pool):
+    timeouts = pool.timeouts
+    assert pool.run(_sleep, 60, timeout=0.5) is SymbolicResult.TIMEOUT
+    assert pool.timeouts == timeouts + 1
+    # a fresh worker replaces the killed one
+    assert pool.run(_sleep, 0, timeout=60) is SymbolicResult.MATCH
+
+
+def test_unparseable_pairs_do_not_use_the_pool(monkeypatch):
+    def fail():
+        raise AssertionError("the symbolic pool should not be used for unparseable pairs")
+
+    monkeypatch.setattr(symbolic, "get_symbolic_pool", fail)
+    assert compare_real_numbers("x + 1", "2", 1e-5, timeout=60) is SymbolicResult.UNPARSEABLE
+    assert compare_symbolic_equivalence("1 +", "1", 1e-5, timeout=60) is SymbolicResult.UNPARSEABLE
+
+
+def test_symbolic_pool_size(monkeypatch):
+    monkeypatch.setattr(symbolic, "_POOL", None)
+    monkeypatch.setattr(symbolic, "_POOL_MAX_WORKERS", None)
+    set_symbolic_pool_size(2)
+    pool = get_symbolic_pool()
+    try:
+        assert pool.max_workers == 2
+    finally:
+        pool.close()
+    with pytest.raises(ValueError, match="positive"):
+        set_symbolic_pool_size(0)
+
+
+def test_math_verifier_falls_back_on_timeout(math_verifier, monkeypatch):
+    monkeypatch.setattr(math_verifier, "enable_llm_judge_fallback", False)
+    monkeypatch.setattr(
+        "glmv_reward.verifiers.math_verifier.compare_real_numbers", lambda *args, **kwargs: SymbolicResult.TIMEOUT
+    )
+    assert math_verifier.judge("9**9**9**9", "1") == math_verifier.min_reward
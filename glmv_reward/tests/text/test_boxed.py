@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from glmv_reward.utils.text import BoxMatch, find_boxed_content, find_boxed_content_with_boxed, find_boxed_matches
+
+
+def _reference_find_boxed_content_with_boxed(text):
+    # * the original character-by-character implementation
+    results = []
+    i = 0
+    while i < len(text):
+        if text[i : i + 7] == "\\boxed{":
+            i += 7
+            content = ""
+            brace_count = 1
+            while i < len(text) and brace_count > 0:
+                if text[i] == "{":
+                    brace_count += 1
+                elif text[i] == "}":
+                    brace_count -= 1
+                if brace_count > 0:
+                    content += text[i]
+                i += 1
+            results.append(content)
+        else:
+            i += 1
+    return results
+
+
+def _reference_find_boxed_content(text, begin_token="<|begin_of_box|>", end_token="<|end_of_box|>"):
+    # * the original stack-based implementation
+    boxed_matches = _reference_find_boxed_content_with_boxed(text)
+    if len(boxed_matches) > 0:
+        return boxed_matches
+
+    results = []
+    stack = []
+    num = 0
+    i = 0
+    while i < len(text):
+        begin_pos = text.find(begin_token, i)
+        end_pos = text.find(end_token, i)
+        if begin_pos == -1 and end_pos == -1:
+            break
+        if begin_pos == -1 or (end_pos != -1 and end_pos < begin_pos):
+            if stack and end_pos != -1:
+                num -= 1
+                if num == 0:
+                    results.append(text[stack[-1] + len(begin_token) : end_pos].strip())
+                stack.pop()
+            i = end_pos + len(end_token)
+        else:
+            stack.append(begin_pos)
+            num += 1
+            i = begin_pos + len(begin_token)
+    return results
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("The answer is \\boxed{42}.", ["42"]),
+        ("\\boxed{\\boxed{\\boxed{42}}}", ["\\boxed{\\boxed{42}}"]),
+        ("\\boxed{42} and \\boxed{43}", ["42", "43"]),
+        ("\\boxed{\\frac{1}{2}}", ["\\frac{1}{2}"]),
+        ("\\boxed{unclosed {brace}", ["unclosed {brace}"]),
+        ("<|begin_of_box|>\\boxed{7}<|end_of_box|>", ["7"]),
+        ("<|begin_of_box|> 42 <|end_of_box|><|begin_of_box|>43<|end_of_box|>", ["42", "43"]),
+        ("<|begin_of_box|>a<|begin_of_box|>b<|end_of_box|>c<|end_of_box|>", ["a<|begin_of_box|>b<|end_of_box|>c"]),
+        ("<|end_of_box|><|begin_of_box|>x<|end_of_box|><|end_of_box|>", ["x"]),
+        ("<|begin_of_box|>never closed", []),
+        ("no answer", []),
+    ],
+)
+def test_find_boxed_content(text, expected):
+    assert find_boxed_content(text) == expected
+
+
+def test_find_boxed_matches_returns_spans():
+    text = "so \\boxed{4} then <|begin_of_box|>5<|end_of_box|>"
+    assert find_boxed_matches(text) == [BoxMatch("4", 3, 12)]
+
+    text = "so <|begin_of_box|> 5 <|end_of_box|>!"
+    (match,) = find_boxed_matches(text)
+    assert match.content == "5"
+    assert text[match.start : match.end] == "<|begin_of_box|> 5 <|end_of_box|>"
+
+    text = "\\boxed{a{b}"
+    assert find_boxed_matches(text) == [BoxMatch("a{b}", 0, len(text))]
+
+
+@pytest.mark.parametrize(
+    ("begin_token", "end_token"), [("[[", "]]"), ("\\[", "\\]"), ("<box>", "</box>"), ("xx", "x}")]
+)
+def test_custom_tokens_match_reference(begin_token, end_token):
+    rng = random.Random(1)
+    pieces = [begin_token, end_token, "\\boxed{", "{", "}", " ", "x", "\\"]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        expected = _reference_find_boxed_content(text, begin_token, end_token)
+        assert find_boxed_content(text, begin_token, end_token) == expected, text
+
+
+def test_matches_reference_on_random_texts():
+    rng = random.Random(0)
+    pieces = ["\\boxed{", "\\boxed", "{", "}", "<|begin_of_box|>", "<|end_of_box|>", "<|begin_of_box", " ", "a", "1"]
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        assert find_boxed_content_with_boxed(text) == _reference_find_boxed_content_with_boxed(text), text
+        assert find_boxed_content(text) == _reference_find_boxed_content(text), text
+
+
+def test_empty_tokens_are_rejected():
+    with pytest.raises(ValueError, match="should not be empty"):
+        find_boxed_matches("text", begin_token="")
@@ -0,0 +1,73 @@
+import random
+import re
+
+import pytest
+
+from glmv_reward.utils.text import detect_long_paragraph_mixing
+
+
+def _reference_detect_long_paragraph_mixing(text, min_chinese_chars=50, min_english_words=200):
+    # * the original implementation
+    paragraphs = [p.strip() for p in re.split(r"\n{2,}", text) if p.strip()]
+    has_long_chinese = False
+    has_long_english = False
+    for para in paragraphs:
+        chinese_count = len(re.findall(r"[\u4e00-\u9fff]", para))
+        english_count = len(re.findall(r"\b[a-zA-Z]{2,}\b", para))
+        if chinese_count >= min_chinese_chars and chinese_count / len(para) > 0.8:
+            has_long_chinese = True
+        if english_count >= min_english_words and english_count / (len(para.split()) + 1e-5) > 0.7:
+            has_long_english = True
+        if has_long_chinese and has_long_english:
+            return True
+    return has_long_chinese and has_long_english
+
+
+_CHINESE = "因为三角形的面积等于底乘以高除以二所以答案是十二"
+_ENGLISH = "the area of the triangle equals half the base times the height so answer is twelve".split()
+
+
+def _chinese_paragraph(rng, length):
+    return "".join(rng.choice(_CHINESE) for _ in range(length))
+
+
+def _english_paragraph(rng, words):
+    return " ".join(rng.choice(_ENGLISH) for _ in range(words))
+
+
+def test_detects_long_paragraph_mixing():
+    rng = random.Random(0)
+    chinese = _chinese_paragraph(rng, 80)
+    english = _english_paragraph(rng, 250)
+    assert detect_long_paragraph_mixing(f"{chinese}\n\n{english}") is True
+    assert detect_long_paragraph_mixing(f"{chinese}\n{english}") is False
+    assert detect_long_paragraph_mixing(f"{chinese}\n\n{chinese}") is False
+    assert detect_long_paragraph_mixing(f"{english}\n\n\n{english}") is False
+    assert detect_long_paragraph_mixing("") is False
+
+
+def test_words_glued_to_chinese_characters_are_not_counted():
+    rng = random.Random(0)
+    chinese = _chinese_paragraph(rng, 80)
+    glued = " ".join(f"{word}中" for word in _english_paragraph(rng, 250).split())
+    assert detect_long_paragraph_mixing(f"{chinese}\n\n{glued}") is False
+
+
+@pytest.mark.parametrize(("min_chinese_chars", "min_english_words"), [(50, 200), (5, 10), (1, 1), (0, 0)])
+def test_matches_reference_on_random_texts(min_chinese_chars, min_english_words):
+    rng = random.Random(min_chinese_chars)
+    for _ in range(300):
+        paragraphs = []
+        for _ in range(rng.randint(0, 6)):
+            kind = rng.random()
+            if kind < 0.3:
+                paragraphs.append(_chinese_paragraph(rng, rng.randint(0, 120)))
+            elif kind < 0.6:
+                paragraphs.append(_english_paragraph(rng, rng.randint(0, 300)))
+            elif kind < 0.8:
+                paragraphs.append(_chinese_paragraph(rng, 30) + " " + _english_paragraph(rng, 20))
+            else:
+                paragraphs.append(rng.choice(["", "  ", "x = 1", "中a", "a1b2", "\t"]))
+        text = "".join(paragraph + rng.choice(["\n", "\n\n", "\n\n\n", " \n \n"]) for paragraph in paragraphs)
+        expected = _reference_detect_long_paragraph_mixing(text, min_chinese_chars, min_english_words)
+        assert detect_long_paragraph_mixing(text, min_chinese_chars, min_english_words) is expected
@@ -0,0 +1,84 @@
+import random
+import re
+
+import pytest
+
+from glmv_reward.utils import text as text_utils
+from glmv_reward.utils.text import detect_repeat
+
+
+def _reference_detect_repeat(text, min_chars=50, min_repetition=10, exclude_length=3):
+    # * the original implementation
+    text = re.sub(r"\|[-]+\|", "|", text)
+    for ch in ["=", "|", "-", "~", "_", "#", "*", ".", "%", "－", "█", " ", "─"]:
+        text = re.sub(rf"{re.escape(ch)}{{{exclude_length},}}", "", text)
+
+    times = {}
+    for i in range(min_chars, len(text) + 1):
+        hash_val = hash(text[i - min_chars : i])
+        times[hash_val] = times.get(hash_val, 0) + 1
+        if times[hash_val] >= min_repetition:
+            return True
+    return False
+
+
+def _random_text(rng, length, alphabet="abcdefghij klmnopqrstuvwxyz中文公式=-|.*"):
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def test_detects_degenerate_outputs():
+    assert detect_repeat("Let me check again. " * 20) is True
+    assert detect_repeat("Let me check again. " * 2) is False
+    assert detect_repeat("The answer is 42. " * 3000) is True
+
+
+def test_ignores_formatting_runs():
+    assert detect_repeat("=" * 5000) is False
+    assert detect_repeat("|---|---|\n" * 10) is False
+    assert _reference_detect_repeat("|---|---|\n" * 10) is False
+
+
+@pytest.mark.parametrize(("length", "min_chars", "min_repetition"), [(200, 5, 3), (3000, 8, 4), (20000, 50, 10)])
+def test_matches_reference_on_random_texts(length, min_chars, min_repetition):
+    rng = random.Random(length)
+    for _ in range(20):
+        text = _random_text(
+            rng, length, alphabet=rng.choice(["ab", "abc ", "abcdefghij klmnopqrstuvwxyz中文公式=-|.*"])
+        )
+        expected = _reference_detect_repeat(text, min_chars, min_repetition)
+        assert detect_repeat(text, min_chars, min_repetition) is expected
+
+
+@pytest.mark.parametrize("repeat_at", [100, 10_000, 30_000])
+def test_matches_reference_on_long_texts(repeat_at):
+    rng = random.Random(repeat_at)
+    text = _random_text(rng, 32_000)
+    assert detect_repeat(text) is _reference_detect_repeat(text) is False
+
+    phrase = _random_text(rng, 60)
+    text = text[:repeat_at] + phrase * 12 + text[repeat_at:]
+    assert detect_repeat(text) is _reference_detect_repeat(text) is True
+
+
+def test_hash_collisions_are_confirmed(monkeypatch):
+    def colliding_hashes(codes, window):
+        return text_utils.np.zeros(len(codes) - window + 1, dtype=text_utils.np.uint64)
+
+    monkeypatch.setattr(text_utils, "_window_hashes", colliding_hashes)
+    text = _random_text(random.Random(0), 10_000)
+    assert detect_repeat(text) is False
+
+
+def test_lone_surrogates():
+    # * e.g. a truncated surrogate pair decoded with `errors="surrogatepass"`
+    assert detect_repeat("\ud800" + "abc" * 3000) is True
+    rng = random.Random(0)
+    text = "\udfff" + _random_text(rng, 10_000)
+    assert detect_repeat(text) is _reference_detect_repeat(text) is False
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="min_chars"):
+        detect_repeat("text", min_chars=0)
+    with pytest.raises(ValueError, match="min_repetition"):
+        detect_repeat("text", min_repetition=1)
@@ -0,0 +1,132 @@
+import random
+import re
+
+import pytest
+
+from glmv_reward.utils.response import ParsedResponse, parse_response
+
+_STRICT_PATTERN = re.compile(r"^<think>(.*?)</think>\s*<answer>(.*?)</answer>$", re.DOTALL | re.IGNORECASE)
+_LENIENT_PATTERN = re.compile(r"^<think>(.*?)</think>(.*)$", re.DOTALL | re.IGNORECASE)
+_AVOID_TAGS = ["<think>", "</think>", "<answer>", "</answer>"]
+
+
+def _reference_check_answer_format(response):
+    # * the original `RewardSystem.check_answer_format`
+    match = _STRICT_PATTERN.search(response)
+    if not match:
+        return False
+    think_part = match.group(1).strip()
+    answer_part = match.group(2).strip()
+    if (
+        answer_part.lower().count("<|begin_of_box|>") > 1
+        or answer_part.lower().count("<|end_of_box|>") > 1
+        or answer_part.lower().count("\\boxed{") > 0
+    ):
+        return False
+    return not (
+        any(tag in think_part.lower() for tag in _AVOID_TAGS) or any(tag in answer_part.lower() for tag in _AVOID_TAGS)
+    )
+
+
+def _check_answer_format(response):
+    parsed = parse_response(response)
+    if parsed.answer is None:
+        return False
+    begin_box_count, end_box_count, legacy_boxed_count = parsed.box_token_counts
+    if begin_box_count > 1 or end_box_count > 1 or legacy_boxed_count > 0:
+        return False
+    return not parsed.has_nested_tags
+
+
+_PIECES = [
+    "<think>",
+    "</think>",
+    "<answer>",
+    "</answer>",
+    "<THINK>",
+    "</Answer>",
+    "<|begin_of_box|>",
+    "<|end_of_box|>",
+    "<|BEGIN_OF_BOX|>",
+    "\\boxed{",
+    "\\BOXED{",
+    "}",
+    " ",
+    "\n",
+    "42",
+    "İ",
+    "K",
+]
+
+
+def _random_response(rng):
+    middle = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 8)))
+    answer = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 6)))
+    return (
+        rng.choice(["<think>", "<Think>", ""])
+        + middle
+        + rng.choice(["</think><answer>", "</think>\n<answer>", ""])
+        + (answer + rng.choice(["</answer>", "</ANSWER>", ""]))
+        + rng.choice(["", "", "\n", "\n\n", " ", "</answer>", "</answer>\n"])
+    )
+
+
+def test_check_answer_format_matches_reference():
+    rng = random.Random(0)
+    for _ in range(20000):
+        response = _random_response(rng)
+        match = _STRICT_PATTERN.search(response)
+        parsed = ParsedResponse(response)
+        assert parsed.think == (None if match is None else match.group(1).strip()), response
+        assert parsed.answer == (None if match is None else match.group(2).strip()), response
+        assert _check_answer_format(response) is _reference_check_answer_format(response), response
+
+
+def test_lenient_layout_matches_reference():
+    rng = random.Random(1)
+    for _ in range(20000):
+        response = _random_response(rng)
+        parsed = ParsedResponse(response)
+        match = _LENIENT_PATTERN.search(response)
+        if match is None:
+            assert parsed.lenient_answer is None
+            assert parsed.lenient_has_think_tags is False
+            continue
+        think_part, answer_part = match.group(1).strip(), match.group(2).strip()
+        assert parsed.lenient_think == think_part
+        assert parsed.lenient_answer == answer_part
+        assert parsed.lenient_has_think_tags is any(tag in think_part.lower() for tag in _AVOID_TAGS[:2])
+        assert parsed.lenient_has_nested_tags is (
+            any(tag in think_part.lower() for tag in _AVOID_TAGS)
+            or any(tag in answer_part.lower() for tag in _AVOID_TAGS)
+        )
+
+
+@pytest.mark.parametrize(
+    ("response", "think", "answer", "boxes"),
+    [
+        (
+            "<think>a</think><answer><|begin_of_box|>42<|end_of_box|></answer>",
+            "a",
+            "<|begin_of_box|>42<|end_of_box|>",
+            ["42"],
+        ),
+        (
+            "<think>a</think>\n<answer> \\boxed{1} and \\boxed{2} </answer>",
+            "a",
+            "\\boxed{1} and \\boxed{2}",
+            ["1", "2"],
+        ),
+        ("<think>a</think>42", None, None, []),
+    ],
+)
+def test_parsed_response(response, think, answer, boxes):
+    parsed = ParsedResponse(response)
+    assert parsed.think == think
+    assert parsed.answer == answer
+    assert [box.content for box in parsed.answer_boxes] == boxes
+
+
+def test_parse_response_is_memoized():
+    response = "<think>a</think><answer>b</answer>"
+    assert parse_response(response) is parse_response(response)